@@ -1,6 +1,8 @@
 import logging
 import os
 import re
+import threading
+import time
 import uuid
 from typing import Any, Optional
 
@@ -31,15 +33,12 @@ from rest_framework.response import Response
 from tenant_account_v2.models import OrganizationMember as OrganizationMember
 from tenant_account_v2.organization_member_service import OrganizationMemberService
 from utils.user_context import UserContext
+from utils.user_session import UserSessionUtils
 
 logger = logging.getLogger(__name__)
 
 
 class AuthenticationService:
-    def __init__(self) -> None:
-        self.authentication_helper = AuthenticationHelper()
-        self.default_organization: Organization = self.user_organization()
-
     def _validate_password_complexity(self, password: str) -> None:
         """Validate password meets complexity requirements."""
         if len(password) < 12:
@@ -110,11 +109,38 @@ class AuthenticationService:
 
     def __init__(self) -> None:
         self.authentication_helper = AuthenticationHelper()
-        self.default_organization: Organization = self.user_organization()
+        self._default_organization: Optional[Organization] = None
+        self._default_organization_loaded_at = 0.0
+        self._default_organization_lock = threading.Lock()
         # Rate limiting now handled by external service (Redis)
         # Initialize with empty dict for backward compatibility
         self.login_attempts = {}
 
+    @property
+    def default_organization(self) -> Organization:
+        """Organization of `user_organization()`, loaded on first use.
+
+        A service can be shared by the requests of a process, so the
+        organization is reloaded once it is older than
+        `DEFAULT_ORGANIZATION_REFRESH_INTERVAL` seconds.
+        """
+        if self._is_default_organization_stale():
+            with self._default_organization_lock:
+                if self._is_default_organization_stale():
+                    self.default_organization = self.user_organization()
+        return self._default_organization
+
+    @default_organization.setter
+    def default_organization(self, organization: Organization) -> None:
+        self._default_organization = organization
+        self._default_organization_loaded_at = time.monotonic()
+
+    def _is_default_organization_stale(self) -> bool:
+        if self._default_organization is None:
+            return True
+        age = time.monotonic() - self._default_organization_loaded_at
+        return age >= settings.DEFAULT_ORGANIZATION_REFRESH_INTERVAL
+
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP address for rate limiting."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
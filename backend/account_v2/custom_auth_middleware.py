@@ -1,10 +1,13 @@
+import threading
+from typing import Optional
+
 from account_v2.authentication_plugin_registry import AuthenticationPluginRegistry
 from account_v2.authentication_service import AuthenticationService
 from account_v2.constants import Common
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse, JsonResponse
-from utils.constants import Account
 from utils.local_context import StateStore
+from utils.user_context import UserContext
 from utils.user_session import UserSessionUtils
 
 from backend.constants import RequestHeader
@@ -14,6 +17,31 @@ class CustomAuthMiddleware:
     def __init__(self, get_response: HttpResponse):
         self.get_response = get_response
         # One-time configuration and initialization.
+        self._auth_service: Optional[AuthenticationService] = None
+        self._auth_service_lock = threading.Lock()
+
+    @property
+    def auth_service(self) -> AuthenticationService:
+        """Authentication service shared by all requests of the process.
+
+        It's created on the first authenticated request rather than at
+        startup, since plugins may need the database to be ready.
+        """
+        if self._auth_service is None:
+            with self._auth_service_lock:
+                if self._auth_service is None:
+                    self._auth_service = self._create_auth_service()
+        return self._auth_service
+
+    @staticmethod
+    def _create_auth_service() -> AuthenticationService:
+        if AuthenticationPluginRegistry.is_plugin_available():
+            auth_service: AuthenticationService = (
+                AuthenticationPluginRegistry.get_plugin()
+            )
+        else:
+            auth_service = AuthenticationService()
+        return auth_service
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         # Returns result without authenticated if added in whitelisted paths
@@ -25,27 +53,22 @@ class CustomAuthMiddleware:
         if settings.INTERNAL_SERVICE_API_KEY:
             # Use constant-time comparison to prevent timing attacks
             from django.utils.crypto import constant_time_compare
-            if constant_time_compare(x_api_key or '', settings.INTERNAL_SERVICE_API_KEY):
+
+            if constant_time_compare(
+                x_api_key or "", settings.INTERNAL_SERVICE_API_KEY
+            ):
                 return self.get_response(request)
             return self.get_response(request)
 
-        if AuthenticationPluginRegistry.is_plugin_available():
-            auth_service: AuthenticationService = (
-                AuthenticationPluginRegistry.get_plugin()
-            )
-        else:
-            auth_service = AuthenticationService()
-
-        is_authenticated = auth_service.is_authenticated(request)
+        is_authenticated = self.auth_service.is_authenticated(request)
 
         if is_authenticated:
             StateStore.set(Common.LOG_EVENTS_ID, request.session.session_key)
-            StateStore.set(
-                Account.ORGANIZATION_ID,
-                UserSessionUtils.get_organization_id(request=request),
+            UserContext.set_organization_identifier(
+                UserSessionUtils.get_organization_id(request=request)
             )
             response = self.get_response(request)
-            StateStore.clear(Account.ORGANIZATION_ID)
+            UserContext.clear_organization()
             StateStore.clear(Common.LOG_EVENTS_ID)
 
             return response
@@ -1 +1,42 @@
-# Create your tests here.
+from account_v2.custom_auth_middleware import CustomAuthMiddleware
+from account_v2.models import User
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.base import SessionBase
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+
+def _request(user, **headers) -> HttpRequest:
+    request = RequestFactory().get("/api/v1/unstract/org/workflow/", **headers)
+    request.user = user
+    request.session = SessionBase()
+    request.organization_id = None
+    return request
+
+
+def _middleware() -> CustomAuthMiddleware:
+    return CustomAuthMiddleware(lambda request: HttpResponse("ok"))
+
+
+def test_auth_service_shared_across_requests(monkeypatch):
+    created = []
+    create_auth_service = CustomAuthMiddleware._create_auth_service
+
+    def _create_auth_service():
+        created.append(True)
+        return create_auth_service()
+
+    monkeypatch.setattr(
+        CustomAuthMiddleware, "_create_auth_service", staticmethod(_create_auth_service)
+    )
+    middleware = _middleware()
+    # Runs without database access, pytest-django fails on any query
+    for _ in range(100):
+        assert middleware(_request(User(username="user"))).status_code == 200
+    assert len(created) == 1
+
+
+def test_unauthenticated_request_rejected(settings):
+    settings.INTERNAL_SERVICE_API_KEY = None
+    response = _middleware()(_request(AnonymousUser()))
+    assert response.status_code == 401
@@ -18,8 +18,8 @@ from rest_framework.request import Request
 from rest_framework.serializers import Serializer
 from rest_framework.utils.serializer_helpers import ReturnDict
 from tags.models import Tag
-from utils.constants import Account, CeleryQueue
-from utils.local_context import StateStore
+from utils.constants import CeleryQueue
+from utils.user_context import UserContext
 from workflow_manager.endpoint_v2.destination import DestinationConnector
 from workflow_manager.endpoint_v2.source import SourceConnector
 from workflow_manager.workflow_v2.dto import ExecutionResponse
@@ -40,7 +40,7 @@ class DeploymentHelper(BaseAPIKeyValidator):
         if not api_name:
             raise InvalidAPIRequest("Missing params api_name")
         # Set organization in state store for API
-        StateStore.set(Account.ORGANIZATION_ID, org_name)
+        UserContext.set_organization_identifier(org_name)
 
     @staticmethod
     def validate_and_process(
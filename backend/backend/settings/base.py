@@ -111,12 +111,36 @@ PROMPT_PORT = os.environ.get("PROMPT_PORT", 3003)
 PROMPT_STUDIO_FILE_PATH = os.environ.get(
     "PROMPT_STUDIO_FILE_PATH", "/app/prompt-studio-data"
 )
+# Seconds files streamed from remote storage are cached locally, 0 disables
+FILE_STREAM_CACHE_TTL = int(os.environ.get("FILE_STREAM_CACHE_TTL", 300))
+FILE_STREAM_CACHE_DIR = os.environ.get(
+    "FILE_STREAM_CACHE_DIR", "/tmp/unstract-file-stream-cache"
+)
+# Seconds between evictions of expired files from the local cache
+FILE_STREAM_CACHE_EVICTION_INTERVAL = int(
+    os.environ.get("FILE_STREAM_CACHE_EVICTION_INTERVAL", 60)
+)
 X2TEXT_HOST = os.environ.get("X2TEXT_HOST", "http://localhost")
 X2TEXT_PORT = os.environ.get("X2TEXT_PORT", 3004)
 STRUCTURE_TOOL_IMAGE_URL = get_required_setting("STRUCTURE_TOOL_IMAGE_URL")
 STRUCTURE_TOOL_IMAGE_NAME = get_required_setting("STRUCTURE_TOOL_IMAGE_NAME")
 STRUCTURE_TOOL_IMAGE_TAG = get_required_setting("STRUCTURE_TOOL_IMAGE_TAG")
 CACHE_TTL_SEC = os.environ.get("CACHE_TTL_SEC", 10800)
+# Number of keys per SCAN iteration and UNLINK batch of cache enumerations
+CACHE_SCAN_BATCH_SIZE = int(os.environ.get("CACHE_SCAN_BATCH_SIZE", 1000))
+# Record cache keys in per scope registries so that enumerating and
+# clearing a scope does not iterate the whole Redis keyspace
+CACHE_KEY_REGISTRY_ENABLED = CommonUtils.str_to_bool(
+    os.environ.get("CACHE_KEY_REGISTRY_ENABLED", "False")
+)
+# Seconds a resolved organization is shared across requests of a process,
+# 0 limits reuse to a single request or task
+ORGANIZATION_CACHE_TTL = int(os.environ.get("ORGANIZATION_CACHE_TTL", 0))
+# Seconds after which the default organization of the process wide
+# authentication service is reloaded
+DEFAULT_ORGANIZATION_REFRESH_INTERVAL = int(
+    os.environ.get("DEFAULT_ORGANIZATION_REFRESH_INTERVAL", 300)
+)
 
 DEFAULT_AUTH_USERNAME = os.environ.get("DEFAULT_AUTH_USERNAME", "unstract")
 DEFAULT_AUTH_PASSWORD = os.environ.get("DEFAULT_AUTH_PASSWORD", "unstract")
@@ -129,12 +153,83 @@ LOG_HISTORY_CONSUMER_INTERVAL = int(
     get_required_setting("LOG_HISTORY_CONSUMER_INTERVAL", "60")
 )
 LOGS_BATCH_LIMIT = int(get_required_setting("LOGS_BATCH_LIMIT", "30"))
+# Usage rollups used by usage dashboards and per run token counts
+USAGE_ROLLUP_COMPACTION_INTERVAL = int(
+    os.environ.get("USAGE_ROLLUP_COMPACTION_INTERVAL", 300)
+)
+USAGE_ROLLUP_SETTLE_DELAY = int(os.environ.get("USAGE_ROLLUP_SETTLE_DELAY", 120))
+USAGE_ROLLUP_MAX_HOURS_PER_RUN = int(
+    os.environ.get("USAGE_ROLLUP_MAX_HOURS_PER_RUN", 168)
+)
+USAGE_ROLLUP_RESCAN_HOURS = int(os.environ.get("USAGE_ROLLUP_RESCAN_HOURS", 6))
 LOGS_EXPIRATION_TIME_IN_SECOND = int(
     get_required_setting("LOGS_EXPIRATION_TIME_IN_SECOND", "86400")
 )
 
 INDEXING_FLAG_TTL = int(get_required_setting("INDEXING_FLAG_TTL"))
+# Expiry of the org-wide single-flight indexing lock, releases locks of
+# crashed workers
+INDEXING_LOCK_TTL = int(os.environ.get("INDEXING_LOCK_TTL", 900))
+# Time a caller waits on an in-flight indexing before reporting it as pending
+INDEXING_LOCK_WAIT_TIMEOUT = int(os.environ.get("INDEXING_LOCK_WAIT_TIMEOUT", 30))
 NOTIFICATION_TIMEOUT = int(get_required_setting("NOTIFICATION_TIMEOUT", "5"))
+# Files of a workflow's output uploaded concurrently to a destination connector
+DESTINATION_UPLOAD_MAX_WORKERS = int(
+    os.environ.get("DESTINATION_UPLOAD_MAX_WORKERS", 4)
+)
+# Write rows of database destinations that support it in batches of
+# DB_DESTINATION_BULK_BATCH_SIZE rows, instead of an insert per file
+DB_DESTINATION_BULK_WRITE = CommonUtils.str_to_bool(
+    os.environ.get("DB_DESTINATION_BULK_WRITE", "False")
+)
+DB_DESTINATION_BULK_BATCH_SIZE = int(
+    os.environ.get("DB_DESTINATION_BULK_BATCH_SIZE", 500)
+)
+# Seconds after which incremental source listing starts over with a full rescan
+SOURCE_LISTING_FULL_RESCAN_INTERVAL = int(
+    os.environ.get("SOURCE_LISTING_FULL_RESCAN_INTERVAL", 86400)
+)
+# "inline" to embed input files in review queue messages, "reference" to
+# store them under REVIEW_QUEUE_FILE_PATH in permanent storage. Messages then
+# carry no file_content, "reference" needs a review queue consumer which reads
+# the file through QueueUtils.get_file_content and releases it through
+# QueueUtils.acknowledge once the message is processed
+REVIEW_QUEUE_PAYLOAD_MODE = os.environ.get("REVIEW_QUEUE_PAYLOAD_MODE", "inline")
+REVIEW_QUEUE_FILE_PATH = os.environ.get(
+    "REVIEW_QUEUE_FILE_PATH", "unstract/review-queue"
+)
+# Days stored files of review queue messages that are never acknowledged
+# are kept, deleted every REVIEW_QUEUE_FILE_CLEANUP_INTERVAL seconds
+REVIEW_QUEUE_FILE_TTL_DAYS = int(os.environ.get("REVIEW_QUEUE_FILE_TTL_DAYS", 30))
+REVIEW_QUEUE_FILE_CLEANUP_INTERVAL = int(
+    os.environ.get("REVIEW_QUEUE_FILE_CLEANUP_INTERVAL", 3600)
+)
+# Keep-alive connections pooled per webhook host
+WEBHOOK_POOL_MAXSIZE = int(os.environ.get("WEBHOOK_POOL_MAXSIZE", 10))
+# Concurrent deliveries per webhook endpoint across workers, 0 for no limit
+WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT = int(
+    os.environ.get("WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT", 10)
+)
+# Times a webhook is deferred for a busy endpoint before it's delivered
+# regardless of WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT
+WEBHOOK_MAX_BUSY_DEFERRALS = int(os.environ.get("WEBHOOK_MAX_BUSY_DEFERRALS", 60))
+# Upper bound in seconds of the exponential backoff between webhook retries
+WEBHOOK_RETRY_BACKOFF_MAX = int(os.environ.get("WEBHOOK_RETRY_BACKOFF_MAX", 300))
+# Seconds API webhooks to the same URL are coalesced into a single request
+# with a JSON array payload, 0 sends each notification on its own
+WEBHOOK_BATCH_WINDOW = int(os.environ.get("WEBHOOK_BATCH_WINDOW", 0))
+# Reuse compiled tool instances of a workflow across its executions
+WORKFLOW_PLAN_CACHE_ENABLED = CommonUtils.str_to_bool(
+    os.environ.get("WORKFLOW_PLAN_CACHE_ENABLED", "True")
+)
+# Run the files of multi-tool workflows through their tools as a pipeline,
+# with up to WORKFLOW_PIPELINE_STAGE_CONCURRENCY files per tool at a time
+WORKFLOW_PIPELINED_EXECUTION = CommonUtils.str_to_bool(
+    os.environ.get("WORKFLOW_PIPELINED_EXECUTION", "False")
+)
+WORKFLOW_PIPELINE_STAGE_CONCURRENCY = int(
+    os.environ.get("WORKFLOW_PIPELINE_STAGE_CONCURRENCY", 2)
+)
 ATOMIC_REQUESTS = CommonUtils.str_to_bool(
     os.environ.get("DJANGO_ATOMIC_REQUESTS", "False")
 )
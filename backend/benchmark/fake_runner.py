@@ -0,0 +1,221 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from unstract.tool_sandbox.constants import UnstractRunner
+from unstract.workflow_execution.constants import (
+    MetaDataKey,
+    ToolMetadataKey,
+    ToolOutputType,
+)
+from unstract.workflow_execution.execution_file_handler import ExecutionFileHandler
+from utils.cache_service import CacheService
+
+from unstract.core.constants import RunnerJobKey, RunnerJobStatus
+from unstract.filesystem import FileStorageType, FileSystem
+
+logger = logging.getLogger(__name__)
+
+
+class FakeRunner:
+    """Local stand-in for the runner service.
+
+    Instead of starting a tool container, a run writes a deterministic JSON
+    output for the file to the execution directory, the way a tool does.
+    Since no tool runs, prompt-service, LLMs, embeddings and vector DBs
+    aren't called either, leaving only the platform's own overhead to be
+    measured.
+
+    Runs are served over `container/run` and, like the runner, as jobs
+    over `container/jobs` whose completion is pushed to Redis.
+    """
+
+    TOOL_NAME = "benchmark_echo"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """
+        Args:
+            delay (float): Seconds each run takes, to simulate tool time
+        """
+        self.delay = delay
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler())
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._executor = ThreadPoolExecutor(thread_name_prefix="fake-runner-job")
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def host(self) -> str:
+        return "http://127.0.0.1"
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._executor.shutdown(wait=True)
+
+    def run(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Writes the output of a tool run to the execution directory."""
+        if self.delay:
+            time.sleep(self.delay)
+        handler = ExecutionFileHandler(
+            workflow_id=data["workflow_id"],
+            execution_id=data["execution_id"],
+            organization_id=data["organization_id"],
+        )
+        file_storage = FileSystem(FileStorageType.WORKFLOW_EXECUTION).get_file_storage()
+        metadata = handler.get_workflow_metadata()
+        output = {
+            "file_execution_id": data["file_execution_id"],
+            "source_name": metadata.get(MetaDataKey.SOURCE_NAME),
+            "source_hash": metadata.get(MetaDataKey.SOURCE_HASH),
+        }
+        file_storage.write(path=handler.infile, mode="w", data=json.dumps(output))
+        metadata.setdefault(MetaDataKey.TOOL_METADATA, []).append(
+            {
+                ToolMetadataKey.TOOL_NAME: self.TOOL_NAME,
+                ToolMetadataKey.OUTPUT_TYPE: ToolOutputType.JSON,
+                ToolMetadataKey.ELAPSED_TIME: self.delay,
+            }
+        )
+        file_storage.json_dump(path=handler.metadata_file, data=metadata)
+        return {"type": "RESULT", "result": None}
+
+    def submit_job(self, data: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+        """Starts a job for the run, unless one exists for its container.
+
+        Returns:
+            tuple[dict[str, Any], bool]: The job, and whether it was created
+        """
+        job_id = data["container_name"]
+        with self._lock:
+            if job_id in self._jobs:
+                return dict(self._jobs[job_id]), False
+            job = {"job_id": job_id, "status": RunnerJobStatus.QUEUED}
+            self._jobs[job_id] = dict(job)
+        self._executor.submit(self._run_job, job_id, data)
+        return job, True
+
+    def get_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def cancel_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Cancels a job, whose run is left to finish with its result
+        dropped."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            if job["status"] in RunnerJobStatus.FINISHED:
+                return dict(job)
+            job["status"] = RunnerJobStatus.CANCELLED
+            job["result"] = {"type": "RESULT", "result": None, "error": "Job cancelled"}
+        self._notify(job_id, RunnerJobStatus.CANCELLED)
+        return self.get_job(job_id)
+
+    def _run_job(self, job_id: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            if self._jobs[job_id]["status"] != RunnerJobStatus.QUEUED:
+                return
+            self._jobs[job_id]["status"] = RunnerJobStatus.RUNNING
+        try:
+            result = self.run(data)
+        except Exception as e:
+            logger.exception(f"Fake job {job_id} failed: {e}")
+            result = {"type": "RESULT", "result": None, "error": str(e)}
+        status = (
+            RunnerJobStatus.FAILED if result.get("error") else RunnerJobStatus.COMPLETED
+        )
+        with self._lock:
+            job = self._jobs[job_id]
+            if job["status"] != RunnerJobStatus.RUNNING:
+                return
+            job["status"] = status
+            job["result"] = result
+        self._notify(job_id, status)
+
+    @staticmethod
+    def _notify(job_id: str, status: str) -> None:
+        try:
+            CacheService.rpush(f"{RunnerJobKey.DONE_PREFIX}{job_id}", status)
+        except Exception as e:
+            # Waiters fall back to checking the job's status
+            logger.warning(f"Unable to notify fake job {job_id}: {e}")
+
+    def _get_handler(self) -> type[BaseHTTPRequestHandler]:
+        runner = self
+        base = UnstractRunner.BASE_API_ENDPOINT
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                job_id = self._get_job_id(path)
+                if job_id:
+                    self._respond_job(runner.get_job(job_id))
+                    return
+                # Tools are loaded from the registry JSON, these are only
+                # called when loading from the container
+                key = path.rsplit("/", 1)[-1]
+                self._respond(200, {key: {}})
+
+            def do_POST(self) -> None:
+                if self.path == f"{base}{UnstractRunner.JOBS_API_ENDPOINT}":
+                    job, created = runner.submit_job(self._read_json())
+                    self._respond(202 if created else 200, job)
+                    return
+                if self.path != f"{base}{UnstractRunner.RUN_API_ENDPOINT}":
+                    self._respond(404, {"error": f"Unknown path {self.path}"})
+                    return
+                data = self._read_json()
+                try:
+                    self._respond(200, runner.run(data))
+                except Exception as e:
+                    logger.exception(f"Fake run failed: {e}")
+                    self._respond(200, {"type": "RESULT", "error": str(e)})
+
+            def do_DELETE(self) -> None:
+                job_id = self._get_job_id(self.path)
+                if not job_id:
+                    self._respond(404, {"error": f"Unknown path {self.path}"})
+                    return
+                self._respond_job(runner.cancel_job(job_id))
+
+            def _get_job_id(self, path: str) -> Optional[str]:
+                prefix = f"{base}{UnstractRunner.JOBS_API_ENDPOINT}/"
+                return path.removeprefix(prefix) if path.startswith(prefix) else None
+
+            def _read_json(self) -> dict[str, Any]:
+                length = int(self.headers.get("Content-Length", 0))
+                data: dict[str, Any] = json.loads(self.rfile.read(length))
+                return data
+
+            def _respond_job(self, job: Optional[dict[str, Any]]) -> None:
+                if job:
+                    self._respond(200, job)
+                else:
+                    self._respond(404, {"error": "Unknown job"})
+
+            def _respond(self, status: int, body: dict[str, Any]) -> None:
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format, *args)
+
+        return Handler
@@ -0,0 +1,145 @@
+import resource
+import statistics
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterator
+from unittest import mock
+
+import redis
+from django.db import connections
+
+
+@dataclass
+class BenchmarkResult:
+    files: int
+    seconds: float
+    files_per_sec: float
+    p50_file_seconds: float
+    p99_file_seconds: float
+    db_queries: int
+    db_queries_per_file: float
+    redis_ops: int
+    redis_ops_per_file: float
+    peak_rss_mb: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class MetricsCollector:
+    """Counts DB queries and Redis commands, and times files, of the code
+    run inside `collect()`."""
+
+    file_seconds: list[float] = field(default_factory=list)
+    db_queries: int = 0
+    redis_ops: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _file_starts: dict[Any, float] = field(default_factory=dict)
+
+    def time_file(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wraps the function processing a single file to time it."""
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.file_seconds.append(time.perf_counter() - start)
+
+        return timed
+
+    def start_file(self, file_id: Any) -> None:
+        """Starts timing a file, for files processed across several
+        functions or threads."""
+        with self._lock:
+            self._file_starts.setdefault(file_id, time.perf_counter())
+
+    def end_file(self, file_id: Any) -> None:
+        """Stops timing a file started with `start_file`."""
+        with self._lock:
+            start = self._file_starts.pop(file_id, None)
+            if start is not None:
+                self.file_seconds.append(time.perf_counter() - start)
+
+    @contextmanager
+    def collect(self) -> Iterator[None]:
+        def count_query(execute, sql, params, many, context):  # type: ignore
+            with self._lock:
+                self.db_queries += 1
+            return execute(sql, params, many, context)
+
+        def counting(command: Callable[..., Any]) -> Callable[..., Any]:
+            def execute_command(*args: Any, **kwargs: Any) -> Any:
+                with self._lock:
+                    self.redis_ops += 1
+                return command(*args, **kwargs)
+
+            return execute_command
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            # Pipelines buffer commands through their own execute_command
+            for client in (redis.Redis, redis.client.Pipeline):
+                stack.enter_context(
+                    mock.patch.object(
+                        client,
+                        "execute_command",
+                        counting(client.execute_command),
+                    )
+                )
+            yield
+
+    def result(self, files: int, seconds: float) -> BenchmarkResult:
+        return BenchmarkResult(
+            files=files,
+            seconds=round(seconds, 3),
+            files_per_sec=round(files / seconds, 3) if seconds else 0.0,
+            p50_file_seconds=round(self._percentile(50), 4),
+            p99_file_seconds=round(self._percentile(99), 4),
+            db_queries=self.db_queries,
+            db_queries_per_file=round(self.db_queries / files, 2) if files else 0.0,
+            redis_ops=self.redis_ops,
+            redis_ops_per_file=round(self.redis_ops / files, 2) if files else 0.0,
+            peak_rss_mb=round(self._peak_rss_mb(), 1),
+        )
+
+    def _percentile(self, percentile: int) -> float:
+        if not self.file_seconds:
+            return 0.0
+        if len(self.file_seconds) == 1:
+            return self.file_seconds[0]
+        return statistics.quantiles(self.file_seconds, n=100, method="inclusive")[
+            percentile - 1
+        ]
+
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS, kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def check_thresholds(values: dict[str, Any], thresholds: dict[str, float]) -> list[str]:
+    """Compares the metrics of a result against `min_<metric>` and
+    `max_<metric>` thresholds.
+
+    Returns:
+        list[str]: Breached thresholds, empty if all are met
+    """
+    breaches = []
+    for name, limit in thresholds.items():
+        bound, _, metric = name.partition("_")
+        value = values.get(metric)
+        if value is None:
+            continue
+        if bound == "min" and value < limit:
+            breaches.append(f"{metric} {value} is below {limit}")
+        elif bound == "max" and value > limit:
+            breaches.append(f"{metric} {value} is above {limit}")
+    return breaches
@@ -0,0 +1,114 @@
+import json
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+from account_v2.authentication_service import AuthenticationService
+from account_v2.custom_auth_middleware import CustomAuthMiddleware
+from account_v2.models import User
+from benchmark.metrics import MetricsCollector, check_thresholds
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from utils.user_session import UserSessionUtils
+
+THRESHOLDS_FILE = Path(__file__).resolve().parents[3] / "benchmark" / "thresholds.json"
+MODE = "auth_middleware"
+
+
+def _per_request_auth_service(
+    middleware: CustomAuthMiddleware,
+) -> AuthenticationService:
+    """Authentication service of a request before the middleware shared it,
+    whose constructor loaded the default organization."""
+    auth_service = CustomAuthMiddleware._create_auth_service()
+    getattr(auth_service, "default_organization", None)
+    return auth_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the request throughput of the authentication middleware, "
+        "with session authenticated requests to a view that returns right "
+        "away. Reports requests/sec, per request p50/p99 latency, DB queries "
+        "and Redis commands, and fails if any of the thresholds are breached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organization-id", required=True)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument(
+            "--per-request-service",
+            action="store_true",
+            help=(
+                "Create the authentication service for every request, as "
+                "before it was shared, to compare against"
+            ),
+        )
+        parser.add_argument(
+            "--thresholds",
+            default=str(THRESHOLDS_FILE),
+            help=f"JSON of thresholds per mode, '{MODE}' is used",
+        )
+        parser.add_argument("--no-check", action="store_true")
+        parser.add_argument("--output", help="File to write the result JSON to")
+
+    def handle(self, *args, **options):
+        middleware = CustomAuthMiddleware(lambda request: HttpResponse("ok"))
+        user = User(username="benchmark")
+        http_requests = [
+            self._get_request(user, options["organization_id"])
+            for _ in range(options["requests"])
+        ]
+        collector = MetricsCollector()
+        call = collector.time_file(middleware)
+        with ExitStack() as stack:
+            if options["per_request_service"]:
+                stack.enter_context(
+                    mock.patch.object(
+                        CustomAuthMiddleware,
+                        "auth_service",
+                        property(_per_request_auth_service),
+                    )
+                )
+            # Creates the shared service outside of the measured requests
+            call(self._get_request(user, options["organization_id"]))
+            collector.file_seconds.clear()
+            with collector.collect():
+                start = time.perf_counter()
+                for request in http_requests:
+                    response = call(request)
+                    if response.status_code != 200:
+                        raise CommandError(
+                            f"Request failed with status {response.status_code}"
+                        )
+                seconds = time.perf_counter() - start
+
+        result = collector.result(files=len(http_requests), seconds=seconds)
+        values = {
+            metric.replace("file", "request"): value
+            for metric, value in result.to_dict().items()
+        }
+        output = json.dumps({"mode": MODE, **values}, indent=2)
+        self.stdout.write(output)
+        if options["output"]:
+            Path(options["output"]).write_text(output)
+        if options["no_check"]:
+            return
+        with open(options["thresholds"]) as file:
+            thresholds: dict[str, float] = json.load(file).get(MODE, {})
+        breaches = check_thresholds(values, thresholds)
+        if breaches:
+            raise CommandError("Thresholds breached: " + "; ".join(breaches))
+        self.stdout.write(self.style.SUCCESS("All thresholds met"))
+
+    @staticmethod
+    def _get_request(user: User, organization_id: str) -> HttpRequest:
+        request = RequestFactory().get(f"/api/v1/unstract/{organization_id}/")
+        request.user = user
+        request.session = SessionBase()
+        request.organization_id = organization_id
+        UserSessionUtils.set_organization_id(request, organization_id)
+        return request
@@ -0,0 +1,228 @@
+import json
+import os
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from api_v2.models import APIDeployment
+from benchmark.fake_runner import FakeRunner
+from benchmark.metrics import MetricsCollector, check_thresholds
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from utils.user_context import UserContext
+from workflow_manager.endpoint_v2.source import SourceConnector
+from workflow_manager.file_execution.models import WorkflowFileExecution
+from workflow_manager.workflow_v2.enums import ExecutionStatus
+from workflow_manager.workflow_v2.execution import WorkflowExecutionServiceHelper
+from workflow_manager.workflow_v2.models.execution import WorkflowExecution
+from workflow_manager.workflow_v2.models.workflow import Workflow
+from workflow_manager.workflow_v2.workflow_helper import WorkflowHelper
+
+THRESHOLDS_FILE = Path(__file__).resolve().parents[3] / "benchmark" / "thresholds.json"
+FINAL_STATUSES = (
+    ExecutionStatus.COMPLETED,
+    ExecutionStatus.ERROR,
+    ExecutionStatus.STOPPED,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the throughput of an ETL workflow or API deployment, with "
+        "tools replaced by a local fake runner. Reports files/sec, per file "
+        "p50/p99 latency, DB queries, Redis commands and peak RSS, and fails "
+        "if any of the thresholds are breached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organization-id", required=True)
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument(
+            "--workflow-id",
+            help="ETL workflow to run, its source is expected to be a local folder",
+        )
+        target.add_argument("--api-id", help="API deployment to run")
+        parser.add_argument("--files", type=int, default=20)
+        parser.add_argument(
+            "--file-size", type=int, default=64, help="Size of files in KiB"
+        )
+        parser.add_argument(
+            "--input-dir",
+            help=(
+                "Folder of the ETL workflow's local source, generated files are "
+                "written here. Existing files are used if not given"
+            ),
+        )
+        parser.add_argument(
+            "--tool-delay",
+            type=float,
+            default=0.0,
+            help="Seconds each fake tool run takes",
+        )
+        parser.add_argument(
+            "--runner-jobs",
+            action="store_true",
+            help="Run tools as jobs of the fake runner, awaited through Redis",
+        )
+        parser.add_argument(
+            "--thresholds",
+            default=str(THRESHOLDS_FILE),
+            help="JSON of thresholds per mode, 'etl' and 'api'",
+        )
+        parser.add_argument("--no-check", action="store_true")
+        parser.add_argument("--output", help="File to write the result JSON to")
+
+    def handle(self, *args, **options):
+        UserContext.set_organization_identifier(options["organization_id"])
+        mode = "api" if options["api_id"] else "etl"
+        runner = FakeRunner(delay=options["tool_delay"])
+        runner.start()
+        env = {
+            "UNSTRACT_RUNNER_HOST": runner.host,
+            "UNSTRACT_RUNNER_PORT": str(runner.port),
+            "UNSTRACT_RUNNER_JOBS_ENABLED": str(options["runner_jobs"]),
+        }
+        collector = MetricsCollector()
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(mock.patch.dict(os.environ, env))
+                self._time_files(stack, collector)
+                if mode == "api":
+                    files, seconds = self._run_api(collector, options)
+                else:
+                    files, seconds = self._run_etl(collector, options)
+        finally:
+            runner.stop()
+            UserContext.clear_organization()
+
+        result = collector.result(files=files, seconds=seconds)
+        output = json.dumps({"mode": mode, **result.to_dict()}, indent=2)
+        self.stdout.write(output)
+        if options["output"]:
+            Path(options["output"]).write_text(output)
+        if options["no_check"]:
+            return
+        with open(options["thresholds"]) as file:
+            thresholds: dict[str, float] = json.load(file).get(mode, {})
+        breaches = check_thresholds(result.to_dict(), thresholds)
+        if files and not collector.file_seconds:
+            breaches.append("no file was timed, per file latency is unknown")
+        if breaches:
+            raise CommandError("Thresholds breached: " + "; ".join(breaches))
+        self.stdout.write(self.style.SUCCESS("All thresholds met"))
+
+    @staticmethod
+    def _time_files(stack: ExitStack, collector: MetricsCollector) -> None:
+        """Times each file from being added to the execution directory until
+        its final status is set, which both the sequential and the pipelined
+        file processing go through."""
+        add_file_to_volume = SourceConnector.add_file_to_volume
+        update_status = WorkflowFileExecution.update_status
+
+        def timed_add_file_to_volume(
+            source: SourceConnector, *args: Any, **kwargs: Any
+        ) -> str:
+            collector.start_file(kwargs["workflow_file_execution"].id)
+            return add_file_to_volume(source, *args, **kwargs)
+
+        def timed_update_status(
+            file_execution: WorkflowFileExecution,
+            status: ExecutionStatus,
+            *args: Any,
+            **kwargs: Any,
+        ) -> None:
+            update_status(file_execution, status, *args, **kwargs)
+            if status in FINAL_STATUSES:
+                collector.end_file(file_execution.id)
+
+        stack.enter_context(
+            mock.patch.object(
+                SourceConnector, "add_file_to_volume", timed_add_file_to_volume
+            )
+        )
+        stack.enter_context(
+            mock.patch.object(
+                WorkflowFileExecution, "update_status", timed_update_status
+            )
+        )
+
+    def _run_etl(
+        self, collector: MetricsCollector, options: dict[str, Any]
+    ) -> tuple[int, float]:
+        workflow = Workflow.objects.get(id=options["workflow_id"])
+        if options["input_dir"]:
+            self._generate_files(
+                Path(options["input_dir"]), options["files"], options["file_size"]
+            )
+        workflow_execution = WorkflowExecutionServiceHelper.create_workflow_execution(
+            workflow_id=workflow.id,
+            mode=WorkflowExecution.Mode.INSTANT,
+        )
+        with collector.collect():
+            start = time.perf_counter()
+            WorkflowHelper.run_workflow(
+                workflow=workflow,
+                workflow_execution=workflow_execution,
+                organization_id=options["organization_id"],
+                use_file_history=False,
+            )
+            seconds = time.perf_counter() - start
+        workflow_execution.refresh_from_db()
+        return workflow_execution.total_files, seconds
+
+    def _run_api(
+        self, collector: MetricsCollector, options: dict[str, Any]
+    ) -> tuple[int, float]:
+        api = APIDeployment.objects.get(id=options["api_id"])
+        file_objs = [
+            SimpleUploadedFile(name, content, content_type="text/plain")
+            for name, content in self._iter_files(
+                options["files"], options["file_size"]
+            )
+        ]
+        with collector.collect():
+            start = time.perf_counter()
+            # Same steps as DeploymentHelper.execute_workflow, in process
+            # rather than through the API deployments queue
+            workflow_execution = (
+                WorkflowExecutionServiceHelper.create_workflow_execution(
+                    workflow_id=api.workflow.id,
+                    pipeline_id=api.id,
+                    mode=WorkflowExecution.Mode.QUEUE,
+                    total_files=len(file_objs),
+                )
+            )
+            hash_values_of_files = SourceConnector.add_input_file_to_api_storage(
+                workflow_id=api.workflow.id,
+                execution_id=workflow_execution.id,
+                file_objs=file_objs,
+            )
+            WorkflowHelper.run_workflow(
+                workflow=api.workflow,
+                workflow_execution=workflow_execution,
+                hash_values_of_files=hash_values_of_files,
+                organization_id=options["organization_id"],
+                pipeline_id=str(api.id),
+                use_file_history=False,
+            )
+            seconds = time.perf_counter() - start
+        return len(file_objs), seconds
+
+    @classmethod
+    def _generate_files(cls, input_dir: Path, count: int, size_kib: int) -> None:
+        input_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in cls._iter_files(count, size_kib):
+            (input_dir / name).write_bytes(content)
+
+    @staticmethod
+    def _iter_files(count: int, size_kib: int):
+        """Text files of the given size, unique to the run so that none are
+        skipped as already processed."""
+        run_id = uuid.uuid4().hex[:8]
+        for index in range(count):
+            line = f"benchmark {run_id} file {index}\n".encode()
+            content = (line * (size_kib * 1024 // len(line) + 1))[: size_kib * 1024]
+            yield f"benchmark_{run_id}_{index}.txt", content
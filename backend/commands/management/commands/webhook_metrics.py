@@ -0,0 +1,24 @@
+import json
+
+from django.core.management.base import BaseCommand
+from notification_v2.provider.webhook.delivery import WebhookDelivery
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the webhook delivery metrics of hosts: counts of deliveries, "
+        "failures and retries, and the latency of attempts in total and per "
+        "bucket"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--host",
+            action="append",
+            help="Host to print, as in the webhook URL. All hosts if not given",
+        )
+
+    def handle(self, *args, **options):
+        hosts = options["host"] or WebhookDelivery.get_hosts()
+        metrics = {host: WebhookDelivery.get_metrics(host) for host in hosts}
+        self.stdout.write(json.dumps(metrics, indent=2))
@@ -6,10 +6,11 @@ class LogService:
     def remove_logs_on_logout(session_id: str) -> None:
 
         if session_id:
-            key_pattern = f"{LogService.generate_redis_key(session_id=session_id)}*"
+            redis_key = LogService.generate_redis_key(session_id=session_id)
+            key_pattern = f"{redis_key}*"
 
             # Delete keys matching the pattern
-            CacheService.clear_cache(key_pattern=key_pattern)
+            CacheService.clear_cache(key_pattern=key_pattern, scope=redis_key)
 
     @staticmethod
     def generate_redis_key(session_id):
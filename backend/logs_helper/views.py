@@ -29,7 +29,7 @@ class LogsHelperViewSet(viewsets.ModelViewSet):
         redis_key = LogService.generate_redis_key(session_id=session_id)
 
         # Retrieve keys matching the pattern
-        keys = CacheService.get_all_keys(f"{redis_key}*")
+        keys = CacheService.get_all_keys(f"{redis_key}*", scope=redis_key)
 
         # Retrieve values corresponding to the keys and sort them by timestamp
         logs = []
@@ -63,6 +63,11 @@ class LogsHelperViewSet(viewsets.ModelViewSet):
             f"{LogService.generate_redis_key(session_id=session_id)}:{timestamp}"
         )
 
-        CacheService.set_key(redis_key, log_data, logs_expiry)
+        CacheService.set_key(
+            redis_key,
+            log_data,
+            logs_expiry,
+            scope=LogService.generate_redis_key(session_id=session_id),
+        )
 
         return Response({"message": "Successfully stored the message in redis"})
@@ -2,6 +2,8 @@ from notification_v2.provider.webhook.webhook import Webhook
 
 
 class APIWebhook(Webhook):
+    SUPPORTS_BATCHING = True
+
     def send(self):
         """Send the API webhook notification."""
         super().send()
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from utils.cache_service import redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDelivery:
+    """Delivers webhooks over keep-alive sessions pooled per host.
+
+    Concurrent deliveries to an endpoint are limited across workers by a
+    counter in Redis, retries back off exponentially with jitter, and the
+    outcome of deliveries is counted per host in Redis. Deliveries aren't
+    limited while Redis is unavailable.
+    """
+
+    INFLIGHT_KEY_PREFIX = "webhook_inflight:"
+    BATCH_KEY_PREFIX = "webhook_batch:"
+    BATCH_STARTED_SUFFIX = ":started_at"
+    METRICS_KEY_PREFIX = "webhook_metrics:"
+    # Upper bounds in seconds of the latency buckets attempts are counted in
+    LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    _sessions: dict[str, requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, url: str) -> requests.Session:
+        """Returns the session of the URL's host, creating it if needed."""
+        host = urlsplit(url).netloc
+        with cls._sessions_lock:
+            session = cls._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.WEBHOOK_POOL_MAXSIZE,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                cls._sessions[host] = session
+            return session
+
+    @classmethod
+    def post(
+        cls, url: str, payload: Any, headers: Optional[dict[str, str]], timeout: int
+    ) -> requests.Response:
+        """Posts the payload, recording latency and outcome.
+
+        Raises:
+            requests.exceptions.RequestException: If the request failed or
+                returned an error status
+        """
+        start = time.monotonic()
+        try:
+            response = cls.get_session(url).post(
+                url, json=payload, headers=headers, timeout=timeout
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            cls.record(url=url, latency=time.monotonic() - start, failed=True)
+            raise
+        latency = time.monotonic() - start
+        cls.record(url=url, latency=latency)
+        logger.info(f"Webhook delivered to {url} in {latency:.3f}s")
+        return response
+
+    @classmethod
+    def acquire_slot(cls, url: str, timeout: int) -> bool:
+        """Takes one of the endpoint's `WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT`
+        delivery slots.
+
+        The counter expires a while after it was created, so that slots of
+        workers that died before releasing them are reclaimed. Its expiry
+        isn't refreshed by later deliveries, which would keep it alive for
+        as long as the endpoint gets traffic.
+
+        Returns:
+            bool: True if a slot was taken, False if the endpoint is busy
+        """
+        limit = settings.WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT
+        if not limit:
+            return True
+        key = cls._key(cls.INFLIGHT_KEY_PREFIX, url)
+        try:
+            pipeline = redis_cache.pipeline()
+            pipeline.set(key, 0, ex=int(timeout) * 2 + 1, nx=True)
+            pipeline.incr(key)
+            _, inflight = pipeline.execute()
+            if inflight > limit:
+                redis_cache.decr(key)
+                return False
+        except Exception as e:
+            logger.warning(f"Unable to limit concurrent webhooks to {url}: {e}")
+        return True
+
+    @classmethod
+    def release_slot(cls, url: str) -> None:
+        if not settings.WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT:
+            return
+        key = cls._key(cls.INFLIGHT_KEY_PREFIX, url)
+        try:
+            # Negative if the slot was taken while Redis was unavailable, or
+            # after the counter expired, dropped to not exceed the limit later
+            if redis_cache.decr(key) < 0:
+                redis_cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Unable to release webhook slot of {url}: {e}")
+
+    @staticmethod
+    def get_backoff(retry_delay: int, attempt: int) -> int:
+        """Seconds to wait before retrying, exponential in the attempt and
+        capped at `WEBHOOK_RETRY_BACKOFF_MAX`, with full jitter so that
+        retries of a burst don't hit a recovering receiver at once."""
+        backoff = min(retry_delay * (2**attempt), settings.WEBHOOK_RETRY_BACKOFF_MAX)
+        return max(1, round(random.uniform(backoff / 2, backoff)))
+
+    @classmethod
+    def add_to_batch(
+        cls, url: str, payload: Any, headers: Optional[dict[str, str]]
+    ) -> bool:
+        """Queues the payload for a batched delivery to the URL.
+
+        A batch still queued twice `WEBHOOK_BATCH_WINDOW` after it started
+        has lost its scheduled delivery, e.g. to a worker restart, and is
+        scheduled again by the sender of its next payload.
+
+        Returns:
+            bool: True if the sender has to schedule the delivery of the
+                batch, for its first payload or once the batch is overdue
+        """
+        key = cls.get_batch_key(url=url, headers=headers)
+        started_key = f"{key}{cls.BATCH_STARTED_SUFFIX}"
+        # Outlives the batch window in case its delivery is never scheduled
+        expiry = settings.WEBHOOK_BATCH_WINDOW * 10 + 60
+        now = time.time()
+        pipeline = redis_cache.pipeline()
+        pipeline.rpush(key, json.dumps(payload))
+        pipeline.expire(key, expiry)
+        pipeline.expire(started_key, expiry)
+        pipeline.get(started_key)
+        length, _, _, started_at = pipeline.execute()
+        if length == 1:
+            redis_cache.set(started_key, now, ex=expiry)
+            return True
+        # Not set yet if the batch was started concurrently
+        if started_at is None:
+            return False
+        if now - float(started_at) <= settings.WEBHOOK_BATCH_WINDOW * 2:
+            return False
+        logger.warning(f"Delivery of webhook batch to {url} is overdue, rescheduling")
+        redis_cache.set(started_key, now, ex=expiry)
+        return True
+
+    @classmethod
+    def pop_batch(cls, batch_key: str) -> list[Any]:
+        """Takes all payloads of a batch."""
+        pipeline = redis_cache.pipeline(transaction=True)
+        pipeline.lrange(batch_key, 0, -1)
+        pipeline.delete(batch_key, f"{batch_key}{cls.BATCH_STARTED_SUFFIX}")
+        items, _ = pipeline.execute()
+        return [json.loads(item) for item in items]
+
+    @classmethod
+    def get_batch_key(cls, url: str, headers: Optional[dict[str, str]]) -> str:
+        # Headers are part of the key, notifications to a URL may differ in auth
+        headers_json = json.dumps(headers or {}, sort_keys=True)
+        return cls._key(cls.BATCH_KEY_PREFIX, f"{url}|{headers_json}")
+
+    @classmethod
+    def record(
+        cls,
+        url: str,
+        latency: Optional[float] = None,
+        failed: bool = False,
+        retried: bool = False,
+    ) -> None:
+        """Counts a delivery attempt in the metrics of the URL's host."""
+        key = f"{cls.METRICS_KEY_PREFIX}{urlsplit(url).netloc}"
+        try:
+            pipeline = redis_cache.pipeline()
+            if retried:
+                pipeline.hincrby(key, "retries", 1)
+            else:
+                pipeline.hincrby(key, "failures" if failed else "deliveries", 1)
+            if latency is not None:
+                pipeline.hincrbyfloat(key, "latency_seconds_total", latency)
+                pipeline.hincrby(key, cls._latency_bucket(latency), 1)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Unable to record webhook metrics for {url}: {e}")
+
+    @classmethod
+    def get_hosts(cls) -> list[str]:
+        """Hosts with delivery metrics."""
+        keys = redis_cache.scan_iter(match=f"{cls.METRICS_KEY_PREFIX}*")
+        return sorted(
+            (key.decode() if isinstance(key, bytes) else key).removeprefix(
+                cls.METRICS_KEY_PREFIX
+            )
+            for key in keys
+        )
+
+    @classmethod
+    def get_metrics(cls, host: str) -> dict[str, float]:
+        """Delivery metrics of a host.
+
+        Returns:
+            dict[str, float]: Counts of `deliveries`, `failures` and
+                `retries`, the `latency_seconds_total` of attempts and the
+                count of attempts per latency bucket, `latency_le_<seconds>`
+                up to `latency_le_inf`
+        """
+        metrics = redis_cache.hgetall(f"{cls.METRICS_KEY_PREFIX}{host}")
+        return {
+            (key.decode() if isinstance(key, bytes) else key): float(value)
+            for key, value in metrics.items()
+        }
+
+    @classmethod
+    def _latency_bucket(cls, latency: float) -> str:
+        for bound in cls.LATENCY_BUCKETS:
+            if latency <= bound:
+                return f"latency_le_{bound}"
+        return "latency_le_inf"
+
+    @staticmethod
+    def _key(prefix: str, value: str) -> str:
+        return f"{prefix}{hashlib.sha256(value.encode()).hexdigest()}"
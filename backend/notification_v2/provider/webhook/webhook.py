@@ -3,8 +3,11 @@ from typing import Any, Optional
 
 import requests
 from celery import shared_task
+from django.conf import settings
 from notification_v2.enums import AuthorizationType
 from notification_v2.provider.notification_provider import NotificationProvider
+from notification_v2.provider.webhook.delivery import WebhookDelivery
+from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,8 @@ logger = logging.getLogger(__name__)
 class WebhookNotificationArg:
     MAX_RETRIES = "max_retries"
     RETRY_DELAY = "retry_delay"
+    ATTEMPT = "attempt"
+    DEFERRALS = "deferrals"
 
 
 class HeaderConstants:
@@ -19,6 +24,10 @@ class HeaderConstants:
 
 
 class Webhook(NotificationProvider):
+    # Whether the receiver accepts a JSON array of payloads, which allows
+    # coalescing notifications in batches
+    SUPPORTS_BATCHING = False
+
     def send(self):
         """Send the webhook notification."""
         try:
@@ -27,6 +36,13 @@ class Webhook(NotificationProvider):
         except ValueError as e:
             logger.error(f"Error validating notification {self.notification} :: {e}")
             return
+        if self.SUPPORTS_BATCHING and settings.WEBHOOK_BATCH_WINDOW:
+            self.add_to_batch(headers=headers)
+            return
+        self.send_now(headers=headers)
+
+    def send_now(self, headers: dict[str, str]) -> None:
+        """Send the notification on its own."""
         send_webhook_notification.apply_async(
             (self.notification.url, self.payload, headers, self.NOTIFICATION_TIMEOUT),
             kwargs={
@@ -35,6 +51,31 @@ class Webhook(NotificationProvider):
             },
         )
 
+    def add_to_batch(self, headers: dict[str, str]) -> None:
+        """Queue the payload to be sent with others to the same URL within
+        `WEBHOOK_BATCH_WINDOW` seconds.
+
+        The payload is sent on its own while Redis is unavailable.
+        """
+        url = self.notification.url
+        try:
+            schedule = WebhookDelivery.add_to_batch(
+                url=url, payload=self.payload, headers=headers
+            )
+        except RedisError as e:
+            logger.warning(f"Unable to batch webhook to {url}, sending it now: {e}")
+            self.send_now(headers=headers)
+            return
+        if schedule:
+            send_webhook_batch.apply_async(
+                (url, headers, self.NOTIFICATION_TIMEOUT),
+                kwargs={
+                    WebhookNotificationArg.MAX_RETRIES: self.notification.max_retries,
+                    WebhookNotificationArg.RETRY_DELAY: self.RETRY_DELAY,
+                },
+                countdown=settings.WEBHOOK_BATCH_WINDOW,
+            )
+
     def validate(self):
         """Validate notification.
 
@@ -101,7 +142,7 @@ class Webhook(NotificationProvider):
         return headers
 
 
-@shared_task(bind=True, name="send_webhook_notification")
+@shared_task(bind=True, name="send_webhook_notification", max_retries=None)
 def send_webhook_notification(
     self,
     url: str,
@@ -110,9 +151,16 @@ def send_webhook_notification(
     timeout: int = 10,
     max_retries: Optional[int] = None,
     retry_delay: int = 10,
+    attempt: int = 0,
+    deferrals: int = 0,
 ):
     """Celery task to send a webhook with retries and error handling.
 
+    Retries back off exponentially from `retry_delay`, with jitter. A
+    delivery deferred because the endpoint is at its concurrency limit
+    doesn't count as an attempt. After `WEBHOOK_MAX_BUSY_DEFERRALS`
+    deferrals the webhook is delivered regardless of the limit.
+
     Args:
         url (str): The URL to which the webhook should be sent.
         payload (dict): The payload to be sent in the webhook request.
@@ -121,28 +169,51 @@ def send_webhook_notification(
         timeout (int, optional): The request timeout in seconds. Defaults to 10.
         max_retries (int, optional): The maximum number of retries allowed.
         Defaults to None.
-        retry_delay (int, optional): The delay between retries in seconds.
+        retry_delay (int, optional): The base delay between retries in seconds.
         Defaults to 10.
+        attempt (int, optional): Number of failed attempts so far.
+        Defaults to 0.
+        deferrals (int, optional): Number of times the delivery was deferred
+        for a busy endpoint so far. Defaults to 0.
 
     Returns:
         None
     """
+    has_slot = deferrals < settings.WEBHOOK_MAX_BUSY_DEFERRALS
+    if has_slot and not WebhookDelivery.acquire_slot(url=url, timeout=timeout):
+        raise self.retry(
+            countdown=WebhookDelivery.get_backoff(retry_delay=1, attempt=0),
+            kwargs={
+                **self.request.kwargs,
+                WebhookNotificationArg.DEFERRALS: deferrals + 1,
+            },
+        )
+    if not has_slot:
+        logger.warning(
+            f"Webhook to {url} deferred {deferrals} times for a busy endpoint, "
+            "delivering it regardless of the concurrency limit"
+        )
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        if not (200 <= response.status_code < 300):
-            logger.error(
-                f"Request to {url} failed with status code {response.status_code}. "
-                f"Response: {response.text}"
-            )
+        WebhookDelivery.post(url=url, payload=payload, headers=headers, timeout=timeout)
     except requests.exceptions.RequestException as exc:
         if max_retries is not None:
-            if self.request.retries < max_retries:
+            if attempt < max_retries:
+                countdown = WebhookDelivery.get_backoff(
+                    retry_delay=retry_delay, attempt=attempt
+                )
                 logger.warning(
-                    f"Request to {url} failed. Retrying in {retry_delay} seconds. "
-                    f"Attempt {self.request.retries + 1}/{max_retries}. Error: {exc}"
+                    f"Request to {url} failed. Retrying in {countdown} seconds. "
+                    f"Attempt {attempt + 1}/{max_retries}. Error: {exc}"
+                )
+                WebhookDelivery.record(url=url, retried=True)
+                raise self.retry(
+                    exc=exc,
+                    countdown=countdown,
+                    kwargs={
+                        **self.request.kwargs,
+                        WebhookNotificationArg.ATTEMPT: attempt + 1,
+                    },
                 )
-                raise self.retry(exc=exc, countdown=retry_delay)
             else:
                 logger.error(
                     f"Failed to send webhook to {url} after {max_retries} attempts. "
@@ -152,3 +223,42 @@ def send_webhook_notification(
         else:
             logger.error(f"Webhook request to {url} failed with error: {exc}")
             return None
+    finally:
+        if has_slot:
+            WebhookDelivery.release_slot(url=url)
+
+
+@shared_task(bind=True, name="send_webhook_batch")
+def send_webhook_batch(
+    self,
+    url: str,
+    headers: Any = None,
+    timeout: int = 10,
+    max_retries: Optional[int] = None,
+    retry_delay: int = 10,
+):
+    """Celery task to send the notifications queued for a URL as a single
+    webhook with a JSON array payload.
+
+    Args:
+        url (str): The URL to which the webhook should be sent.
+        headers (dict, optional): Headers the notifications were queued with.
+        timeout (int, optional): The request timeout in seconds. Defaults to 10.
+        max_retries (int, optional): The maximum number of retries allowed.
+        retry_delay (int, optional): The base delay between retries in seconds.
+
+    Returns:
+        None
+    """
+    batch_key = WebhookDelivery.get_batch_key(url=url, headers=headers)
+    payloads = WebhookDelivery.pop_batch(batch_key)
+    if not payloads:
+        return None
+    logger.info(f"Sending batch of {len(payloads)} notifications to {url}")
+    send_webhook_notification.apply_async(
+        (url, payloads, headers, timeout),
+        kwargs={
+            WebhookNotificationArg.MAX_RETRIES: max_retries,
+            WebhookNotificationArg.RETRY_DELAY: retry_delay,
+        },
+    )
@@ -0,0 +1,182 @@
+from typing import Any, Optional
+from unittest import mock
+
+import pytest  # type: ignore
+from django.test import override_settings
+from notification_v2.provider.webhook.delivery import WebhookDelivery
+
+URL = "https://example.com/hook"
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def command(*args: Any, **kwargs: Any) -> None:
+            self.commands.append((name, args, kwargs))
+
+        return command
+
+    def execute(self) -> list[Any]:
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """Keeps the keys of a `Redis` client in memory, recording the expiry
+    set on them instead of expiring them."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.expiries: list[tuple[str, int]] = []
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def incr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) + 1
+        return int(self.data[key])
+
+    def decr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) - 1
+        return int(self.data[key])
+
+    def expire(self, key: str, seconds: int) -> bool:
+        if key not in self.data:
+            return False
+        self.expiries.append((key, seconds))
+        return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    def set(
+        self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False
+    ) -> Optional[bool]:
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        if ex is not None:
+            self.expiries.append((key, ex))
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def rpush(self, key: str, value: Any) -> int:
+        self.data.setdefault(key, []).append(value)
+        return len(self.data[key])
+
+    def lrange(self, key: str, start: int, end: int) -> list[Any]:
+        return list(self.data.get(key, []))
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        fields = self.data.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+        return int(fields[field])
+
+    def hincrbyfloat(self, key: str, field: str, amount: float) -> float:
+        fields = self.data.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+        return float(fields[field])
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        fields = self.data.get(key, {})
+        return {field.encode(): str(value).encode() for field, value in fields.items()}
+
+    def scan_iter(self, match: str) -> list[bytes]:
+        prefix = match.rstrip("*")
+        return [key.encode() for key in self.data if key.startswith(prefix)]
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    fake_redis = FakeRedis()
+    with mock.patch(
+        "notification_v2.provider.webhook.delivery.redis_cache", fake_redis
+    ):
+        yield fake_redis
+
+
+@override_settings(WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT=2)
+def test_slots_limit_concurrency(redis):
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    assert not WebhookDelivery.acquire_slot(URL, timeout=10)
+    WebhookDelivery.release_slot(URL)
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+
+
+@override_settings(WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT=2)
+def test_slot_counter_expiry_set_once(redis):
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    assert not WebhookDelivery.acquire_slot(URL, timeout=10)
+    WebhookDelivery.release_slot(URL)
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    key = WebhookDelivery._key(WebhookDelivery.INFLIGHT_KEY_PREFIX, URL)
+    assert redis.expiries == [(key, 21)]
+
+    # Slots leaked by dead workers are reclaimed once the counter expires
+    redis.delete(key)
+    assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    assert redis.expiries == [(key, 21), (key, 21)]
+
+
+@override_settings(WEBHOOK_MAX_CONCURRENCY_PER_ENDPOINT=2)
+def test_slots_fail_open_on_redis_errors(redis):
+    with mock.patch.object(redis, "pipeline", side_effect=ConnectionError):
+        assert WebhookDelivery.acquire_slot(URL, timeout=10)
+    # Releasing the slot taken without Redis doesn't free one up later
+    WebhookDelivery.release_slot(URL)
+    assert redis.data == {}
+    with mock.patch.object(redis, "decr", side_effect=ConnectionError):
+        WebhookDelivery.release_slot(URL)
+
+
+@override_settings(WEBHOOK_BATCH_WINDOW=5)
+def test_batch_scheduled_once(redis):
+    with mock.patch("time.time", return_value=1000):
+        assert WebhookDelivery.add_to_batch(URL, {"n": 1}, headers=None)
+    with mock.patch("time.time", return_value=1010):
+        assert not WebhookDelivery.add_to_batch(URL, {"n": 2}, headers=None)
+
+    batch_key = WebhookDelivery.get_batch_key(URL, headers=None)
+    assert WebhookDelivery.pop_batch(batch_key) == [{"n": 1}, {"n": 2}]
+    assert redis.data == {}
+    with mock.patch("time.time", return_value=1020):
+        assert WebhookDelivery.add_to_batch(URL, {"n": 3}, headers=None)
+
+
+@override_settings(WEBHOOK_BATCH_WINDOW=5)
+def test_overdue_batch_rescheduled(redis):
+    with mock.patch("time.time", return_value=1000):
+        assert WebhookDelivery.add_to_batch(URL, {"n": 1}, headers=None)
+    # Delivery scheduled for the first payload never ran
+    with mock.patch("time.time", return_value=1011):
+        assert WebhookDelivery.add_to_batch(URL, {"n": 2}, headers=None)
+    with mock.patch("time.time", return_value=1012):
+        assert not WebhookDelivery.add_to_batch(URL, {"n": 3}, headers=None)
+
+
+def test_metrics_count_attempts_per_latency_bucket(redis):
+    WebhookDelivery.record(URL, latency=0.05)
+    WebhookDelivery.record(URL, latency=0.3)
+    WebhookDelivery.record(URL, latency=30, failed=True)
+    WebhookDelivery.record(URL, retried=True)
+
+    assert WebhookDelivery.get_hosts() == ["example.com"]
+    assert WebhookDelivery.get_metrics("example.com") == {
+        "deliveries": 2,
+        "failures": 1,
+        "retries": 1,
+        "latency_seconds_total": pytest.approx(30.35),
+        "latency_le_0.1": 1,
+        "latency_le_0.5": 1,
+        "latency_le_inf": 1,
+    }
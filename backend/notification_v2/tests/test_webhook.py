@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.test import override_settings
+from notification_v2.provider.webhook import webhook
+from notification_v2.provider.webhook.webhook import Webhook
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+URL = "https://example.com/hook"
+HEADERS = {"Content-Type": "application/json"}
+
+
+def get_webhook() -> Webhook:
+    notification = mock.Mock(url=URL, max_retries=3)
+    return Webhook(notification=notification, payload={"n": 1})
+
+
+@override_settings(WEBHOOK_BATCH_WINDOW=5)
+def test_batched_webhook_sent_now_without_redis():
+    with mock.patch.object(
+        webhook.WebhookDelivery, "add_to_batch", side_effect=RedisConnectionError
+    ), mock.patch.object(
+        webhook.send_webhook_notification, "apply_async"
+    ) as send, mock.patch.object(
+        webhook.send_webhook_batch, "apply_async"
+    ) as send_batch:
+        get_webhook().add_to_batch(headers=HEADERS)
+
+    send.assert_called_once()
+    assert send.call_args.args[0][:3] == (URL, {"n": 1}, HEADERS)
+    send_batch.assert_not_called()
+
+
+@override_settings(WEBHOOK_BATCH_WINDOW=5)
+def test_batched_webhook_scheduled_once():
+    with mock.patch.object(
+        webhook.WebhookDelivery, "add_to_batch", side_effect=[True, False]
+    ), mock.patch.object(
+        webhook.send_webhook_notification, "apply_async"
+    ) as send, mock.patch.object(
+        webhook.send_webhook_batch, "apply_async"
+    ) as send_batch:
+        get_webhook().add_to_batch(headers=HEADERS)
+        get_webhook().add_to_batch(headers=HEADERS)
+
+    send.assert_not_called()
+    send_batch.assert_called_once()
+    assert send_batch.call_args.kwargs["countdown"] == 5
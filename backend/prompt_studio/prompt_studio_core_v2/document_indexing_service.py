@@ -1,53 +1,172 @@
+import logging
+import math
+import time
+import uuid
 from typing import Optional
 
 from django.conf import settings
 from prompt_studio.prompt_studio_core_v2.constants import IndexingStatus
 from utils.cache_service import CacheService
 
+logger = logging.getLogger(__name__)
+
 
 class DocumentIndexingService:
+    """Tracks indexing state of documents in prompt studio.
+
+    State is scoped to the organization and the effective index key
+    (`doc_id_key`), so that users of the same organization indexing the
+    same document with the same profile share a single indexing run.
+    """
+
     CACHE_PREFIX = "document_indexing:"
+    LOCK_PREFIX = "document_indexing_lock:"
+    EXTRACT_PREFIX = "document_indexing_extract:"
+    DONE_PREFIX = "document_indexing_done:"
 
     @classmethod
-    def set_document_indexing(cls, org_id: str, user_id: str, doc_id_key: str) -> None:
+    def set_document_indexing(cls, org_id: str, doc_id_key: str) -> None:
         CacheService.set_key(
-            cls._cache_key(org_id, user_id, doc_id_key),
+            cls._cache_key(org_id, doc_id_key),
             IndexingStatus.STARTED_STATUS.value,
             expire=settings.INDEXING_FLAG_TTL,
         )
 
     @classmethod
-    def is_document_indexing(cls, org_id: str, user_id: str, doc_id_key: str) -> bool:
-        return (
-            CacheService.get_key(cls._cache_key(org_id, user_id, doc_id_key))
-            == IndexingStatus.STARTED_STATUS.value
-        )
+    def is_document_indexing(cls, org_id: str, doc_id_key: str) -> bool:
+        return CacheService.check_a_key_exist(cls._lock_key(org_id, doc_id_key))
 
     @classmethod
     def mark_document_indexed(
-        cls, org_id: str, user_id: str, doc_id_key: str, doc_id: str
+        cls,
+        org_id: str,
+        doc_id_key: str,
+        doc_id: str,
+        extracted_file_path: Optional[str] = None,
     ) -> None:
         CacheService.set_key(
-            cls._cache_key(org_id, user_id, doc_id_key),
+            cls._cache_key(org_id, doc_id_key),
             doc_id,
             expire=settings.INDEXING_FLAG_TTL,
         )
+        if extracted_file_path:
+            CacheService.set_key(
+                cls._extract_key(org_id, doc_id_key),
+                extracted_file_path,
+                expire=settings.INDEXING_FLAG_TTL,
+            )
 
     @classmethod
-    def get_indexed_document_id(
-        cls, org_id: str, user_id: str, doc_id_key: str
-    ) -> Optional[str]:
-        result = CacheService.get_key(cls._cache_key(org_id, user_id, doc_id_key))
+    def get_extracted_file_path(cls, org_id: str, doc_id_key: str) -> Optional[str]:
+        """Path of the text extracted by the caller which indexed the
+        document, used by callers reusing that index."""
+        return CacheService.get_key(cls._extract_key(org_id, doc_id_key))
+
+    @classmethod
+    def get_indexed_document_id(cls, org_id: str, doc_id_key: str) -> Optional[str]:
+        result = CacheService.get_key(cls._cache_key(org_id, doc_id_key))
         if result and result != IndexingStatus.STARTED_STATUS.value:
             return result
         return None
 
     @classmethod
-    def remove_document_indexing(
-        cls, org_id: str, user_id: str, doc_id_key: str
-    ) -> None:
-        CacheService.delete_a_key(cls._cache_key(org_id, user_id, doc_id_key))
+    def remove_document_indexing(cls, org_id: str, doc_id_key: str) -> None:
+        CacheService.delete_a_key(cls._cache_key(org_id, doc_id_key))
+        CacheService.delete_a_key(cls._extract_key(org_id, doc_id_key))
+
+    @classmethod
+    def acquire_indexing_lock(cls, org_id: str, doc_id_key: str) -> Optional[str]:
+        """Try to become the single indexer of a document in the organization.
+
+        The lock expires after `INDEXING_LOCK_TTL` seconds so that a crashed
+        worker cannot block indexing of the document indefinitely.
+
+        Args:
+            org_id (str): ID of the organization
+            doc_id_key (str): Effective index key of the document
+
+        Returns:
+            Optional[str]: Lock token if acquired, None if another caller
+                is already indexing the document
+        """
+        token = uuid.uuid4().hex
+        acquired = CacheService.add_key(
+            cls._lock_key(org_id, doc_id_key),
+            token,
+            expire=settings.INDEXING_LOCK_TTL,
+        )
+        return token if acquired else None
+
+    @classmethod
+    def release_indexing_lock(cls, org_id: str, doc_id_key: str, token: str) -> None:
+        """Release the indexing lock if it is still held by `token`, waking
+        callers waiting on it.
+
+        A lock which expired and got re-acquired by another caller is left
+        untouched.
+        """
+        lock_key = cls._lock_key(org_id, doc_id_key)
+        if CacheService.get_key(lock_key) == token:
+            CacheService.delete_a_key(lock_key)
+            CacheService.rpush(
+                cls._done_key(org_id, doc_id_key, token),
+                token,
+                expire=settings.INDEXING_LOCK_WAIT_TIMEOUT,
+            )
+
+    @classmethod
+    def wait_for_indexed_document(
+        cls, org_id: str, doc_id_key: str, timeout: Optional[int] = None
+    ) -> Optional[str]:
+        """Wait for an in-flight indexing of the document to complete.
+
+        Blocks on the completion notification of the lock held at the time
+        of the call, pushed when that lock is released.
+
+        Args:
+            org_id (str): ID of the organization
+            doc_id_key (str): Effective index key of the document
+            timeout (Optional[int]): Seconds to wait. Defaults to
+                `INDEXING_LOCK_WAIT_TIMEOUT`
+
+        Returns:
+            Optional[str]: Indexed document ID if the in-flight indexing
+                completed, None if it is still running after `timeout` or
+                ended without a result
+        """
+        if timeout is None:
+            timeout = settings.INDEXING_LOCK_WAIT_TIMEOUT
+        deadline = time.monotonic() + timeout
+        token = CacheService.get_key(cls._lock_key(org_id, doc_id_key))
+        while token:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.info(
+                    f"Document with index key '{doc_id_key}' is still being "
+                    f"indexed after waiting {timeout}s"
+                )
+                return None
+            done_key = cls._done_key(org_id, doc_id_key, token)
+            if CacheService.blpop(done_key, timeout=math.ceil(remaining)):
+                # Pass the notification on to the next caller waiting
+                CacheService.rpush(
+                    done_key, token, expire=settings.INDEXING_LOCK_WAIT_TIMEOUT
+                )
+            token = CacheService.get_key(cls._lock_key(org_id, doc_id_key))
+        return cls.get_indexed_document_id(org_id=org_id, doc_id_key=doc_id_key)
+
+    @classmethod
+    def _cache_key(cls, org_id: str, doc_id_key: str) -> str:
+        return f"{cls.CACHE_PREFIX}{org_id}:{doc_id_key}"
+
+    @classmethod
+    def _lock_key(cls, org_id: str, doc_id_key: str) -> str:
+        return f"{cls.LOCK_PREFIX}{org_id}:{doc_id_key}"
+
+    @classmethod
+    def _extract_key(cls, org_id: str, doc_id_key: str) -> str:
+        return f"{cls.EXTRACT_PREFIX}{org_id}:{doc_id_key}"
 
     @classmethod
-    def _cache_key(cls, org_id: str, user_id: str, doc_id_key: str) -> str:
-        return f"{cls.CACHE_PREFIX}{org_id}:{user_id}:{doc_id_key}"
+    def _done_key(cls, org_id: str, doc_id_key: str, token: str) -> str:
+        return f"{cls.DONE_PREFIX}{org_id}:{doc_id_key}:{token}"
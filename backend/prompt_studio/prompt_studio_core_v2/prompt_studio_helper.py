@@ -968,51 +968,99 @@ class PromptStudioHelper:
             )
             if not reindex:
                 indexed_doc_id = DocumentIndexingService.get_indexed_document_id(
-                    org_id=org_id, user_id=user_id, doc_id_key=doc_id_key
+                    org_id=org_id, doc_id_key=doc_id_key
                 )
                 if indexed_doc_id:
-                    return {
-                        "status": IndexingStatus.COMPLETED_STATUS.value,
-                        "output": indexed_doc_id,
-                    }
-                # Polling if document is already being indexed
-                if DocumentIndexingService.is_document_indexing(
-                    org_id=org_id, user_id=user_id, doc_id_key=doc_id_key
-                ):
-                    return {
-                        "status": IndexingStatus.PENDING_STATUS.value,
-                        "output": IndexingStatus.DOCUMENT_BEING_INDEXED.value,
-                    }
-
-            # Set the document as being indexed
-            DocumentIndexingService.set_document_indexing(
-                org_id=org_id, user_id=user_id, doc_id_key=doc_id_key
-            )
-            doc_id: str = tool_index.index(
-                tool_id=tool_id,
-                embedding_instance_id=embedding_model,
-                vector_db_instance_id=vector_db,
-                x2text_instance_id=x2text_adapter,
-                file_path=file_path,
-                chunk_size=profile_manager.chunk_size,
-                chunk_overlap=profile_manager.chunk_overlap,
-                reindex=reindex,
-                output_file_path=extract_file_path,
-                usage_kwargs=usage_kwargs.copy(),
-                process_text=process_text,
-                fs=fs,
-                enable_highlight=enable_highlight,
+                    return PromptStudioHelper._reuse_indexed_document(
+                        org_id=org_id,
+                        doc_id_key=doc_id_key,
+                        doc_id=indexed_doc_id,
+                        document_id=document_id,
+                        is_summary=is_summary,
+                        profile_manager=profile_manager,
+                        extract_file_path=extract_file_path,
+                        fs=fs,
+                    )
+
+            # Only one caller in the organization indexes a document with
+            # a given index key, others wait on and reuse its result
+            lock_token = DocumentIndexingService.acquire_indexing_lock(
+                org_id=org_id, doc_id_key=doc_id_key
             )
+            if not lock_token:
+                indexed_doc_id = DocumentIndexingService.wait_for_indexed_document(
+                    org_id=org_id, doc_id_key=doc_id_key
+                )
+                if indexed_doc_id:
+                    return PromptStudioHelper._reuse_indexed_document(
+                        org_id=org_id,
+                        doc_id_key=doc_id_key,
+                        doc_id=indexed_doc_id,
+                        document_id=document_id,
+                        is_summary=is_summary,
+                        profile_manager=profile_manager,
+                        extract_file_path=extract_file_path,
+                        fs=fs,
+                    )
+                return {
+                    "status": IndexingStatus.PENDING_STATUS.value,
+                    "output": IndexingStatus.DOCUMENT_BEING_INDEXED.value,
+                }
+
+            try:
+                # Indexed by the previous holder of the lock since the check
+                # above, it's reused as well
+                if not reindex:
+                    indexed_doc_id = DocumentIndexingService.get_indexed_document_id(
+                        org_id=org_id, doc_id_key=doc_id_key
+                    )
+                    if indexed_doc_id:
+                        return PromptStudioHelper._reuse_indexed_document(
+                            org_id=org_id,
+                            doc_id_key=doc_id_key,
+                            doc_id=indexed_doc_id,
+                            document_id=document_id,
+                            is_summary=is_summary,
+                            profile_manager=profile_manager,
+                            extract_file_path=extract_file_path,
+                            fs=fs,
+                        )
+                # Set the document as being indexed
+                DocumentIndexingService.set_document_indexing(
+                    org_id=org_id, doc_id_key=doc_id_key
+                )
+                doc_id: str = tool_index.index(
+                    tool_id=tool_id,
+                    embedding_instance_id=embedding_model,
+                    vector_db_instance_id=vector_db,
+                    x2text_instance_id=x2text_adapter,
+                    file_path=file_path,
+                    chunk_size=profile_manager.chunk_size,
+                    chunk_overlap=profile_manager.chunk_overlap,
+                    reindex=reindex,
+                    output_file_path=extract_file_path,
+                    usage_kwargs=usage_kwargs.copy(),
+                    process_text=process_text,
+                    fs=fs,
+                    enable_highlight=enable_highlight,
+                )
 
-            PromptStudioIndexHelper.handle_index_manager(
-                document_id=document_id,
-                is_summary=is_summary,
-                profile_manager=profile_manager,
-                doc_id=doc_id,
-            )
-            DocumentIndexingService.mark_document_indexed(
-                org_id=org_id, user_id=user_id, doc_id_key=doc_id_key, doc_id=doc_id
-            )
+                PromptStudioIndexHelper.handle_index_manager(
+                    document_id=document_id,
+                    is_summary=is_summary,
+                    profile_manager=profile_manager,
+                    doc_id=doc_id,
+                )
+                DocumentIndexingService.mark_document_indexed(
+                    org_id=org_id,
+                    doc_id_key=doc_id_key,
+                    doc_id=doc_id,
+                    extracted_file_path=extract_file_path,
+                )
+            finally:
+                DocumentIndexingService.release_indexing_lock(
+                    org_id=org_id, doc_id_key=doc_id_key, token=lock_token
+                )
             return {"status": IndexingStatus.COMPLETED_STATUS.value, "output": doc_id}
         except (IndexingError, IndexingAPIError, SdkError) as e:
             logger.error(f"Indexing failed : {e} ", stack_info=True, exc_info=True)
@@ -1027,6 +1075,85 @@ class PromptStudioHelper:
                 f"Error while indexing '{doc_name}'. {str(e)}"
             ) from e
 
+    @staticmethod
+    def _reuse_indexed_document(
+        org_id: str,
+        doc_id_key: str,
+        doc_id: str,
+        document_id: str,
+        is_summary: bool,
+        profile_manager: ProfileManager,
+        extract_file_path: Optional[str],
+        fs: FileStorage,
+    ) -> dict[str, Any]:
+        """Reuses a document indexed by another caller with the same index
+        key instead of indexing it again.
+
+        Args:
+            org_id (str): ID of the organization
+            doc_id_key (str): Effective index key of the document
+            doc_id (str): ID of the indexed document
+            document_id (str): ID of this caller's document
+            is_summary (bool): Whether the summary of the document is indexed
+            profile_manager (ProfileManager): Profile the document is indexed with
+            extract_file_path (Optional[str]): Path where this caller expects
+                the extracted text
+            fs (FileStorage): File storage holding the extracted text
+
+        Returns:
+            dict[str, Any]: Completed indexing status with the document's ID
+        """
+        PromptStudioHelper._reuse_extracted_text(
+            org_id=org_id,
+            doc_id_key=doc_id_key,
+            extract_file_path=extract_file_path,
+            fs=fs,
+        )
+        PromptStudioIndexHelper.handle_index_manager(
+            document_id=document_id,
+            is_summary=is_summary,
+            profile_manager=profile_manager,
+            doc_id=doc_id,
+        )
+        return {"status": IndexingStatus.COMPLETED_STATUS.value, "output": doc_id}
+
+    @staticmethod
+    def _reuse_extracted_text(
+        org_id: str,
+        doc_id_key: str,
+        extract_file_path: Optional[str],
+        fs: FileStorage,
+    ) -> None:
+        """Copies the text extracted by the caller which indexed the document
+        when this caller's copy of the document has not been extracted yet.
+
+        Args:
+            org_id (str): ID of the organization
+            doc_id_key (str): Effective index key of the document
+            extract_file_path (Optional[str]): Path where this caller expects
+                the extracted text
+            fs (FileStorage): File storage holding the extracted text
+        """
+        if not extract_file_path or fs.exists(extract_file_path):
+            return
+        source_path = DocumentIndexingService.get_extracted_file_path(
+            org_id=org_id, doc_id_key=doc_id_key
+        )
+        if not source_path or source_path == extract_file_path:
+            return
+        if not fs.exists(source_path):
+            logger.warning(
+                f"Extracted text '{source_path}' for index key '{doc_id_key}' "
+                "is no longer available"
+            )
+            return
+        fs.mkdir(os.path.dirname(extract_file_path), create_parents=True)
+        fs.write(
+            path=extract_file_path,
+            mode="w",
+            data=fs.read(path=source_path, mode="r"),
+        )
+
     @staticmethod
     def _fetch_single_pass_response(
         tool: CustomTool,
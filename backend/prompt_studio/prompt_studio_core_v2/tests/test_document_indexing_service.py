@@ -0,0 +1,244 @@
+from collections import defaultdict
+from typing import Any, Callable, Optional
+from unittest import mock
+
+import pytest  # type: ignore
+from django.test import override_settings
+from prompt_studio.prompt_studio_core_v2.constants import IndexingStatus
+from prompt_studio.prompt_studio_core_v2.document_indexing_service import (
+    DocumentIndexingService,
+)
+
+MODULE = "prompt_studio.prompt_studio_core_v2.document_indexing_service"
+ORG_ID = "org"
+DOC_ID_KEY = "index-key"
+
+
+class FakeCacheService:
+    """Keeps keys and lists of `CacheService` in memory, on a clock which
+    moves on only while waiting in `blpop`.
+
+    `on_wait` stands for other callers, run whenever `blpop` finds the list
+    empty.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.lists: defaultdict[str, list[str]] = defaultdict(list)
+        self.now = 0.0
+        self.waits: list[tuple[str, int]] = []
+        self.on_wait: Callable[[], None] = lambda: None
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def get_key(self, key: str) -> Optional[Any]:
+        return self.data.get(key)
+
+    def set_key(self, key: str, value: Any, expire: int = 0) -> None:
+        self.data[key] = value
+
+    def add_key(self, key: str, value: Any, expire: int = 0) -> bool:
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def check_a_key_exist(self, key: str) -> bool:
+        return key in self.data
+
+    def delete_a_key(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def rpush(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        self.lists[key].append(value)
+
+    def blpop(self, key: str, timeout: int) -> Optional[str]:
+        self.waits.append((key, timeout))
+        if not self.lists[key]:
+            self.on_wait()
+        if not self.lists[key]:
+            self.now += timeout
+            return None
+        return self.lists[key].pop(0)
+
+
+@pytest.fixture
+def cache() -> FakeCacheService:
+    fake_cache = FakeCacheService()
+    with (
+        mock.patch(f"{MODULE}.CacheService", fake_cache),
+        mock.patch(f"{MODULE}.time.monotonic", fake_cache.monotonic),
+        override_settings(
+            INDEXING_FLAG_TTL=3600, INDEXING_LOCK_TTL=900, INDEXING_LOCK_WAIT_TIMEOUT=30
+        ),
+    ):
+        yield fake_cache
+
+
+def acquire() -> Optional[str]:
+    return DocumentIndexingService.acquire_indexing_lock(
+        org_id=ORG_ID, doc_id_key=DOC_ID_KEY
+    )
+
+
+def release(token: str) -> None:
+    DocumentIndexingService.release_indexing_lock(
+        org_id=ORG_ID, doc_id_key=DOC_ID_KEY, token=token
+    )
+
+
+def wait(timeout: Optional[int] = None) -> Optional[str]:
+    return DocumentIndexingService.wait_for_indexed_document(
+        org_id=ORG_ID, doc_id_key=DOC_ID_KEY, timeout=timeout
+    )
+
+
+def finish_indexing(token: str, doc_id: Optional[str] = "doc-1") -> None:
+    if doc_id:
+        DocumentIndexingService.mark_document_indexed(
+            org_id=ORG_ID, doc_id_key=DOC_ID_KEY, doc_id=doc_id
+        )
+    release(token)
+
+
+def test_lock_held_by_a_single_caller(cache):
+    token = acquire()
+    assert token
+    assert acquire() is None
+    assert DocumentIndexingService.is_document_indexing(ORG_ID, DOC_ID_KEY)
+
+    # Only the token holding the lock releases it
+    release("other-token")
+    assert acquire() is None
+    release(token)
+    assert not DocumentIndexingService.is_document_indexing(ORG_ID, DOC_ID_KEY)
+    assert acquire()
+
+
+def test_release_after_expiry_keeps_lock_of_next_holder(cache):
+    expired_token = acquire()
+    cache.delete_a_key(DocumentIndexingService._lock_key(ORG_ID, DOC_ID_KEY))
+    token = acquire()
+    assert token and token != expired_token
+
+    release(expired_token)
+    assert acquire() is None
+    release(token)
+    assert acquire()
+
+
+def test_wait_returns_document_indexed_by_lock_holder(cache):
+    token = acquire()
+    cache.on_wait = lambda: finish_indexing(token)
+
+    assert wait() == "doc-1"
+    done_key = DocumentIndexingService._done_key(ORG_ID, DOC_ID_KEY, token)
+    assert cache.waits == [(done_key, 30)]
+    # The notification is left for the next caller waiting
+    assert cache.lists[done_key] == [token]
+    assert cache.now == 0
+
+
+def test_wait_returns_none_when_indexing_fails(cache):
+    token = acquire()
+    cache.on_wait = lambda: finish_indexing(token, doc_id=None)
+
+    assert wait() is None
+    assert len(cache.waits) == 1
+
+
+def test_wait_returns_none_when_lock_disappears(cache):
+    acquire()
+    # The lock holder crashed and its lock expired
+    cache.on_wait = lambda: cache.delete_a_key(
+        DocumentIndexingService._lock_key(ORG_ID, DOC_ID_KEY)
+    )
+
+    assert wait(timeout=10) is None
+    assert len(cache.waits) == 1
+
+
+def test_wait_times_out_while_still_indexing(cache):
+    acquire()
+
+    assert wait(timeout=10) is None
+    assert [timeout for _, timeout in cache.waits] == [10]
+    assert cache.now == 10
+    assert DocumentIndexingService.is_document_indexing(ORG_ID, DOC_ID_KEY)
+
+
+def test_wait_without_indexing_in_flight_returns_right_away(cache):
+    DocumentIndexingService.mark_document_indexed(
+        org_id=ORG_ID, doc_id_key=DOC_ID_KEY, doc_id="doc-1"
+    )
+
+    assert wait() == "doc-1"
+    assert cache.waits == []
+
+
+HELPER_MODULE = "prompt_studio.prompt_studio_core_v2.prompt_studio_helper"
+
+
+@pytest.fixture
+def index():
+    with (
+        mock.patch(f"{HELPER_MODULE}.PromptIdeBaseTool"),
+        mock.patch(f"{HELPER_MODULE}.Index") as index,
+    ):
+        index.return_value.generate_index_key.return_value = DOC_ID_KEY
+        yield index
+
+
+@pytest.fixture
+def index_helper():
+    with mock.patch(f"{HELPER_MODULE}.PromptStudioIndexHelper") as index_helper:
+        yield index_helper
+
+
+def dynamic_indexer() -> dict[str, Any]:
+    from prompt_studio.prompt_studio_core_v2.prompt_studio_helper import (
+        PromptStudioHelper,
+    )
+
+    return PromptStudioHelper.dynamic_indexer(
+        profile_manager=mock.MagicMock(),
+        tool_id="tool",
+        file_path="documents/file.pdf",
+        org_id=ORG_ID,
+        document_id="document",
+        user_id="user",
+        run_id="run",
+        fs=mock.MagicMock(),
+    )
+
+
+def assert_reused(result, index, index_helper, doc_id: str) -> None:
+    assert result == {"status": IndexingStatus.COMPLETED_STATUS.value, "output": doc_id}
+    index.return_value.index.assert_not_called()
+    index_helper.handle_index_manager.assert_called_once()
+    assert index_helper.handle_index_manager.call_args.kwargs["doc_id"] == doc_id
+
+
+def test_dynamic_indexer_reuses_index_of_other_caller(cache, index, index_helper):
+    token = acquire()
+    cache.on_wait = lambda: finish_indexing(token, doc_id="doc-of-other-caller")
+
+    result = dynamic_indexer()
+
+    assert_reused(result, index, index_helper, "doc-of-other-caller")
+
+
+def test_dynamic_indexer_reuses_index_completed_before_taking_lock(
+    cache, index, index_helper
+):
+    # Indexed by the previous lock holder after the first check
+    with mock.patch.object(
+        DocumentIndexingService,
+        "get_indexed_document_id",
+        side_effect=[None, "doc-of-previous-holder"],
+    ):
+        result = dynamic_indexer()
+
+    assert_reused(result, index, index_helper, "doc-of-previous-holder")
+    assert acquire()
@@ -44,6 +44,8 @@ prompt_studio_file = PromptStudioCoreView.as_view(
     }
 )
 
+prompt_studio_document = PromptStudioCoreView.as_view({"get": "fetch_document_ide"})
+
 prompt_studio_export = PromptStudioCoreView.as_view(
     {"post": "export_tool", "get": "export_tool_info"}
 )
@@ -109,6 +111,11 @@ urlpatterns = format_suffix_patterns(
             prompt_studio_file,
             name="prompt_studio_file",
         ),
+        path(
+            "prompt-studio/file/<uuid:pk>/document",
+            prompt_studio_document,
+            name="prompt_studio_document",
+        ),
         path(
             "prompt-studio/export/<uuid:pk>",
             prompt_studio_export,
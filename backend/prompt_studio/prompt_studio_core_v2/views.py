@@ -5,7 +5,7 @@ from typing import Any, Optional
 from account_v2.custom_exceptions import DuplicateData
 from django.db import IntegrityError
 from django.db.models import QuerySet
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponseBase
 from file_management.constants import FileInformationKey as FileKey
 from file_management.exceptions import FileNotFound
 from permissions.permission import IsOwner, IsOwnerOrSharedUser
@@ -379,6 +379,46 @@ class PromptStudioCoreView(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"])
     def fetch_contents_ide(self, request: HttpRequest, pk: Any = None) -> Response:
         custom_tool = self.get_object()
+        file_name, allowed_content_types = self._get_ide_file_info(request)
+        try:
+            contents = PromptStudioFileHelper.fetch_file_contents(
+                file_name=file_name,
+                org_id=UserSessionUtils.get_organization_id(request),
+                user_id=custom_tool.created_by.user_id,
+                tool_id=str(custom_tool.tool_id),
+                allowed_content_types=allowed_content_types,
+            )
+        except FileNotFoundError:
+            raise FileNotFound()
+        return Response({"data": contents}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def fetch_document_ide(
+        self, request: HttpRequest, pk: Any = None
+    ) -> HttpResponseBase:
+        """Streams a document as is, unlike `fetch_contents_ide` which
+        returns it base64 encoded in JSON.
+
+        Supports range requests and conditional GETs, letting viewers render
+        the first pages of large documents before the rest is fetched.
+        """
+        custom_tool = self.get_object()
+        file_name, allowed_content_types = self._get_ide_file_info(request)
+        try:
+            return PromptStudioFileHelper.stream_file_contents(
+                request=request,
+                file_name=file_name,
+                org_id=UserSessionUtils.get_organization_id(request),
+                user_id=custom_tool.created_by.user_id,
+                tool_id=str(custom_tool.tool_id),
+                allowed_content_types=allowed_content_types,
+            )
+        except FileNotFoundError:
+            raise FileNotFound()
+
+    def _get_ide_file_info(self, request: HttpRequest) -> tuple[str, list[str]]:
+        """Resolves the name of the requested document's file for its view
+        type, and the content types allowed to be served."""
         serializer = FileInfoIdeSerializer(data=request.GET)
         serializer.is_valid(raise_exception=True)
         document_id: str = serializer.validated_data.get("document_id")
@@ -403,17 +443,7 @@ class PromptStudioCoreView(viewsets.ModelViewSet):
                 f"{FileViewTypes.SUMMARIZE.lower()}/"
                 f"{filename_without_extension}.txt"
             )
-        try:
-            contents = PromptStudioFileHelper.fetch_file_contents(
-                file_name=file_name,
-                org_id=UserSessionUtils.get_organization_id(request),
-                user_id=custom_tool.created_by.user_id,
-                tool_id=str(custom_tool.tool_id),
-                allowed_content_types=allowed_content_types,
-            )
-        except FileNotFoundError:
-            raise FileNotFound()
-        return Response({"data": contents}, status=status.HTTP_200_OK)
+        return file_name, allowed_content_types
 
     @action(detail=True, methods=["post"])
     def upload_for_ide(self, request: HttpRequest, pk: Any = None) -> Response:
@@ -476,12 +506,25 @@ class PromptStudioCoreView(viewsets.ModelViewSet):
         document: DocumentManager = DocumentManager.objects.get(pk=document_id)
 
         try:
-            # Delete indexed flags in redis
+            # Delete indexed flags in redis, unless the index is shared with
+            # another document of the organization
             index_managers = IndexManager.objects.filter(document_manager=document_id)
             for index_manager in index_managers:
                 raw_index_id = index_manager.raw_index_id
+                if not raw_index_id:
+                    continue
+                index_shared = (
+                    IndexManager.objects.filter(
+                        raw_index_id=raw_index_id,
+                        document_manager__tool__organization=custom_tool.organization,
+                    )
+                    .exclude(document_manager=document_id)
+                    .exists()
+                )
+                if index_shared:
+                    continue
                 DocumentIndexingService.remove_document_indexing(
-                    org_id=org_id, user_id=user_id, doc_id_key=raw_index_id
+                    org_id=org_id, doc_id_key=raw_index_id
                 )
             # Delete the document record
             document.delete()
@@ -3,3 +3,15 @@ from django.apps import AppConfig
 
 class UsageConfig(AppConfig):
     name = "usage_v2"
+
+    def ready(self):
+        from django.conf import settings
+        from usage_v2.constants import UsageRollupConstants
+        from utils.periodic_task import create_periodic_task_if_not_exists
+
+        create_periodic_task_if_not_exists(
+            name=UsageRollupConstants.PERIODIC_TASK_NAME,
+            task=UsageRollupConstants.TASK,
+            interval=settings.USAGE_ROLLUP_COMPACTION_INTERVAL,
+            queue=UsageRollupConstants.CELERY_QUEUE_NAME,
+        )
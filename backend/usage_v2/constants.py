@@ -24,3 +24,9 @@ class UsageRequestParams:
     OFFSET = "offset"
     ORDER_BY = "order_by"
     ORDER = "order"
+
+
+class UsageRollupConstants:
+    TASK = "compact_usage_rollups"
+    PERIODIC_TASK_NAME = "usage_rollup_compaction"
+    CELERY_QUEUE_NAME = "celery_periodic_logs"
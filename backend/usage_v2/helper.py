@@ -1,12 +1,14 @@
 import logging
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
+from account_v2.models import Organization
 from django.db.models import QuerySet, Sum
 from rest_framework.exceptions import APIException
 
 from .constants import UsageKeys
 from .models import Usage
+from .rollup import UsageRollupHelper
 
 logger = logging.getLogger(__name__)
 
@@ -32,14 +34,17 @@ class UsageHelper:
             APIException: For unexpected errors during database operations.
         """
         try:
-            # Aggregate the token counts for the given run_id
-            usage_summary = Usage.objects.filter(run_id=run_id).aggregate(
-                embedding_tokens=Sum(UsageKeys.EMBEDDING_TOKENS),
-                prompt_tokens=Sum(UsageKeys.PROMPT_TOKENS),
-                completion_tokens=Sum(UsageKeys.COMPLETION_TOKENS),
-                total_tokens=Sum(UsageKeys.TOTAL_TOKENS),
-                cost_in_dollars=Sum(UsageKeys.COST_IN_DOLLARS),
-            )
+            # Served from rollups when available, falls back to aggregating
+            # the token counts for the given run_id
+            usage_summary = UsageRollupHelper.get_run_usage(run_id=run_id)
+            if usage_summary is None:
+                usage_summary = Usage.objects.filter(run_id=run_id).aggregate(
+                    embedding_tokens=Sum(UsageKeys.EMBEDDING_TOKENS),
+                    prompt_tokens=Sum(UsageKeys.PROMPT_TOKENS),
+                    completion_tokens=Sum(UsageKeys.COMPLETION_TOKENS),
+                    total_tokens=Sum(UsageKeys.TOTAL_TOKENS),
+                    cost_in_dollars=Sum(UsageKeys.COST_IN_DOLLARS),
+                )
 
             logger.debug(f"Token counts aggregated successfully for run_id: {run_id}")
 
@@ -83,6 +88,42 @@ class UsageHelper:
             total_cost=Sum("cost_in_dollars"),
         )
 
+    @staticmethod
+    def aggregate_usage_metrics_from_rollups(
+        organization: Organization,
+        start_date: datetime,
+        end_date: datetime,
+        filters: dict[str, Any],
+    ) -> Optional[dict[str, Any]]:
+        """
+        Aggregate usage metrics over a date range from the usage rollups.
+
+        Args:
+            organization (Organization): Organization to aggregate usage of.
+            start_date (datetime): Start date of the usage period.
+            end_date (datetime): End date of the usage period, inclusive.
+            filters (dict): Exact matches on `usage_type` and
+                `adapter_instance_id`.
+
+        Returns:
+            Optional[dict]: Aggregated usage metrics in the shape of
+                `aggregate_usage_metrics`, None if rollups are unavailable.
+        """
+        usage_summary = UsageRollupHelper.get_range_usage(
+            organization=organization,
+            start_date=start_date,
+            end_date=end_date,
+            filters=filters,
+        )
+        if usage_summary is None:
+            return None
+        return {
+            "total_prompt_tokens": usage_summary[UsageKeys.PROMPT_TOKENS],
+            "total_completion_tokens": usage_summary[UsageKeys.COMPLETION_TOKENS],
+            "total_tokens": usage_summary[UsageKeys.TOTAL_TOKENS],
+            "total_cost": usage_summary[UsageKeys.COST_IN_DOLLARS],
+        }
+
     @staticmethod
     def format_usage_response(
         aggregated_data: dict[str, Any], start_date: datetime, end_date: datetime
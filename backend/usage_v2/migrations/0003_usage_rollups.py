@@ -0,0 +1,238 @@
+# Generated by Django 4.2.1 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account_v2", "0001_initial"),
+        ("usage_v2", "0002_alter_usage_run_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usage",
+            index=models.Index(
+                fields=["organization", "created_at"], name="usage_organiz_6e1f38_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="UsageRollupState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        db_comment="Name of the rollup compaction",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "compacted_until",
+                    models.DateTimeField(
+                        db_comment="Usage created before this time is reflected in rollups"
+                    ),
+                ),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "usage_rollup_state",
+            },
+        ),
+        migrations.CreateModel(
+            name="UsageRunRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                (
+                    "run_id",
+                    models.UUIDField(db_comment="Identifier for the run", unique=True),
+                ),
+                (
+                    "execution_id",
+                    models.CharField(
+                        blank=True,
+                        db_comment="Identifier for the execution instance",
+                        max_length=255,
+                        null=True,
+                    ),
+                ),
+                (
+                    "embedding_tokens",
+                    models.BigIntegerField(
+                        db_comment="Number of tokens used for embedding"
+                    ),
+                ),
+                (
+                    "prompt_tokens",
+                    models.BigIntegerField(
+                        db_comment="Number of tokens used for the prompt"
+                    ),
+                ),
+                (
+                    "completion_tokens",
+                    models.BigIntegerField(
+                        db_comment="Number of tokens used for the completion"
+                    ),
+                ),
+                (
+                    "total_tokens",
+                    models.BigIntegerField(db_comment="Total number of tokens used"),
+                ),
+                (
+                    "cost_in_dollars",
+                    models.FloatField(db_comment="Total cost in dollars"),
+                ),
+                (
+                    "usage_count",
+                    models.IntegerField(db_comment="Number of usage entries summed"),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        blank=True,
+                        db_comment="Foreign key reference to the Organization model.",
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="account_v2.organization",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "usage_run_rollup",
+            },
+        ),
+        migrations.CreateModel(
+            name="UsageTimeRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hourly"), ("day", "Daily")],
+                        db_comment="Size of the time bucket, either 'hour' or 'day'",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "bucket_start",
+                    models.DateTimeField(db_comment="Start of the time bucket in UTC"),
+                ),
+                (
+                    "usage_type",
+                    models.CharField(
+                        choices=[
+                            ("llm", "LLM Usage"),
+                            ("embedding", "Embedding Usage"),
+                        ],
+                        db_comment="Type of usage, either 'llm' or 'embedding'",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "adapter_instance_id",
+                    models.CharField(
+                        db_comment="Identifier for the adapter instance", max_length=255
+                    ),
+                ),
+                (
+                    "model_name",
+                    models.CharField(
+                        db_comment="Name of the model used", max_length=255
+                    ),
+                ),
+                (
+                    "embedding_tokens",
+                    models.BigIntegerField(
+                        db_comment="Number of tokens used for embedding"
+                    ),
+                ),
+                (
+                    "prompt_tokens",
+                    models.BigIntegerField(
+                        db_comment="Number of tokens used for the prompt"
+                    ),
+                ),
+                (
+                    "completion_tokens",
+                    models.BigIntegerField(
+                        db_comment="Number of tokens used for the completion"
+                    ),
+                ),
+                (
+                    "total_tokens",
+                    models.BigIntegerField(db_comment="Total number of tokens used"),
+                ),
+                (
+                    "cost_in_dollars",
+                    models.FloatField(db_comment="Total cost in dollars"),
+                ),
+                (
+                    "usage_count",
+                    models.IntegerField(db_comment="Number of usage entries summed"),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        db_comment="Foreign key reference to the Organization model.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="account_v2.organization",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "usage_time_rollup",
+                "indexes": [
+                    models.Index(
+                        fields=["organization", "granularity", "bucket_start"],
+                        name="usage_time__organiz_280d4d_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="usagetimerollup",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "organization",
+                    "granularity",
+                    "bucket_start",
+                    "usage_type",
+                    "adapter_instance_id",
+                    "model_name",
+                ),
+                name="unique_usage_time_rollup_bucket",
+            ),
+        ),
+    ]
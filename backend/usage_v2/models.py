@@ -1,5 +1,6 @@
 import uuid
 
+from account_v2.models import Organization
 from django.db import models
 from utils.models.base_model import BaseModel
 from utils.models.organization_mixin import (
@@ -79,4 +80,136 @@ class Usage(DefaultOrganizationMixin, BaseModel):
         db_table = "usage"
         indexes = [
             models.Index(fields=["run_id"]),
+            models.Index(fields=["organization", "created_at"]),
         ]
+
+
+class UsageRollupGranularity(models.TextChoices):
+    HOUR = "hour", "Hourly"
+    DAY = "day", "Daily"
+
+
+class UsageRollupModelManager(DefaultOrganizationManagerMixin, models.Manager):
+    pass
+
+
+class UsageTimeRollup(DefaultOrganizationMixin, BaseModel):
+    """Usage summed per organization, time bucket, adapter and model.
+
+    Maintained by the usage rollup compaction task from `Usage`.
+    """
+
+    # Not null, NULLs would be distinct in the unique bucket constraint
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        db_comment="Foreign key reference to the Organization model.",
+    )
+    granularity = models.CharField(
+        max_length=16,
+        choices=UsageRollupGranularity.choices,
+        db_comment="Size of the time bucket, either 'hour' or 'day'",
+    )
+    bucket_start = models.DateTimeField(db_comment="Start of the time bucket in UTC")
+    usage_type = models.CharField(
+        max_length=255,
+        choices=UsageType.choices,
+        db_comment="Type of usage, either 'llm' or 'embedding'",
+    )
+    adapter_instance_id = models.CharField(
+        max_length=255, db_comment="Identifier for the adapter instance"
+    )
+    model_name = models.CharField(max_length=255, db_comment="Name of the model used")
+    embedding_tokens = models.BigIntegerField(
+        db_comment="Number of tokens used for embedding"
+    )
+    prompt_tokens = models.BigIntegerField(
+        db_comment="Number of tokens used for the prompt"
+    )
+    completion_tokens = models.BigIntegerField(
+        db_comment="Number of tokens used for the completion"
+    )
+    total_tokens = models.BigIntegerField(db_comment="Total number of tokens used")
+    cost_in_dollars = models.FloatField(db_comment="Total cost in dollars")
+    usage_count = models.IntegerField(db_comment="Number of usage entries summed")
+    # Manager
+    objects = UsageRollupModelManager()
+
+    def __str__(self):
+        return f"{self.granularity}:{self.bucket_start}:{self.adapter_instance_id}"
+
+    class Meta:
+        db_table = "usage_time_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "organization",
+                    "granularity",
+                    "bucket_start",
+                    "usage_type",
+                    "adapter_instance_id",
+                    "model_name",
+                ],
+                name="unique_usage_time_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["organization", "granularity", "bucket_start"]),
+        ]
+
+
+class UsageRunRollup(DefaultOrganizationMixin, BaseModel):
+    """Usage summed per run, i.e. per file execution or prompt studio run.
+
+    Maintained by the usage rollup compaction task from `Usage`.
+    """
+
+    run_id = models.UUIDField(unique=True, db_comment="Identifier for the run")
+    execution_id = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        db_comment="Identifier for the execution instance",
+    )
+    embedding_tokens = models.BigIntegerField(
+        db_comment="Number of tokens used for embedding"
+    )
+    prompt_tokens = models.BigIntegerField(
+        db_comment="Number of tokens used for the prompt"
+    )
+    completion_tokens = models.BigIntegerField(
+        db_comment="Number of tokens used for the completion"
+    )
+    total_tokens = models.BigIntegerField(db_comment="Total number of tokens used")
+    cost_in_dollars = models.FloatField(db_comment="Total cost in dollars")
+    usage_count = models.IntegerField(db_comment="Number of usage entries summed")
+    # Manager
+    objects = UsageRollupModelManager()
+
+    def __str__(self):
+        return str(self.run_id)
+
+    class Meta:
+        db_table = "usage_run_rollup"
+
+
+class UsageRollupState(models.Model):
+    """Progress of the usage rollup compaction.
+
+    All `Usage` entries created before `compacted_until` are reflected in
+    the rollup tables.
+    """
+
+    name = models.CharField(
+        max_length=64, unique=True, db_comment="Name of the rollup compaction"
+    )
+    compacted_until = models.DateTimeField(
+        db_comment="Usage created before this time is reflected in rollups"
+    )
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}:{self.compacted_until}"
+
+    class Meta:
+        db_table = "usage_rollup_state"
@@ -0,0 +1,349 @@
+import logging
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Optional
+
+from account_v2.models import Organization
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q, QuerySet, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .constants import UsageKeys
+from .models import (
+    Usage,
+    UsageRollupGranularity,
+    UsageRollupState,
+    UsageRunRollup,
+    UsageTimeRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMED_FIELDS = [
+    UsageKeys.EMBEDDING_TOKENS,
+    UsageKeys.PROMPT_TOKENS,
+    UsageKeys.COMPLETION_TOKENS,
+    UsageKeys.TOTAL_TOKENS,
+    UsageKeys.COST_IN_DOLLARS,
+]
+TIME_ROLLUP_GROUP_FIELDS = [
+    "organization",
+    "usage_type",
+    UsageKeys.ADAPTER_INSTANCE_ID,
+    UsageKeys.MODEL_NAME,
+]
+
+
+def _sum_annotations(count: Any) -> dict[str, Any]:
+    """Sums of `SUMMED_FIELDS` under `sum_` prefixed aliases, which avoid
+    clashing with the model's fields."""
+    annotations: dict[str, Any] = {
+        f"sum_{field}": Sum(field) for field in SUMMED_FIELDS
+    }
+    annotations["sum_usage_count"] = count
+    return annotations
+
+
+def _rollup_values(row: dict[str, Any]) -> dict[str, Any]:
+    values = {field: row[f"sum_{field}"] or 0 for field in SUMMED_FIELDS}
+    values["usage_count"] = row["sum_usage_count"]
+    return values
+
+
+def _add(first: Optional[Any], second: Optional[Any]) -> Optional[Any]:
+    """Adds two sums where None stands for a sum over no rows."""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return first + second
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = _floor_hour(value)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+def _floor_day(value: datetime) -> datetime:
+    return _floor_hour(value).replace(hour=0)
+
+
+def _ceil_day(value: datetime) -> datetime:
+    floored = _floor_day(value)
+    return floored if floored == value else floored + timedelta(days=1)
+
+
+def _get_rescan_start(watermark: datetime) -> datetime:
+    """Start of the hours recomputed when compacting past the watermark."""
+    return watermark - timedelta(hours=settings.USAGE_ROLLUP_RESCAN_HOURS)
+
+
+class UsageRollupHelper:
+    """Maintains and reads the usage rollup tables.
+
+    Usage created before the compaction watermark is summed into hourly,
+    daily and per run rollups. Reads combine rollups with the raw `Usage`
+    entries past the watermark and at unaligned range boundaries, so that
+    results match aggregating the raw entries.
+
+    Usage committed late with an older `created_at` is picked up by
+    recomputing the last `USAGE_ROLLUP_RESCAN_HOURS` hours before the
+    watermark whenever it advances. Usage without an organization is left
+    out of the time rollups, which are only read per organization.
+    """
+
+    STATE_NAME = "usage_rollup"
+
+    @classmethod
+    def get_watermark(cls) -> Optional[datetime]:
+        """Time before which all usage is reflected in the rollups."""
+        state = UsageRollupState.objects.filter(name=cls.STATE_NAME).first()
+        return state.compacted_until if state else None
+
+    @classmethod
+    def compact(cls) -> Optional[datetime]:
+        """Sums usage of completed hours past the watermark into rollups.
+
+        Hours are recomputed as a whole, which makes compaction idempotent,
+        including the trailing `USAGE_ROLLUP_RESCAN_HOURS` before the
+        watermark.
+        Usage is only compacted once it is older than
+        `USAGE_ROLLUP_SETTLE_DELAY` seconds, and at most
+        `USAGE_ROLLUP_MAX_HOURS_PER_RUN` hours are compacted per call to
+        bound the work of backfilling existing usage.
+
+        Returns:
+            Optional[datetime]: The watermark after compaction
+        """
+        watermark = cls.get_watermark()
+        if watermark is None:
+            earliest = Usage._base_manager.aggregate(earliest=Min("created_at"))[
+                "earliest"
+            ]
+            if earliest is None:
+                logger.info("No usage to compact into rollups")
+                return None
+            watermark = _floor_hour(earliest)
+
+        cutoff = _floor_hour(
+            timezone.now() - timedelta(seconds=settings.USAGE_ROLLUP_SETTLE_DELAY)
+        )
+        cutoff = min(
+            cutoff,
+            watermark + timedelta(hours=settings.USAGE_ROLLUP_MAX_HOURS_PER_RUN),
+        )
+        if watermark >= cutoff:
+            return watermark
+
+        start = _get_rescan_start(watermark)
+        with transaction.atomic():
+            cls._compact_hours(start=start, end=cutoff)
+            cls._compact_days(start=_floor_day(start), end=_ceil_day(cutoff))
+            cls._compact_runs(start=start, end=cutoff)
+            UsageRollupState.objects.update_or_create(
+                name=cls.STATE_NAME, defaults={"compacted_until": cutoff}
+            )
+        logger.info(f"Usage rollups compacted from {watermark} until {cutoff}")
+        return cutoff
+
+    @staticmethod
+    def _compact_hours(start: datetime, end: datetime) -> None:
+        rows = (
+            Usage._base_manager.filter(
+                created_at__gte=start, created_at__lt=end, organization__isnull=False
+            )
+            .annotate(bucket=TruncHour("created_at", tzinfo=dt_timezone.utc))
+            .values("bucket", *TIME_ROLLUP_GROUP_FIELDS)
+            .annotate(**_sum_annotations(Count("id")))
+        )
+        UsageRollupHelper._upsert_time_rollups(rows, UsageRollupGranularity.HOUR)
+
+    @staticmethod
+    def _compact_days(start: datetime, end: datetime) -> None:
+        rows = (
+            UsageTimeRollup._base_manager.filter(
+                granularity=UsageRollupGranularity.HOUR,
+                bucket_start__gte=start,
+                bucket_start__lt=end,
+            )
+            .annotate(bucket=TruncDay("bucket_start", tzinfo=dt_timezone.utc))
+            .values("bucket", *TIME_ROLLUP_GROUP_FIELDS)
+            .annotate(**_sum_annotations(Sum("usage_count")))
+        )
+        UsageRollupHelper._upsert_time_rollups(rows, UsageRollupGranularity.DAY)
+
+    @staticmethod
+    def _upsert_time_rollups(rows: QuerySet, granularity: str) -> None:
+        rollups = [
+            UsageTimeRollup(
+                granularity=granularity,
+                bucket_start=row["bucket"],
+                organization_id=row["organization"],
+                usage_type=row["usage_type"],
+                adapter_instance_id=row[UsageKeys.ADAPTER_INSTANCE_ID],
+                model_name=row[UsageKeys.MODEL_NAME],
+                **_rollup_values(row),
+            )
+            for row in rows
+        ]
+        UsageTimeRollup._base_manager.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=[
+                "organization",
+                "granularity",
+                "bucket_start",
+                "usage_type",
+                UsageKeys.ADAPTER_INSTANCE_ID,
+                UsageKeys.MODEL_NAME,
+            ],
+            update_fields=[*SUMMED_FIELDS, "usage_count", "modified_at"],
+        )
+
+    @staticmethod
+    def _compact_runs(start: datetime, end: datetime) -> None:
+        run_ids = (
+            Usage._base_manager.filter(
+                created_at__gte=start, created_at__lt=end, run_id__isnull=False
+            )
+            .values_list(UsageKeys.RUN_ID, flat=True)
+            .distinct()
+        )
+        rows = (
+            Usage._base_manager.filter(run_id__in=run_ids, created_at__lt=end)
+            .values(UsageKeys.RUN_ID, "organization")
+            .annotate(
+                **_sum_annotations(Count("id")), run_execution_id=Min("execution_id")
+            )
+        )
+        rollups = [
+            UsageRunRollup(
+                run_id=row[UsageKeys.RUN_ID],
+                organization_id=row["organization"],
+                execution_id=row["run_execution_id"],
+                **_rollup_values(row),
+            )
+            for row in rows
+        ]
+        UsageRunRollup._base_manager.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=[UsageKeys.RUN_ID],
+            update_fields=[
+                *SUMMED_FIELDS,
+                "execution_id",
+                "usage_count",
+                "modified_at",
+            ],
+        )
+
+    @classmethod
+    def get_run_usage(cls, run_id: str) -> Optional[dict[str, Any]]:
+        """Usage summed for a run, in the shape of aggregating `Usage` by
+        `SUMMED_FIELDS`.
+
+        Returns:
+            Optional[dict[str, Any]]: Summed usage, None if rollups are not
+                available yet
+        """
+        watermark = cls.get_watermark()
+        if watermark is None:
+            return None
+        rollup = UsageRunRollup.objects.filter(run_id=run_id).first()
+        result: dict[str, Any] = {field: None for field in SUMMED_FIELDS}
+        if rollup:
+            result = {field: getattr(rollup, field) for field in SUMMED_FIELDS}
+        tail = Usage.objects.filter(run_id=run_id, created_at__gte=watermark).aggregate(
+            **{field: Sum(field) for field in SUMMED_FIELDS}
+        )
+        return {field: _add(result[field], tail[field]) for field in SUMMED_FIELDS}
+
+    @classmethod
+    def get_range_usage(
+        cls,
+        organization: Organization,
+        start_date: datetime,
+        end_date: datetime,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Usage summed over an inclusive date range, in the shape of
+        aggregating `Usage` by `SUMMED_FIELDS`.
+
+        Full days and hours before the watermark are read from rollups,
+        the remaining edges of the range from `Usage`.
+
+        Args:
+            organization (Organization): Organization to sum usage of
+            start_date (datetime): Start of the range
+            end_date (datetime): End of the range, inclusive
+            filters (Optional[dict[str, Any]]): Exact matches on fields
+                present in both `Usage` and the time rollups, such as
+                `usage_type` or `adapter_instance_id`
+
+        Returns:
+            Optional[dict[str, Any]]: Summed usage, None if rollups are not
+                available yet
+        """
+        watermark = cls.get_watermark()
+        if watermark is None:
+            return None
+        filters = filters or {}
+        hours_start = _ceil_hour(start_date)
+        hours_end = min(_floor_hour(end_date), watermark)
+
+        raw = Usage.objects.filter(organization=organization, **filters)
+        if hours_start >= hours_end:
+            return cls._sum_queryset(
+                raw.filter(created_at__range=[start_date, end_date])
+            )
+
+        days_start = _ceil_day(hours_start)
+        days_end = max(_floor_day(hours_end), days_start)
+        rollups = UsageTimeRollup.objects.filter(organization=organization, **filters)
+        if days_start < hours_end:
+            rollup_filter = Q(
+                granularity=UsageRollupGranularity.DAY,
+                bucket_start__gte=days_start,
+                bucket_start__lt=days_end,
+            )
+            rollup_filter |= Q(
+                granularity=UsageRollupGranularity.HOUR,
+                bucket_start__gte=hours_start,
+                bucket_start__lt=days_start,
+            )
+            rollup_filter |= Q(
+                granularity=UsageRollupGranularity.HOUR,
+                bucket_start__gte=days_end,
+                bucket_start__lt=hours_end,
+            )
+            rolled_up = rollups.filter(rollup_filter)
+        else:
+            rolled_up = rollups.filter(
+                granularity=UsageRollupGranularity.HOUR,
+                bucket_start__gte=hours_start,
+                bucket_start__lt=hours_end,
+            )
+
+        parts = [
+            cls._sum_queryset(rolled_up),
+            cls._sum_queryset(
+                raw.filter(created_at__gte=start_date, created_at__lt=hours_start)
+            ),
+            cls._sum_queryset(
+                raw.filter(created_at__gte=hours_end, created_at__lte=end_date)
+            ),
+        ]
+        return {
+            field: _add(_add(parts[0][field], parts[1][field]), parts[2][field])
+            for field in SUMMED_FIELDS
+        }
+
+    @staticmethod
+    def _sum_queryset(queryset: QuerySet) -> dict[str, Any]:
+        return queryset.aggregate(**{field: Sum(field) for field in SUMMED_FIELDS})
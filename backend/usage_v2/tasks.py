@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .constants import UsageRollupConstants
+from .rollup import UsageRollupHelper
+
+
+@shared_task(name=UsageRollupConstants.TASK)
+def compact_usage_rollups() -> None:
+    UsageRollupHelper.compact()
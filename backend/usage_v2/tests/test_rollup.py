@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest  # type: ignore
+from django.test import override_settings
+from usage_v2.rollup import (
+    _ceil_day,
+    _ceil_hour,
+    _floor_day,
+    _floor_hour,
+    _get_rescan_start,
+)
+
+UTC = timezone.utc
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+@pytest.mark.parametrize(
+    "value, floored, ceiled",
+    [
+        (
+            datetime(2024, 3, 1, 10, 0, tzinfo=UTC),
+            datetime(2024, 3, 1, 10, 0, tzinfo=UTC),
+            datetime(2024, 3, 1, 10, 0, tzinfo=UTC),
+        ),
+        (
+            datetime(2024, 3, 1, 10, 0, 0, 1, tzinfo=UTC),
+            datetime(2024, 3, 1, 10, 0, tzinfo=UTC),
+            datetime(2024, 3, 1, 11, 0, tzinfo=UTC),
+        ),
+        (
+            datetime(2024, 3, 1, 23, 59, 59, tzinfo=UTC),
+            datetime(2024, 3, 1, 23, 0, tzinfo=UTC),
+            datetime(2024, 3, 2, 0, 0, tzinfo=UTC),
+        ),
+        # Half hour offsets are aligned to UTC hours, not local ones
+        (
+            datetime(2024, 3, 1, 10, 30, tzinfo=IST),
+            datetime(2024, 3, 1, 5, 0, tzinfo=UTC),
+            datetime(2024, 3, 1, 5, 0, tzinfo=UTC),
+        ),
+        (
+            datetime(2024, 3, 1, 10, 0, tzinfo=IST),
+            datetime(2024, 3, 1, 4, 0, tzinfo=UTC),
+            datetime(2024, 3, 1, 5, 0, tzinfo=UTC),
+        ),
+    ],
+)
+def test_hour_boundaries(value, floored, ceiled):
+    assert _floor_hour(value) == floored
+    assert _ceil_hour(value) == ceiled
+
+
+@pytest.mark.parametrize(
+    "value, floored, ceiled",
+    [
+        (
+            datetime(2024, 3, 1, tzinfo=UTC),
+            datetime(2024, 3, 1, tzinfo=UTC),
+            datetime(2024, 3, 1, tzinfo=UTC),
+        ),
+        (
+            datetime(2024, 3, 1, 0, 0, 0, 1, tzinfo=UTC),
+            datetime(2024, 3, 1, tzinfo=UTC),
+            datetime(2024, 3, 2, tzinfo=UTC),
+        ),
+        (
+            datetime(2024, 2, 29, 23, 0, tzinfo=UTC),
+            datetime(2024, 2, 29, tzinfo=UTC),
+            datetime(2024, 3, 1, tzinfo=UTC),
+        ),
+        # Local midnight of IST is on the previous UTC day
+        (
+            datetime(2024, 3, 1, 0, 0, tzinfo=IST),
+            datetime(2024, 2, 29, tzinfo=UTC),
+            datetime(2024, 3, 1, tzinfo=UTC),
+        ),
+    ],
+)
+def test_day_boundaries(value, floored, ceiled):
+    assert _floor_day(value) == floored
+    assert _ceil_day(value) == ceiled
+
+
+@override_settings(USAGE_ROLLUP_RESCAN_HOURS=6)
+def test_rescan_start():
+    watermark = datetime(2024, 3, 1, 2, 0, tzinfo=UTC)
+    assert _get_rescan_start(watermark) == datetime(2024, 2, 29, 20, 0, tzinfo=UTC)
+    assert _floor_day(_get_rescan_start(watermark)) == datetime(2024, 2, 29, tzinfo=UTC)
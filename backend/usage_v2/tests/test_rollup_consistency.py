@@ -0,0 +1,167 @@
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from unittest import mock
+
+import pytest  # type: ignore
+from account_v2.models import Organization
+from django.db.models import Sum
+from django.test import override_settings
+from usage_v2.models import Usage
+from usage_v2.rollup import SUMMED_FIELDS, UsageRollupHelper
+from utils.user_context import UserContext
+
+pytestmark = pytest.mark.django_db
+
+UTC = timezone.utc
+NOW = datetime(2024, 3, 5, 12, 0, tzinfo=UTC)
+RUN_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def organization() -> Any:
+    organization = Organization.objects.create(
+        name="org", display_name="org", organization_id="org"
+    )
+    with ExitStack() as stack:
+        stack.enter_context(
+            mock.patch.object(
+                UserContext, "get_organization", return_value=organization
+            )
+        )
+        stack.enter_context(
+            override_settings(
+                USAGE_ROLLUP_SETTLE_DELAY=0,
+                USAGE_ROLLUP_MAX_HOURS_PER_RUN=24 * 30,
+                USAGE_ROLLUP_RESCAN_HOURS=6,
+            )
+        )
+        yield organization
+
+
+def add_usage(
+    organization: Organization,
+    created_at: datetime,
+    tokens: int,
+    run_id: Optional[uuid.UUID] = None,
+) -> None:
+    usage = Usage.objects.create(
+        organization=organization,
+        adapter_instance_id="adapter",
+        run_id=run_id,
+        usage_type="llm",
+        model_name="model",
+        embedding_tokens=0,
+        prompt_tokens=tokens,
+        completion_tokens=2 * tokens,
+        total_tokens=3 * tokens,
+        cost_in_dollars=tokens / 100,
+    )
+    # created_at is set on creation, backdated like usage of the past
+    Usage.objects.filter(pk=usage.pk).update(created_at=created_at)
+
+
+def compact(now: datetime) -> None:
+    with mock.patch("usage_v2.rollup.timezone.now", return_value=now):
+        UsageRollupHelper.compact()
+
+
+def raw_usage(queryset: Any) -> dict[str, Any]:
+    return queryset.aggregate(**{field: Sum(field) for field in SUMMED_FIELDS})
+
+
+def assert_matches(actual: Optional[dict[str, Any]], expected: dict[str, Any]):
+    assert actual is not None
+    assert actual.keys() == expected.keys()
+    for field, value in expected.items():
+        assert actual[field] == pytest.approx(value), field
+
+
+@pytest.fixture
+def usage(organization: Organization) -> Organization:
+    """Usage over a few days, at hour and day boundaries and in between."""
+    times = [
+        datetime(2024, 3, 1, 0, 0, tzinfo=UTC),
+        datetime(2024, 3, 1, 9, 15, tzinfo=UTC),
+        datetime(2024, 3, 1, 9, 59, 59, tzinfo=UTC),
+        datetime(2024, 3, 2, 13, 30, tzinfo=UTC),
+        datetime(2024, 3, 3, 0, 0, tzinfo=UTC),
+        datetime(2024, 3, 3, 23, 59, tzinfo=UTC),
+        datetime(2024, 3, 4, 6, 45, tzinfo=UTC),
+        datetime(2024, 3, 5, 10, 30, tzinfo=UTC),
+        datetime(2024, 3, 5, 11, 50, tzinfo=UTC),
+    ]
+    for index, created_at in enumerate(times):
+        add_usage(organization, created_at, tokens=index + 1, run_id=RUN_ID)
+    compact(NOW)
+    return organization
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        # Partial hours and days at both ends
+        (
+            datetime(2024, 3, 1, 9, 30, tzinfo=UTC),
+            datetime(2024, 3, 4, 7, 10, tzinfo=UTC),
+        ),
+        # Aligned to days
+        (
+            datetime(2024, 3, 1, 0, 0, tzinfo=UTC),
+            datetime(2024, 3, 4, 0, 0, tzinfo=UTC),
+        ),
+        # Within a single day
+        (
+            datetime(2024, 3, 2, 10, 5, tzinfo=UTC),
+            datetime(2024, 3, 2, 14, 0, tzinfo=UTC),
+        ),
+        # Within a single hour
+        (
+            datetime(2024, 3, 1, 9, 10, tzinfo=UTC),
+            datetime(2024, 3, 1, 9, 20, tzinfo=UTC),
+        ),
+        # Past the watermark
+        (
+            datetime(2024, 3, 3, 12, 0, tzinfo=UTC),
+            datetime(2024, 3, 6, 0, 0, tzinfo=UTC),
+        ),
+    ],
+)
+def test_range_usage_matches_raw_usage(usage, start, end):
+    expected = raw_usage(
+        Usage.objects.filter(organization=usage, created_at__range=[start, end])
+    )
+    actual = UsageRollupHelper.get_range_usage(
+        organization=usage, start_date=start, end_date=end
+    )
+    assert_matches(actual, expected)
+
+
+def test_run_usage_matches_raw_usage(usage):
+    add_usage(usage, NOW + timedelta(minutes=5), tokens=50, run_id=RUN_ID)
+
+    actual = UsageRollupHelper.get_run_usage(run_id=str(RUN_ID))
+
+    assert_matches(actual, raw_usage(Usage.objects.filter(run_id=RUN_ID)))
+
+
+def test_late_usage_is_rolled_up_on_next_compaction(usage):
+    start = datetime(2024, 3, 4, 0, 0, tzinfo=UTC)
+    end = datetime(2024, 3, 5, 23, 0, tzinfo=UTC)
+    # Committed after the hour it's dated in was compacted
+    add_usage(usage, datetime(2024, 3, 5, 8, 20, tzinfo=UTC), tokens=7, run_id=RUN_ID)
+
+    compact(NOW + timedelta(hours=2))
+
+    expected = raw_usage(
+        Usage.objects.filter(organization=usage, created_at__range=[start, end])
+    )
+    actual = UsageRollupHelper.get_range_usage(
+        organization=usage, start_date=start, end_date=end
+    )
+    assert_matches(actual, expected)
+    assert_matches(
+        UsageRollupHelper.get_run_usage(run_id=str(RUN_ID)),
+        raw_usage(Usage.objects.filter(run_id=RUN_ID)),
+    )
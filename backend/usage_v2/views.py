@@ -31,6 +31,11 @@ class UsageView(viewsets.ModelViewSet):
     filterset_class = UsageFilter
     ordering_fields = ["created_at"]
 
+    NON_FILTER_PARAMS = {"page", "page_size", "ordering"}
+    EXPLICIT_DATE_FILTERS = {"created_at_gte", "created_at_lte"}
+    ROLLUP_DATE_FILTERS = EXPLICIT_DATE_FILTERS | {"date_range"}
+    ROLLUP_EXACT_FILTERS = {"usage_type", UsageKeys.ADAPTER_INSTANCE_ID}
+
     def get_queryset(self):
         """
         Returns a queryset filtered by the current user's organization.
@@ -59,13 +64,37 @@ class UsageView(viewsets.ModelViewSet):
         )
 
         # Aggregate and prepare response
-        aggregated_data = UsageHelper.aggregate_usage_metrics(queryset)
+        aggregated_data = None
+        if self._can_aggregate_from_rollups(request):
+            aggregated_data = UsageHelper.aggregate_usage_metrics_from_rollups(
+                organization=UserContext.get_organization(),
+                start_date=date_range.start_date,
+                end_date=date_range.end_date,
+                filters={
+                    param: request.query_params[param]
+                    for param in self.ROLLUP_EXACT_FILTERS
+                    if request.query_params.get(param)
+                },
+            )
+        if aggregated_data is None:
+            aggregated_data = UsageHelper.aggregate_usage_metrics(queryset)
         response_data = UsageHelper.format_usage_response(
             aggregated_data, date_range.start_date, date_range.end_date
         )
 
         return Response(status=status.HTTP_200_OK, data=response_data)
 
+    def _can_aggregate_from_rollups(self, request: HttpRequest) -> bool:
+        """Checks if the requested filters can be answered by usage rollups,
+        which hold usage per time bucket, usage type, adapter and model."""
+        params = {
+            param for param, value in request.query_params.items() if value
+        } - self.NON_FILTER_PARAMS
+        if not params <= self.ROLLUP_DATE_FILTERS | self.ROLLUP_EXACT_FILTERS:
+            return False
+        # Preset and explicit dates are both applied to the raw usage
+        return not ("date_range" in params and params & self.EXPLICIT_DATE_FILTERS)
+
     @action(detail=True, methods=["get"])
     def get_token_usage(self, request: HttpRequest) -> Response:
         """Retrieves the aggregated token usage for a given run_id.
@@ -8,6 +8,8 @@ redis_cache = get_redis_connection("default")
 
 
 class CacheService:
+    KEY_REGISTRY_PREFIX = "key_registry:"
+
     @staticmethod
     def get_key(key: str) -> Optional[Any]:
         data = cache.get(str(key))
@@ -20,24 +22,114 @@ class CacheService:
 
     @staticmethod
     def set_key(
-        key: str, value: Any, expire: int = int(settings.CACHE_TTL_SEC)
+        key: str,
+        value: Any,
+        expire: int = int(settings.CACHE_TTL_SEC),
+        scope: Optional[str] = None,
     ) -> None:
+        """Set a key, recording it in the registry of `scope` if the key
+        registry is enabled."""
         cache.set(
             str(key),
             value,
             expire,
         )
+        if scope:
+            CacheService.register_key(scope=scope, key=str(key), expire=expire)
+
+    @staticmethod
+    def add_key(
+        key: str, value: Any, expire: int = int(settings.CACHE_TTL_SEC)
+    ) -> bool:
+        """Set the key only if it does not exist yet.
+
+        Returns:
+            bool: True if the key was set, False if it already existed
+        """
+        return bool(cache.add(str(key), value, expire))
 
     @staticmethod
-    def get_all_keys(key_pattern: str) -> Any:
-        keys = redis_cache.keys(key_pattern)
+    def get_all_keys(key_pattern: str, scope: Optional[str] = None) -> Any:
+        """Get keys matching the pattern.
+
+        Keys are read from the registry of `scope` if the key registry is
+        enabled, otherwise the keyspace is iterated with SCAN, which unlike
+        KEYS does not block Redis.
+        """
+        if scope and settings.CACHE_KEY_REGISTRY_ENABLED:
+            keys = CacheService._get_registered_keys(
+                scope=scope, key_pattern=key_pattern
+            )
+        else:
+            keys = redis_cache.scan_iter(
+                match=key_pattern, count=settings.CACHE_SCAN_BATCH_SIZE
+            )
         # Ensure all keys are strings
         return [key.decode("utf-8") if isinstance(key, bytes) else key for key in keys]
 
     @staticmethod
-    def clear_cache(key_pattern: str) -> Any:
-        """Delete keys in bulk based on the key pattern."""
-        cache.delete_pattern(key_pattern)
+    def clear_cache(key_pattern: str, scope: Optional[str] = None) -> Any:
+        """Delete keys in bulk based on the key pattern.
+
+        Keys are found as in `get_all_keys` and removed with UNLINK in
+        batches of `CACHE_SCAN_BATCH_SIZE`.
+        """
+        batch: list[str] = []
+        for key in CacheService.get_all_keys(key_pattern=key_pattern, scope=scope):
+            batch.append(key)
+            if len(batch) >= settings.CACHE_SCAN_BATCH_SIZE:
+                redis_cache.unlink(*batch)
+                batch = []
+        if batch:
+            redis_cache.unlink(*batch)
+        if scope and settings.CACHE_KEY_REGISTRY_ENABLED:
+            redis_cache.unlink(CacheService._registry_key(scope))
+
+    @staticmethod
+    def register_key(scope: str, key: str, expire: Optional[int] = None) -> None:
+        """Record a key in the registry of its scope, so that the scope can be
+        enumerated and cleared without iterating the global keyspace.
+
+        No-op unless `CACHE_KEY_REGISTRY_ENABLED` is set. The registry
+        expires with the latest key written to it.
+        """
+        if not settings.CACHE_KEY_REGISTRY_ENABLED:
+            return
+        registry_key = CacheService._registry_key(scope)
+        pipeline = redis_cache.pipeline()
+        pipeline.sadd(registry_key, key)
+        if expire:
+            pipeline.expire(registry_key, int(expire))
+        else:
+            pipeline.persist(registry_key)
+        pipeline.execute()
+
+    @staticmethod
+    def _get_registered_keys(scope: str, key_pattern: str) -> list[Any]:
+        """Get keys of the scope's registry matching the pattern, dropping
+        keys which expired since they were registered."""
+        registry_key = CacheService._registry_key(scope)
+        keys = list(
+            redis_cache.sscan_iter(
+                registry_key,
+                match=key_pattern,
+                count=settings.CACHE_SCAN_BATCH_SIZE,
+            )
+        )
+        if not keys:
+            return keys
+        pipeline = redis_cache.pipeline()
+        for key in keys:
+            pipeline.exists(key)
+        exists = pipeline.execute()
+        expired = [key for key, found in zip(keys, exists) if not found]
+        if expired:
+            redis_cache.srem(registry_key, *expired)
+        return [key for key, found in zip(keys, exists) if found]
+
+    @staticmethod
+    def _registry_key(scope: str) -> str:
+        return f"{CacheService.KEY_REGISTRY_PREFIX}{scope}"
 
     @staticmethod
     def check_a_key_exist(key: str, version: Any = None) -> bool:
@@ -64,13 +156,33 @@ class CacheService:
         return cache.delete(key)
 
     @staticmethod
-    def rpush(key: str, value: str) -> None:
-        redis_cache.rpush(key, value)
+    def rpush(key: str, value: str, expire: Optional[int] = None) -> None:
+        if not expire:
+            redis_cache.rpush(key, value)
+            return
+        pipeline = redis_cache.pipeline()
+        pipeline.rpush(key, value)
+        pipeline.expire(key, int(expire))
+        pipeline.execute()
 
     @staticmethod
     def lpop(key: str) -> Any:
         return redis_cache.lpop(key)
 
+    @staticmethod
+    def blpop(key: str, timeout: int) -> Optional[str]:
+        """Pop the first value of a list, waiting up to `timeout` seconds
+        for one to be pushed.
+
+        Returns:
+            Optional[str]: Value popped, None if the wait timed out
+        """
+        result = redis_cache.blpop([key], timeout=timeout)
+        if result is None:
+            return None
+        _, value = result
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
     @staticmethod
     def lrem(key: str, value: str) -> None:
         redis_cache.lrem(key, value)
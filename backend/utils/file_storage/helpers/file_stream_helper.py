@@ -0,0 +1,358 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date
+from unstract.sdk.file_storage import FileStorage, FileStorageProvider
+from utils.file_storage.constants import FileStorageKeys
+
+logger = logging.getLogger(__name__)
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Content types storages report when none was set on upload
+GENERIC_CONTENT_TYPES = {"application/octet-stream", "binary/octet-stream"}
+
+
+@dataclass
+class StreamedFileInfo:
+    size: int
+    modified_at: float
+    # Content type recorded by the storage, None if unknown
+    content_type: Optional[str] = None
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised for a `Range` header outside of the file."""
+
+
+class FileStreamHelper:
+    """Serves files from a file storage as HTTP responses, with support for
+    range requests and conditional GETs.
+
+    Files of remote storages are kept in a local cache for
+    `FILE_STREAM_CACHE_TTL` seconds, so that the range requests of a viewer
+    don't each go to the storage. A file is cached on its first request:
+    while streamed to the client for a whole file, and in the background
+    for a range, which is served from the storage meanwhile. A file is
+    cached by a single request at a time, through a `.partial` file created
+    exclusively, other requests are served from the storage meanwhile.
+    Expired files are evicted every `FILE_STREAM_CACHE_EVICTION_INTERVAL`
+    seconds.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    PARTIAL_SUFFIX = ".partial"
+    _evicted_at = 0.0
+    _eviction_lock = threading.Lock()
+
+    @classmethod
+    def get_file_info(cls, fs: FileStorage, path: str) -> StreamedFileInfo:
+        """Size, modification time and content type of a file, from a single
+        stat of the storage."""
+        info: dict[str, Any] = fs.fs.info(path)
+        modified_at = cls._get_timestamp(info)
+        if modified_at is None:
+            modified_at = fs.modification_time(path=path).timestamp()
+        content_type = (
+            info.get("ContentType")
+            or info.get("contentType")
+            or info.get("content_type")
+        )
+        if not isinstance(content_type, str) or content_type in GENERIC_CONTENT_TYPES:
+            content_type = None
+        return StreamedFileInfo(
+            size=int(info.get("size") or 0),
+            modified_at=modified_at,
+            content_type=content_type,
+        )
+
+    @classmethod
+    def stream(
+        cls,
+        request: HttpRequest,
+        fs: FileStorage,
+        path: str,
+        content_type: str,
+        file_info: Optional[StreamedFileInfo] = None,
+    ) -> HttpResponse:
+        """Responds with the file, or the part of it requested by a `Range`
+        header.
+
+        Args:
+            request (HttpRequest): Request for the file
+            fs (FileStorage): Storage holding the file
+            path (str): Path of the file in the storage
+            content_type (str): Content type of the file
+            file_info (Optional[StreamedFileInfo]): Info of the file, looked
+                up with `get_file_info` if not given
+
+        Returns:
+            HttpResponse: 200 with the file, 206 with the requested range,
+                304 if the client's copy is current or 416 for an
+                unsatisfiable range
+        """
+        file_info = file_info or cls.get_file_info(fs=fs, path=path)
+        size = file_info.size
+        etag = cls._get_etag(path=path, size=size, modified_at=file_info.modified_at)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": http_date(file_info.modified_at),
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, no-cache",
+        }
+
+        if cls._matches(request.headers.get("If-None-Match"), etag):
+            return cls._with_headers(HttpResponse(status=304), headers)
+
+        try:
+            byte_range = cls._parse_range(request=request, size=size, etag=etag)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            headers["Content-Range"] = f"bytes */{size}"
+            return cls._with_headers(response, headers)
+
+        start, end = byte_range or (0, size - 1)
+        cache_path = cls._get_cache_path(path=path, etag=etag)
+        if cache_path and os.path.exists(cache_path):
+            chunks = cls._read_cached(cache_path=cache_path, start=start, end=end)
+        elif cache_path and not byte_range:
+            chunks = cls._read_through(fs=fs, path=path, end=end, cache_path=cache_path)
+        else:
+            if cache_path:
+                cls._fill_cache(fs=fs, path=path, size=size, cache_path=cache_path)
+            chunks = cls._read(fs=fs, path=path, start=start, end=end)
+
+        status = 206 if byte_range else 200
+        response = StreamingHttpResponse(
+            chunks, status=status, content_type=content_type
+        )
+        headers["Content-Length"] = str(end - start + 1 if size else 0)
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return cls._with_headers(response, headers)
+
+    @staticmethod
+    def _with_headers(response: HttpResponse, headers: dict[str, str]) -> HttpResponse:
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    @staticmethod
+    def _get_etag(path: str, size: int, modified_at: float) -> str:
+        digest = hashlib.md5(f"{path}:{size}:{modified_at}".encode()).hexdigest()
+        return f'"{digest}"'
+
+    @staticmethod
+    def _get_timestamp(info: dict[str, Any]) -> Optional[float]:
+        """Modification time in a storage's file info, whose key and type
+        differ across storages."""
+        for key in ("mtime", "LastModified", "last_modified", "updated"):
+            value = info.get(key)
+            if isinstance(value, datetime):
+                return value.timestamp()
+            if isinstance(value, (int, float)):
+                return float(value)
+            if isinstance(value, str):
+                try:
+                    return datetime.fromisoformat(
+                        value.replace("Z", "+00:00")
+                    ).timestamp()
+                except ValueError:
+                    continue
+        return None
+
+    @staticmethod
+    def _matches(header: Optional[str], etag: str) -> bool:
+        if not header:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        return "*" in tags or etag in tags
+
+    @classmethod
+    def _parse_range(
+        cls, request: HttpRequest, size: int, etag: str
+    ) -> Optional[tuple[int, int]]:
+        """Parses a single range `Range` header.
+
+        Returns:
+            Optional[tuple[int, int]]: The inclusive range, None to serve
+                the whole file
+
+        Raises:
+            RangeNotSatisfiable: If the range is outside of the file
+        """
+        header = request.headers.get("Range")
+        if not header:
+            return None
+        if_range = request.headers.get("If-Range")
+        if if_range and if_range != etag:
+            return None
+        # Multiple ranges aren't supported, the whole file is served instead
+        match = RANGE_PATTERN.match(header.strip())
+        if not match:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            suffix = int(last)
+            if not suffix or not size:
+                raise RangeNotSatisfiable(header)
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            raise RangeNotSatisfiable(header)
+        return start, end
+
+    @classmethod
+    def _read(cls, fs: FileStorage, path: str, start: int, end: int) -> Iterator[bytes]:
+        position = start
+        while position <= end:
+            length = min(cls.CHUNK_SIZE, end - position + 1)
+            chunk = fs.read(path=path, mode="rb", seek_position=position, length=length)
+            if not chunk:
+                return
+            yield chunk
+            position += len(chunk)
+
+    @classmethod
+    def _read_cached(cls, cache_path: str, start: int, end: int) -> Iterator[bytes]:
+        with open(cache_path, "rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(cls.CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                yield chunk
+                remaining -= len(chunk)
+
+    @classmethod
+    def _read_through(
+        cls, fs: FileStorage, path: str, end: int, cache_path: str
+    ) -> Iterator[bytes]:
+        """Streams the whole file while writing it to the cache, unless it's
+        already being cached."""
+        cache_file = cls._open_partial(cache_path)
+        if not cache_file:
+            yield from cls._read(fs=fs, path=path, start=0, end=end)
+            return
+        yield from cls._write_through(
+            fs=fs, path=path, end=end, cache_path=cache_path, cache_file=cache_file
+        )
+
+    @classmethod
+    def _write_through(
+        cls,
+        fs: FileStorage,
+        path: str,
+        end: int,
+        cache_path: str,
+        cache_file: BinaryIO,
+    ) -> Iterator[bytes]:
+        completed = False
+        try:
+            with cache_file:
+                for chunk in cls._read(fs=fs, path=path, start=0, end=end):
+                    cache_file.write(chunk)
+                    yield chunk
+            os.replace(cache_file.name, cache_path)
+            completed = True
+        finally:
+            if not completed:
+                with suppress(FileNotFoundError):
+                    os.remove(cache_file.name)
+
+    @classmethod
+    def _fill_cache(
+        cls, fs: FileStorage, path: str, size: int, cache_path: str
+    ) -> None:
+        """Caches the whole file in the background, unless already being
+        cached."""
+        cache_file = cls._open_partial(cache_path)
+        if not cache_file:
+            return
+
+        def fill() -> None:
+            try:
+                for _ in cls._write_through(
+                    fs=fs,
+                    path=path,
+                    end=size - 1,
+                    cache_path=cache_path,
+                    cache_file=cache_file,
+                ):
+                    pass
+            except Exception as e:
+                logger.warning(f"Unable to cache {path} for streaming: {e}")
+
+        threading.Thread(target=fill, name="file-stream-cache", daemon=True).start()
+
+    @classmethod
+    def _open_partial(cls, cache_path: str) -> Optional[BinaryIO]:
+        """Claims the caching of a file, None if another request (of any
+        process) is caching it."""
+        try:
+            return open(f"{cache_path}{cls.PARTIAL_SUFFIX}", "xb")
+        except FileExistsError:
+            return None
+
+    @classmethod
+    def _get_cache_path(cls, path: str, etag: str) -> Optional[str]:
+        """Path of the file in the local cache, None if it's not cached.
+
+        Files of local storages aren't cached. Cached files are keyed by
+        their ETag, which changes along with the file.
+        """
+        if not settings.FILE_STREAM_CACHE_TTL or not cls._is_remote_storage():
+            return None
+        cache_dir = settings.FILE_STREAM_CACHE_DIR
+        os.makedirs(cache_dir, exist_ok=True)
+        cls._evict_expired(cache_dir)
+        name = hashlib.sha256(f"{path}:{etag}".encode()).hexdigest()
+        return os.path.join(cache_dir, name)
+
+    @classmethod
+    def _evict_expired(cls, cache_dir: str) -> None:
+        """Removes files cached longer than `FILE_STREAM_CACHE_TTL`, at most
+        once every `FILE_STREAM_CACHE_EVICTION_INTERVAL` seconds.
+
+        Files being cached are written to continuously, they're only evicted
+        once abandoned.
+        """
+        now = time.time()
+        with cls._eviction_lock:
+            if now - cls._evicted_at < settings.FILE_STREAM_CACHE_EVICTION_INTERVAL:
+                return
+            cls._evicted_at = now
+        expired_before = now - settings.FILE_STREAM_CACHE_TTL
+        for entry in os.scandir(cache_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < expired_before:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                # Evicted concurrently
+                continue
+
+    @staticmethod
+    def _is_remote_storage() -> bool:
+        try:
+            storage = json.loads(
+                os.environ.get(FileStorageKeys.PERMANENT_REMOTE_STORAGE, "{}")
+            )
+        except json.JSONDecodeError:
+            return False
+        provider = storage.get("provider", FileStorageProvider.LOCAL.value)
+        return provider != FileStorageProvider.LOCAL.value
@@ -4,12 +4,14 @@ import os
 from pathlib import Path
 from typing import Any
 
+from django.http import HttpRequest, HttpResponse
 from file_management.exceptions import InvalidFileType
 from file_management.file_management_helper import FileManagerHelper
 from unstract.sdk.file_storage import FileStorage
 from unstract.sdk.file_storage.constants import StorageType
 from unstract.sdk.file_storage.env_helper import EnvHelper
 from utils.file_storage.constants import FileStorageConstants, FileStorageKeys
+from utils.file_storage.helpers.file_stream_helper import FileStreamHelper
 
 from unstract.core.utilities import UnstractUtils
 
@@ -82,15 +84,15 @@ class PromptStudioFileHelper:
         )
 
     @staticmethod
-    def fetch_file_contents(
-        org_id: str,
-        user_id: str,
-        tool_id: str,
-        file_name: str,
-        allowed_content_types: list[str],
-    ) -> dict[str, Any]:
-        """Method to fetch file contents from the remote location.
-        The path is constructed in runtime based on the args"""
+    def get_file_path(
+        org_id: str, user_id: str, tool_id: str, file_name: str
+    ) -> tuple[FileStorage, str, str]:
+        """Resolves the permanent storage path of a prompt studio file.
+
+        Returns:
+            tuple[FileStorage, str, str]: Storage of the file, its path and
+                its legacy path for lazy copy
+        """
         fs_instance = EnvHelper.get_storage(
             storage_type=StorageType.PERMANENT,
             env_name=FileStorageKeys.PERMANENT_REMOTE_STORAGE,
@@ -126,6 +128,60 @@ class PromptStudioFileHelper:
             )
         file_path = str(Path(file_system_path) / file_name)
         legacy_file_path = str(Path(legacy_file_system_path) / file_name)
+        return fs_instance, file_path, legacy_file_path
+
+    @staticmethod
+    def stream_file_contents(
+        request: HttpRequest,
+        org_id: str,
+        user_id: str,
+        tool_id: str,
+        file_name: str,
+        allowed_content_types: list[str],
+    ) -> HttpResponse:
+        """Method to serve a file from the remote location as is, with
+        support for range requests and conditional GETs.
+        The path is constructed in runtime based on the args"""
+        fs_instance, file_path, legacy_file_path = PromptStudioFileHelper.get_file_path(
+            org_id=org_id, user_id=user_id, tool_id=tool_id, file_name=file_name
+        )
+        try:
+            file_info = FileStreamHelper.get_file_info(fs=fs_instance, path=file_path)
+        except FileNotFoundError:
+            # Copies the file from its legacy path, raising if not there either
+            fs_instance.mime_type(path=file_path, legacy_storage_path=legacy_file_path)
+            file_info = FileStreamHelper.get_file_info(fs=fs_instance, path=file_path)
+        # Detected from the file's contents unless recorded by the storage
+        file_content_type = file_info.content_type or fs_instance.mime_type(
+            path=file_path, legacy_storage_path=legacy_file_path
+        )
+        if file_content_type not in (
+            "application/pdf",
+            "text/plain",
+            *allowed_content_types,
+        ):
+            raise InvalidFileType(f"File type '{file_content_type}' is not allowed.")
+        return FileStreamHelper.stream(
+            request=request,
+            fs=fs_instance,
+            path=file_path,
+            content_type=file_content_type,
+            file_info=file_info,
+        )
+
+    @staticmethod
+    def fetch_file_contents(
+        org_id: str,
+        user_id: str,
+        tool_id: str,
+        file_name: str,
+        allowed_content_types: list[str],
+    ) -> dict[str, Any]:
+        """Method to fetch file contents from the remote location.
+        The path is constructed in runtime based on the args"""
+        fs_instance, file_path, legacy_file_path = PromptStudioFileHelper.get_file_path(
+            org_id=org_id, user_id=user_id, tool_id=tool_id, file_name=file_name
+        )
         file_content_type = fs_instance.mime_type(
             path=file_path, legacy_storage_path=legacy_file_path
         )
@@ -29,7 +29,8 @@ class StateStore:
 
     @classmethod
     def _del_thread_local(cls, key: str) -> None:
-        delattr(cls.thread_local, key)
+        if hasattr(cls.thread_local, key):
+            delattr(cls.thread_local, key)
 
     @classmethod
     def get(cls, key: str) -> Any:
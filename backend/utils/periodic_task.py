@@ -0,0 +1,66 @@
+import logging
+import sys
+
+from django.db import IntegrityError
+from django.db.utils import ProgrammingError
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+def create_periodic_task_if_not_exists(
+    name: str, task: str, interval: int, queue: str, enabled: bool = True
+) -> None:
+    """Schedules a Celery task to run periodically, bringing an existing
+    schedule of the same name up to date.
+
+    Meant to be called when an app is ready, so failures are logged rather
+    than raised.
+
+    Args:
+        name (str): Name of the periodic task
+        task (str): Name of the Celery task to run
+        interval (int): Interval between runs, in seconds
+        queue (str): Celery queue to run the task on
+        enabled (bool): Whether the task is scheduled to run. Defaults to True.
+    """
+    try:
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=interval,
+            period=IntervalSchedule.SECONDS,
+        )
+    except ProgrammingError as error:
+        logger.warning(
+            f"ProgrammingError occurred while creating {name} scheduler. "
+            "If you are currently running migrations for new environment, "
+            "you can ignore this warning"
+        )
+        if all(arg not in sys.argv for arg in ("migrate", "makemigrations")):
+            logger.warning(f"ProgrammingError details: {error}")
+        return
+    except IntervalSchedule.MultipleObjectsReturned as error:
+        logger.error(f"Error occurred while getting interval schedule: {error}")
+        schedule = IntervalSchedule.objects.filter(
+            every=interval,
+            period=IntervalSchedule.SECONDS,
+        ).first()
+    try:
+        periodic_task, created = PeriodicTask.objects.get_or_create(
+            name=name,
+            task=task,
+            defaults={"interval": schedule, "queue": queue, "enabled": enabled},
+        )
+        if created:
+            logger.info(f"Scheduler {name} created successfully.")
+        elif (
+            periodic_task.interval != schedule
+            or periodic_task.queue != queue
+            or periodic_task.enabled != enabled
+        ):
+            periodic_task.interval = schedule
+            periodic_task.queue = queue
+            periodic_task.enabled = enabled
+            periodic_task.save()
+            logger.info(f"Scheduler {name} updated successfully.")
+    except IntegrityError as error:
+        logger.error(f"Error occurred while creating {name} scheduler: {error}")
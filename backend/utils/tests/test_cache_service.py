@@ -0,0 +1,152 @@
+import fnmatch
+from contextlib import ExitStack
+from typing import Any, Optional
+from unittest import mock
+
+import pytest  # type: ignore
+from django.test import override_settings
+from utils.cache_service import CacheService
+
+SCOPE = "org:cache:workflow"
+REGISTRY_KEY = f"{CacheService.KEY_REGISTRY_PREFIX}{SCOPE}"
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def command(*args: Any) -> None:
+            self.commands.append((name, args))
+
+        return command
+
+    def execute(self) -> list[Any]:
+        return [getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class FakeRedis:
+    """Keeps keys and sets of a `Redis` client in memory, recording the
+    commands clearing them and the expiry set on them."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.expiry: dict[str, Optional[int]] = {}
+        self.unlinks: list[tuple[str, ...]] = []
+        self.scans: list[dict[str, Any]] = []
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self)
+
+    def set(self, key: str, value: Any, timeout: Any = None) -> None:
+        self.data[key] = value
+
+    def scan_iter(self, match: str, count: int) -> list[bytes]:
+        self.scans.append({"match": match, "count": count})
+        keys = [key for key in self.data if fnmatch.fnmatchcase(key, match)]
+        return [key.encode() for key in keys]
+
+    def sscan_iter(self, key: str, match: str, count: int) -> list[bytes]:
+        members = self.data.get(key, set())
+        return [member.encode() for member in members if fnmatch.fnmatch(member, match)]
+
+    def sadd(self, key: str, member: str) -> int:
+        self.data.setdefault(key, set()).add(member)
+        return 1
+
+    def srem(self, key: str, *members: bytes) -> int:
+        for member in members:
+            self.data.get(key, set()).discard(member.decode())
+        return len(members)
+
+    def exists(self, key: bytes) -> int:
+        return int(key.decode() in self.data)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        self.expiry[key] = seconds
+        return True
+
+    def persist(self, key: str) -> bool:
+        self.expiry[key] = None
+        return True
+
+    def rpush(self, key: str, value: str) -> int:
+        self.data.setdefault(key, []).append(value.encode())
+        return len(self.data[key])
+
+    def blpop(self, keys: list[str], timeout: int) -> Optional[tuple[bytes, bytes]]:
+        for key in keys:
+            if self.data.get(key):
+                return key.encode(), self.data[key].pop(0)
+        return None
+
+    def unlink(self, *keys: str) -> int:
+        self.unlinks.append(keys)
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    fake_redis = FakeRedis()
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("utils.cache_service.redis_cache", fake_redis))
+        stack.enter_context(mock.patch("utils.cache_service.cache", fake_redis))
+        stack.enter_context(override_settings(CACHE_SCAN_BATCH_SIZE=2))
+        yield fake_redis
+
+
+@override_settings(CACHE_KEY_REGISTRY_ENABLED=False)
+def test_clears_scanned_keys_in_batches(redis):
+    for key in ("cache:1", "cache:2", "cache:3", "other:1"):
+        redis.set(key, "value")
+
+    CacheService.clear_cache("cache:*", scope=SCOPE)
+
+    assert redis.scans == [{"match": "cache:*", "count": 2}]
+    assert [sorted(batch) for batch in redis.unlinks] == [
+        ["cache:1", "cache:2"],
+        ["cache:3"],
+    ]
+    assert list(redis.data) == ["other:1"]
+
+
+@override_settings(CACHE_KEY_REGISTRY_ENABLED=True)
+def test_registry_expires_with_latest_key(redis):
+    CacheService.set_key("cache:1", "value", expire=60, scope=SCOPE)
+    assert redis.expiry[REGISTRY_KEY] == 60
+
+    CacheService.set_key("cache:2", "value", expire=0, scope=SCOPE)
+    assert redis.expiry[REGISTRY_KEY] is None
+    assert redis.data[REGISTRY_KEY] == {"cache:1", "cache:2"}
+
+
+@override_settings(CACHE_KEY_REGISTRY_ENABLED=True)
+def test_clears_registered_keys_without_scanning(redis):
+    for key in ("cache:1", "cache:2", "cache:3"):
+        CacheService.set_key(key, "value", scope=SCOPE)
+    redis.set("cache:unregistered", "value")
+    # Expired since it was registered
+    redis.data.pop("cache:2")
+
+    assert sorted(CacheService.get_all_keys("cache:*", scope=SCOPE)) == [
+        "cache:1",
+        "cache:3",
+    ]
+    assert redis.data[REGISTRY_KEY] == {"cache:1", "cache:3"}
+
+    CacheService.clear_cache("cache:*", scope=SCOPE)
+
+    assert redis.scans == []
+    assert list(redis.data) == ["cache:unregistered"]
+    assert redis.unlinks[-1] == (REGISTRY_KEY,)
+
+
+def test_pushed_values_popped_in_order(redis):
+    CacheService.rpush("done", "first", expire=30)
+    CacheService.rpush("done", "second")
+
+    assert redis.expiry == {"done": 30}
+    assert CacheService.blpop("done", timeout=1) == "first"
+    assert CacheService.blpop("done", timeout=1) == "second"
+    assert CacheService.blpop("done", timeout=1) is None
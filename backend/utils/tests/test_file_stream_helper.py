@@ -0,0 +1,130 @@
+import os
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import fsspec
+import pytest  # type: ignore
+from django.test import RequestFactory, override_settings
+from utils.file_storage.helpers.file_stream_helper import FileStreamHelper
+
+MODULE = "utils.file_storage.helpers.file_stream_helper"
+CONTENT = bytes(range(256)) * 40
+
+
+class SyncThread:
+    """Runs the target of a `Thread` on start, for background fills to be
+    done once a response is returned."""
+
+    def __init__(self, target: Any, **kwargs: Any) -> None:
+        self.target = target
+
+    def start(self) -> None:
+        self.target()
+
+
+class TestFileStreamHelper:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path) -> Any:
+        self.path = str(tmp_path / "document.pdf")
+        Path(self.path).write_bytes(CONTENT)
+        self.cache_dir = tmp_path / "cache"
+        fs = fsspec.filesystem("file")
+        self.read = mock.Mock(side_effect=self.read_file)
+        self.fs = SimpleNamespace(fs=fs, read=self.read)
+        with ExitStack() as stack:
+            stack.enter_context(
+                override_settings(
+                    FILE_STREAM_CACHE_TTL=60,
+                    FILE_STREAM_CACHE_DIR=str(self.cache_dir),
+                    FILE_STREAM_CACHE_EVICTION_INTERVAL=30,
+                )
+            )
+            stack.enter_context(
+                mock.patch.object(
+                    FileStreamHelper, "_is_remote_storage", return_value=True
+                )
+            )
+            stack.enter_context(mock.patch.object(FileStreamHelper, "CHUNK_SIZE", 1000))
+            stack.enter_context(mock.patch.object(FileStreamHelper, "_evicted_at", 0.0))
+            stack.enter_context(
+                mock.patch(f"{MODULE}.threading", SimpleNamespace(Thread=SyncThread))
+            )
+            yield
+
+    def read_file(self, path: str, mode: str, seek_position: int, length: int) -> bytes:
+        with open(path, "rb") as file:
+            file.seek(seek_position)
+            return file.read(length)
+
+    def stream(self, **headers: str) -> Any:
+        request = RequestFactory().get("/", **headers)
+        return FileStreamHelper.stream(
+            request=request, fs=self.fs, path=self.path, content_type="application/pdf"
+        )
+
+    def cached_files(self) -> list[str]:
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_range_is_served_and_cached(self) -> None:
+        response = self.stream(HTTP_RANGE="bytes=100-2599")
+
+        assert response.status_code == 206
+        assert response["Content-Range"] == f"bytes 100-2599/{len(CONTENT)}"
+        assert response["Content-Length"] == "2500"
+        assert b"".join(response.streaming_content) == CONTENT[100:2600]
+        assert len(self.cached_files()) == 1
+
+        self.read.reset_mock()
+        response = self.stream(HTTP_RANGE="bytes=-10")
+        assert b"".join(response.streaming_content) == CONTENT[-10:]
+        self.read.assert_not_called()
+
+    def test_unsatisfiable_range(self) -> None:
+        response = self.stream(HTTP_RANGE=f"bytes={len(CONTENT)}-")
+
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+    def test_current_copy_is_not_modified(self) -> None:
+        etag = self.stream()["ETag"]
+
+        response = self.stream(HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_file_is_cached_by_a_single_request(self) -> None:
+        etag = self.stream()["ETag"]
+        cache_path = FileStreamHelper._get_cache_path(path=self.path, etag=etag)
+        # Being cached by another request
+        Path(f"{cache_path}.partial").touch()
+
+        response = self.stream(HTTP_RANGE="bytes=0-9")
+        assert b"".join(response.streaming_content) == CONTENT[:10]
+        response = self.stream()
+        assert b"".join(response.streaming_content) == CONTENT
+
+        assert self.cached_files() == [f"{os.path.basename(cache_path)}.partial"]
+
+    def test_expired_files_are_evicted_periodically(self) -> None:
+        self.cache_dir.mkdir()
+        expired = self.cache_dir / "expired"
+        expired.touch()
+        os.utime(expired, (0, 0))
+
+        with mock.patch(f"{MODULE}.time.time", return_value=1000.0):
+            FileStreamHelper._get_cache_path(path=self.path, etag='"1"')
+        assert self.cached_files() == []
+
+        expired.touch()
+        os.utime(expired, (0, 0))
+        with mock.patch(f"{MODULE}.time.time", return_value=1020.0):
+            FileStreamHelper._get_cache_path(path=self.path, etag='"1"')
+        assert self.cached_files() == ["expired"]
+
+        with mock.patch(f"{MODULE}.time.time", return_value=1030.0):
+            FileStreamHelper._get_cache_path(path=self.path, etag='"1"')
+        assert self.cached_files() == []
@@ -0,0 +1,81 @@
+from unittest import mock
+
+import pytest  # type: ignore
+from django.db.utils import ProgrammingError
+from utils.periodic_task import create_periodic_task_if_not_exists
+
+MODULE = "utils.periodic_task"
+
+
+@pytest.fixture
+def schedules():
+    with mock.patch(f"{MODULE}.IntervalSchedule") as interval_schedule:
+        interval_schedule.MultipleObjectsReturned = type(
+            "MultipleObjectsReturned", (Exception,), {}
+        )
+        interval_schedule.objects.get_or_create.side_effect = lambda every, period: (
+            f"every {every}s",
+            False,
+        )
+        yield interval_schedule
+
+
+@pytest.fixture
+def periodic_tasks():
+    with mock.patch(f"{MODULE}.PeriodicTask") as periodic_task:
+        yield periodic_task.objects
+
+
+def schedule(interval: int = 60, queue: str = "queue", enabled: bool = True) -> None:
+    create_periodic_task_if_not_exists(
+        name="cleanup",
+        task="run_cleanup",
+        interval=interval,
+        queue=queue,
+        enabled=enabled,
+    )
+
+
+def test_creates_periodic_task(schedules, periodic_tasks):
+    periodic_tasks.get_or_create.return_value = (mock.MagicMock(), True)
+
+    schedule()
+
+    periodic_tasks.get_or_create.assert_called_once_with(
+        name="cleanup",
+        task="run_cleanup",
+        defaults={"interval": "every 60s", "queue": "queue", "enabled": True},
+    )
+
+
+def test_existing_task_left_alone_when_unchanged(schedules, periodic_tasks):
+    existing = mock.MagicMock(interval="every 60s", queue="queue", enabled=True)
+    periodic_tasks.get_or_create.return_value = (existing, False)
+
+    schedule()
+
+    existing.save.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"interval": 30}, {"queue": "other_queue"}, {"enabled": False}],
+)
+def test_existing_task_updated(schedules, periodic_tasks, changes):
+    existing = mock.MagicMock(interval="every 60s", queue="queue", enabled=True)
+    periodic_tasks.get_or_create.return_value = (existing, False)
+
+    schedule(**changes)
+
+    existing.save.assert_called_once_with()
+    assert existing.interval == f"every {changes.get('interval', 60)}s"
+    assert existing.queue == changes.get("queue", "queue")
+    assert existing.enabled == changes.get("enabled", True)
+
+
+def test_missing_tables_skip_scheduling(schedules, periodic_tasks):
+    schedules.objects.get_or_create.side_effect = ProgrammingError("No table")
+
+    schedule()
+
+    periodic_tasks.get_or_create.assert_not_called()
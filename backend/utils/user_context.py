@@ -1,12 +1,20 @@
+import threading
+import time
 from typing import Optional
 
 from account_v2.models import Organization
+from django.conf import settings
 from django.db.utils import ProgrammingError
 from utils.constants import Account
 from utils.local_context import StateStore
 
 
 class UserContext:
+    # Organizations shared across requests of the process, keyed by
+    # organization_id. Used only if ORGANIZATION_CACHE_TTL is set.
+    _organization_cache: dict[str, tuple[Organization, float]] = {}
+    _organization_cache_lock = threading.Lock()
+
     @staticmethod
     def get_organization_identifier() -> str:
         organization_id = StateStore.get(Account.ORGANIZATION_ID)
@@ -15,19 +23,65 @@ class UserContext:
     @staticmethod
     def set_organization_identifier(organization_identifier: str) -> None:
         StateStore.set(Account.ORGANIZATION_ID, organization_identifier)
+        StateStore.clear(Account.ORGANIZATION)
+
+    @staticmethod
+    def clear_organization() -> None:
+        """Clears the organization of the current request or task."""
+        StateStore.clear(Account.ORGANIZATION_ID)
+        StateStore.clear(Account.ORGANIZATION)
 
     @staticmethod
     def get_organization() -> Optional[Organization]:
+        """Returns the organization of the current request or task.
+
+        The organization is resolved once and kept in the `StateStore` next
+        to its identifier, so that tenant filtering adds no queries after the
+        first. It's only reused while the identifier matches.
+        """
         organization_id = StateStore.get(Account.ORGANIZATION_ID)
-        try:
-            organization: Organization = Organization.objects.get(
-                organization_id=organization_id
-            )
-        except Organization.DoesNotExist:
-            return None
-        except ProgrammingError:
-            # Handle cases where the database schema might not be fully set up,
-            # especially during the execution of management commands
-            # other than runserver
+        if not organization_id:
             return None
+        organization: Optional[Organization] = StateStore.get(Account.ORGANIZATION)
+        if organization and organization.organization_id == organization_id:
+            return organization
+
+        organization = UserContext._get_cached_organization(organization_id)
+        if not organization:
+            try:
+                organization = Organization.objects.get(organization_id=organization_id)
+            except Organization.DoesNotExist:
+                return None
+            except ProgrammingError:
+                # Handle cases where the database schema might not be fully set up,
+                # especially during the execution of management commands
+                # other than runserver
+                return None
+            UserContext._cache_organization(organization)
+        StateStore.set(Account.ORGANIZATION, organization)
         return organization
+
+    @classmethod
+    def _get_cached_organization(cls, organization_id: str) -> Optional[Organization]:
+        if not settings.ORGANIZATION_CACHE_TTL:
+            return None
+        with cls._organization_cache_lock:
+            cached = cls._organization_cache.get(organization_id)
+            if not cached:
+                return None
+            organization, expires_at = cached
+            if expires_at <= time.monotonic():
+                del cls._organization_cache[organization_id]
+                return None
+            return organization
+
+    @classmethod
+    def _cache_organization(cls, organization: Organization) -> None:
+        if not settings.ORGANIZATION_CACHE_TTL:
+            return
+        expires_at = time.monotonic() + settings.ORGANIZATION_CACHE_TTL
+        with cls._organization_cache_lock:
+            cls._organization_cache[organization.organization_id] = (
+                organization,
+                expires_at,
+            )
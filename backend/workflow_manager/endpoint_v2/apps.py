@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class WorkflowEndpointConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "workflow_manager.endpoint_v2"
+
+    def ready(self):
+        from django.conf import settings
+        from utils.periodic_task import create_periodic_task_if_not_exists
+        from workflow_manager.endpoint_v2.constants import QueueFileCleanup
+
+        create_periodic_task_if_not_exists(
+            name=QueueFileCleanup.PERIODIC_TASK_NAME,
+            task=QueueFileCleanup.TASK,
+            interval=settings.REVIEW_QUEUE_FILE_CLEANUP_INTERVAL,
+            queue=QueueFileCleanup.CELERY_QUEUE_NAME,
+        )
@@ -0,0 +1,149 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Optional
+
+from workflow_manager.endpoint_v2.database_utils import DatabaseUtils
+from workflow_manager.file_execution.models import WorkflowFileExecution
+from workflow_manager.workflow_v2.enums import ExecutionStatus
+from workflow_manager.workflow_v2.file_history_helper import FileHistoryHelper
+
+from unstract.connectors.databases.unstract_db import UnstractDB
+
+logger = logging.getLogger(__name__)
+
+
+class BulkDBWriter:
+    """Writes the rows of a database destination in batches.
+
+    Rows are accumulated per table and written with the connector's
+    `bulk_insert` once `DB_DESTINATION_BULK_BATCH_SIZE` of them are pending
+    or at the end of the execution, see `DestinationConnector.flush_bulk_rows`.
+    Tables are created and their column types looked up once per execution.
+
+    The file history of a file is only created once its rows are written
+    to every table, so that files whose rows fail to be written are
+    processed again by later runs, and their file executions are marked as
+    failed. Tables are written independently, a failed table only fails
+    the files with rows in it.
+    """
+
+    def __init__(self, db_class: UnstractDB, batch_size: int) -> None:
+        self.db_class = db_class
+        self.batch_size = batch_size
+        self.error: Optional[str] = None
+        self._engine: Any = None
+        self._lock = threading.Lock()
+        self._column_types: dict[str, dict[str, str]] = {}
+        # Rows pending per table, with the file execution of each row
+        self._rows: dict[str, list[tuple[str, dict[str, Any]]]] = defaultdict(list)
+        # File histories to create once the rows of the files are written
+        self._files: dict[str, Optional[dict[str, Any]]] = {}
+        # Files whose rows failed to be written
+        self._failed_files: set[str] = set()
+
+    @property
+    def engine(self) -> Any:
+        if self._engine is None:
+            self._engine = self.db_class.get_engine()
+        return self._engine
+
+    def add_row(
+        self, table_name: str, values: dict[str, Any], file_execution_id: str
+    ) -> None:
+        """Holds back a file's row until the next flush.
+
+        Args:
+            table_name (str): Table to write to
+            values (dict[str, Any]): Columns and values of the row
+            file_execution_id (str): File execution the row is written for
+        """
+        with self._lock:
+            if table_name not in self._column_types:
+                DatabaseUtils.create_table_if_not_exists(
+                    db_class=self.db_class,
+                    engine=self.engine,
+                    table_name=table_name,
+                    database_entry=values,
+                )
+                self._column_types[table_name] = DatabaseUtils.get_column_types(
+                    conn_cls=self.db_class, table_name=table_name
+                )
+            row = DatabaseUtils.get_sql_values_for_query(
+                values=values,
+                column_types=self._column_types[table_name],
+                cls_name=self.db_class.__class__.__name__,
+            )
+            self._rows[table_name].append((str(file_execution_id), row))
+            self._files.setdefault(str(file_execution_id), None)
+
+    def add_file_history(self, file_execution_id: str, **file_history: Any) -> bool:
+        """Creates a file history once the file's rows are written, with the
+        arguments of `FileHistoryHelper.create_file_history`.
+
+        Returns:
+            bool: False if the file has no rows held back or failed, its
+                history is to be created right away
+        """
+        file_execution_id = str(file_execution_id)
+        with self._lock:
+            if file_execution_id in self._failed_files:
+                return True
+            if file_execution_id not in self._files:
+                return False
+            self._files[file_execution_id] = file_history
+            return True
+
+    def has_failed(self, file_execution_id: str) -> bool:
+        """Whether rows of the file failed to be written."""
+        with self._lock:
+            return str(file_execution_id) in self._failed_files
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return sum(len(rows) for rows in self._rows.values()) >= self.batch_size
+
+    def flush(self) -> int:
+        """Writes the rows held back.
+
+        Returns:
+            int: Number of files whose rows could not be written
+        """
+        with self._lock:
+            rows, self._rows = self._rows, defaultdict(list)
+            files, self._files = self._files, {}
+        if not rows:
+            return 0
+        failed_files: set[str] = set()
+        errors: list[str] = []
+        for table_name, table_rows in rows.items():
+            try:
+                self.db_class.bulk_insert(
+                    engine=self.engine,
+                    table_name=table_name,
+                    rows=[row for _, row in table_rows],
+                )
+                logger.info(f"Wrote {len(table_rows)} rows to table {table_name}")
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                table_files = {file_execution_id for file_execution_id, _ in table_rows}
+                failed_files |= table_files
+                errors.append(
+                    f"Error writing the rows of {len(table_files)} files to "
+                    f"table {table_name}. {detail}"
+                )
+                logger.error(errors[-1], exc_info=True)
+        if failed_files:
+            self.error = " ".join(errors)
+            with self._lock:
+                self._failed_files |= failed_files
+            for workflow_file_execution in WorkflowFileExecution.objects.filter(
+                id__in=list(failed_files)
+            ):
+                workflow_file_execution.update_status(
+                    status=ExecutionStatus.ERROR, execution_error=self.error
+                )
+        for file_execution_id, file_history in files.items():
+            if file_history and file_execution_id not in failed_files:
+                FileHistoryHelper.create_file_history(**file_history)
+        return len(failed_files)
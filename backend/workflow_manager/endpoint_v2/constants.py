@@ -43,6 +43,7 @@ class SourceKey:
     PROCESS_SUB_DIRECTORIES = "processSubDirectories"
     MAX_FILES = "maxFiles"
     FOLDERS = "folders"
+    INCREMENTAL_LISTING = "incrementalListing"
 
 
 class DestinationKey:
@@ -110,3 +111,20 @@ class ApiDeploymentResultStatus:
 class QueueResultStatus:
     SUCCESS = "Success"
     FAILED = "Failed"
+
+
+class QueuePayloadMode:
+    """How the input file is carried by review queue messages."""
+
+    # Base64 encoded file content in the message
+    INLINE = "inline"
+    # File kept in permanent storage, referenced by the message
+    REFERENCE = "reference"
+
+
+class QueueFileCleanup:
+    """Periodic deletion of expired input files of review queue messages."""
+
+    TASK = "delete_expired_review_queue_files"
+    PERIODIC_TASK_NAME = "review_queue_file_cleanup"
+    CELERY_QUEUE_NAME = "celery_periodic_logs"
@@ -3,19 +3,24 @@ import base64
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, Union
 
 from connector_v2.models import ConnectorInstance
+from django.conf import settings
 from plugins.workflow_manager.workflow_v2.utils import WorkflowUtil
 from rest_framework.exceptions import APIException
 from unstract.sdk.constants import ToolExecKey
 from unstract.sdk.tool.mime_types import EXT_MIME_MAP
 from unstract.workflow_execution.constants import ToolOutputType
+from unstract.workflow_execution.enums import LogLevel
 from utils.user_context import UserContext
 from workflow_manager.endpoint_v2.base_connector import BaseConnector
+from workflow_manager.endpoint_v2.bulk_db_writer import BulkDBWriter
 from workflow_manager.endpoint_v2.constants import (
     ApiDeploymentResultStatus,
     DestinationKey,
+    QueuePayloadMode,
     QueueResultStatus,
     WorkflowFileType,
 )
@@ -29,7 +34,11 @@ from workflow_manager.endpoint_v2.exceptions import (
     ToolOutputTypeMismatch,
 )
 from workflow_manager.endpoint_v2.models import WorkflowEndpoint
-from workflow_manager.endpoint_v2.queue_utils import QueueResult, QueueUtils
+from workflow_manager.endpoint_v2.queue_utils import (
+    QueueFileStore,
+    QueueResult,
+    QueueUtils,
+)
 from workflow_manager.workflow_v2.enums import ExecutionStatus
 from workflow_manager.workflow_v2.execution import WorkflowExecutionServiceHelper
 from workflow_manager.workflow_v2.file_history_helper import FileHistoryHelper
@@ -74,6 +83,7 @@ class DestinationConnector(BaseConnector):
         self.api_results: list[dict[str, Any]] = []
         self.queue_results: list[dict[str, Any]] = []
         self.execution_service = execution_service
+        self.bulk_writer = self._get_bulk_writer()
 
     def _get_endpoint_for_workflow(
         self,
@@ -191,7 +201,10 @@ class DestinationConnector(BaseConnector):
                     file_execution_id,
                 )
             else:
-                self.insert_into_db(input_file_path=input_file_path)
+                self.insert_into_db(
+                    input_file_path=input_file_path,
+                    file_execution_id=file_execution_id,
+                )
         elif connection_type == WorkflowEndpoint.ConnectionType.API:
             result = self.get_result(file_history)
             exec_metadata = self.get_metadata(file_history)
@@ -211,7 +224,7 @@ class DestinationConnector(BaseConnector):
             )
 
         if use_file_history and not file_history:
-            FileHistoryHelper.create_file_history(
+            file_history_data = dict(
                 cache_key=file_hash.file_hash,
                 workflow=workflow,
                 status=ExecutionStatus.COMPLETED,
@@ -219,9 +232,63 @@ class DestinationConnector(BaseConnector):
                 metadata=metadata,
                 file_name=file_name,
             )
+            # Recorded by the bulk writer once the file's rows are written
+            if not (
+                self.bulk_writer
+                and self.bulk_writer.add_file_history(
+                    file_execution_id, **file_history_data
+                )
+            ):
+                FileHistoryHelper.create_file_history(**file_history_data)
+
+    def _get_bulk_writer(self) -> Optional[BulkDBWriter]:
+        """Writer of the rows in batches, if enabled with
+        `DB_DESTINATION_BULK_WRITE` and supported by the database."""
+        if (
+            not settings.DB_DESTINATION_BULK_WRITE
+            or self.endpoint.connection_type != WorkflowEndpoint.ConnectionType.DATABASE
+            or not self.endpoint.connector_instance
+        ):
+            return None
+        connector_instance: ConnectorInstance = self.endpoint.connector_instance
+        db_class = DatabaseUtils.get_db_class(
+            connector_id=connector_instance.connector_id,
+            connector_settings=connector_instance.metadata,
+        )
+        if not db_class.can_bulk_insert():
+            return None
+        return BulkDBWriter(
+            db_class=db_class, batch_size=settings.DB_DESTINATION_BULK_BATCH_SIZE
+        )
+
+    def flush_bulk_rows(self, force: bool = True) -> int:
+        """Writes the rows held back by the bulk writer, once a batch is full
+        unless forced.
+
+        Args:
+            force (bool): Whether to write rows of an incomplete batch
+
+        Returns:
+            int: Number of files whose rows could not be written
+        """
+        if not self.bulk_writer:
+            return 0
+        if not force and not self.bulk_writer.is_full():
+            return 0
+        failed_files = self.bulk_writer.flush()
+        if failed_files and self.execution_service:
+            self.execution_service.publish_log(
+                message=self.bulk_writer.error, level=LogLevel.ERROR
+            )
+        return failed_files
 
     def copy_output_to_output_directory(self) -> None:
-        """Copy output to the destination directory."""
+        """Copy output to the destination directory.
+
+        Directories are created first, files are then uploaded by up to
+        `DESTINATION_UPLOAD_MAX_WORKERS` threads if the connector supports
+        concurrent uploads.
+        """
         connector: ConnectorInstance = self.endpoint.connector_instance
         connector_settings: dict[str, Any] = connector.connector_metadata
         destination_configurations: dict[str, Any] = self.endpoint.configuration
@@ -249,6 +316,7 @@ class DestinationConnector(BaseConnector):
             fs = file_system.get_file_storage()
             dir_path = fs.walk(str(destination_volume_path))
 
+            uploads: list[tuple[str, str]] = []
             for root, dirs, files in dir_path:
                 for dir_name in dirs:
                     current_dir = os.path.join(
@@ -265,14 +333,47 @@ class DestinationConnector(BaseConnector):
                         os.path.relpath(root, destination_volume_path),
                         file_name,
                     )
-                    destination_fs.upload_file_to_storage(
-                        source_path=source_path, destination_path=destination_path
-                    )
+                    uploads.append((source_path, destination_path))
+            self._upload_files(destination_fs=destination_fs, uploads=uploads)
         except ConnectorError as e:
             raise UnstractFSException(core_err=e) from e
 
-    def insert_into_db(self, input_file_path: str) -> None:
-        """Insert data into the database."""
+    @staticmethod
+    def _upload_files(destination_fs: Any, uploads: list[tuple[str, str]]) -> None:
+        """Upload files to the destination connector.
+
+        Args:
+            destination_fs (UnstractFileSystem): Destination connector
+            uploads (list[tuple[str, str]]): Source and destination paths
+        """
+        max_workers = min(settings.DESTINATION_UPLOAD_MAX_WORKERS, len(uploads))
+        if max_workers <= 1 or not destination_fs.supports_concurrent_upload():
+            for source_path, destination_path in uploads:
+                destination_fs.upload_file_to_storage(
+                    source_path=source_path, destination_path=destination_path
+                )
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    destination_fs.upload_file_to_storage,
+                    source_path=source_path,
+                    destination_path=destination_path,
+                )
+                for source_path, destination_path in uploads
+            ]
+            # Raises the first error after all uploads are done
+            for future in futures:
+                future.result()
+
+    def insert_into_db(
+        self, input_file_path: str, file_execution_id: Optional[str] = None
+    ) -> None:
+        """Insert data into the database.
+
+        With a bulk writer, the row is written with others later on, see
+        `flush_bulk_rows`.
+        """
         connector_instance: ConnectorInstance = self.endpoint.connector_instance
         connector_settings: dict[str, Any] = connector_instance.metadata
         destination_configurations: dict[str, Any] = self.endpoint.configuration
@@ -316,6 +417,13 @@ class DestinationConnector(BaseConnector):
             file_path=input_file_path,
             execution_id=self.execution_id,
         )
+        if self.bulk_writer and file_execution_id:
+            self.bulk_writer.add_row(
+                table_name=table_name,
+                values=values,
+                file_execution_id=file_execution_id,
+            )
+            return
         db_class = DatabaseUtils.get_db_class(
             connector_id=connector_instance.connector_id,
             connector_settings=connector_settings,
@@ -569,7 +677,8 @@ class DestinationConnector(BaseConnector):
         """Handle the Manual Review QUEUE result.
 
         This method is responsible for pushing the input file and result to
-        review queue.
+        review queue. Depending on `REVIEW_QUEUE_PAYLOAD_MODE` the file is
+        either inlined in the message or stored and referenced by it.
         Args:
             file_name (str): The name of the file.
             workflow (Workflow): The workflow object containing
@@ -594,27 +703,34 @@ class DestinationConnector(BaseConnector):
         source_fs = self.get_fsspec(
             settings=connector_settings, connector_id=connector.connector_id
         )
+        q_name = f"review_queue_{self.organization_id}_{workflow.id}"
+        whisper_hash = meta_data.get("whisper-hash") if meta_data else None
+        queue_result = QueueResult(
+            file=file_name,
+            status=QueueResultStatus.SUCCESS,
+            result=result,
+            workflow_id=str(self.workflow_id),
+            whisper_hash=whisper_hash,
+            file_execution_id=file_execution_id,
+        )
         with source_fs.open(input_file_path, "rb") as remote_file:
-            whisper_hash = None
-            file_content = remote_file.read()
-            # Convert file content to a base64 encoded string
-            file_content_base64 = base64.b64encode(file_content).decode("utf-8")
-            q_name = f"review_queue_{self.organization_id}_{workflow.id}"
-            if meta_data:
-                whisper_hash = meta_data.get("whisper-hash")
+            if settings.REVIEW_QUEUE_PAYLOAD_MODE == QueuePayloadMode.REFERENCE:
+                # Queued once in storage, consumers resolve it through
+                # QueueUtils.get_file_content and release it on acknowledgement
+                queue_result.file_reference = QueueFileStore.store(
+                    stream=remote_file,
+                    organization_id=self.organization_id,
+                    workflow_id=str(self.workflow_id),
+                    file_name=file_name,
+                )
             else:
-                whisper_hash = None
-            queue_result = QueueResult(
-                file=file_name,
-                status=QueueResultStatus.SUCCESS,
-                result=result,
-                workflow_id=str(self.workflow_id),
-                file_content=file_content_base64,
-                whisper_hash=whisper_hash,
-                file_execution_id=file_execution_id,
-            ).to_dict()
-            # Convert the result dictionary to a JSON string
-            queue_result_json = json.dumps(queue_result)
-            conn = QueueUtils.get_queue_inst()
-            # Enqueue the JSON string
-            conn.enqueue(queue_name=q_name, message=queue_result_json)
+                # Convert file content to a base64 encoded string
+                file_content = remote_file.read()
+                queue_result.file_content = base64.b64encode(file_content).decode(
+                    "utf-8"
+                )
+        # Convert the result dictionary to a JSON string
+        queue_result_json = json.dumps(queue_result.to_dict())
+        conn = QueueUtils.get_queue_inst()
+        # Enqueue the JSON string
+        conn.enqueue(queue_name=q_name, message=queue_result_json)
@@ -1,9 +1,19 @@
+import base64
+import hashlib
 import logging
+import uuid
 from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
 from enum import Enum
-from typing import Any, Optional
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
 
+from django.conf import settings
+from unstract.sdk.file_storage import FileStorage
+from unstract.sdk.file_storage.constants import StorageType
+from unstract.sdk.file_storage.env_helper import EnvHelper
 from utils.constants import Common
+from utils.file_storage.constants import FileStorageKeys
 from workflow_manager.endpoint_v2.exceptions import UnstractQueueException
 
 from unstract.connectors.queues import connectors as queue_connectors
@@ -30,6 +40,175 @@ class QueueUtils:
         connector_class: UnstractQueue = connector(connector_settings)
         return connector_class
 
+    @staticmethod
+    def get_file_content(message: dict[str, Any]) -> Optional[str]:
+        """Base64 encoded input file of a queue message.
+
+        Referenced files are read from storage only when this is called, so
+        consumers listing or filtering messages don't fetch them.
+        """
+        reference = message.get("file_reference")
+        if not reference:
+            return message.get("file_content")
+        content = QueueFileStore.read(QueueFileReference.from_dict(reference))
+        return base64.b64encode(content).decode("utf-8")
+
+    @staticmethod
+    def acknowledge(message: dict[str, Any]) -> None:
+        """Releases what a queue message holds once it's been processed.
+
+        Referenced files are deleted here, those of messages never
+        acknowledged are deleted once expired by
+        `QueueFileStore.delete_expired`.
+        """
+        reference = message.get("file_reference")
+        if reference:
+            QueueFileStore.delete(QueueFileReference.from_dict(reference))
+
+
+@dataclass
+class QueueFileReference:
+    """Input file of a queue message kept in permanent storage."""
+
+    path: str
+    hash: str
+    size: int
+    expires_at: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "hash": self.hash,
+            "size": self.size,
+            "expires_at": self.expires_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QueueFileReference":
+        return cls(
+            path=data["path"],
+            hash=data["hash"],
+            size=data["size"],
+            expires_at=data.get("expires_at"),
+        )
+
+
+class QueueFileStore:
+    """Stores input files of review queue messages under
+    `REVIEW_QUEUE_FILE_PATH` in permanent storage.
+
+    Each message gets its own copy, in a directory of the day it was
+    stored. It's deleted on acknowledgement of the message, or with the
+    rest of its day once `REVIEW_QUEUE_FILE_TTL_DAYS` days have passed.
+    """
+
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    @staticmethod
+    def get_storage() -> FileStorage:
+        return EnvHelper.get_storage(
+            storage_type=StorageType.PERMANENT,
+            env_name=FileStorageKeys.PERMANENT_REMOTE_STORAGE,
+        )
+
+    @classmethod
+    def store(
+        cls,
+        stream: BinaryIO,
+        organization_id: str,
+        workflow_id: str,
+        file_name: str,
+    ) -> QueueFileReference:
+        """Copies a file to storage in chunks, hashing it on the way.
+
+        Args:
+            stream (BinaryIO): File to store, read till its end
+            organization_id (str): Organization of the message
+            workflow_id (str): Workflow of the message
+            file_name (str): Name of the file
+
+        Returns:
+            QueueFileReference: Reference to the stored copy
+        """
+        stored_on = datetime.now(timezone.utc).date()
+        directory = (
+            Path(settings.REVIEW_QUEUE_FILE_PATH)
+            / stored_on.isoformat()
+            / organization_id
+            / workflow_id
+            / uuid.uuid4().hex
+        )
+        path = str(directory / file_name)
+        file_hash = hashlib.sha256()
+        size = 0
+        fs = cls.get_storage().fs
+        fs.makedirs(str(directory), exist_ok=True)
+        with fs.open(path, "wb") as stored_file:
+            while chunk := stream.read(cls.CHUNK_SIZE):
+                file_hash.update(chunk)
+                size += len(chunk)
+                stored_file.write(chunk)
+        expires_at = datetime.combine(
+            stored_on + timedelta(days=settings.REVIEW_QUEUE_FILE_TTL_DAYS + 1),
+            time.min,
+            tzinfo=timezone.utc,
+        )
+        return QueueFileReference(
+            path=path,
+            hash=file_hash.hexdigest(),
+            size=size,
+            expires_at=expires_at.isoformat(),
+        )
+
+    @classmethod
+    def read(cls, reference: QueueFileReference) -> bytes:
+        """Reads a referenced file.
+
+        Raises:
+            UnstractQueueException: If the file changed since it was queued
+        """
+        content: bytes = cls.get_storage().read(path=reference.path, mode="rb")
+        if hashlib.sha256(content).hexdigest() != reference.hash:
+            raise UnstractQueueException(
+                detail=f"Queued file '{reference.path}' doesn't match its hash"
+            )
+        return content
+
+    @classmethod
+    def delete(cls, reference: QueueFileReference) -> None:
+        fs = cls.get_storage()
+        try:
+            fs.rm(str(Path(reference.path).parent), recursive=True)
+        except FileNotFoundError:
+            logger.info(f"Queued file '{reference.path}' is already deleted")
+
+    @classmethod
+    def delete_expired(cls, today: Optional[date] = None) -> int:
+        """Deletes the files of days older than `REVIEW_QUEUE_FILE_TTL_DAYS`,
+        of messages which were never acknowledged.
+
+        Returns:
+            int: Number of days deleted
+        """
+        today = today or datetime.now(timezone.utc).date()
+        oldest_kept = today - timedelta(days=settings.REVIEW_QUEUE_FILE_TTL_DAYS)
+        fs = cls.get_storage().fs
+        root = settings.REVIEW_QUEUE_FILE_PATH
+        if not fs.exists(root):
+            return 0
+        deleted = 0
+        for day_path in fs.ls(root, detail=False):
+            try:
+                stored_on = date.fromisoformat(Path(day_path).name)
+            except ValueError:
+                continue
+            if stored_on < oldest_kept:
+                fs.rm(day_path, recursive=True)
+                deleted += 1
+        if deleted:
+            logger.info(f"Deleted review queue files of {deleted} expired day(s)")
+        return deleted
+
 
 @dataclass
 class QueueResult:
@@ -37,9 +216,10 @@ class QueueResult:
     status: QueueResultStatus
     result: Any
     workflow_id: str
-    file_content: str
+    file_content: Optional[str] = None
     whisper_hash: Optional[str] = None
     file_execution_id: Optional[str] = None
+    file_reference: Optional[QueueFileReference] = None
 
     def to_dict(self) -> Any:
         return {
@@ -50,4 +230,7 @@ class QueueResult:
             "workflow_id": self.workflow_id,
             "file_content": self.file_content,
             "file_execution_id": self.file_execution_id,
+            "file_reference": (
+                self.file_reference.to_dict() if self.file_reference else None
+            ),
         }
@@ -34,7 +34,12 @@ from workflow_manager.endpoint_v2.exceptions import (
     SourceConnectorNotConfigured,
 )
 from workflow_manager.endpoint_v2.models import WorkflowEndpoint
+from workflow_manager.endpoint_v2.source_listing import (
+    SourceListingCursor,
+    list_files_after,
+)
 from workflow_manager.file_execution.models import WorkflowFileExecution
+from workflow_manager.workflow_v2.enums import ExecutionStatus
 from workflow_manager.workflow_v2.execution import WorkflowExecutionServiceHelper
 from workflow_manager.workflow_v2.file_history_helper import FileHistoryHelper
 from workflow_manager.workflow_v2.models.workflow import Workflow
@@ -89,6 +94,25 @@ class SourceConnector(BaseConnector):
         self.organization_id = organization_id
         self.hash_value_of_file_content: Optional[str] = None
         self.execution_service = execution_service
+        # Cursor of an incremental listing, saved once the run is over
+        self.listing_cursor: Optional[SourceListingCursor] = None
+        self.listed_until: Optional[str] = None
+        self.listed_paths: list[str] = []
+
+    def for_file_execution(self, file_execution_id: str) -> "SourceConnector":
+        """Copy of the connector adding a file to a directory of its own,
+        `<execution_dir>/<file_execution_id>`, to process files of an
+        execution concurrently.
+
+        Args:
+            file_execution_id (str): UUID for a single run of a file
+
+        Returns:
+            SourceConnector: A shallow copy of the connector
+        """
+        source: SourceConnector = super().for_file_execution(file_execution_id)
+        source.hash_value_of_file_content = None
+        return source
 
     def _get_endpoint_for_workflow(
         self,
@@ -305,6 +329,10 @@ class SourceConnector(BaseConnector):
         matched_files: dict[str, FileHash] = {}
         count = 0
         max_depth = int(SourceConstant.MAX_RECURSIVE_DEPTH) if recursive else 1
+        if self._is_incremental_listing():
+            return self._get_matched_files_incrementally(
+                source_fs, input_directory, patterns, max_depth, limit
+            )
 
         for root, dirs, files in source_fs.walk(input_directory, maxdepth=max_depth):
             for file in files:
@@ -329,6 +357,97 @@ class SourceConnector(BaseConnector):
 
         return matched_files, count
 
+    def _is_incremental_listing(self) -> bool:
+        """Incremental listing applies to pipeline runs only, manual runs of
+        a workflow always list everything."""
+        return bool(
+            self.endpoint.configuration.get(SourceKey.INCREMENTAL_LISTING, False)
+            and self.execution_service
+            and self.execution_service.pipeline_id
+        )
+
+    def _get_matched_files_incrementally(
+        self,
+        source_fs: Any,
+        input_directory: str,
+        patterns: list[str],
+        max_depth: int,
+        limit: int,
+    ) -> tuple[dict[str, FileHash], int]:
+        """Get matched files after the pipeline's listing cursor.
+
+        Files are examined in lexicographic order of their paths. The cursor
+        is moved to the last one examined by `save_listing_cursor` once the
+        run is over, so the next run resumes after it. See
+        `SourceListingCursor`.
+        """
+        matched_files: dict[str, FileHash] = {}
+        count = 0
+        listing_cursor = SourceListingCursor(
+            pipeline_id=str(self.execution_service.pipeline_id),
+            input_directory=input_directory,
+        )
+        last_examined: Optional[str] = None
+        listed_until = listing_cursor.cursor
+        # Listed a page at a time, until enough files match or none are left
+        while count < limit:
+            file_paths = list_files_after(
+                source_fs,
+                input_directory,
+                max_depth,
+                cursor=listed_until,
+                limit=limit,
+            )
+            for file_path in file_paths:
+                if count >= limit:
+                    break
+                last_examined = file_path
+                if not self._should_process_file(os.path.basename(file_path), patterns):
+                    continue
+                file_content, file_size = self.get_file_content(
+                    input_file_path=file_path
+                )
+                if self._is_new_file(
+                    file_path=file_path,
+                    file_content=file_content,
+                    workflow=self.endpoint.workflow,
+                ):
+                    matched_files[file_path] = self._create_file_hash(
+                        file_path=file_path,
+                        file_content=file_content,
+                        file_size=file_size,
+                    )
+                    count += 1
+            if len(file_paths) < limit:
+                break
+            listed_until = file_paths[-1]
+        self.listing_cursor = listing_cursor
+        self.listed_until = last_examined
+        self.listed_paths = list(matched_files)
+        return matched_files, count
+
+    def save_listing_cursor(self) -> None:
+        """Moves the cursor of an incremental listing past the files run.
+
+        Called once the run is over, so that files of a run that failed
+        midway are listed again. The cursor stops before the first file not
+        processed successfully.
+        """
+        if not self.listing_cursor:
+            return
+        completed_paths = set(
+            WorkflowFileExecution.objects.filter(
+                workflow_execution_id=self.execution_id,
+                file_path__in=self.listed_paths,
+                status=ExecutionStatus.COMPLETED,
+            ).values_list("file_path", flat=True)
+        )
+        self.listing_cursor.save_after_run(
+            listed_until=self.listed_until,
+            matched_paths=self.listed_paths,
+            completed_paths=completed_paths,
+        )
+
     def _should_process_file(self, file: str, patterns: list[str]) -> bool:
         """
         Check if the file should be processed based on the patterns.
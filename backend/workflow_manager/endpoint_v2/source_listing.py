@@ -0,0 +1,141 @@
+import heapq
+import logging
+import os
+import time
+from typing import Any, Optional
+
+from django.conf import settings
+from utils.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+
+class SourceListingCursor:
+    """Watermark of a pipeline's incremental listing of a source folder.
+
+    Listing resumes after the lexicographically greatest path examined by
+    the previous run, skipping folders that hold only paths before it. A
+    full rescan from the start is done once the cursor is older than
+    `SOURCE_LISTING_FULL_RESCAN_INTERVAL` seconds, or if it's lost, so
+    that files added or modified before the cursor are picked up too.
+    """
+
+    KEY_PREFIX = "source_listing_cursor"
+
+    def __init__(self, pipeline_id: str, input_directory: str) -> None:
+        self.key = f"{self.KEY_PREFIX}:{pipeline_id}:{input_directory}"
+        self.cursor: Optional[str] = None
+        self.rescanned_at = time.time()
+        state: Optional[dict[str, Any]] = CacheService.get_key(self.key)
+        if not state:
+            logger.info(f"No listing cursor for {self.key}, doing a full rescan")
+            return
+        rescan_interval = settings.SOURCE_LISTING_FULL_RESCAN_INTERVAL
+        if time.time() - state["rescanned_at"] >= rescan_interval:
+            logger.info(f"Listing cursor of {self.key} expired, doing a full rescan")
+            return
+        self.cursor = state["cursor"]
+        self.rescanned_at = state["rescanned_at"]
+
+    def save(self, cursor: Optional[str]) -> None:
+        """Stores the cursor, kept until the next full rescan is due."""
+        if cursor is None:
+            cursor = self.cursor
+        CacheService.set_key(
+            self.key,
+            {"cursor": cursor, "rescanned_at": self.rescanned_at},
+            expire=None,
+        )
+
+    def save_after_run(
+        self,
+        listed_until: Optional[str],
+        matched_paths: list[str],
+        completed_paths: set[str],
+    ) -> None:
+        """Stores the cursor once the run of the files listed after it is
+        over.
+
+        The cursor stops before the first matched file that wasn't processed
+        successfully, so that it's listed again by the next run and retried
+        as file history allows.
+
+        Args:
+            listed_until (Optional[str]): Last path examined by the listing
+            matched_paths (list[str]): Sorted paths of the files run
+            completed_paths (set[str]): Paths of the files run successfully
+        """
+        previous = self.cursor
+        for path in matched_paths:
+            if path not in completed_paths:
+                logger.info(
+                    f"Listing cursor of {self.key} stopped before {path}, "
+                    "which wasn't processed successfully"
+                )
+                self.save(previous)
+                return
+            previous = path
+        self.save(listed_until)
+
+
+class _DescendingPath(str):
+    """Path ordered in reverse, turning `heapq`'s min-heap into a max-heap."""
+
+    def __lt__(self, other: str) -> bool:
+        return str.__gt__(self, other)
+
+
+def list_files_after(
+    source_fs: Any,
+    input_directory: str,
+    max_depth: int,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[str]:
+    """Lists the paths of files after the cursor, in lexicographic order.
+
+    With a limit only the first paths are kept, in a heap bounded by it.
+    Once it's full, subfolders sorting after all kept paths aren't listed.
+
+    Args:
+        source_fs (Any): fsspec file system to list
+        input_directory (str): Folder to list
+        max_depth (int): Depth of folders to list
+        cursor (Optional[str]): Path to list after, everything is listed
+            if None
+        limit (Optional[int]): Maximum number of paths to list, all if None
+
+    Returns:
+        list[str]: Sorted file paths greater than the cursor
+    """
+    if limit is not None and limit <= 0:
+        return []
+    # Greatest of the paths kept on top
+    heap: list[_DescendingPath] = []
+    for root, dirs, files in source_fs.walk(input_directory, maxdepth=max_depth):
+        for file in files:
+            file_path = str(os.path.join(root, file))
+            if cursor is not None and file_path <= cursor:
+                continue
+            if limit is None or len(heap) < limit:
+                heapq.heappush(heap, _DescendingPath(file_path))
+            elif file_path < str(heap[0]):
+                heapq.heapreplace(heap, _DescendingPath(file_path))
+        bound = str(heap[0]) if limit is not None and len(heap) >= limit else None
+        if cursor or bound:
+            # Walked top down, pruned folders aren't listed
+            dirs[:] = [
+                dir
+                for dir in dirs
+                if not _is_outside(os.path.join(root, dir), cursor, bound)
+            ]
+    return sorted(str(path) for path in heap)
+
+
+def _is_outside(dir_path: str, cursor: Optional[str], bound: Optional[str]) -> bool:
+    """Whether every path within the folder sorts before the cursor, or
+    after the bound."""
+    prefix = dir_path.rstrip("/") + "/"
+    if cursor and prefix < cursor and not cursor.startswith(prefix):
+        return True
+    return bool(bound and prefix > bound)
@@ -0,0 +1,8 @@
+from celery import shared_task
+from workflow_manager.endpoint_v2.constants import QueueFileCleanup
+from workflow_manager.endpoint_v2.queue_utils import QueueFileStore
+
+
+@shared_task(name=QueueFileCleanup.TASK)
+def delete_expired_review_queue_files() -> None:
+    QueueFileStore.delete_expired()
@@ -0,0 +1,83 @@
+from contextlib import ExitStack
+from typing import Any
+from unittest import mock
+
+import pytest  # type: ignore
+from workflow_manager.endpoint_v2.bulk_db_writer import BulkDBWriter
+from workflow_manager.workflow_v2.enums import ExecutionStatus
+
+MODULE = "workflow_manager.endpoint_v2.bulk_db_writer"
+
+
+class TestBulkDBWriter:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Any:
+        self.db_class = mock.Mock()
+        self.file_executions: dict[str, mock.Mock] = {}
+        with ExitStack() as stack:
+            database_utils = stack.enter_context(mock.patch(f"{MODULE}.DatabaseUtils"))
+            database_utils.get_sql_values_for_query.side_effect = (
+                lambda values, column_types, cls_name: values
+            )
+            self.file_history_helper = stack.enter_context(
+                mock.patch(f"{MODULE}.FileHistoryHelper")
+            )
+            file_execution_model = stack.enter_context(
+                mock.patch(f"{MODULE}.WorkflowFileExecution")
+            )
+            file_execution_model.objects.filter.side_effect = lambda id__in: [
+                self.file_executions.setdefault(id, mock.Mock(id=id)) for id in id__in
+            ]
+            yield
+
+    def add_file(self, writer: BulkDBWriter, file_execution_id: str, *tables: str):
+        for table in tables:
+            writer.add_row(table, {"file": file_execution_id}, file_execution_id)
+        assert writer.add_file_history(file_execution_id, file_name=file_execution_id)
+
+    def test_file_history_is_created_once_rows_are_written(self) -> None:
+        writer = BulkDBWriter(db_class=self.db_class, batch_size=2)
+        self.add_file(writer, "file-1", "table")
+        assert not writer.is_full()
+        self.add_file(writer, "file-2", "table")
+
+        self.file_history_helper.create_file_history.assert_not_called()
+        assert writer.is_full()
+        assert writer.flush() == 0
+
+        self.db_class.bulk_insert.assert_called_once_with(
+            engine=writer.engine,
+            table_name="table",
+            rows=[{"file": "file-1"}, {"file": "file-2"}],
+        )
+        self.file_history_helper.create_file_history.assert_has_calls(
+            [mock.call(file_name="file-1"), mock.call(file_name="file-2")]
+        )
+        # Without rows held back, the history is created by the caller
+        assert not writer.add_file_history("file-3", file_name="file-3")
+
+    def test_failed_table_fails_only_its_files(self) -> None:
+        def bulk_insert(engine: Any, table_name: str, rows: Any) -> None:
+            if table_name == "failing":
+                raise Exception("Connection lost")
+
+        self.db_class.bulk_insert.side_effect = bulk_insert
+        writer = BulkDBWriter(db_class=self.db_class, batch_size=10)
+        self.add_file(writer, "file-1", "table", "failing")
+        self.add_file(writer, "file-2", "table")
+
+        assert writer.flush() == 1
+
+        assert "table failing" in writer.error
+        assert "Connection lost" in writer.error
+        self.file_executions["file-1"].update_status.assert_called_once_with(
+            status=ExecutionStatus.ERROR, execution_error=writer.error
+        )
+        assert list(self.file_executions) == ["file-1"]
+        self.file_history_helper.create_file_history.assert_called_once_with(
+            file_name="file-2"
+        )
+        assert writer.has_failed("file-1")
+        assert not writer.has_failed("file-2")
+        # A failed file's history is never created
+        assert writer.add_file_history("file-1", file_name="file-1")
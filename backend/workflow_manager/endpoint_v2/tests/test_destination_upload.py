@@ -0,0 +1,97 @@
+import threading
+from typing import Any
+from unittest import mock
+
+import pytest  # type: ignore
+from django.test import override_settings
+from workflow_manager.endpoint_v2.destination import DestinationConnector
+
+UPLOADS = [(f"output/file-{index}.txt", f"/out/file-{index}.txt") for index in range(4)]
+
+
+class FakeDestination:
+    """Destination connector recording the uploads and the threads they
+    ran on.
+
+    With `concurrent` set, each upload waits for another one to start, so
+    uploads only finish when run at the same time.
+    """
+
+    def __init__(self, concurrent: bool = True, fail_on: str = "") -> None:
+        self.concurrent = concurrent
+        self.fail_on = fail_on
+        self.uploads: list[tuple[str, str]] = []
+        self.threads: set[int] = set()
+        self.lock = threading.Lock()
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def supports_concurrent_upload(self) -> bool:
+        return self.concurrent
+
+    def upload_file_to_storage(self, source_path: str, destination_path: str) -> None:
+        with self.lock:
+            self.uploads.append((source_path, destination_path))
+            self.threads.add(threading.get_ident())
+        if self.concurrent:
+            self.barrier.wait()
+        if source_path == self.fail_on:
+            raise ConnectionError(f"Failed to upload {source_path}")
+
+
+def upload(destination: Any, uploads: list[tuple[str, str]] = UPLOADS) -> None:
+    DestinationConnector._upload_files(destination_fs=destination, uploads=uploads)
+
+
+@override_settings(DESTINATION_UPLOAD_MAX_WORKERS=2)
+def test_uploads_concurrently():
+    destination = FakeDestination()
+
+    upload(destination)
+
+    assert sorted(destination.uploads) == UPLOADS
+    assert len(destination.threads) == 2
+    assert threading.get_ident() not in destination.threads
+
+
+@override_settings(DESTINATION_UPLOAD_MAX_WORKERS=2)
+def test_uploads_in_order_without_concurrent_upload_support():
+    destination = FakeDestination(concurrent=False)
+
+    upload(destination)
+
+    assert destination.uploads == UPLOADS
+    assert destination.threads == {threading.get_ident()}
+
+
+@pytest.mark.parametrize(
+    "max_workers, uploads", [(1, UPLOADS), (4, UPLOADS[:1]), (4, [])]
+)
+def test_uploads_in_order_without_concurrency(max_workers, uploads):
+    destination = FakeDestination(concurrent=False)
+    destination.supports_concurrent_upload = mock.MagicMock(return_value=True)
+
+    with override_settings(DESTINATION_UPLOAD_MAX_WORKERS=max_workers):
+        upload(destination, uploads)
+
+    assert destination.uploads == uploads
+    assert destination.threads <= {threading.get_ident()}
+
+
+@override_settings(DESTINATION_UPLOAD_MAX_WORKERS=2)
+def test_failed_upload_raised_once_all_uploads_are_done():
+    destination = FakeDestination(fail_on="output/file-1.txt")
+
+    with pytest.raises(ConnectionError, match="file-1"):
+        upload(destination)
+
+    assert sorted(destination.uploads) == UPLOADS
+
+
+@override_settings(DESTINATION_UPLOAD_MAX_WORKERS=2)
+def test_failed_sequential_upload_stops_uploads():
+    destination = FakeDestination(concurrent=False, fail_on="output/file-1.txt")
+
+    with pytest.raises(ConnectionError, match="file-1"):
+        upload(destination)
+
+    assert destination.uploads == UPLOADS[:2]
@@ -0,0 +1,75 @@
+import base64
+import hashlib
+import io
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import fsspec
+import pytest  # type: ignore
+from django.test import override_settings
+from workflow_manager.endpoint_v2.queue_utils import QueueFileStore, QueueUtils
+
+
+class TestQueueFileStore:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path) -> Any:
+        self.root = str(tmp_path / "review-queue")
+        fs = fsspec.filesystem("file")
+        storage = SimpleNamespace(
+            fs=fs,
+            read=lambda path, mode: fs.cat_file(path),
+            rm=fs.rm,
+        )
+        with ExitStack() as stack:
+            stack.enter_context(
+                override_settings(
+                    REVIEW_QUEUE_FILE_PATH=self.root, REVIEW_QUEUE_FILE_TTL_DAYS=2
+                )
+            )
+            stack.enter_context(
+                mock.patch.object(QueueFileStore, "get_storage", return_value=storage)
+            )
+            yield
+
+    def store(self, content: bytes) -> dict[str, Any]:
+        with mock.patch.object(QueueFileStore, "CHUNK_SIZE", 4):
+            reference = QueueFileStore.store(
+                stream=io.BytesIO(content),
+                organization_id="org",
+                workflow_id="workflow",
+                file_name="a.pdf",
+            )
+        return {"file_reference": reference.to_dict()}
+
+    def test_streams_file_to_a_path_per_message(self) -> None:
+        content = b"content of the file"
+        first = self.store(content)
+        second = self.store(content)
+
+        reference = first["file_reference"]
+        assert reference["hash"] == hashlib.sha256(content).hexdigest()
+        assert reference["size"] == len(content)
+        assert reference["expires_at"]
+        assert reference["path"] != second["file_reference"]["path"]
+        assert base64.b64decode(QueueUtils.get_file_content(first)) == content
+
+        QueueUtils.acknowledge(first)
+        assert not Path(reference["path"]).exists()
+        assert Path(second["file_reference"]["path"]).exists()
+
+    def test_deletes_days_past_expiry(self) -> None:
+        for day in ("2024-01-01", "2024-01-08", "2024-01-10", "not-a-day"):
+            (Path(self.root) / day / "org").mkdir(parents=True)
+
+        deleted = QueueFileStore.delete_expired(today=date(2024, 1, 10))
+
+        assert deleted == 1
+        assert sorted(path.name for path in Path(self.root).iterdir()) == [
+            "2024-01-08",
+            "2024-01-10",
+            "not-a-day",
+        ]
@@ -0,0 +1,219 @@
+import time
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import fsspec
+import pytest  # type: ignore
+from django.test import override_settings
+from workflow_manager.endpoint_v2.source import SourceConnector
+from workflow_manager.endpoint_v2.source_listing import (
+    SourceListingCursor,
+    list_files_after,
+)
+
+FILES = [
+    "2024/01/a.pdf",
+    "2024/01/b.pdf",
+    "2024/02/a.pdf",
+    "2024/10/a.pdf",
+    "2025/01/a.pdf",
+    "root.pdf",
+]
+
+
+class TestListFilesAfter:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path) -> None:
+        for file in FILES:
+            path = tmp_path / file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(file)
+        self.fs = fsspec.filesystem("file")
+        self.root = str(tmp_path)
+
+    def relative(self, paths: list[str]) -> list[str]:
+        return [path[len(self.root) + 1 :] for path in paths]
+
+    def test_lists_everything_without_cursor(self) -> None:
+        paths = list_files_after(self.fs, self.root, max_depth=10)
+        assert self.relative(paths) == sorted(FILES)
+
+    def test_lists_after_cursor(self) -> None:
+        cursor = f"{self.root}/2024/02/a.pdf"
+        paths = list_files_after(self.fs, self.root, max_depth=10, cursor=cursor)
+        assert self.relative(paths) == ["2024/10/a.pdf", "2025/01/a.pdf", "root.pdf"]
+
+    def test_skips_folders_before_cursor(self) -> None:
+        cursor = f"{self.root}/2024/10/a.pdf"
+        with mock.patch.object(self.fs, "ls", wraps=self.fs.ls) as ls:
+            paths = list_files_after(self.fs, self.root, max_depth=10, cursor=cursor)
+        listed = {self.relative([call.args[0]])[0] for call in ls.call_args_list}
+        assert "2024/01" not in listed and "2024/02" not in listed
+        assert self.relative(paths) == ["2025/01/a.pdf", "root.pdf"]
+
+    def test_respects_max_depth(self) -> None:
+        paths = list_files_after(self.fs, self.root, max_depth=1)
+        assert self.relative(paths) == ["root.pdf"]
+
+    def test_limit_keeps_first_paths(self) -> None:
+        cursor = f"{self.root}/2024/01/a.pdf"
+        paths = list_files_after(
+            self.fs, self.root, max_depth=10, cursor=cursor, limit=2
+        )
+        assert self.relative(paths) == ["2024/01/b.pdf", "2024/02/a.pdf"]
+        assert list_files_after(self.fs, self.root, max_depth=10, limit=0) == []
+
+    def test_limit_skips_folders_after_kept_paths(self, tmp_path: Path) -> None:
+        (tmp_path / "2024" / "00.pdf").write_text("00")
+        with mock.patch.object(self.fs, "ls", wraps=self.fs.ls) as ls:
+            paths = list_files_after(self.fs, self.root, max_depth=10, limit=1)
+        listed = {self.relative([call.args[0]])[0] for call in ls.call_args_list}
+        assert "2024/01" not in listed and "2025/01" not in listed
+        assert self.relative(paths) == ["2024/00.pdf"]
+
+    def test_resumes_to_full_listing(self) -> None:
+        cursor = None
+        seen: list[str] = []
+        while True:
+            paths = list_files_after(self.fs, self.root, max_depth=10, cursor=cursor)
+            if not paths:
+                break
+            # Two files per run
+            seen.extend(paths[:2])
+            cursor = paths[:2][-1]
+        assert self.relative(seen) == sorted(FILES)
+
+
+class TestSourceListingCursor:
+    @pytest.fixture(autouse=True)
+    def cache(self) -> Any:
+        store: dict[str, Any] = {}
+        with mock.patch(
+            "workflow_manager.endpoint_v2.source_listing.CacheService"
+        ) as cache_service:
+            cache_service.get_key.side_effect = store.get
+            cache_service.set_key.side_effect = (
+                lambda key, value, expire: store.__setitem__(key, value)
+            )
+            yield store
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_resumes_from_saved_cursor(self) -> None:
+        SourceListingCursor("pipeline", "/input").save("/input/b.pdf")
+        assert SourceListingCursor("pipeline", "/input").cursor == "/input/b.pdf"
+        assert SourceListingCursor("other", "/input").cursor is None
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_keeps_cursor_when_nothing_new(self) -> None:
+        SourceListingCursor("pipeline", "/input").save("/input/b.pdf")
+        SourceListingCursor("pipeline", "/input").save(None)
+        assert SourceListingCursor("pipeline", "/input").cursor == "/input/b.pdf"
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_full_rescan_when_expired(self, cache: dict[str, Any]) -> None:
+        listing_cursor = SourceListingCursor("pipeline", "/input")
+        listing_cursor.rescanned_at = time.time() - 3600
+        listing_cursor.save("/input/b.pdf")
+        assert SourceListingCursor("pipeline", "/input").cursor is None
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_moved_past_completed_run(self) -> None:
+        SourceListingCursor("pipeline", "/input").save("/input/a.pdf")
+        SourceListingCursor("pipeline", "/input").save_after_run(
+            listed_until="/input/d.txt",
+            matched_paths=["/input/b.pdf", "/input/c.pdf"],
+            completed_paths={"/input/b.pdf", "/input/c.pdf"},
+        )
+        assert SourceListingCursor("pipeline", "/input").cursor == "/input/d.txt"
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_stops_before_first_failed_file(self) -> None:
+        SourceListingCursor("pipeline", "/input").save("/input/a.pdf")
+        SourceListingCursor("pipeline", "/input").save_after_run(
+            listed_until="/input/e.pdf",
+            matched_paths=["/input/b.pdf", "/input/c.pdf", "/input/d.pdf"],
+            completed_paths={"/input/b.pdf", "/input/d.pdf"},
+        )
+        assert SourceListingCursor("pipeline", "/input").cursor == "/input/b.pdf"
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_kept_when_first_file_failed(self) -> None:
+        SourceListingCursor("pipeline", "/input").save("/input/a.pdf")
+        SourceListingCursor("pipeline", "/input").save_after_run(
+            listed_until="/input/c.pdf",
+            matched_paths=["/input/b.pdf", "/input/c.pdf"],
+            completed_paths={"/input/c.pdf"},
+        )
+        assert SourceListingCursor("pipeline", "/input").cursor == "/input/a.pdf"
+
+
+class TestIncrementalSourceListing:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path) -> Any:
+        for file in FILES:
+            path = tmp_path / file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(file)
+        self.root = str(tmp_path)
+        self.store: dict[str, Any] = {}
+        self.source = SourceConnector.__new__(SourceConnector)
+        self.source.execution_id = "execution"
+        self.source.endpoint = mock.Mock()
+        self.source.execution_service = mock.Mock(pipeline_id="pipeline")
+        self.source.listing_cursor = None
+        with mock.patch(
+            "workflow_manager.endpoint_v2.source_listing.CacheService"
+        ) as cache_service, mock.patch.object(
+            SourceConnector, "get_file_content", return_value=(b"", 0)
+        ), mock.patch.object(
+            SourceConnector, "_is_new_file", return_value=True
+        ), mock.patch.object(
+            SourceConnector,
+            "_create_file_hash",
+            side_effect=lambda file_path, **kwargs: file_path,
+        ):
+            cache_service.get_key.side_effect = self.store.get
+            cache_service.set_key.side_effect = (
+                lambda key, value, expire: self.store.__setitem__(key, value)
+            )
+            yield
+
+    def list_files(self, limit: int) -> list[str]:
+        matched_files, _ = self.source._get_matched_files_incrementally(
+            fsspec.filesystem("file"), self.root, ["*.pdf"], max_depth=10, limit=limit
+        )
+        return list(matched_files)
+
+    def complete_run(self, completed_paths: list[str]) -> None:
+        with mock.patch(
+            "workflow_manager.endpoint_v2.source.WorkflowFileExecution"
+        ) as file_execution:
+            file_execution.objects.filter.return_value.values_list.return_value = (
+                completed_paths
+            )
+            self.source.save_listing_cursor()
+
+    def cursor(self) -> Any:
+        return SourceListingCursor("pipeline", self.root).cursor
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_cursor_moved_once_run_is_over(self) -> None:
+        paths = self.list_files(limit=2)
+        # A run that fails or crashes after listing doesn't move the cursor
+        assert self.cursor() is None
+        assert self.list_files(limit=2) == paths
+
+        self.complete_run(paths)
+        assert self.cursor() == paths[-1]
+        assert self.list_files(limit=2) == [
+            f"{self.root}/2024/02/a.pdf",
+            f"{self.root}/2024/10/a.pdf",
+        ]
+
+    @override_settings(SOURCE_LISTING_FULL_RESCAN_INTERVAL=3600)
+    def test_failed_files_listed_again(self) -> None:
+        paths = self.list_files(limit=3)
+        self.complete_run([paths[0], paths[2]])
+        assert self.cursor() == paths[0]
+        assert self.list_files(limit=3)[0] == paths[1]
@@ -6,6 +6,8 @@ class WorkflowConfig(AppConfig):
     name = "workflow_manager.workflow_v2"
 
     def ready(self):
+        # Connects the signals invalidating compiled workflow plans
+        import workflow_manager.workflow_v2.plan_cache  # noqa: F401
         from workflow_manager.workflow_v2.execution_log_utils import (
             create_log_consumer_scheduler_if_not_exists,
         )
@@ -14,6 +14,7 @@ from unstract.workflow_execution.dto import ToolInstance as ToolInstanceDataClas
 from unstract.workflow_execution.dto import WorkflowDto
 from unstract.workflow_execution.enums import ExecutionType, LogComponent, LogState
 from unstract.workflow_execution.exceptions import StopExecution
+from unstract.workflow_execution.log_policy import LogPolicy
 from utils.local_context import StateStore
 from utils.user_context import UserContext
 from workflow_manager.file_execution.models import WorkflowFileExecution
@@ -22,6 +23,7 @@ from workflow_manager.workflow_v2.enums import ExecutionStatus
 from workflow_manager.workflow_v2.exceptions import WorkflowExecutionError
 from workflow_manager.workflow_v2.models import Workflow, WorkflowExecution
 from workflow_manager.workflow_v2.models.execution import EXECUTION_ERROR_LENGTH
+from workflow_manager.workflow_v2.plan_cache import WorkflowPlanCache
 
 logger = logging.getLogger(__name__)
 
@@ -38,12 +40,16 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
         mode: tuple[str, str] = WorkflowExecution.Mode.INSTANT,
         workflow_execution: Optional[WorkflowExecution] = None,
         use_file_history: bool = True,
+        pipelined: bool = False,
     ) -> None:
-        tool_instances_as_dto = []
-        for tool_instance in tool_instances:
-            tool_instances_as_dto.append(
+        tool_instances_as_dto = WorkflowPlanCache.get_tool_instances(
+            workflow_id=workflow.id,
+            tool_instances=tool_instances,
+            compile=lambda: [
                 self.convert_tool_instance_model_to_data_class(tool_instance)
-            )
+                for tool_instance in tool_instances
+            ],
+        )
         workflow_as_dto: WorkflowDto = self.convert_workflow_model_to_data_class(
             workflow=workflow
         )
@@ -60,6 +66,9 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
             platform_service_api_key=str(platform_key.key),
             ignore_processed_entities=False,
         )
+        # Logs of pipelines and API deployments are budgeted, the ones of
+        # interactive and single-step runs are published as they come
+        self.log_policy = LogPolicy(verbose=not pipeline_id or single_step)
         if not workflow_execution:
             # Use pipline_id for pipelines / API deployment
             # since session might not be present.
@@ -101,6 +110,10 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
         self.pipeline_id = pipeline_id
         self.execution_id = str(workflow_execution.id)
         self.use_file_history = use_file_history
+        # Files run through the tool steps as a pipeline, each in a directory
+        # of its own, see `PipelinedFileProcessor`
+        self.pipelined = pipelined
+        self.isolate_file_execution = pipelined
         self.tags = workflow_execution.tag_names
         logger.info(
             f"Executing for Pipeline ID: {pipeline_id}, "
@@ -186,6 +199,9 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
             execution.attempts += 1
 
         execution.save()
+        if status in [ExecutionStatus.ERROR, ExecutionStatus.STOPPED]:
+            # Final logs might not be published once the execution fails or stops
+            self.flush_logs()
 
     def has_successful_compilation(self) -> bool:
         return self.compilation_result["success"] is True
@@ -282,6 +298,7 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
         Returns:
             None
         """
+        self.log_policy.set_total_files(total_files)
         self.publish_log(f"Total matched files: {total_files}")
         self.publish_update_log(LogState.BEGIN_WORKFLOW, "1", LogComponent.STATUS_BAR)
         self.publish_update_log(
@@ -306,6 +323,7 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
             f"Total files: {total_files}, "
             f"{successful_files} successfully executed and {failed_files} error(s)"
         )
+        self.flush_logs()
 
     def publish_initial_tool_execution_logs(
         self, current_file_idx: int, total_files: int, file_name: str
@@ -346,6 +364,22 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
         execution_type = ExecutionType.COMPLETE
         if single_step:
             execution_type = ExecutionType.STEP
+        self.start_input_file(
+            file_execution_id=file_execution_id,
+            file_name=file_name,
+            workflow_file_execution=workflow_file_execution,
+        )
+        self.execute(file_execution_id, single_step)
+        self.publish_log(f"Tool executed successfully for '{file_name}'")
+        self._handle_execution_type(execution_type)
+
+    def start_input_file(
+        self,
+        file_execution_id: str,
+        file_name: str,
+        workflow_file_execution: WorkflowFileExecution,
+    ) -> None:
+        """Marks the input file as sent for execution of its tools."""
         self.publish_log(
             f"No entries found in cache, executing the tool for '{file_name}'"
         )
@@ -362,9 +396,35 @@ class WorkflowExecutionServiceHelper(WorkflowExecutionService):
             f"file '{file_name}'"
         )
 
-        self.execute(file_execution_id, single_step)
+    def execute_step(self, step: int) -> None:
+        """Executes a single tool step for the file of a service copied with
+        `for_file_execution`, failing like `execute`.
+
+        Args:
+            step (int): Zero-based step to execute
+        """
+        if self.compilation_result["success"] is False:
+            error_message = (
+                f"Errors while compiling workflow "
+                f"{self.compilation_result['problems'][0]}"
+            )
+            raise WorkflowExecutionError(error_message)
+        try:
+            self.execute_workflow_step(step)
+        except StopExecution:
+            raise
+        except Exception as exception:
+            message = str(exception)[:EXECUTION_ERROR_LENGTH]
+            logger.error(
+                f"Execution {self.execution_id}, run {self.file_execution_id} "
+                f"failed at step {step}: {exception}"
+            )
+            raise WorkflowExecutionError(message) from exception
+
+    def complete_input_file(self, file_name: str) -> None:
+        """Logs the completion of all tool steps of a pipelined file."""
+        self._finalize_execution(ExecutionType.COMPLETE)
         self.publish_log(f"Tool executed successfully for '{file_name}'")
-        self._handle_execution_type(execution_type)
 
     def initiate_tool_execution(
         self,
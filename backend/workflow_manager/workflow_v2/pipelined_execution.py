@@ -0,0 +1,303 @@
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from account_v2.constants import Common
+from django.conf import settings
+from django.db import connections
+from unstract.workflow_execution.enums import LogComponent, LogLevel, LogState
+from unstract.workflow_execution.exceptions import StopExecution
+from utils.local_context import StateStore
+from utils.user_context import UserContext
+from workflow_manager.endpoint_v2.destination import DestinationConnector
+from workflow_manager.endpoint_v2.dto import FileHash
+from workflow_manager.endpoint_v2.source import SourceConnector
+from workflow_manager.file_execution.models import WorkflowFileExecution
+from workflow_manager.workflow_v2.enums import ExecutionStatus
+from workflow_manager.workflow_v2.execution import WorkflowExecutionServiceHelper
+from workflow_manager.workflow_v2.models.workflow import Workflow
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelinedFile:
+    """An input file on its way through the pipeline."""
+
+    number: int
+    file_hash: FileHash
+    workflow_file_execution: WorkflowFileExecution
+    execution_service: WorkflowExecutionServiceHelper
+    source: SourceConnector
+    destination: DestinationConnector
+    file_name: Optional[str] = None
+    # Error of a tool step, the file's output is still handled
+    error: Optional[str] = None
+    # Error before the file reached its tools, no output is handled
+    failure: Optional[str] = None
+    stopped: Optional[str] = None
+
+
+class PipelinedFileProcessor:
+    """Processes the input files of an execution through its tool steps as
+    a pipeline.
+
+    Each tool step is a stage consuming files as the previous stage hands
+    them over, with `WORKFLOW_PIPELINE_STAGE_CONCURRENCY` files in a stage
+    at a time, so that a multi-tool workflow keeps all its tools busy.
+    Outputs are handled by a final stage one file at a time, in the order
+    of the files, so that results are collected and rows written like in
+    the sequential mode. Each file runs in a directory of its own, its
+    steps in order, and a failed step skips the file's remaining steps
+    while its output is handled like in the sequential mode.
+    """
+
+    def __init__(
+        self,
+        workflow: Workflow,
+        source: SourceConnector,
+        destination: DestinationConnector,
+        execution_service: WorkflowExecutionServiceHelper,
+        total_files: int,
+    ) -> None:
+        self.workflow = workflow
+        self.source = source
+        self.destination = destination
+        self.execution_service = execution_service
+        self.total_files = total_files
+        self.total_steps = len(execution_service.tool_sandboxes)
+        self.organization_id = UserContext.get_organization_identifier()
+        self.stop_event = threading.Event()
+        self.done: queue.Queue[PipelinedFile] = queue.Queue()
+        # Files done with their tool steps, held until the files before them
+        # are handed over to the output stage
+        self.output_lock = threading.Lock()
+        self.output_order: list[int] = []
+        self.next_output = 0
+        self.ready_outputs: dict[int, PipelinedFile] = {}
+        concurrency = max(1, settings.WORKFLOW_PIPELINE_STAGE_CONCURRENCY)
+        # A stage per tool step, and a last one for the outputs
+        self.stages = [
+            ThreadPoolExecutor(
+                max_workers=concurrency if stage < self.total_steps else 1,
+                thread_name_prefix=f"pipeline-stage-{stage}",
+            )
+            for stage in range(self.total_steps + 1)
+        ]
+
+    def process(
+        self, files: list[tuple[int, FileHash, WorkflowFileExecution]]
+    ) -> list[PipelinedFile]:
+        """Runs the files through the pipeline.
+
+        Args:
+            files (list[tuple[int, FileHash, WorkflowFileExecution]]): Files
+                with their 1-based number, in processing order
+
+        Returns:
+            list[PipelinedFile]: Processed files, in the given order
+        """
+        self.output_order = [number for number, _, _ in files]
+        try:
+            for number, file_hash, workflow_file_execution in files:
+                file_execution_id = str(workflow_file_execution.id)
+                service = self.execution_service.for_file_execution(file_execution_id)
+                source = self.source.for_file_execution(file_execution_id)
+                source.execution_service = service
+                destination = self.destination.for_file_execution(file_execution_id)
+                destination.execution_service = service
+                pipelined_file = PipelinedFile(
+                    number=number,
+                    file_hash=file_hash,
+                    workflow_file_execution=workflow_file_execution,
+                    execution_service=service,
+                    source=source,
+                    destination=destination,
+                )
+                self._submit(0, pipelined_file)
+            processed = [self.done.get() for _ in files]
+        finally:
+            for stage in self.stages:
+                stage.shutdown(wait=True)
+        return sorted(processed, key=lambda pipelined_file: pipelined_file.number)
+
+    def _submit(self, stage: int, pipelined_file: PipelinedFile) -> None:
+        self.stages[stage].submit(self._run_stage, stage, pipelined_file)
+
+    def _submit_output(self, pipelined_file: PipelinedFile) -> None:
+        """Hands the file over to the output stage once the files before it
+        are, failed and stopped files included, so that the stage's single
+        worker takes them in order."""
+        with self.output_lock:
+            self.ready_outputs[pipelined_file.number] = pipelined_file
+            while (
+                self.next_output < len(self.output_order)
+                and self.output_order[self.next_output] in self.ready_outputs
+            ):
+                ready_file = self.ready_outputs.pop(self.output_order[self.next_output])
+                self.next_output += 1
+                try:
+                    self._submit(self.total_steps, ready_file)
+                except Exception as e:
+                    ready_file.failure = (
+                        f"Error processing file "
+                        f"'{self._get_file_name(ready_file)}'. {e}"
+                    )
+                    logger.error(ready_file.failure, exc_info=True)
+                    self.done.put(ready_file)
+
+    def _run_stage(self, stage: int, pipelined_file: PipelinedFile) -> None:
+        """Runs a file through a stage and hands it over to the next one.
+
+        The file ends up in `done` whatever fails, so that `process` never
+        waits on it forever.
+        """
+        try:
+            UserContext.set_organization_identifier(self.organization_id)
+            StateStore.set(
+                Common.LOG_EVENTS_ID, pipelined_file.execution_service.execution_log_id
+            )
+            self._run_stage_step(stage, pipelined_file)
+        except Exception as e:
+            # Errors reporting the errors of the stage fail the file
+            pipelined_file.failure = pipelined_file.failure or (
+                f"Error processing file '{self._get_file_name(pipelined_file)}'. {e}"
+            )
+            logger.error(pipelined_file.failure, exc_info=True)
+        finally:
+            connections.close_all()
+        if stage < self.total_steps - 1 and not (
+            pipelined_file.failure or pipelined_file.stopped
+        ):
+            try:
+                self._submit(stage + 1, pipelined_file)
+                return
+            except Exception as e:
+                pipelined_file.failure = (
+                    f"Error processing file "
+                    f"'{self._get_file_name(pipelined_file)}'. {e}"
+                )
+                logger.error(pipelined_file.failure, exc_info=True)
+        if stage < self.total_steps:
+            self._submit_output(pipelined_file)
+        else:
+            self.done.put(pipelined_file)
+
+    def _run_stage_step(self, stage: int, pipelined_file: PipelinedFile) -> None:
+        try:
+            if stage == 0:
+                self._prepare(pipelined_file)
+            if stage < self.total_steps:
+                self._execute_step(stage, pipelined_file)
+            else:
+                self._handle_output(pipelined_file)
+        except StopExecution as e:
+            self.stop_event.set()
+            pipelined_file.stopped = str(e)
+        except Exception as e:
+            message = (
+                f"Error processing file '{self._get_file_name(pipelined_file)}'. {e}"
+            )
+            # Errors of the tool stages are handled as output like errors of
+            # the tools, errors handling the output fail the file
+            if stage < self.total_steps:
+                pipelined_file.error = pipelined_file.error or message
+            else:
+                pipelined_file.failure = message
+            logger.error(message, stack_info=True, exc_info=True)
+            pipelined_file.execution_service.publish_log(message, level=LogLevel.ERROR)
+
+    @staticmethod
+    def _get_file_name(pipelined_file: PipelinedFile) -> str:
+        return os.path.basename(pipelined_file.file_hash.file_path)
+
+    def _prepare(self, pipelined_file: PipelinedFile) -> None:
+        """Adds the file to its execution directory, see
+        `WorkflowHelper._process_file`."""
+        file_hash = pipelined_file.file_hash
+        service = pipelined_file.execution_service
+        if self.stop_event.is_set():
+            pipelined_file.stopped = "Execution stopped"
+            return
+        try:
+            pipelined_file.file_name = pipelined_file.source.add_file_to_volume(
+                input_file_path=file_hash.file_path,
+                workflow_file_execution=pipelined_file.workflow_file_execution,
+                tags=service.tags,
+            )
+        except Exception as e:
+            file_name = os.path.basename(file_hash.file_path)
+            pipelined_file.failure = f"Error processing file '{file_name}'. {e}"
+            logger.error(pipelined_file.failure, stack_info=True, exc_info=True)
+            service.publish_log(message=pipelined_file.failure, level=LogLevel.ERROR)
+            return
+        service.initiate_tool_execution(
+            pipelined_file.number,
+            self.total_files,
+            pipelined_file.file_name,
+            single_step=False,
+        )
+        pipelined_file.workflow_file_execution.update_status(
+            status=ExecutionStatus.INITIATED
+        )
+        if not file_hash.is_executed:
+            service.start_input_file(
+                file_execution_id=str(pipelined_file.workflow_file_execution.id),
+                file_name=pipelined_file.file_name,
+                workflow_file_execution=pipelined_file.workflow_file_execution,
+            )
+
+    def _execute_step(self, step: int, pipelined_file: PipelinedFile) -> None:
+        if (
+            pipelined_file.failure
+            or pipelined_file.stopped
+            or pipelined_file.error
+            or pipelined_file.file_hash.is_executed
+        ):
+            return
+        try:
+            pipelined_file.execution_service.execute_step(step)
+        except StopExecution:
+            raise
+        except Exception as e:
+            file_name = self._get_file_name(pipelined_file)
+            pipelined_file.error = f"Error processing file '{file_name}'. {str(e)}"
+            pipelined_file.execution_service.publish_log(
+                pipelined_file.error, level=LogLevel.ERROR
+            )
+
+    def _handle_output(self, pipelined_file: PipelinedFile) -> None:
+        """Handles the output of the file, see `WorkflowHelper._process_file`."""
+        if pipelined_file.failure or pipelined_file.stopped:
+            return
+        service = pipelined_file.execution_service
+        file_name = pipelined_file.file_name
+        file_hash = pipelined_file.file_hash
+        if not pipelined_file.error and not file_hash.is_executed:
+            service.complete_input_file(file_name)
+        service.publish_update_log(
+            LogState.RUNNING,
+            f"Processing output for {file_name}",
+            LogComponent.DESTINATION,
+        )
+        pipelined_file.destination.handle_output(
+            file_name=file_name,
+            file_hash=file_hash,
+            workflow=self.workflow,
+            input_file_path=file_hash.file_path,
+            error=pipelined_file.error,
+            use_file_history=service.use_file_history,
+            file_execution_id=str(pipelined_file.workflow_file_execution.id),
+        )
+        service.publish_update_log(
+            LogState.SUCCESS,
+            f"{file_name}'s output is processed successfully",
+            LogComponent.DESTINATION,
+        )
+        # Rows are written once a batch is full, the rest of them by
+        # `WorkflowHelper.process_input_files`
+        self.destination.flush_bulk_rows(force=False)
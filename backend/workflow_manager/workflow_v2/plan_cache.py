@@ -0,0 +1,113 @@
+import copy
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from prompt_studio.prompt_studio_registry_v2.models import PromptStudioRegistry
+from tool_instance_v2.models import ToolInstance
+from unstract.tool_registry import ToolRegistry
+from unstract.workflow_execution.dto import ToolInstance as ToolInstanceDataClass
+from utils.cache_service import redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompiledPlan:
+    version: tuple[Any, ...]
+    tool_instances: list[ToolInstanceDataClass]
+
+
+class WorkflowPlanCache:
+    """Process wide cache of the compiled tool instances of workflows.
+
+    Compiling looks up each tool instance's tool in the tool registry, or
+    in the exported Prompt Studio tools. Plans are reused while their
+    version is unchanged, which is derived from the tool instances'
+    `modified_at`, the version of the tools JSON files and a generation
+    counter in Redis that's bumped on changes to exported Prompt Studio
+    tools, which may be used by any workflow.
+    """
+
+    GENERATION_KEY = "workflow_plan_generation"
+
+    _lock = threading.Lock()
+    _plans: dict[str, CompiledPlan] = {}
+
+    @classmethod
+    def get_tool_instances(
+        cls,
+        workflow_id: str,
+        tool_instances: list[ToolInstance],
+        compile: Callable[[], list[ToolInstanceDataClass]],
+    ) -> list[ToolInstanceDataClass]:
+        """Compiled tool instances of the workflow, compiled if not cached
+        or outdated.
+
+        Args:
+            workflow_id (str): Workflow the tool instances belong to
+            tool_instances (list[ToolInstance]): Tool instances in step order
+            compile (Callable): Compiles the tool instances
+
+        Returns:
+            list[ToolInstanceDataClass]: Compiled tool instances, a copy
+                that can be modified freely
+        """
+        if not settings.WORKFLOW_PLAN_CACHE_ENABLED:
+            return compile()
+        version = cls._get_version(tool_instances)
+        if version is None:
+            return compile()
+        workflow_id = str(workflow_id)
+        with cls._lock:
+            plan = cls._plans.get(workflow_id)
+        if plan and plan.version == version:
+            logger.debug(f"Using compiled plan of workflow {workflow_id}")
+            return copy.deepcopy(plan.tool_instances)
+        compiled = compile()
+        with cls._lock:
+            cls._plans[workflow_id] = CompiledPlan(
+                version=version, tool_instances=copy.deepcopy(compiled)
+            )
+        return compiled
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Outdates the compiled plans of all processes."""
+        try:
+            redis_cache.incr(cls.GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Unable to invalidate compiled workflow plans: {e}")
+        with cls._lock:
+            cls._plans.clear()
+
+    @classmethod
+    def _get_version(
+        cls, tool_instances: list[ToolInstance]
+    ) -> Optional[tuple[Any, ...]]:
+        """Version of the plan, None if it could not be determined."""
+        try:
+            tools_version = ToolRegistry().get_tools_version()
+            generation = redis_cache.get(cls.GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Unable to determine version of workflow plan: {e}")
+            return None
+        if None in tools_version:
+            return None
+        instances = tuple(
+            (str(instance.id), instance.step, instance.modified_at)
+            for instance in tool_instances
+        )
+        return instances, tools_version, generation
+
+
+@receiver(post_save, sender=PromptStudioRegistry)
+@receiver(post_delete, sender=PromptStudioRegistry)
+def invalidate_workflow_plans(sender, instance, **kwargs):
+    """Signal to outdate compiled plans using an exported tool."""
+    WorkflowPlanCache.invalidate()
@@ -0,0 +1,135 @@
+import pytest
+from account_v2.models import Organization, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from utils.user_context import UserContext
+from workflow_manager.workflow_v2.execution_view import WorkflowExecutionViewSet
+from workflow_manager.workflow_v2.models import Workflow
+from workflow_manager.workflow_v2.models.execution import WorkflowExecution
+from workflow_manager.workflow_v2.views import WorkflowViewSet
+
+pytestmark = pytest.mark.django_db
+
+ORGANIZATION_TABLE = f'FROM "{Organization._meta.db_table}"'
+
+
+def _organization_queries(context: CaptureQueriesContext) -> list[str]:
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if ORGANIZATION_TABLE in query["sql"]
+    ]
+
+
+@pytest.fixture
+def organization() -> Organization:
+    return Organization.objects.create(
+        name="org", display_name="org", organization_id="org_query_count"
+    )
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create(username="query_count", user_id="query_count")
+
+
+@pytest.fixture(autouse=True)
+def organization_context(organization: Organization, settings):
+    settings.ORGANIZATION_CACHE_TTL = 0
+    UserContext._organization_cache.clear()
+    UserContext.set_organization_identifier(organization.organization_id)
+    yield
+    UserContext.clear_organization()
+    UserContext._organization_cache.clear()
+
+
+@pytest.fixture
+def workflows(user: User) -> list[Workflow]:
+    return [
+        Workflow.objects.create(workflow_name=f"workflow-{i}", created_by=user)
+        for i in range(5)
+    ]
+
+
+def test_tenant_querysets_resolve_organization_once(workflows: list[Workflow]):
+    UserContext.set_organization_identifier(UserContext.get_organization_identifier())
+    with CaptureQueriesContext(connection) as context:
+        for _ in range(10):
+            assert len(list(Workflow.objects.all())) == len(workflows)
+    assert len(_organization_queries(context)) == 1
+    assert len(context.captured_queries) == 11
+
+
+def test_save_reuses_resolved_organization(user: User, organization: Organization):
+    UserContext.get_organization()
+    with CaptureQueriesContext(connection) as context:
+        workflow = Workflow.objects.create(workflow_name="workflow", created_by=user)
+    assert workflow.organization == organization
+    assert not _organization_queries(context)
+
+
+def test_organization_resolved_again_on_identifier_change(
+    organization: Organization,
+):
+    other = Organization.objects.create(
+        name="other", display_name="other", organization_id="org_query_count_other"
+    )
+    assert UserContext.get_organization() == organization
+    UserContext.set_organization_identifier(other.organization_id)
+    assert UserContext.get_organization() == other
+    UserContext.clear_organization()
+    assert UserContext.get_organization() is None
+
+
+def test_process_cache_shared_across_requests(organization: Organization, settings):
+    settings.ORGANIZATION_CACHE_TTL = 60
+    UserContext.get_organization()
+    UserContext.clear_organization()
+    UserContext.set_organization_identifier(organization.organization_id)
+    with CaptureQueriesContext(connection) as context:
+        assert UserContext.get_organization() == organization
+    assert not context.captured_queries
+
+
+def test_workflow_list_view_queries(
+    organization: Organization, user: User, workflows: list[Workflow]
+):
+    # Creating the workflows resolved the organization already, a new
+    # request starts without it
+    UserContext._organization_cache.clear()
+    UserContext.set_organization_identifier(organization.organization_id)
+    view = WorkflowViewSet.as_view({"get": "list"})
+    request = APIRequestFactory().get("/workflow/")
+    force_authenticate(request, user=user)
+    with CaptureQueriesContext(connection) as context:
+        response = view(request)
+    assert response.status_code == 200
+    assert len(response.data) == len(workflows)
+    assert len(_organization_queries(context)) == 1
+
+    request = APIRequestFactory().get("/workflow/")
+    force_authenticate(request, user=user)
+    with CaptureQueriesContext(connection) as context:
+        view(request)
+    assert not _organization_queries(context)
+
+
+def test_execution_list_view_queries(user: User, workflows: list[Workflow]):
+    workflow = workflows[0]
+    for _ in range(5):
+        WorkflowExecution.objects.create(
+            workflow_id=workflow.id,
+            execution_mode=WorkflowExecution.Mode.INSTANT,
+            execution_method=WorkflowExecution.Method.DIRECT,
+            execution_type=WorkflowExecution.Type.COMPLETE,
+        )
+    view = WorkflowExecutionViewSet.as_view({"get": "list"})
+    for _ in range(2):
+        request = APIRequestFactory().get(f"/workflow/{workflow.id}/execution/")
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as context:
+            response = view(request, pk=workflow.id)
+        assert response.status_code == 200
+        assert len(response.data) == 5
+        assert not _organization_queries(context)
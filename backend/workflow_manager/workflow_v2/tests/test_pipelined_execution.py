@@ -0,0 +1,303 @@
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from types import SimpleNamespace
+from typing import Any, Optional
+from unittest import mock
+
+import pytest  # type: ignore
+from django.test import override_settings
+from unstract.workflow_execution.constants import MetaDataKey, WorkflowFileType
+from unstract.workflow_execution.exceptions import StopExecution
+from workflow_manager.endpoint_v2.destination import DestinationConnector
+from workflow_manager.endpoint_v2.models import WorkflowEndpoint
+from workflow_manager.endpoint_v2.source import SourceConnector
+from workflow_manager.workflow_v2.pipelined_execution import (
+    PipelinedFile,
+    PipelinedFileProcessor,
+)
+
+TOTAL_STEPS = 2
+
+
+class FakeExecutionService:
+    """Records the steps run by the copies of an execution service."""
+
+    def __init__(
+        self,
+        calls: list[tuple[str, Any]],
+        errors: dict[tuple[str, int], Exception],
+        file_execution_id: Optional[str] = None,
+    ) -> None:
+        self.calls = calls
+        self.errors = errors
+        self.file_execution_id = file_execution_id
+        self.tool_sandboxes = [mock.Mock() for _ in range(TOTAL_STEPS)]
+        self.execution_log_id = "log"
+        self.tags: list[str] = []
+        self.use_file_history = False
+        self.fail_logs = False
+
+    def for_file_execution(self, file_execution_id: str) -> "FakeExecutionService":
+        service = FakeExecutionService(self.calls, self.errors, file_execution_id)
+        service.fail_logs = self.fail_logs
+        return service
+
+    def execute_step(self, step: int) -> None:
+        time.sleep(random.uniform(0, 0.01))
+        self.calls.append((self.file_execution_id, step))
+        error = self.errors.get((self.file_execution_id, step))
+        if error:
+            raise error
+
+    def publish_log(self, *args: Any, **kwargs: Any) -> None:
+        if self.fail_logs:
+            raise ConnectionError("Log channel unavailable")
+
+    def initiate_tool_execution(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def start_input_file(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def complete_input_file(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def publish_update_log(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class FakeConnector:
+    """Source and destination of the files of an execution."""
+
+    def __init__(self, outputs: list[tuple[str, Optional[str]]]) -> None:
+        self.outputs = outputs
+        self.execution_service: Optional[FakeExecutionService] = None
+        self.flushes = 0
+
+    def for_file_execution(self, file_execution_id: str) -> "FakeConnector":
+        return FakeConnector(self.outputs)
+
+    def add_file_to_volume(self, input_file_path: str, **kwargs: Any) -> str:
+        return input_file_path
+
+    def handle_output(self, file_name: str, error: Optional[str], **kwargs) -> None:
+        time.sleep(random.uniform(0, 0.01))
+        self.outputs.append((file_name, error))
+
+    def flush_bulk_rows(self, force: bool = True) -> int:
+        self.flushes += 1
+        return 0
+
+
+class TestPipelinedFileProcessor:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Any:
+        self.calls: list[tuple[str, Any]] = []
+        self.errors: dict[tuple[str, int], Exception] = {}
+        self.outputs: list[tuple[str, Optional[str]]] = []
+        self.service = FakeExecutionService(self.calls, self.errors)
+        module = "workflow_manager.workflow_v2.pipelined_execution"
+        with ExitStack() as stack:
+            for name in ("UserContext", "StateStore", "connections"):
+                stack.enter_context(mock.patch(f"{module}.{name}"))
+            yield
+
+    def process(self, total_files: int, concurrency: int = 2) -> list[PipelinedFile]:
+        files = [
+            (
+                number,
+                SimpleNamespace(file_path=f"file-{number}", is_executed=False),
+                mock.Mock(id=f"file-{number}"),
+            )
+            for number in range(1, total_files + 1)
+        ]
+        self.destination = FakeConnector(self.outputs)
+        with override_settings(WORKFLOW_PIPELINE_STAGE_CONCURRENCY=concurrency):
+            processor = PipelinedFileProcessor(
+                workflow=mock.Mock(),
+                source=FakeConnector(self.outputs),
+                destination=self.destination,
+                execution_service=self.service,
+                total_files=total_files,
+            )
+        # Fails instead of hanging if a file never comes out of the pipeline
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(processor.process, files).result(timeout=30)
+
+    def steps_of(self, file_execution_id: str) -> list[int]:
+        return [step for file, step in self.calls if file == file_execution_id]
+
+    def test_files_run_their_steps_in_order(self) -> None:
+        processed = self.process(total_files=6)
+
+        assert [pipelined_file.number for pipelined_file in processed] == list(
+            range(1, 7)
+        )
+        for number in range(1, 7):
+            assert self.steps_of(f"file-{number}") == [0, 1]
+        assert sorted(self.outputs) == [(f"file-{n}", None) for n in range(1, 7)]
+
+    def test_outputs_handled_in_file_order(self) -> None:
+        self.errors[("file-3", 0)] = ValueError("Tool failed")
+        self.errors[("file-7", 1)] = ValueError("Tool failed")
+
+        self.process(total_files=12, concurrency=4)
+
+        # Results are collected in the order of the files, whichever of
+        # them finishes its tools first
+        assert [file for file, _ in self.outputs] == [
+            f"file-{number}" for number in range(1, 13)
+        ]
+        # Bulk rows are written by the output stage as batches fill up
+        assert self.destination.flushes == 12
+
+    def test_failed_step_skips_remaining_steps_of_file(self) -> None:
+        self.errors[("file-2", 0)] = ValueError("Tool failed")
+
+        processed = self.process(total_files=3)
+
+        assert self.steps_of("file-2") == [0]
+        assert self.steps_of("file-1") == self.steps_of("file-3") == [0, 1]
+        assert "Tool failed" in processed[1].error
+        assert processed[0].error is None and processed[2].error is None
+        outputs = dict(self.outputs)
+        assert "Tool failed" in outputs["file-2"]
+        assert outputs["file-1"] is None and outputs["file-3"] is None
+
+    def test_stop_skips_files_not_started(self) -> None:
+        self.errors[("file-1", 0)] = StopExecution("Execution stopped by user")
+
+        processed = self.process(total_files=3, concurrency=1)
+
+        assert processed[0].stopped == "Execution stopped by user"
+        assert [pipelined_file.stopped for pipelined_file in processed[1:]] == [
+            "Execution stopped",
+            "Execution stopped",
+        ]
+        assert self.steps_of("file-2") == self.steps_of("file-3") == []
+        assert self.outputs == []
+
+    def test_failure_reporting_an_error_fails_file(self) -> None:
+        self.service.fail_logs = True
+        self.errors[("file-1", 0)] = ValueError("Tool failed")
+
+        processed = self.process(total_files=2)
+
+        assert "Log channel unavailable" in processed[0].failure
+        assert processed[1].failure is None
+        assert [file for file, _ in self.outputs] == ["file-2"]
+
+
+class FakeFileStorage:
+    """Keeps the files of execution directories in memory."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, Any] = {}
+        self.fs = mock.Mock()
+        self.fs.info.side_effect = FileNotFoundError
+
+    def write(self, path: str, mode: str, data: Any, **kwargs: Any) -> None:
+        self.files[path] = data
+
+    def json_dump(self, path: str, data: Any) -> None:
+        self.files[path] = json.dumps(data)
+
+    def read(self, path: str, mode: str = "r", **kwargs: Any) -> Any:
+        return self.files[path]
+
+    def mime_type(self, path: str) -> str:
+        return "text/plain"
+
+
+class TestConnectorsForFileExecution:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Any:
+        self.storage = FakeFileStorage()
+        self.execution_dir = "/execution/org/workflow/execution"
+        with ExitStack() as stack:
+            for module in (
+                "workflow_manager.endpoint_v2.source",
+                "workflow_manager.endpoint_v2.destination",
+                "unstract.workflow_execution.execution_file_handler",
+            ):
+                file_system = stack.enter_context(mock.patch(f"{module}.FileSystem"))
+                file_system.return_value.get_file_storage.return_value = self.storage
+            stack.enter_context(
+                mock.patch.dict(
+                    os.environ, {"WORKFLOW_EXECUTION_DIR_PREFIX": "/execution"}
+                )
+            )
+            stack.enter_context(
+                mock.patch(
+                    "workflow_manager.endpoint_v2.destination.UserContext"
+                    ".get_organization_identifier",
+                    return_value="org",
+                )
+            )
+            endpoint = mock.Mock(
+                connection_type=WorkflowEndpoint.ConnectionType.FILESYSTEM
+            )
+            for connector_class in (SourceConnector, DestinationConnector):
+                stack.enter_context(
+                    mock.patch.object(
+                        connector_class,
+                        "_get_endpoint_for_workflow",
+                        return_value=endpoint,
+                    )
+                )
+            stack.enter_context(
+                mock.patch.object(
+                    DestinationConnector, "_get_source_endpoint_for_workflow"
+                )
+            )
+            stack.enter_context(
+                mock.patch.object(
+                    DestinationConnector, "_get_bulk_writer", return_value=None
+                )
+            )
+            yield
+
+    def test_file_runs_in_its_own_directory(self) -> None:
+        workflow = mock.Mock(id="workflow")
+        source = SourceConnector(
+            workflow=workflow, execution_id="execution", organization_id="org"
+        )
+        destination = DestinationConnector(workflow=workflow, execution_id="execution")
+        file_source = source.for_file_execution("file-1")
+        file_destination = destination.for_file_execution("file-1")
+        file_dir = f"{self.execution_dir}/file-1"
+        assert source.execution_dir == destination.execution_dir == self.execution_dir
+        assert file_source.execution_dir == file_destination.execution_dir == file_dir
+        assert file_destination.api_results is destination.api_results
+
+        content = b"file content"
+        workflow_file_execution = mock.Mock(
+            id="file-1", file_hash=source.get_file_content_hash(content)
+        )
+        with mock.patch.object(
+            SourceConnector, "get_file_content", return_value=(content, len(content))
+        ):
+            file_name = file_source.add_file_to_volume(
+                input_file_path="/input/a.pdf",
+                workflow_file_execution=workflow_file_execution,
+            )
+        assert file_name == "a.pdf"
+        assert self.storage.files[f"{file_dir}/{WorkflowFileType.SOURCE}"] == content
+        assert self.storage.files[f"{file_dir}/{WorkflowFileType.INFILE}"] == content
+        assert not any(
+            path.startswith(f"{self.execution_dir}/{WorkflowFileType.INFILE}")
+            for path in self.storage.files
+        )
+
+        metadata = file_destination.get_metadata()
+        assert metadata[MetaDataKey.FILE_EXECUTION_ID] == "file-1"
+        # Output and metadata of the tool, read from the file's directory
+        metadata[MetaDataKey.TOOL_METADATA] = [{"output_type": "TXT"}]
+        self.storage.json_dump(f"{file_dir}/{WorkflowFileType.METADATA_JSON}", metadata)
+        self.storage.files[f"{file_dir}/{WorkflowFileType.INFILE}"] = "extracted"
+        file_destination.invalidate_metadata()
+        assert file_destination.get_result() == "extracted"
@@ -0,0 +1,100 @@
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Optional
+from unittest import mock
+
+import pytest  # type: ignore
+from django.db.models.signals import post_save
+from django.test import override_settings
+from prompt_studio.prompt_studio_registry_v2.models import PromptStudioRegistry
+from workflow_manager.workflow_v2.plan_cache import WorkflowPlanCache
+
+MODULE = "workflow_manager.workflow_v2.plan_cache"
+MODIFIED_AT = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    def incr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+
+class TestWorkflowPlanCache:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Any:
+        self.redis = FakeRedis()
+        self.tool_instances = [
+            SimpleNamespace(id=f"instance-{step}", step=step, modified_at=MODIFIED_AT)
+            for step in (1, 2)
+        ]
+        self.compile = mock.Mock(side_effect=lambda: [{"compiled": True}])
+        with ExitStack() as stack:
+            stack.enter_context(override_settings(WORKFLOW_PLAN_CACHE_ENABLED=True))
+            stack.enter_context(mock.patch(f"{MODULE}.redis_cache", self.redis))
+            tool_registry = stack.enter_context(mock.patch(f"{MODULE}.ToolRegistry"))
+            self.get_tools_version = tool_registry.return_value.get_tools_version
+            self.get_tools_version.return_value = ("tools.json", 1.0)
+            stack.enter_context(mock.patch.object(WorkflowPlanCache, "_plans", {}))
+            yield
+
+    def get_tool_instances(self) -> Any:
+        return WorkflowPlanCache.get_tool_instances(
+            workflow_id="workflow",
+            tool_instances=self.tool_instances,
+            compile=self.compile,
+        )
+
+    def assert_compiled(self, times: int) -> None:
+        assert self.compile.call_count == times
+
+    def test_plan_is_reused_and_copied(self) -> None:
+        self.get_tool_instances()[0]["compiled"] = False
+
+        assert self.get_tool_instances() == [{"compiled": True}]
+        self.assert_compiled(1)
+
+    def test_tool_instance_change_outdates_plan(self) -> None:
+        self.get_tool_instances()
+        self.tool_instances[1].modified_at = MODIFIED_AT + timedelta(seconds=1)
+
+        self.get_tool_instances()
+        self.get_tool_instances()
+        self.assert_compiled(2)
+
+    def test_registry_change_outdates_plan(self) -> None:
+        self.get_tool_instances()
+        self.get_tools_version.return_value = ("tools.json", 2.0)
+
+        self.get_tool_instances()
+        self.assert_compiled(2)
+
+    def test_generation_bumped_by_another_process_outdates_plan(self) -> None:
+        self.get_tool_instances()
+        self.redis.incr(WorkflowPlanCache.GENERATION_KEY)
+
+        self.get_tool_instances()
+        self.assert_compiled(2)
+
+    def test_exported_tool_change_outdates_plan(self) -> None:
+        self.get_tool_instances()
+
+        post_save.send(sender=PromptStudioRegistry, instance=mock.Mock(), created=False)
+
+        assert self.redis.data == {WorkflowPlanCache.GENERATION_KEY: 1}
+        self.get_tool_instances()
+        self.assert_compiled(2)
+
+    def test_unknown_version_is_not_cached(self) -> None:
+        self.get_tools_version.return_value = ("tools.json", None)
+
+        self.get_tool_instances()
+        self.get_tool_instances()
+        self.assert_compiled(2)
@@ -11,6 +11,7 @@ from celery import current_task
 from celery import exceptions as celery_exceptions
 from celery import shared_task
 from celery.result import AsyncResult
+from django.conf import settings
 from django.db import IntegrityError
 from pipeline_v2.models import Pipeline
 from pipeline_v2.pipeline_processor import PipelineProcessor
@@ -19,10 +20,10 @@ from rest_framework import serializers
 from tool_instance_v2.constants import ToolInstanceKey
 from tool_instance_v2.models import ToolInstance
 from tool_instance_v2.tool_instance_helper import ToolInstanceHelper
+from unstract.workflow_execution.constants import StepExecution
 from unstract.workflow_execution.enums import LogComponent, LogLevel, LogState
 from unstract.workflow_execution.exceptions import StopExecution
 from utils.cache_service import CacheService
-from utils.constants import Account
 from utils.local_context import StateStore
 from utils.user_context import UserContext
 from workflow_manager.endpoint_v2.destination import DestinationConnector
@@ -48,6 +49,7 @@ from workflow_manager.workflow_v2.execution import WorkflowExecutionServiceHelpe
 from workflow_manager.workflow_v2.file_history_helper import FileHistoryHelper
 from workflow_manager.workflow_v2.models.execution import WorkflowExecution
 from workflow_manager.workflow_v2.models.workflow import Workflow
+from workflow_manager.workflow_v2.pipelined_execution import PipelinedFileProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +96,7 @@ class WorkflowHelper:
         execution_mode: tuple[str, str],
         workflow_execution: WorkflowExecution,
         use_file_history: bool = True,  # Will be False for API deployment alone
+        pipelined: bool = False,
     ) -> WorkflowExecutionServiceHelper:
         workflow_execution_service = WorkflowExecutionServiceHelper(
             organization_id=organization_id,
@@ -105,6 +108,7 @@ class WorkflowHelper:
             mode=execution_mode,
             workflow_execution=workflow_execution,
             use_file_history=use_file_history,
+            pipelined=pipelined,
         )
         workflow_execution_service.build()
         return workflow_execution_service
@@ -149,6 +153,19 @@ class WorkflowHelper:
         if total_files > 0:
             q_file_no_list = WorkflowUtil.get_q_no_list(workflow, total_files)
 
+        if execution_service.pipelined:
+            successful_files, failed_files, error_message = (
+                cls._process_input_files_pipelined(
+                    workflow=workflow,
+                    source=source,
+                    destination=destination,
+                    execution_service=execution_service,
+                    input_files=input_files,
+                    q_file_no_list=q_file_no_list if total_files > 0 else [],
+                )
+            )
+            input_files = {}
+
         for index, (file_name, file_hash) in enumerate(input_files.items()):
             # Get workflow execution file
             workflow_execution_file = cls._get_or_create_workflow_execution_file(
@@ -203,6 +220,17 @@ class WorkflowHelper:
                 execution_service.publish_log(
                     message=error_message, level=LogLevel.ERROR
                 )
+            failed_writes = destination.flush_bulk_rows(force=False)
+            if failed_writes:
+                successful_files -= failed_writes
+                failed_files += failed_writes
+                error_message = destination.bulk_writer.error
+
+        failed_writes = destination.flush_bulk_rows()
+        if failed_writes:
+            successful_files -= failed_writes
+            failed_files += failed_writes
+            error_message = destination.bulk_writer.error
         # TODO: Store only generic WF errors here (concerning all failed files)
         # TODO: Review if we need partial success
         if failed_files and failed_files >= total_files:
@@ -219,6 +247,82 @@ class WorkflowHelper:
         )
         return execution_service.get_execution_instance()
 
+    @classmethod
+    def _process_input_files_pipelined(
+        cls,
+        workflow: Workflow,
+        source: SourceConnector,
+        destination: DestinationConnector,
+        execution_service: WorkflowExecutionServiceHelper,
+        input_files: dict[str, FileHash],
+        q_file_no_list: list[int],
+    ) -> tuple[int, int, Optional[str]]:
+        """Processes the input files with `PipelinedFileProcessor`, updating
+        their status like `process_input_files`.
+
+        Returns:
+            tuple[int, int, Optional[str]]: Successful and failed files, and
+                the last error processing a file
+        """
+        files = []
+        for index, file_hash in enumerate(input_files.values()):
+            workflow_execution_file = cls._get_or_create_workflow_execution_file(
+                execution_service=execution_service,
+                file_hash=file_hash,
+                source=source,
+            )
+            file_number = index + 1
+            file_hash = WorkflowUtil.add_file_destination_filehash(
+                file_number,
+                q_file_no_list,
+                file_hash,
+            )
+            files.append((file_number, file_hash, workflow_execution_file))
+
+        processor = PipelinedFileProcessor(
+            workflow=workflow,
+            source=source,
+            destination=destination,
+            execution_service=execution_service,
+            total_files=len(files),
+        )
+        successful_files = 0
+        failed_files = 0
+        error_message = None
+        stopped = None
+        bulk_writer = destination.bulk_writer
+        for pipelined_file in processor.process(files):
+            workflow_execution_file = pipelined_file.workflow_file_execution
+            if pipelined_file.stopped:
+                stopped = stopped or pipelined_file.stopped
+                workflow_execution_file.update_status(
+                    status=ExecutionStatus.STOPPED,
+                    execution_error=pipelined_file.stopped,
+                )
+            elif pipelined_file.failure:
+                failed_files += 1
+                error_message = pipelined_file.failure
+                workflow_execution_file.update_status(
+                    status=ExecutionStatus.ERROR,
+                    execution_error=pipelined_file.failure,
+                )
+            elif pipelined_file.error:
+                failed_files += 1
+                workflow_execution_file.update_status(
+                    status=ExecutionStatus.ERROR,
+                    execution_error=pipelined_file.error,
+                )
+            elif bulk_writer and bulk_writer.has_failed(workflow_execution_file.id):
+                # Marked failed when its rows were written by the output stage
+                failed_files += 1
+                error_message = bulk_writer.error
+            else:
+                successful_files += 1
+                workflow_execution_file.update_status(ExecutionStatus.COMPLETED)
+        if stopped:
+            execution_service.update_execution(ExecutionStatus.STOPPED, error=stopped)
+        return successful_files, failed_files, error_message
+
     @staticmethod
     def _process_file(
         current_file_idx: int,
@@ -323,6 +427,11 @@ class WorkflowHelper:
             execution_mode=execution_mode,
             workflow_execution=workflow_execution,
             use_file_history=use_file_history,
+            pipelined=(
+                settings.WORKFLOW_PIPELINED_EXECUTION
+                and not single_step
+                and len(tool_instances) > 1
+            ),
         )
         execution_id = execution_service.execution_id
         source = SourceConnector(
@@ -354,6 +463,7 @@ class WorkflowHelper:
                 single_step=single_step,
                 input_files=input_files,
             )
+            source.save_listing_cursor()
             WorkflowHelper._update_pipeline_status(
                 pipeline_id=pipeline_id, workflow_execution=workflow_execution
             )
@@ -369,6 +479,7 @@ class WorkflowHelper:
         except Exception as e:
             logger.error(f"Error executing workflow {workflow}: {e}")
             logger.error(f"Error {traceback.format_exc()}")
+            execution_service.flush_logs()
             workflow_execution = WorkflowExecutionServiceHelper.update_execution_err(
                 execution_id, str(e)
             )
@@ -616,7 +727,7 @@ class WorkflowHelper:
         """
         task_id = current_task.request.id
         # Set organization in state store for execution
-        StateStore.set(Account.ORGANIZATION_ID, schema_name)
+        UserContext.set_organization_identifier(schema_name)
         return WorkflowHelper.execute_workflow(
             organization_id=schema_name,
             task_id=task_id,
@@ -756,7 +867,7 @@ class WorkflowHelper:
             else:
                 task_id = current_task.request.id
                 # TODO: Remove this if scheduled runs work
-                StateStore.set(Account.ORGANIZATION_ID, org_schema)
+                UserContext.set_organization_identifier(org_schema)
                 execution_result = WorkflowHelper.execute_workflow(
                     organization_id=org_schema,
                     task_id=task_id,
@@ -859,6 +970,13 @@ class WorkflowHelper:
             if current_action is None:
                 raise InvalidRequest(WorkflowErrors.INVALID_EXECUTION_ID)
             CacheService.set_key(execution_id, execution_action)
+            # The paused execution blocks on this list and resumes as soon
+            # as the action is pushed
+            CacheService.rpush(
+                StepExecution.get_action_key(execution_id),
+                execution_action,
+                expire=StepExecution.CACHE_EXP_START_SEC,
+            )
             workflow_execution = WorkflowExecution.objects.get(pk=execution_id)
 
             return ExecutionResponse(
@@ -901,7 +1019,12 @@ class WorkflowHelper:
         response: dict[str, Any] = {}
         try:
             key_pattern = f"*:cache:{workflow_id}:*"
-            CacheService.clear_cache(key_pattern)
+            # Tool results are cached by platform service under the
+            # organization, which registers them in this scope
+            organization_id = UserContext.get_organization_identifier()
+            CacheService.clear_cache(
+                key_pattern, scope=f"{organization_id}:cache:{workflow_id}"
+            )
             response["message"] = WorkflowMessages.CACHE_CLEAR_SUCCESS
             response["status"] = 200
             return response
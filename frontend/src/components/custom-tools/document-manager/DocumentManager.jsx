@@ -206,6 +206,15 @@ function DocumentManager({ generateIndex, handleUpdateTool, handleDocChange }) {
       return;
     }
 
+    if (
+      viewType === viewTypes.original &&
+      !isPublicSource &&
+      !(isSimplePromptStudio && getDocumentsSps)
+    ) {
+      handleGetDocumentStream();
+      return;
+    }
+
     if (isSimplePromptStudio && getDocumentsSps) {
       handleGetDocumentsReq(getDocumentsSps, viewType);
     } else {
@@ -228,6 +237,29 @@ function DocumentManager({ generateIndex, handleUpdateTool, handleDocChange }) {
       });
   };
 
+  // The viewer loads the document as is from its URL, fetching the pages it
+  // shows by range. Its first byte is requested to report a missing document.
+  const handleGetDocumentStream = () => {
+    const url = `/api/v1/unstract/${sessionDetails?.orgId}/prompt-studio/file/${details?.tool_id}/document?document_id=${selectedDoc?.document_id}&view_type=${viewTypes.original}`;
+    const requestOptions = {
+      url,
+      method: "GET",
+      headers: { Range: "bytes=0-0" },
+    };
+    axiosPrivate(requestOptions)
+      .then(() => {
+        setFileData({});
+        setBlobFileUrl(url);
+        setFileUrl(url);
+      })
+      .catch((err) => {
+        handleGetDocsError(err, viewTypes.original);
+      })
+      .finally(() => {
+        handleLoadingStateUpdate(viewTypes.original, false);
+      });
+  };
+
   const getDocuments = async (toolId, docId, viewType) => {
     let url = `/api/v1/unstract/${sessionDetails?.orgId}/prompt-studio/file/${toolId}?document_id=${docId}&view_type=${viewType}`;
     if (isPublicSource) {
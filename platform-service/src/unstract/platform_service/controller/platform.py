@@ -366,6 +366,27 @@ def platform_details() -> Any:
     return result, 200
 
 
+def get_cache_registry_key(account_id: str, key: str) -> Optional[str]:
+    """Registry set recording the cache keys of a workflow.
+
+    Tools cache under `cache:<workflow_id>:...`, the backend enumerates and
+    clears the registry `key_registry:<account_id>:cache:<workflow_id>`
+    instead of scanning Redis. Registered keys and the registry expire
+    `CACHE_KEY_REGISTRY_TTL` seconds after the last write to the registry,
+    members of keys gone before are dropped by the backend when read.
+
+    Returns:
+        Optional[str]: Registry key, None if the registry is disabled or the
+            key is not scoped to a workflow
+    """
+    if not Env.CACHE_KEY_REGISTRY_ENABLED:
+        return None
+    parts = key.split(":", 2)
+    if len(parts) < 3 or parts[0] != "cache":
+        return None
+    return f"key_registry:{account_id}:cache:{parts[1]}"
+
+
 @platform_bp.route("/cache", methods=["POST", "GET", "DELETE"], endpoint="cache")
 @authentication_middleware
 def cache() -> Any:
@@ -399,7 +420,19 @@ def cache() -> Any:
                 password=Env.REDIS_PASSWORD,
             )
             redis_key = f"{account_id}:{key}"
-            r.set(redis_key, value)
+            registry_key = get_cache_registry_key(account_id=account_id, key=key)
+            if registry_key:
+                # The registry outlives its keys, its expiry is refreshed by
+                # every key written to it
+                ttl = Env.CACHE_KEY_REGISTRY_TTL or None
+                pipeline = r.pipeline()
+                pipeline.set(redis_key, value, ex=ttl)
+                pipeline.sadd(registry_key, redis_key)
+                if ttl:
+                    pipeline.expire(registry_key, ttl)
+                pipeline.execute()
+            else:
+                r.set(redis_key, value)
             r.close()
         except Exception as e:
             raise APIError(message=f"Error while caching data: {e}") from e
@@ -433,7 +466,14 @@ def cache() -> Any:
             )
             redis_key = f"{account_id}:{key}"
             app.logger.info(f"Deleting cached data for key: {redis_key}")
-            r.delete(redis_key)
+            registry_key = get_cache_registry_key(account_id=account_id, key=key)
+            if registry_key:
+                pipeline = r.pipeline()
+                pipeline.delete(redis_key)
+                pipeline.srem(registry_key, redis_key)
+                pipeline.execute()
+            else:
+                r.delete(redis_key)
             r.close()
             return "OK", 200
         except Exception as e:
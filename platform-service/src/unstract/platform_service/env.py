@@ -28,6 +28,13 @@ class Env:
     )
     DB_SCHEMA = EnvManager.get_required_setting("DB_SCHEMA")
     LOG_LEVEL = EnvManager.get_required_setting("LOG_LEVEL", LogLevel.INFO)
+    # Record tool cache keys in per workflow sets, must match the backend
+    CACHE_KEY_REGISTRY_ENABLED = (
+        os.environ.get("CACHE_KEY_REGISTRY_ENABLED", "False").lower() == "true"
+    )
+    # Seconds registered cache keys and their registry are kept from the
+    # last write, 0 to keep them until cleared
+    CACHE_KEY_REGISTRY_TTL = int(os.environ.get("CACHE_KEY_REGISTRY_TTL", 2592000))
 
 
 EnvManager.raise_for_missing_envs()
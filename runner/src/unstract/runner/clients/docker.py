@@ -3,7 +3,7 @@ import os
 from collections.abc import Iterator
 from typing import Any, Optional
 
-from docker.errors import APIError, ImageNotFound
+from docker.errors import APIError, ImageNotFound, NotFound
 from docker.models.containers import Container
 from unstract.runner.clients.interface import (
     ContainerClientInterface,
@@ -191,3 +191,9 @@ class Client(ContainerClientInterface):
     def run_container(self, config: dict[Any, Any]) -> Any:
         self.logger.info(f"Docker config: {config}")
         return DockerContainer(self.client.containers.run(**config))
+
+    def stop_container(self, container_name: str) -> None:
+        try:
+            self.client.containers.get(container_name).remove(force=True)
+        except NotFound:
+            self.logger.info(f"Container {container_name} is already removed")
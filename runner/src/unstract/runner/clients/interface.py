@@ -48,6 +48,15 @@ class ContainerClientInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def stop_container(self, container_name: str) -> None:
+        """Stops and removes a running container by its name, if it exists.
+
+        Args:
+            container_name (str): Name of the container.
+        """
+        pass
+
     @abstractmethod
     def get_image(self) -> str:
         """Consturct image name with tag and repo name. Pulls the image if
@@ -3,7 +3,7 @@ import os
 from unittest.mock import MagicMock
 
 import pytest
-from docker.errors import ImageNotFound
+from docker.errors import ImageNotFound, NotFound
 from unstract.runner.constants import Env
 
 from .docker import Client, DockerContainer
@@ -182,5 +182,23 @@ def test_run_container(docker_client, mocker):
     mock_client.containers.run.assert_called_once_with(**config)
 
 
+def test_stop_container(docker_client, mocker):
+    """Test the stop_container method removes the named container."""
+    mock_client = mocker.patch.object(docker_client, "client")
+
+    docker_client.stop_container("test-container")
+
+    mock_client.containers.get.assert_called_once_with("test-container")
+    mock_client.containers.get.return_value.remove.assert_called_once_with(force=True)
+
+
+def test_stop_container_not_found(docker_client, mocker):
+    """Test the stop_container method ignores a missing container."""
+    mock_client = mocker.patch.object(docker_client, "client")
+    mock_client.containers.get.side_effect = NotFound("Container not found")
+
+    docker_client.stop_container("test-container")
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -30,4 +30,9 @@ class Env:
         "WORKFLOW_EXECUTION_FILE_STORAGE_CREDENTIALS"
     )
     EXECUTION_DATA_DIR = "EXECUTION_DATA_DIR"
+    EXTRACTION_CACHE_DIR = "EXTRACTION_CACHE_DIR"
+    EXTRACTION_CACHE_MAX_SIZE_MB = "EXTRACTION_CACHE_MAX_SIZE_MB"
     FLIPT_SERVICE_AVAILABLE = "FLIPT_SERVICE_AVAILABLE"
+    RUNNER_JOB_MAX_WORKERS = "RUNNER_JOB_MAX_WORKERS"
+    RUNNER_JOB_TTL = "RUNNER_JOB_TTL"
+    RUNNER_JOB_HEARTBEAT_TTL = "RUNNER_JOB_HEARTBEAT_TTL"
@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import redis
+from flask import Flask
+from unstract.runner.constants import Env
+from unstract.runner.runner import UnstractRunner
+
+from unstract.core.constants import RunnerJobKey, RunnerJobStatus, ToolRunErrorType
+
+logger = logging.getLogger(__name__)
+
+
+class RunnerJobs:
+    """Tool runs submitted as jobs, tracked in Redis.
+
+    A job is identified by its container name, so a resubmission after a
+    dropped connection returns the existing job instead of starting the
+    tool again. Jobs run on a thread pool of the runner process. Their
+    status and result are kept for `RUNNER_JOB_TTL` seconds from their
+    last change, where any runner worker can serve them, and their
+    completion is pushed to `RunnerJobKey.DONE_PREFIX` for callers to wait
+    on.
+
+    The runner process owning a job keeps a heartbeat of it alive for
+    `RUNNER_JOB_HEARTBEAT_TTL` seconds, refreshed while the job is queued
+    or running. A job whose heartbeat expired was orphaned by a runner
+    that stopped, and is failed when its status is next read.
+
+    A cancelled job is finished right away, its container is stopped if
+    it's running and whatever the run returns after is dropped.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _heartbeat: Optional[threading.Thread] = None
+    _owned_jobs: set[str] = set()
+    _lock = threading.Lock()
+    r = redis.Redis(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", 6379)),
+        username=os.environ.get("REDIS_USER", ""),
+        password=os.environ.get("REDIS_PASSWORD", ""),
+        decode_responses=True,
+    )
+
+    @classmethod
+    def submit(cls, app: Flask, data: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+        """Starts a job for the run request, unless one exists for its
+        container.
+
+        Args:
+            app (Flask): App whose logger the run uses
+            data (dict[str, Any]): Payload of a `container/run` request
+
+        Returns:
+            tuple[dict[str, Any], bool]: The job, and whether it was created
+        """
+        job_id = data["container_name"]
+        key = cls._key(job_id)
+        if not cls.r.hsetnx(key, "status", RunnerJobStatus.QUEUED):
+            job = cls.get(job_id) or {
+                "job_id": job_id,
+                "status": RunnerJobStatus.QUEUED,
+            }
+            return job, False
+        pipeline = cls.r.pipeline()
+        pipeline.hset(
+            key,
+            mapping={
+                "image_name": data["image_name"],
+                "image_tag": data.get("image_tag") or "",
+                "submitted_at": time.time(),
+            },
+        )
+        pipeline.expire(key, cls._ttl())
+        pipeline.set(cls._heartbeat_key(job_id), 1, ex=cls._heartbeat_ttl())
+        pipeline.execute()
+        with cls._lock:
+            cls._owned_jobs.add(job_id)
+        cls._get_executor().submit(cls._run, app, job_id, data)
+        return {"job_id": job_id, "status": RunnerJobStatus.QUEUED}, True
+
+    @classmethod
+    def get(cls, job_id: str) -> Optional[dict[str, Any]]:
+        """Status of a job, with its result once finished.
+
+        Returns:
+            Optional[dict[str, Any]]: The job, None if unknown or expired
+        """
+        job = cls.r.hgetall(cls._key(job_id))
+        if not job:
+            return None
+        if job["status"] not in RunnerJobStatus.FINISHED and not cls.r.exists(
+            cls._heartbeat_key(job_id)
+        ):
+            cls._fail_orphan(job_id)
+            job = cls.r.hgetall(cls._key(job_id))
+        response: dict[str, Any] = {"job_id": job_id, "status": job["status"]}
+        if "result" in job:
+            response["result"] = json.loads(job["result"])
+        return response
+
+    @classmethod
+    def cancel(cls, app: Flask, job_id: str) -> Optional[dict[str, Any]]:
+        """Cancels a job, stopping its container if it's running.
+
+        Returns:
+            Optional[dict[str, Any]]: The job, None if unknown or expired
+        """
+        key = cls._key(job_id)
+
+        def mark_cancelled(
+            pipeline: "redis.client.Pipeline",
+        ) -> Optional[dict[str, str]]:
+            job: dict[str, str] = pipeline.hgetall(key)
+            if not job or job["status"] in RunnerJobStatus.FINISHED:
+                return None
+            result = {"type": "RESULT", "result": None, "error": "Job cancelled"}
+            pipeline.multi()
+            pipeline.hset(
+                key,
+                mapping={
+                    "status": RunnerJobStatus.CANCELLED,
+                    "result": json.dumps(result),
+                },
+            )
+            pipeline.expire(key, cls._ttl())
+            return job
+
+        job = cls.r.transaction(mark_cancelled, key, value_from_callable=True)
+        if job:
+            logger.info(f"Job {job_id} cancelled while {job['status']}")
+            cls._notify(job_id, RunnerJobStatus.CANCELLED)
+            if job["status"] == RunnerJobStatus.RUNNING:
+                runner = UnstractRunner(job["image_name"], job["image_tag"], app)
+                runner.client.stop_container(job_id)
+        return cls.get(job_id)
+
+    @classmethod
+    def _run(cls, app: Flask, job_id: str, data: dict[str, Any]) -> None:
+        try:
+            cls._run_container(app, job_id, data)
+        finally:
+            with cls._lock:
+                cls._owned_jobs.discard(job_id)
+            cls.r.delete(cls._heartbeat_key(job_id))
+
+    @classmethod
+    def _run_container(cls, app: Flask, job_id: str, data: dict[str, Any]) -> None:
+        key = cls._key(job_id)
+        if not cls._set_status(key, RunnerJobStatus.QUEUED, RunnerJobStatus.RUNNING):
+            # Cancelled before it started
+            return
+        try:
+            runner = UnstractRunner(data["image_name"], data["image_tag"], app)
+            result = runner.run_container(
+                container_name=job_id,
+                organization_id=data["organization_id"],
+                workflow_id=data["workflow_id"],
+                execution_id=data["execution_id"],
+                file_execution_id=data["file_execution_id"],
+                settings=data["settings"],
+                envs=data["envs"],
+                messaging_channel=data["messaging_channel"],
+                isolate_file_execution=data.get("isolate_file_execution", False),
+            )
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            result = {
+                "type": "RESULT",
+                "result": None,
+                "error": str(e),
+                "error_type": ToolRunErrorType.RUNNER,
+            }
+        status = (
+            RunnerJobStatus.FAILED if result.get("error") else RunnerJobStatus.COMPLETED
+        )
+        if not cls._set_status(
+            key, RunnerJobStatus.RUNNING, status, result=json.dumps(result)
+        ):
+            # Cancelled while it ran
+            return
+        cls._notify(job_id, status)
+
+    @classmethod
+    def _set_status(cls, key: str, current: str, status: str, **fields: str) -> bool:
+        """Moves a job from the current status to the given one, with any
+        other fields to set.
+
+        Returns:
+            bool: Whether the job was in the current status
+        """
+
+        def set_status(pipeline: "redis.client.Pipeline") -> bool:
+            if pipeline.hget(key, "status") != current:
+                return False
+            pipeline.multi()
+            pipeline.hset(key, mapping={"status": status, **fields})
+            pipeline.expire(key, cls._ttl())
+            return True
+
+        changed: bool = cls.r.transaction(set_status, key, value_from_callable=True)
+        return changed
+
+    @classmethod
+    def _fail_orphan(cls, job_id: str) -> None:
+        """Fails a job whose runner stopped before finishing it."""
+        key = cls._key(job_id)
+        heartbeat_key = cls._heartbeat_key(job_id)
+
+        def fail(pipeline: "redis.client.Pipeline") -> bool:
+            status = pipeline.hget(key, "status")
+            if status is None or status in RunnerJobStatus.FINISHED:
+                return False
+            if pipeline.exists(heartbeat_key):
+                return False
+            result = {
+                "type": "RESULT",
+                "result": None,
+                "error": "Runner stopped before the tool run finished",
+                "error_type": ToolRunErrorType.RUNNER,
+            }
+            pipeline.multi()
+            pipeline.hset(
+                key,
+                mapping={
+                    "status": RunnerJobStatus.FAILED,
+                    "result": json.dumps(result),
+                },
+            )
+            pipeline.expire(key, cls._ttl())
+            return True
+
+        if cls.r.transaction(fail, key, heartbeat_key, value_from_callable=True):
+            logger.warning(f"Job {job_id} orphaned by its runner, failed it")
+            cls._notify(job_id, RunnerJobStatus.FAILED)
+
+    @classmethod
+    def _beat(cls) -> None:
+        """Refreshes the heartbeats of the jobs owned by this process."""
+        interval = cls._heartbeat_ttl() / 3
+        while True:
+            time.sleep(interval)
+            with cls._lock:
+                job_ids = list(cls._owned_jobs)
+            if not job_ids:
+                continue
+            try:
+                pipeline = cls.r.pipeline()
+                for job_id in job_ids:
+                    pipeline.set(cls._heartbeat_key(job_id), 1, ex=cls._heartbeat_ttl())
+                pipeline.execute()
+            except redis.RedisError as e:
+                logger.warning(f"Unable to refresh heartbeats of jobs: {e}")
+
+    @classmethod
+    def _notify(cls, job_id: str, status: str) -> None:
+        done_key = f"{RunnerJobKey.DONE_PREFIX}{job_id}"
+        pipeline = cls.r.pipeline()
+        pipeline.rpush(done_key, status)
+        pipeline.expire(done_key, cls._ttl())
+        pipeline.execute()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=int(os.environ.get(Env.RUNNER_JOB_MAX_WORKERS, 8)),
+                    thread_name_prefix="runner-job",
+                )
+                cls._heartbeat = threading.Thread(
+                    target=cls._beat, name="runner-job-heartbeat", daemon=True
+                )
+                cls._heartbeat.start()
+            return cls._executor
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"{RunnerJobKey.PREFIX}{job_id}"
+
+    @staticmethod
+    def _heartbeat_key(job_id: str) -> str:
+        return f"{RunnerJobKey.HEARTBEAT_PREFIX}{job_id}"
+
+    @staticmethod
+    def _ttl() -> int:
+        return int(os.environ.get(Env.RUNNER_JOB_TTL, 86400))
+
+    @staticmethod
+    def _heartbeat_ttl() -> int:
+        return int(os.environ.get(Env.RUNNER_JOB_HEARTBEAT_TTL, 60))
@@ -2,6 +2,7 @@ from typing import Any, Optional
 
 from flask import Blueprint, Flask, Response, abort, jsonify, request
 from unstract.runner import UnstractRunner
+from unstract.runner.jobs import RunnerJobs
 from unstract.runner.utils import Utils
 
 app = Flask(__name__)
@@ -33,6 +34,7 @@ def run_container() -> Optional[Any]:
     settings = data["settings"]
     envs = data["envs"]
     messaging_channel = data["messaging_channel"]
+    isolate_file_execution = data.get("isolate_file_execution", False)
 
     runner = UnstractRunner(image_name, image_tag, app)
     result = runner.run_container(
@@ -44,10 +46,34 @@ def run_container() -> Optional[Any]:
         settings=settings,
         envs=envs,
         messaging_channel=messaging_channel,
+        isolate_file_execution=isolate_file_execution,
     )
     return result
 
 
+# Submit a run as a job, returns the existing job of the container if any
+@bp.route("container/jobs", methods=["POST"])
+def submit_job() -> tuple[Response, int]:
+    job, created = RunnerJobs.submit(app, request.get_json())
+    return jsonify(job), 202 if created else 200
+
+
+@bp.route("container/jobs/<job_id>", methods=["GET"])
+def get_job(job_id: str) -> Response:
+    job = RunnerJobs.get(job_id)
+    if not job:
+        abort(404)
+    return jsonify(job)
+
+
+@bp.route("container/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id: str) -> Response:
+    job = RunnerJobs.cancel(app, job_id)
+    if not job:
+        abort(404)
+    return jsonify(job)
+
+
 @bp.route("container/<command>", methods=["GET"])
 def run_command(command: str) -> Optional[Any]:
     """Endpoint which will can execute any of the below commands.
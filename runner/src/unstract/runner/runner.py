@@ -14,7 +14,7 @@ from unstract.runner.clients.interface import (
 from unstract.runner.constants import Env, LogLevel, LogType, ToolKey
 from unstract.runner.exception import ToolRunException
 
-from unstract.core.constants import LogFieldName
+from unstract.core.constants import LogFieldName, ToolRunErrorType
 from unstract.core.pubsub_helper import LogPublisher
 
 load_dotenv()
@@ -181,6 +181,7 @@ class UnstractRunner:
         envs: dict[str, Any],
         messaging_channel: Optional[str] = None,
         container_name: Optional[str] = None,
+        isolate_file_execution: bool = False,
     ) -> Optional[Any]:
         """RUN container With RUN Command.
 
@@ -190,6 +191,8 @@ class UnstractRunner:
             settings (dict[str, Any]): Tool settings
             envs (dict[str, Any]): Tool env
             messaging_channel (Optional[str], optional): socket io channel
+            isolate_file_execution (bool): Run the file in a directory of its
+                own, named by its file execution ID
 
         Returns:
             Optional[Any]: _description_
@@ -201,6 +204,19 @@ class UnstractRunner:
             workflow_id,
             execution_id,
         )
+        if isolate_file_execution:
+            envs[Env.EXECUTION_DATA_DIR] = os.path.join(
+                envs[Env.EXECUTION_DATA_DIR], file_execution_id
+            )
+        # Text extracted by tools, shared by the organization's workflows
+        envs[Env.EXTRACTION_CACHE_DIR] = os.path.join(
+            os.getenv(Env.WORKFLOW_EXECUTION_DIR_PREFIX, ""),
+            organization_id,
+            "extraction_cache",
+        )
+        envs[Env.EXTRACTION_CACHE_MAX_SIZE_MB] = os.getenv(
+            Env.EXTRACTION_CACHE_MAX_SIZE_MB, "1024"
+        )
         envs[Env.WORKFLOW_EXECUTION_FILE_STORAGE_CREDENTIALS] = os.getenv(
             Env.WORKFLOW_EXECUTION_FILE_STORAGE_CREDENTIALS, "{}"
         )
@@ -256,12 +272,22 @@ class UnstractRunner:
                 stack_info=True,
                 exc_info=True,
             )
-            result = {"type": "RESULT", "result": None, "error": str(te.message)}
+            result = {
+                "type": "RESULT",
+                "result": None,
+                "error": str(te.message),
+                "error_type": ToolRunErrorType.TOOL,
+            }
         except Exception as e:
             self.logger.error(
                 f"Failed to run docker container: {e}", stack_info=True, exc_info=True
             )
-            result = {"type": "RESULT", "result": None, "error": str(e)}
+            result = {
+                "type": "RESULT",
+                "result": None,
+                "error": str(e),
+                "error_type": ToolRunErrorType.RUNNER,
+            }
         if container:
             container.cleanup()
         return result
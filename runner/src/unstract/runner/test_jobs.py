@@ -0,0 +1,250 @@
+import json
+from typing import Any, Callable, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from unstract.runner.jobs import RunnerJobs
+
+from unstract.core.constants import RunnerJobKey, RunnerJobStatus
+
+JOBS_MODULE = "unstract.runner.jobs"
+JOB_ID = "tool-file-1"
+
+
+class FakePipeline:
+    """Runs commands on `FakeRedis` right away while watching keys, and
+    queues them once `multi` is called, like a `redis-py` pipeline."""
+
+    def __init__(self, redis: "FakeRedis", buffered: bool = True) -> None:
+        self.redis = redis
+        self.buffered = buffered
+        self.commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def multi(self) -> None:
+        self.buffered = True
+
+    def __getattr__(self, name: str) -> Any:
+        def command(*args: Any, **kwargs: Any) -> Any:
+            if not self.buffered:
+                return getattr(self.redis, name)(*args, **kwargs)
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    def execute(self) -> list[Any]:
+        commands, self.commands = self.commands, []
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+
+class FakeRedis:
+    """Keeps the keys of a `Redis` client with decoded responses in
+    memory, without expiry."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self)
+
+    def transaction(
+        self,
+        func: Callable[[FakePipeline], Any],
+        *watches: str,
+        value_from_callable: bool = False,
+    ) -> Any:
+        pipeline = FakePipeline(self, buffered=False)
+        value = func(pipeline)
+        results = pipeline.execute()
+        return value if value_from_callable else results
+
+    def hsetnx(self, key: str, field: str, value: Any) -> bool:
+        fields = self.data.setdefault(key, {})
+        if field in fields:
+            return False
+        fields[field] = str(value)
+        return True
+
+    def hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.data.setdefault(key, {}).update(
+            {field: str(value) for field, value in mapping.items()}
+        )
+        return len(mapping)
+
+    def hget(self, key: str, field: str) -> Optional[str]:
+        return self.data.get(key, {}).get(field)
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.data.get(key, {}))
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        self.data[key] = str(value)
+        return True
+
+    def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return key in self.data
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def rpush(self, key: str, value: Any) -> int:
+        self.data.setdefault(key, []).append(value)
+        return len(self.data[key])
+
+
+@pytest.fixture
+def redis(mocker):
+    fake_redis = FakeRedis()
+    mocker.patch.object(RunnerJobs, "r", fake_redis)
+    mocker.patch.object(RunnerJobs, "_owned_jobs", set())
+    return fake_redis
+
+
+@pytest.fixture
+def executor(mocker):
+    """Executor taking the jobs submitted, which tests run themselves."""
+    executor = MagicMock()
+    mocker.patch.object(RunnerJobs, "_get_executor", return_value=executor)
+    return executor
+
+
+@pytest.fixture
+def runner(mocker):
+    runner_class = mocker.patch(f"{JOBS_MODULE}.UnstractRunner")
+    return runner_class.return_value
+
+
+def get_run_request() -> dict[str, Any]:
+    return {
+        "container_name": JOB_ID,
+        "image_name": "unstract/tool",
+        "image_tag": "1.0.0",
+        "organization_id": "org",
+        "workflow_id": "workflow",
+        "execution_id": "execution",
+        "file_execution_id": "file-1",
+        "settings": {},
+        "envs": {},
+        "messaging_channel": "channel",
+    }
+
+
+def run_submitted_job(executor: MagicMock) -> None:
+    _, app, job_id, data = executor.submit.call_args.args
+    RunnerJobs._run(app, job_id, data)
+
+
+def notifications(redis: FakeRedis) -> list[str]:
+    return list(redis.data.get(f"{RunnerJobKey.DONE_PREFIX}{JOB_ID}", []))
+
+
+def test_job_runs_and_notifies_completion(redis, executor, runner):
+    runner.run_container.return_value = {"type": "RESULT", "result": "output"}
+
+    job, created = RunnerJobs.submit(MagicMock(), get_run_request())
+    assert created
+    assert job == {"job_id": JOB_ID, "status": RunnerJobStatus.QUEUED}
+    run_submitted_job(executor)
+
+    assert RunnerJobs.get(JOB_ID) == {
+        "job_id": JOB_ID,
+        "status": RunnerJobStatus.COMPLETED,
+        "result": {"type": "RESULT", "result": "output"},
+    }
+    assert notifications(redis) == [RunnerJobStatus.COMPLETED]
+    # The heartbeat of a finished job is dropped
+    assert not redis.exists(f"{RunnerJobKey.HEARTBEAT_PREFIX}{JOB_ID}")
+    assert RunnerJobs._owned_jobs == set()
+
+
+def test_resubmission_returns_existing_job(redis, executor, runner):
+    runner.run_container.return_value = {"type": "RESULT", "result": "output"}
+
+    RunnerJobs.submit(MagicMock(), get_run_request())
+    job, created = RunnerJobs.submit(MagicMock(), get_run_request())
+    assert not created
+    assert job == {"job_id": JOB_ID, "status": RunnerJobStatus.QUEUED}
+
+    run_submitted_job(executor)
+    job, created = RunnerJobs.submit(MagicMock(), get_run_request())
+    assert not created
+    assert job["status"] == RunnerJobStatus.COMPLETED
+    executor.submit.assert_called_once()
+    runner.run_container.assert_called_once()
+
+
+def test_cancel_while_queued_skips_run(redis, executor, runner):
+    RunnerJobs.submit(MagicMock(), get_run_request())
+
+    job = RunnerJobs.cancel(MagicMock(), JOB_ID)
+    assert job["status"] == RunnerJobStatus.CANCELLED
+    assert job["result"]["error"] == "Job cancelled"
+    runner.client.stop_container.assert_not_called()
+
+    run_submitted_job(executor)
+    runner.run_container.assert_not_called()
+    assert RunnerJobs.get(JOB_ID)["status"] == RunnerJobStatus.CANCELLED
+    assert notifications(redis) == [RunnerJobStatus.CANCELLED]
+
+
+def test_cancel_while_running_stops_container(redis, executor, runner):
+    def run_container(**kwargs: Any) -> dict[str, Any]:
+        # The container is stopped and whatever the run returns is dropped
+        assert RunnerJobs.get(JOB_ID)["status"] == RunnerJobStatus.RUNNING
+        RunnerJobs.cancel(MagicMock(), JOB_ID)
+        return {"type": "RESULT", "result": None, "error": "Container stopped"}
+
+    runner.run_container.side_effect = run_container
+    RunnerJobs.submit(MagicMock(), get_run_request())
+    run_submitted_job(executor)
+
+    runner.client.stop_container.assert_called_once_with(JOB_ID)
+    job = RunnerJobs.get(JOB_ID)
+    assert job["status"] == RunnerJobStatus.CANCELLED
+    assert job["result"]["error"] == "Job cancelled"
+    assert notifications(redis) == [RunnerJobStatus.CANCELLED]
+
+
+def test_cancel_finished_job_keeps_it(redis, executor, runner):
+    runner.run_container.return_value = {"type": "RESULT", "result": "output"}
+    RunnerJobs.submit(MagicMock(), get_run_request())
+    run_submitted_job(executor)
+
+    assert RunnerJobs.cancel(MagicMock(), JOB_ID)["status"] == (
+        RunnerJobStatus.COMPLETED
+    )
+    assert RunnerJobs.cancel(MagicMock(), "unknown") is None
+
+
+def test_orphaned_job_failed_once_heartbeat_expires(redis, executor, runner):
+    RunnerJobs.submit(MagicMock(), get_run_request())
+    assert RunnerJobs.get(JOB_ID)["status"] == RunnerJobStatus.QUEUED
+
+    # The runner owning the job stopped, its heartbeat expired
+    redis.delete(f"{RunnerJobKey.HEARTBEAT_PREFIX}{JOB_ID}")
+    job = RunnerJobs.get(JOB_ID)
+    assert job["status"] == RunnerJobStatus.FAILED
+    assert job["result"]["error"] == "Runner stopped before the tool run finished"
+    assert RunnerJobs.get(JOB_ID) == job
+    assert notifications(redis) == [RunnerJobStatus.FAILED]
+
+
+def test_failed_run_fails_job(redis, executor, runner):
+    runner.run_container.side_effect = RuntimeError("Docker unavailable")
+
+    RunnerJobs.submit(MagicMock(), get_run_request())
+    run_submitted_job(executor)
+
+    job = RunnerJobs.get(JOB_ID)
+    assert job["status"] == RunnerJobStatus.FAILED
+    assert job["result"]["error"] == "Docker unavailable"
+    assert json.loads(redis.hget(f"{RunnerJobKey.PREFIX}{JOB_ID}", "result")) == (
+        job["result"]
+    )
+    assert notifications(redis) == [RunnerJobStatus.FAILED]
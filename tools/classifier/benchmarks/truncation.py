@@ -0,0 +1,58 @@
+"""Benchmarks truncation of extracted text to the LLM's byte budget.
+
+Run from the tool's folder with `python benchmarks/truncation.py`. The
+previous approach, which re-encoded the growing text for every byte, is
+quadratic and only run up to `LEGACY_MAX_SIZE`.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from truncation import truncate_to_bytes  # type: ignore  # noqa: E402
+
+SIZES = [10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+LEGACY_MAX_SIZE = 100 * 1024
+# Budget of a 128k token context window, as computed by the tool
+MAX_BYTES = int(127_000 * 1.3)
+SAMPLE = "Invoice № 42 — total 1 250,00 €, due 30 días. 請求書 ✓\n"
+
+
+def legacy_truncate(text: str, max_bytes: int) -> str:
+    limited_text = ""
+    for byte in text.encode():
+        if len(limited_text.encode()) < max_bytes:
+            limited_text += chr(byte)
+        else:
+            break
+    return limited_text
+
+
+def make_text(size: int) -> str:
+    repeats = size // len(SAMPLE.encode()) + 1
+    return truncate_to_bytes(SAMPLE * repeats, size)
+
+
+def measure(func, text: str) -> float:
+    runs = 3
+    return min(timeit.repeat(lambda: func(text, MAX_BYTES), number=1, repeat=runs))
+
+
+def main() -> None:
+    print(f"{'input':>10} {'truncated':>10} {'legacy':>10}")
+    for size in SIZES:
+        text = make_text(size)
+        truncated = truncate_to_bytes(text, MAX_BYTES)
+        assert len(truncated.encode()) <= MAX_BYTES
+        assert text.startswith(truncated)
+        new = f"{measure(truncate_to_bytes, text) * 1000:.2f}ms"
+        legacy = "skipped"
+        if size <= LEGACY_MAX_SIZE:
+            legacy = f"{measure(legacy_truncate, text) * 1000:.2f}ms"
+        print(f"{size // 1024:>8}KB {new:>10} {legacy:>10}")
+
+
+if __name__ == "__main__":
+    main()
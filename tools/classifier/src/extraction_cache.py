@@ -0,0 +1,163 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from unstract.sdk.adapter import ToolAdapter
+from unstract.sdk.constants import LogLevel, MetadataKey
+from unstract.sdk.file_storage import FileStorage
+from unstract.sdk.tool.base import BaseTool
+from unstract.sdk.utils import ToolUtils
+
+EXTRACTION_CACHE_DIR = "EXTRACTION_CACHE_DIR"
+EXTRACTION_CACHE_MAX_SIZE_MB = "EXTRACTION_CACHE_MAX_SIZE_MB"
+
+
+class ExtractionCache:
+    """Text extracted from documents, reused across runs and workflows of
+    an organization.
+
+    Entries are kept in the workflow execution file storage under
+    `EXTRACTION_CACHE_DIR`, keyed by the content hash of the file extracted,
+    the x2text adapter and a hash of the adapter's configuration. They are
+    spread over shards by key prefix, and a shard outgrowing its part of
+    `EXTRACTION_CACHE_MAX_SIZE_MB` evicts its oldest entries when written
+    to, so that eviction never lists the whole cache.
+
+    The classifier and text extractor tools, built as separate images, each
+    carry an identical copy of this module so that they share entries.
+    """
+
+    SHARDS = 256
+    # Fields of the modification time in a detailed listing of local, S3,
+    # GCS and Azure storage
+    MODIFICATION_TIME_FIELDS = ("mtime", "LastModified", "updated", "last_modified")
+
+    def __init__(self, tool: BaseTool, fs: FileStorage, cache_dir: str) -> None:
+        self.tool = tool
+        self.fs = fs
+        self.cache_dir = cache_dir
+        max_size = int(tool.get_env_or_die(EXTRACTION_CACHE_MAX_SIZE_MB))
+        self.max_shard_size = max_size * 1024 * 1024 // self.SHARDS
+
+    @classmethod
+    def from_env(cls, tool: BaseTool, fs: FileStorage) -> Optional["ExtractionCache"]:
+        """Cache configured for the tool, None if not set up."""
+        cache_dir = os.environ.get(EXTRACTION_CACHE_DIR)
+        if not cache_dir:
+            tool.stream_log(
+                f"Extraction cache is not available, {EXTRACTION_CACHE_DIR} "
+                "is not set.",
+                level=LogLevel.WARN,
+            )
+            return None
+        return cls(tool=tool, fs=fs, cache_dir=cache_dir)
+
+    def get_key(self, adapter_instance_id: str, input_file: str) -> Optional[str]:
+        """Key of the text extracted from a file by an adapter.
+
+        The content hash of the source file is known already, other input
+        files, such as the output of an earlier tool, are hashed.
+
+        Args:
+            adapter_instance_id (str): ID of the x2text adapter
+            input_file (str): Path of the file to extract text from
+
+        Returns:
+            Optional[str]: Cache key, None if it cannot be determined
+        """
+        try:
+            file_hash = self._get_file_hash(input_file)
+            adapter_config = ToolAdapter.get_adapter_config(
+                self.tool, adapter_instance_id
+            )
+        except Exception as e:
+            self.tool.stream_log(
+                f"Unable to determine the extraction cache key, "
+                f"skipping extraction cache: {e}",
+                level=LogLevel.WARN,
+            )
+            return None
+        if not file_hash:
+            return None
+        config_hash = ToolUtils.hash_str(
+            json.dumps(adapter_config, sort_keys=True, default=str)
+        )
+        return ToolUtils.hash_str(f"{file_hash}:{adapter_instance_id}:{config_hash}")
+
+    def _get_file_hash(self, input_file: str) -> Optional[str]:
+        if input_file == self.tool.get_source_file():
+            source_hash: Optional[str] = self.tool.get_exec_metadata.get(
+                MetadataKey.SOURCE_HASH
+            )
+            if source_hash:
+                return source_hash
+        file_hash: str = self.fs.get_hash_from_file(path=input_file)
+        return file_hash
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._get_path(key)
+        try:
+            if not self.fs.exists(path):
+                return None
+            text: str = self.fs.read(path=path, mode="r")
+        except Exception as e:
+            self.tool.stream_log(
+                f"Unable to read extraction cache: {e}", level=LogLevel.WARN
+            )
+            return None
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        path = self._get_path(key)
+        try:
+            self.fs.mkdir(os.path.dirname(path), create_parents=True)
+            self.fs.write(path=path, mode="w", data=text)
+            self._evict(os.path.dirname(path))
+        except Exception as e:
+            self.tool.stream_log(
+                f"Unable to write extraction cache: {e}", level=LogLevel.WARN
+            )
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def _evict(self, shard_dir: str) -> None:
+        """Removes the oldest entries of a shard beyond its size.
+
+        Sizes and modification times come from a single detailed listing of
+        the shard, instead of a request per entry on remote storage.
+        """
+        entries: list[tuple[float, int, str]] = []
+        for info in self.fs.fs.ls(shard_dir, detail=True):
+            if info.get("type") != "file":
+                continue
+            entries.append(
+                (self._get_modification_time(info), int(info["size"]), info["name"])
+            )
+        shard_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if shard_size <= self.max_shard_size:
+                break
+            self.fs.rm(path)
+            shard_size -= size
+
+    @classmethod
+    def _get_modification_time(cls, info: dict[str, Any]) -> float:
+        """Modification time of an entry of a detailed listing, as a
+        timestamp, named differently by each file system."""
+        for field in cls.MODIFICATION_TIME_FIELDS:
+            value = info.get(field)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                return value.timestamp()
+            if isinstance(value, str):
+                try:
+                    return datetime.fromisoformat(
+                        value.replace("Z", "+00:00")
+                    ).timestamp()
+                except ValueError:
+                    continue
+            return float(value)
+        return 0.0
@@ -1,7 +1,9 @@
+import json
 import re
 from pathlib import Path
 from typing import Any, Optional
 
+from extraction_cache import ExtractionCache  # type: ignore
 from unstract.sdk.cache import ToolCache
 from unstract.sdk.constants import LogLevel, MetadataKey, ToolEnv, UsageKwargs
 from unstract.sdk.llm import LLM
@@ -27,6 +29,18 @@ class ClassifierHelper:
         """
         self.tool = tool
         self.output_dir = output_dir
+        self._cache: Optional[ToolCache] = None
+
+    @property
+    def cache(self) -> ToolCache:
+        """Cache client shared by all cache reads and writes of a run."""
+        if self._cache is None:
+            self._cache = ToolCache(
+                tool=self.tool,
+                platform_host=self.tool.get_env_or_die(ToolEnv.PLATFORM_HOST),
+                platform_port=int(self.tool.get_env_or_die(ToolEnv.PLATFORM_PORT)),
+            )
+        return self._cache
 
     def stream_error_and_exit(
         self, message: str, bin_to_copy_to: str = ReservedBins.FAILED
@@ -104,12 +118,19 @@ class ClassifierHelper:
             self.stream_error_and_exit(f"Error copying file: {e}")
 
     def extract_text(
-        self, file: str, text_extraction_adapter_id: Optional[str]
+        self,
+        file: str,
+        text_extraction_adapter_id: Optional[str],
+        use_cache: bool = False,
     ) -> Optional[str]:
         """Extract text from file.
 
         Args:
             file (str): The path to the input file
+            text_extraction_adapter_id (Optional[str]): X2Text adapter to
+                extract with, file is read as text if not provided
+            use_cache (bool): Whether to reuse text extracted earlier from
+                the same file content with the same adapter configuration
 
         Returns:
             str: page content
@@ -117,7 +138,28 @@ class ClassifierHelper:
         if not text_extraction_adapter_id:
             return self._extract_from_file(file)
 
-        return self._extract_from_adapter(file, text_extraction_adapter_id)
+        cache: Optional[ExtractionCache] = None
+        cache_key: Optional[str] = None
+        if use_cache:
+            cache = ExtractionCache.from_env(
+                tool=self.tool, fs=self.tool.workflow_filestorage
+            )
+        if cache:
+            cache_key = cache.get_key(
+                adapter_instance_id=text_extraction_adapter_id, input_file=file
+            )
+        if cache and cache_key:
+            self.tool.stream_log("Trying to fetch extracted text from cache.")
+            cached_text = cache.get(cache_key)
+            if cached_text:
+                self.tool.stream_log("Extracted text found in cache.")
+                return cached_text
+
+        text = self._extract_from_adapter(file, text_extraction_adapter_id)
+        if cache and cache_key and text:
+            self.tool.stream_log("Saving extracted text to cache.")
+            cache.set(cache_key, text)
+        return text
 
     def _extract_from_adapter(self, file: str, adapter_id: str) -> Optional[str]:
         """Extract text from adapter.
@@ -176,17 +218,19 @@ class ClassifierHelper:
     def find_classification(
         self,
         use_cache: bool,
-        settings_string: str,
+        text: str,
         bins: list[str],
+        llm_adapter_id: str,
         prompt: str,
         llm: LLM,
     ) -> Optional[str]:
         """Find classification for text.
         Args:
             use_cache (bool): Whether to use cache
-            settings_string (str): hash of settings
-            prompt (str): Prompt
+            text (str): Text to classify, as sent to the LLM
             bins (list[str]): Classification Bins
+            llm_adapter_id (str): ID of the LLM adapter used to classify
+            prompt (str): Prompt
             llm (LLM): LLM
 
         Returns:
@@ -198,13 +242,11 @@ class ClassifierHelper:
         classification = None
         cache_key = None
         if use_cache:
-            cache_key = (
-                f"cache:{self.tool.workflow_id}:"
-                f"{ToolUtils.hash_str(settings_string)}:"
-                f"{ToolUtils.hash_str(prompt)}"
+            cache_key = self._get_classification_cache_key(
+                text=text, bins=bins, llm_adapter_id=llm_adapter_id
             )
             self.tool.stream_log("Trying to fetch result from cache.")
-            classification = self.get_result_from_cache(cache_key=cache_key)
+            classification = self.get_result_from_cache(cache_key=cache_key, bins=bins)
             if classification is not None:
                 return classification
 
@@ -216,6 +258,30 @@ class ClassifierHelper:
             self.save_result_to_cache(cache_key=cache_key, result=classification)
         return classification
 
+    def _get_classification_cache_key(
+        self, text: str, bins: list[str], llm_adapter_id: str
+    ) -> str:
+        """Cache key for a classification.
+
+        Normalised over the order of bins so that reordering them hits the
+        same entry. Their case is kept, a classification being one of them.
+
+        Args:
+            text (str): Text to classify
+            bins (list[str]): Classification Bins
+            llm_adapter_id (str): ID of the LLM adapter used to classify
+
+        Returns:
+            str: Cache key
+        """
+        normalised_bins = sorted({bin.strip() for bin in bins})
+        return (
+            f"cache:{self.tool.workflow_id}:classify:"
+            f"{ToolUtils.hash_str(text)}:"
+            f"{ToolUtils.hash_str(json.dumps(normalised_bins))}:"
+            f"{llm_adapter_id}"
+        )
+
     def call_llm(self, prompt: str, llm: LLM) -> str:
         """Call LLM.
 
@@ -278,26 +344,31 @@ class ClassifierHelper:
             )
         return classification
 
-    def get_result_from_cache(self, cache_key: str) -> Optional[str]:
+    def get_result_from_cache(self, cache_key: str, bins: list[str]) -> Optional[str]:
         """Get result from cache.
 
+        A cached classification is matched onto the bins like an LLM
+        response, and treated as a miss if it's none of them.
+
         Args:
             cache_key (str): key
+            bins (list[str]): Classification Bins
 
         Returns:
             Optional[str]: result
         """
-        cache = ToolCache(
-            tool=self.tool,
-            platform_host=self.tool.get_env_or_die(ToolEnv.PLATFORM_HOST),
-            platform_port=int(self.tool.get_env_or_die(ToolEnv.PLATFORM_PORT)),
-        )
-        cached_response: Optional[str] = cache.get(cache_key)
-        if cached_response is not None:
-            classification = cached_response
-            self.tool.stream_cost(cost=0.0, cost_units="cache")
-            return classification
-        return None
+        cached_response: Optional[str] = self.cache.get(cache_key)
+        if cached_response is None:
+            return None
+        classification = cached_response.strip().lower()
+        if classification not in {bin.lower() for bin in bins}:
+            self.tool.stream_log(
+                f"Cached classification '{cached_response}' is not one of the "
+                "bins, ignoring it."
+            )
+            return None
+        self.tool.stream_cost(cost=0.0, cost_units="cache")
+        return classification
 
     def save_result_to_cache(self, cache_key: str, result: Any) -> None:
         """Save result to cache.
@@ -308,9 +379,4 @@ class ClassifierHelper:
         Returns:
             None: None
         """
-        cache = ToolCache(
-            tool=self.tool,
-            platform_host=self.tool.get_env_or_die(ToolEnv.PLATFORM_HOST),
-            platform_port=int(self.tool.get_env_or_die(ToolEnv.PLATFORM_PORT)),
-        )
-        cache.set(cache_key, result)
+        self.cache.set(cache_key, result)
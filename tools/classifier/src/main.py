@@ -3,6 +3,7 @@ from typing import Any, Optional
 
 from helper import ClassifierHelper  # type: ignore
 from helper import ReservedBins
+from truncation import truncate_to_bytes  # type: ignore
 from unstract.sdk.constants import (
     LogLevel,
     LogState,
@@ -63,6 +64,7 @@ class UnstractClassifier(BaseTool):
         text: Optional[str] = self.helper.extract_text(
             file=input_file,
             text_extraction_adapter_id=text_extraction_adapter_id,
+            use_cache=use_cache,
         )
         if not text:
             self.helper.stream_error_and_exit("Unable to extract text")
@@ -104,13 +106,7 @@ class UnstractClassifier(BaseTool):
         max_tokens = llm.get_max_tokens(reserved_for_output=50 + 1000)
         max_bytes = int(max_tokens * 1.3)
         self.stream_log(f"LLM Max tokens: {max_tokens} ==> Max bytes: {max_bytes}")
-        limited_text = ""
-        for byte in text.encode():
-            if len(limited_text.encode()) < max_bytes:
-                limited_text += chr(byte)
-            else:
-                break
-        text = limited_text
+        text = truncate_to_bytes(text, max_bytes)
         self.stream_log(f"Length of text: {len(text.encode())} {len(text)}")
 
         prompt = (
@@ -121,12 +117,12 @@ class UnstractClassifier(BaseTool):
             f"Do not enclose the result within single quotes.\n\nText:\n\n{text}\n\n\nCategory:"  # noqa: E501
         )
 
-        settings_string = "".join(str(value) for value in settings.values())
         classification = self.helper.find_classification(
             use_cache=use_cache,
-            settings_string=settings_string,
-            prompt=prompt,
+            text=text,
             bins=bins,
+            llm_adapter_id=llm_adapter_instance_id,
+            prompt=prompt,
             llm=llm,
         )
 
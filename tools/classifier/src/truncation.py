@@ -0,0 +1,22 @@
+def truncate_to_bytes(text: str, max_bytes: int) -> str:
+    """Truncates text to at most `max_bytes` bytes of UTF-8.
+
+    The text is encoded once and cut at the byte limit, which is linear in
+    the length of the text. A character split by the cut is dropped whole
+    rather than left as a partial byte sequence.
+
+    Args:
+        text (str): Text to truncate
+        max_bytes (int): Maximum size of the UTF-8 encoded text
+
+    Returns:
+        str: Longest prefix of the text within `max_bytes`
+    """
+    if max_bytes <= 0:
+        return ""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    # Text encoded from a str is valid UTF-8, so only a character split at
+    # the end of the cut can fail to decode
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
@@ -0,0 +1,79 @@
+import unittest
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+from helper import ClassifierHelper  # type: ignore
+
+
+class FakeToolCache:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.data.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.data[key] = value
+
+
+class TestFindClassification(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tool = MagicMock(workflow_id="workflow")
+        self.helper = ClassifierHelper(tool=self.tool, output_dir="output")
+        self.helper._cache = FakeToolCache()
+        hash_str = patch("helper.ToolUtils.hash_str", side_effect=lambda text: text)
+        hash_str.start()
+        self.addCleanup(hash_str.stop)
+        self.llm = MagicMock()
+
+    def classify(self, bins: list[str], response: str = "invoice") -> Optional[str]:
+        self.llm.complete.return_value = {"response": MagicMock(text=response)}
+        with patch("helper.LLM.RESPONSE", "response"):
+            return self.helper.find_classification(
+                use_cache=True,
+                text="text",
+                bins=bins,
+                llm_adapter_id="llm",
+                prompt="prompt",
+                llm=self.llm,
+            )
+
+    def test_cached_classification_reused_for_reordered_bins(self) -> None:
+        self.assertEqual(self.classify(["invoice", "receipt", "unknown"]), "invoice")
+        self.llm.complete.reset_mock()
+
+        self.assertEqual(self.classify(["receipt", "unknown", "invoice"]), "invoice")
+        self.llm.complete.assert_not_called()
+        self.tool.stream_cost.assert_called_once_with(cost=0.0, cost_units="cache")
+
+    def test_bins_of_other_case_classified_again(self) -> None:
+        self.classify(["Invoice", "receipt", "unknown"], response="Invoice")
+        self.llm.complete.reset_mock()
+
+        self.assertEqual(self.classify(["invoice", "receipt", "unknown"]), "invoice")
+        self.llm.complete.assert_called_once()
+
+    def test_cached_classification_of_no_bin_is_a_miss(self) -> None:
+        bins = ["invoice", "receipt", "unknown"]
+        cache_key = self.helper._get_classification_cache_key(
+            text="text", bins=bins, llm_adapter_id="llm"
+        )
+        self.helper.cache.set(cache_key, "Contract")
+
+        self.assertEqual(self.classify(bins), "invoice")
+        self.llm.complete.assert_called_once()
+        self.assertEqual(self.helper.cache.get(cache_key), "invoice")
+
+    def test_cached_classification_matched_onto_bins(self) -> None:
+        bins = ["invoice", "receipt", "unknown"]
+        cache_key = self.helper._get_classification_cache_key(
+            text="text", bins=bins, llm_adapter_id="llm"
+        )
+        self.helper.cache.set(cache_key, " Invoice ")
+
+        self.assertEqual(self.classify(bins), "invoice")
+        self.llm.complete.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
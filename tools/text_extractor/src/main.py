@@ -1,8 +1,9 @@
 import ast
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
+from extraction_cache import ExtractionCache  # type: ignore
 from unstract.sdk.constants import LogState, UsageKwargs
 from unstract.sdk.tool.base import BaseTool
 from unstract.sdk.tool.entrypoint import ToolEntrypoint
@@ -44,6 +45,7 @@ class TextExtractor(BaseTool):
             None
         """
         text_extraction_adapter_id = settings["extractorId"]
+        use_cache = settings.get("useExtractionCache", False)
 
         self.stream_log(
             f"Extractor ID: {text_extraction_adapter_id} "
@@ -53,22 +55,48 @@ class TextExtractor(BaseTool):
         input_log = f"Processing file: \n\n`{self.source_file_name}`"
         self.stream_update(input_log, state=LogState.INPUT_UPDATE)
 
-        usage_kwargs: dict[Any, Any] = dict()
-        usage_kwargs[UsageKwargs.RUN_ID] = self.file_execution_id
-        usage_kwargs[UsageKwargs.FILE_NAME] = self.source_file_name
-
-        text_extraction_adapter = X2Text(
-            tool=self,
-            adapter_instance_id=text_extraction_adapter_id,
-            usage_kwargs=usage_kwargs,
-        )
-        self.stream_log("Text extraction adapter has been created successfully.")
-        extraction_result: TextExtractionResult = text_extraction_adapter.process(
-            input_file_path=input_file, fs=self.workflow_filestorage, tags=self.tags
-        )
-        extracted_text = self.convert_to_actual_string(extraction_result.extracted_text)
-
-        self.stream_log("Text has been extracted successfully.")
+        cache: Optional[ExtractionCache] = None
+        cache_key: Optional[str] = None
+        if use_cache:
+            cache = ExtractionCache.from_env(tool=self, fs=self.workflow_filestorage)
+        if cache:
+            cache_key = cache.get_key(
+                adapter_instance_id=text_extraction_adapter_id, input_file=input_file
+            )
+        extracted_text: Optional[str] = None
+        if cache and cache_key:
+            self.stream_log("Trying to fetch extracted text from cache.")
+            extracted_text = cache.get(cache_key)
+
+        cache_hit = extracted_text is not None
+        if cache_hit:
+            self.stream_log("Extracted text found in cache, skipping extraction.")
+            self.stream_cost(cost=0.0, cost_units="cache")
+        else:
+            usage_kwargs: dict[Any, Any] = dict()
+            usage_kwargs[UsageKwargs.RUN_ID] = self.file_execution_id
+            usage_kwargs[UsageKwargs.FILE_NAME] = self.source_file_name
+
+            text_extraction_adapter = X2Text(
+                tool=self,
+                adapter_instance_id=text_extraction_adapter_id,
+                usage_kwargs=usage_kwargs,
+            )
+            self.stream_log("Text extraction adapter has been created successfully.")
+            extraction_result: TextExtractionResult = text_extraction_adapter.process(
+                input_file_path=input_file,
+                fs=self.workflow_filestorage,
+                tags=self.tags,
+            )
+            extracted_text = self.convert_to_actual_string(
+                extraction_result.extracted_text
+            )
+            self.stream_log("Text has been extracted successfully.")
+            if cache and cache_key and extracted_text:
+                self.stream_log("Saving extracted text to cache.")
+                cache.set(cache_key, extracted_text)
+        if use_cache:
+            self.update_exec_metadata({"extraction_cache_hit": cache_hit})
 
         first_5_lines = "\n\n".join(extracted_text.split("\n")[:5])
         output_log = f"### Text\n\n```text\n{first_5_lines}\n```\n\n...(truncated)"
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import fsspec
+from extraction_cache import ExtractionCache  # type: ignore
+from unstract.sdk.constants import MetadataKey
+
+
+class FakeFileStorage:
+    """File storage of the local file system, counting requests."""
+
+    def __init__(self) -> None:
+        self.fs = MagicMock(wraps=fsspec.filesystem("file"))
+
+    def exists(self, path: str) -> bool:
+        return bool(self.fs.exists(path))
+
+    def read(self, path: str, mode: str = "r") -> Any:
+        with self.fs.open(path, mode) as f:
+            return f.read()
+
+    def write(self, path: str, mode: str, data: Any) -> None:
+        with self.fs.open(path, mode) as f:
+            f.write(data)
+
+    def mkdir(self, path: str, create_parents: bool = True) -> None:
+        self.fs.makedirs(path, exist_ok=True)
+
+    def rm(self, path: str) -> None:
+        self.fs.rm(path)
+
+    def get_hash_from_file(self, path: str) -> str:
+        return hashlib.sha256(self.fs.cat_file(path)).hexdigest()
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tool = MagicMock()
+        # A MB over all shards, 4 KiB per shard
+        self.tool.get_env_or_die.return_value = "1"
+        self.fs = FakeFileStorage()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_dir = tmp_dir.name
+        self.cache = ExtractionCache(
+            tool=self.tool, fs=self.fs, cache_dir=self.cache_dir
+        )
+
+    def _set(self, key: str, size: int, mtime: float) -> None:
+        self.cache.set(key, "x" * size)
+        os.utime(self.cache._get_path(key), (mtime, mtime))
+
+    def test_reads_back_text(self) -> None:
+        self.cache.set("ab01", "extracted text")
+        self.assertEqual(self.cache.get("ab01"), "extracted text")
+        self.assertIsNone(self.cache.get("ab02"))
+
+    def test_evicts_oldest_entries_beyond_shard_size(self) -> None:
+        self._set("ab01", size=1200, mtime=1000)
+        self._set("ab02", size=1200, mtime=3000)
+        self._set("ab03", size=1200, mtime=2000)
+
+        self.cache.set("ab04", "x" * 2000)
+
+        self.assertIsNone(self.cache.get("ab01"))
+        self.assertIsNone(self.cache.get("ab03"))
+        self.assertIsNotNone(self.cache.get("ab02"))
+        self.assertIsNotNone(self.cache.get("ab04"))
+
+    def test_eviction_keeps_other_shards(self) -> None:
+        self._set("ab01", size=3000, mtime=1000)
+        self.cache.set("cd01", "x" * 3000)
+
+        self.assertIsNotNone(self.cache.get("ab01"))
+        self.assertIsNotNone(self.cache.get("cd01"))
+
+    def test_eviction_lists_shard_once(self) -> None:
+        for index in range(5):
+            self.cache.set(f"ab0{index}", "text")
+        self.fs.fs.reset_mock()
+
+        self.cache.set("ab09", "text")
+
+        self.fs.fs.ls.assert_called_once_with(
+            os.path.join(self.cache_dir, "ab"), detail=True
+        )
+        self.fs.fs.info.assert_not_called()
+        self.fs.fs.modified.assert_not_called()
+        self.fs.fs.size.assert_not_called()
+
+    def test_modification_time_of_remote_listings(self) -> None:
+        updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for info in (
+            {"mtime": updated.timestamp()},
+            {"LastModified": updated},
+            {"updated": "2024-01-01T00:00:00.000Z"},
+            {"last_modified": updated},
+        ):
+            self.assertEqual(
+                ExtractionCache._get_modification_time(info), updated.timestamp()
+            )
+        self.assertEqual(ExtractionCache._get_modification_time({}), 0.0)
+
+    @patch("extraction_cache.ToolAdapter")
+    def test_key_of_source_file_uses_its_known_hash(self, tool_adapter) -> None:
+        tool_adapter.get_adapter_config.return_value = {"mode": "text"}
+        self.tool.get_source_file.return_value = "/execution/SOURCE"
+        self.tool.get_exec_metadata = {MetadataKey.SOURCE_HASH: "abc"}
+
+        key = self.cache.get_key(
+            adapter_instance_id="adapter", input_file="/execution/SOURCE"
+        )
+
+        self.assertIsNotNone(key)
+        self.fs.fs.cat_file.assert_not_called()
+
+    @patch("extraction_cache.ToolAdapter")
+    def test_key_of_other_input_file_hashes_it(self, tool_adapter) -> None:
+        tool_adapter.get_adapter_config.return_value = {"mode": "text"}
+        self.tool.get_exec_metadata = {MetadataKey.SOURCE_HASH: "abc"}
+        input_file = os.path.join(self.cache_dir, "INFILE")
+        keys = []
+        for content in ("first", "second"):
+            self.fs.write(input_file, "w", content)
+            keys.append(
+                self.cache.get_key(adapter_instance_id="adapter", input_file=input_file)
+            )
+
+        # Output of an earlier tool changes with it, the source hash doesn't
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_classifier_shares_cache(self) -> None:
+        # Both tools read and write the same entries
+        tools_dir = Path(__file__).resolve().parents[2]
+        self.assertEqual(
+            (tools_dir / "classifier" / "src" / "extraction_cache.py").read_text(),
+            (tools_dir / "text_extractor" / "src" / "extraction_cache.py").read_text(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
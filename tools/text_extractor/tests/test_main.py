@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from main import TextExtractor  # type: ignore
+from unstract.sdk.constants import MetadataKey
+
+from .test_extraction_cache import FakeFileStorage
+
+SETTINGS = {"extractorId": "adapter", "useExtractionCache": True}
+
+
+class TestTextExtractorCache(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.dir = tmp_dir.name
+        self.source_file = os.path.join(self.dir, "SOURCE")
+        self.output_dir = os.path.join(self.dir, "COPY_TO_FOLDER")
+        self.fs = FakeFileStorage()
+        self.fs.mkdir(self.output_dir)
+        self.fs.write(self.source_file, "w", "source")
+        self.exec_metadata: dict[Any, Any] = {MetadataKey.SOURCE_HASH: "abc"}
+
+        for target in (
+            patch.dict(
+                os.environ,
+                {
+                    "EXTRACTION_CACHE_DIR": os.path.join(self.dir, "cache"),
+                    "EXTRACTION_CACHE_MAX_SIZE_MB": "1",
+                },
+            ),
+            patch("extraction_cache.ToolAdapter"),
+        ):
+            target.start()
+            self.addCleanup(target.stop)
+        x2text_patch = patch("main.X2Text")
+        self.x2text = x2text_patch.start()
+        self.addCleanup(x2text_patch.stop)
+        self.x2text.return_value.process.return_value.extracted_text = "text"
+
+        tool_patch = patch.multiple(
+            TextExtractor,
+            create=True,
+            workflow_filestorage=self.fs,
+            get_exec_metadata=self.exec_metadata,
+            source_file_name="document.pdf",
+            file_execution_id="file-execution",
+            tags=[],
+            get_source_file=MagicMock(return_value=self.source_file),
+            get_env_or_die=MagicMock(side_effect=os.environ.__getitem__),
+            stream_log=MagicMock(),
+            stream_update=MagicMock(),
+            stream_cost=MagicMock(),
+            stream_error_and_exit=MagicMock(),
+            update_exec_metadata=MagicMock(),
+            write_tool_result=MagicMock(),
+        )
+        tool_patch.start()
+        self.addCleanup(tool_patch.stop)
+        self.tool = TextExtractor.__new__(TextExtractor)
+
+    def run_tool(self, input_file: str) -> None:
+        self.x2text.reset_mock()
+        self.tool.update_exec_metadata.reset_mock()
+        self.tool.run(
+            settings=SETTINGS, input_file=input_file, output_dir=self.output_dir
+        )
+
+    def test_extracts_once_for_same_file(self) -> None:
+        self.run_tool(self.source_file)
+        self.x2text.return_value.process.assert_called_once()
+        self.tool.update_exec_metadata.assert_called_once_with(
+            {"extraction_cache_hit": False}
+        )
+
+        self.run_tool(self.source_file)
+        self.x2text.assert_not_called()
+        self.tool.update_exec_metadata.assert_called_once_with(
+            {"extraction_cache_hit": True}
+        )
+        self.assertEqual(
+            self.fs.read(os.path.join(self.output_dir, "document.txt")), "text"
+        )
+
+    def test_output_of_earlier_tool_not_served_source_text(self) -> None:
+        self.run_tool(self.source_file)
+
+        # An earlier tool in the workflow rewrote the source
+        input_file = os.path.join(self.dir, "INFILE")
+        self.fs.write(input_file, "w", "rewritten")
+        self.run_tool(input_file)
+
+        self.x2text.return_value.process.assert_called_once()
+        self.tool.update_exec_metadata.assert_called_once_with(
+            {"extraction_cache_hit": False}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@ import datetime
 import json
 import logging
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 import google.api_core.exceptions
@@ -59,6 +61,10 @@ class BigQuery(UnstractDB):
     def can_read() -> bool:
         return True
 
+    @staticmethod
+    def can_bulk_insert() -> bool:
+        return True
+
     def get_engine(self) -> Client:
         return bigquery.Client.from_service_account_info(  # type: ignore
             info=self.json_credentials
@@ -150,7 +156,7 @@ class BigQuery(UnstractDB):
                 "Please enter a valid table_name to to create/insert table"
             )
         sql_keys = list(kwargs.get("sql_keys", []))
-        try:
+        with self._map_errors(table_name):
             if sql_values:
                 query_parameters = [
                     bigquery.ScalarQueryParameter(key, "STRING", value)
@@ -163,6 +169,66 @@ class BigQuery(UnstractDB):
             else:
                 query_job = engine.query(sql_query)
             query_job.result()
+
+    def bulk_insert(
+        self, engine: Any, table_name: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Appends rows to a table through a single load job.
+
+        Rows are loaded against the table's schema, so values are typed like
+        their columns instead of bound as strings like in `execute_query`.
+
+        Args:
+            engine (Any): big query client engine
+            table_name (str): db-connector table name
+                              Format  {database}.{schema}.{table}
+            rows (list[dict[str, Any]]): rows as column names and values
+
+        Raises:
+            BigQueryForbiddenException: raised due to insufficient permission
+            BigQueryNotFoundException: raised due to unavailable resource
+            ColumnMissingException: raised due to missing columns in table query
+        """
+        if not rows:
+            return
+        with self._map_errors(table_name):
+            table = engine.get_table(table_name)
+            json_columns = {
+                field.name.lower()
+                for field in table.schema
+                if field.field_type == "JSON"
+            }
+            job_config = bigquery.LoadJobConfig(
+                schema=table.schema,
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            load_job = engine.load_table_from_json(
+                [self._get_load_row(row, json_columns) for row in rows],
+                table,
+                job_config=job_config,
+            )
+            load_job.result()
+
+    @staticmethod
+    def _get_load_row(row: dict[str, Any], json_columns: set[str]) -> dict[str, Any]:
+        """Row with the values of JSON columns parsed, since they are bound
+        as their serialised strings."""
+        load_row: dict[str, Any] = {}
+        for column, value in row.items():
+            if column.lower() in json_columns and isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    pass
+            load_row[column] = value
+        return load_row
+
+    @contextmanager
+    def _map_errors(self, table_name: str) -> Iterator[None]:
+        """Maps errors of BigQuery jobs on a table to connector exceptions."""
+        try:
+            yield
         except google.api_core.exceptions.Forbidden as e:
             logger.error(f"Forbidden exception in creating/inserting data: {str(e)}")
             raise BigQueryForbiddenException(
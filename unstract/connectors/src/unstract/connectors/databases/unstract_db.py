@@ -46,6 +46,12 @@ class UnstractDB(UnstractConnector, ABC):
     def can_read() -> bool:
         return False
 
+    @staticmethod
+    def can_bulk_insert() -> bool:
+        """Whether the connector writes rows in bulk, with a
+        `bulk_insert(engine, table_name, rows)` method of its own."""
+        return False
+
     @staticmethod
     def get_connector_mode() -> ConnectorMode:
         return ConnectorMode.DATABASE
@@ -87,6 +87,11 @@ class GoogleDriveFS(UnstractFileSystem):
     def python_social_auth_backend() -> str:
         return "google-oauth2"
 
+    @staticmethod
+    def supports_concurrent_upload() -> bool:
+        # The Drive client isn't thread-safe
+        return False
+
     @staticmethod
     def can_write() -> bool:
         return True
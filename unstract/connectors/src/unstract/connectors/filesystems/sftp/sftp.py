@@ -86,6 +86,11 @@ class SftpFS(UnstractFileSystem):
     def python_social_auth_backend() -> str:
         return ""
 
+    @staticmethod
+    def supports_concurrent_upload() -> bool:
+        # A single SFTP session is shared by the filesystem
+        return False
+
     def test_credentials(self) -> bool:
         """To test credentials for SFTP."""
         is_dir = False
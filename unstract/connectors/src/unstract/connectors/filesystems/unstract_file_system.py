@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 class UnstractFileSystem(UnstractConnector, ABC):
     """Abstract class for file systems."""
 
+    # Size of the chunks files are streamed in while uploading
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(levelname)s - %(filename)s - %(message)s",
@@ -66,6 +69,14 @@ class UnstractFileSystem(UnstractConnector, ABC):
     def get_connector_mode() -> ConnectorMode:
         return ConnectorMode.FILE_SYSTEM
 
+    @staticmethod
+    def supports_concurrent_upload() -> bool:
+        """Whether files can be uploaded from several threads at once.
+
+        Override to disable for connectors whose client isn't thread-safe.
+        """
+        return True
+
     @abstractmethod
     def get_fsspec_fs(self) -> AbstractFileSystem:
         pass
@@ -95,6 +106,10 @@ class UnstractFileSystem(UnstractConnector, ABC):
         """Method to upload filepath from tool to destination connector
         directory.
 
+        The file is streamed in chunks of `UPLOAD_CHUNK_SIZE`, so that it's
+        never held in memory as a whole. Backends supporting it upload the
+        chunks as parts of a multipart upload.
+
         Args:
             source_path (str): local path of file to be uploaded, coming from tool
             destination_path (str): target path in the storage where the file will be
@@ -104,5 +119,17 @@ class UnstractFileSystem(UnstractConnector, ABC):
         destination_connector_fs = self.get_fsspec_fs()
         file_system = FileSystem(FileStorageType.WORKFLOW_EXECUTION)
         workflow_fs = file_system.get_file_storage()
-        data = workflow_fs.read(path=source_path, mode="rb")
-        destination_connector_fs.write_bytes(normalized_path, data)
+        position = 0
+        with destination_connector_fs.open(normalized_path, "wb") as destination_file:
+            while True:
+                chunk = workflow_fs.read(
+                    path=source_path,
+                    mode="rb",
+                    seek_position=position,
+                    length=self.UPLOAD_CHUNK_SIZE,
+                )
+                if chunk:
+                    destination_file.write(chunk)
+                    position += len(chunk)
+                if len(chunk) < self.UPLOAD_CHUNK_SIZE:
+                    break
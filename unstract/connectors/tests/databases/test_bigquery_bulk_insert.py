@@ -0,0 +1,92 @@
+import unittest
+from typing import Any, Optional
+
+import google.api_core.exceptions
+from google.cloud import bigquery
+
+from unstract.connectors.databases.bigquery.bigquery import BigQuery
+from unstract.connectors.databases.exceptions import (
+    BigQueryForbiddenException,
+    ColumnMissingException,
+)
+
+TABLE_NAME = "project.dataset.table"
+
+
+class FakeJob:
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+
+    def result(self) -> None:
+        if self.error:
+            raise self.error
+
+
+class FakeClient:
+    """Records the load jobs of a `bigquery.Client`."""
+
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+        self.loads: list[tuple[list[dict[str, Any]], Any]] = []
+        self.table = bigquery.Table(
+            TABLE_NAME,
+            schema=[
+                bigquery.SchemaField("id", "STRING"),
+                bigquery.SchemaField("created_at", "TIMESTAMP"),
+                bigquery.SchemaField("data", "JSON"),
+            ],
+        )
+
+    def get_table(self, table_name: str) -> bigquery.Table:
+        return self.table
+
+    def load_table_from_json(
+        self, rows: list[dict[str, Any]], table: Any, job_config: Any
+    ) -> FakeJob:
+        self.loads.append((rows, job_config))
+        return FakeJob(self.error)
+
+
+class TestBigQueryBulkInsert(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bigquery = BigQuery({"json_credentials": "{}"})
+        self.rows = [
+            {
+                "id": str(index),
+                "created_at": "2024-01-01 00:00:00",
+                "data": f'{{"index": {index}}}',
+            }
+            for index in range(3)
+        ]
+
+    def test_rows_loaded_in_single_job(self):
+        client = FakeClient()
+        self.bigquery.bulk_insert(client, TABLE_NAME, self.rows)
+
+        self.assertEqual(len(client.loads), 1)
+        rows, job_config = client.loads[0]
+        self.assertEqual([row["id"] for row in rows], ["0", "1", "2"])
+        self.assertEqual(rows[2]["data"], {"index": 2})
+        self.assertEqual(job_config.schema, client.table.schema)
+        self.assertEqual(
+            job_config.write_disposition, bigquery.WriteDisposition.WRITE_APPEND
+        )
+
+    def test_no_rows(self):
+        client = FakeClient()
+        self.bigquery.bulk_insert(client, TABLE_NAME, [])
+        self.assertEqual(client.loads, [])
+
+    def test_bad_request_is_column_missing(self):
+        client = FakeClient(google.api_core.exceptions.BadRequest("No such field"))
+        with self.assertRaises(ColumnMissingException):
+            self.bigquery.bulk_insert(client, TABLE_NAME, self.rows)
+
+    def test_forbidden(self):
+        client = FakeClient(google.api_core.exceptions.Forbidden("Access denied"))
+        with self.assertRaises(BigQueryForbiddenException):
+            self.bigquery.bulk_insert(client, TABLE_NAME, self.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
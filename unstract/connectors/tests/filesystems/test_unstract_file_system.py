@@ -0,0 +1,94 @@
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from fsspec import AbstractFileSystem
+from fsspec.implementations.memory import MemoryFileSystem
+from unstract.connectors.filesystems.unstract_file_system import UnstractFileSystem
+
+CHUNK_SIZE = UnstractFileSystem.UPLOAD_CHUNK_SIZE
+
+
+class MemoryConnector(UnstractFileSystem):
+    def __init__(self) -> None:
+        super().__init__("Memory")
+        self.fs = MemoryFileSystem()
+        self.fs.store.clear()
+
+    @staticmethod
+    def requires_oauth() -> bool:
+        return False
+
+    @staticmethod
+    def python_social_auth_backend() -> str:
+        return ""
+
+    def get_fsspec_fs(self) -> AbstractFileSystem:
+        return self.fs
+
+    def test_credentials(self) -> bool:
+        return True
+
+
+class FakeWorkflowStorage:
+    """Workflow execution storage holding a single file, recording the reads
+    it's streamed in."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.reads: list[tuple[int, int]] = []
+
+    def read(self, path: str, mode: str, seek_position: int, length: int) -> Any:
+        self.reads.append((seek_position, length))
+        return self.content[seek_position : seek_position + length]
+
+
+class TestUploadFileToStorage(unittest.TestCase):
+    def upload(self, content: bytes) -> tuple[bytes, list[tuple[int, int]]]:
+        connector = MemoryConnector()
+        workflow_storage = FakeWorkflowStorage(content)
+        file_system = MagicMock()
+        file_system.return_value.get_file_storage.return_value = workflow_storage
+        with patch(
+            "unstract.connectors.filesystems.unstract_file_system.FileSystem",
+            file_system,
+        ):
+            connector.upload_file_to_storage(
+                source_path="execution/output/file.txt",
+                destination_path="/output/./file.txt",
+            )
+        return connector.fs.cat_file("/output/file.txt"), workflow_storage.reads
+
+    def test_empty_file(self) -> None:
+        uploaded, reads = self.upload(b"")
+        self.assertEqual(uploaded, b"")
+        self.assertEqual(reads, [(0, CHUNK_SIZE)])
+
+    def test_file_smaller_than_a_chunk(self) -> None:
+        uploaded, reads = self.upload(b"output")
+        self.assertEqual(uploaded, b"output")
+        self.assertEqual(reads, [(0, CHUNK_SIZE)])
+
+    def test_file_of_exactly_one_chunk(self) -> None:
+        content = b"a" * CHUNK_SIZE
+        uploaded, reads = self.upload(content)
+        self.assertEqual(uploaded, content)
+        # Only a short read tells the end of the file
+        self.assertEqual(reads, [(0, CHUNK_SIZE), (CHUNK_SIZE, CHUNK_SIZE)])
+
+    def test_file_streamed_across_chunk_boundary(self) -> None:
+        content = b"a" * CHUNK_SIZE + b"b" * CHUNK_SIZE + b"end"
+        uploaded, reads = self.upload(content)
+        self.assertEqual(uploaded, content)
+        self.assertEqual(
+            reads,
+            [
+                (0, CHUNK_SIZE),
+                (CHUNK_SIZE, CHUNK_SIZE),
+                (2 * CHUNK_SIZE, CHUNK_SIZE),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
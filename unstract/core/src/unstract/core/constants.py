@@ -17,3 +17,27 @@ class LogEventArgument:
 class LogProcessingTask:
     TASK_NAME = "logs_consumer"
     QUEUE_NAME = "celery_log_task_queue"
+
+
+class RunnerJobKey:
+    """Redis keys of tool run jobs, shared by the runner and its callers."""
+
+    PREFIX = "runner_job:"
+    DONE_PREFIX = "runner_job_done:"
+    HEARTBEAT_PREFIX = "runner_job_heartbeat:"
+
+
+class RunnerJobStatus:
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+    FINISHED = {COMPLETED, FAILED, CANCELLED}
+
+
+class ToolRunErrorType:
+    """Source of the error in a runner's response to a tool run."""
+
+    RUNNER = "RUNNER"
+    TOOL = "TOOL"
@@ -1,7 +1,26 @@
 import os
+import threading
 
 import grpc
 
+_channels: dict[tuple[int, str], grpc.Channel] = {}
+_channels_lock = threading.Lock()
+
+
+def get_channel(target: str) -> grpc.Channel:
+    """Returns the channel to the target shared by the clients of a process.
+
+    Channels are keyed by process id as well, since a gRPC channel can't be
+    used across a fork.
+    """
+    key = (os.getpid(), target)
+    with _channels_lock:
+        channel = _channels.get(key)
+        if channel is None:
+            channel = grpc.insecure_channel(target)
+            _channels[key] = channel
+        return channel
+
 
 class BaseClient:
     def __init__(self, stub_class) -> None:
@@ -11,7 +30,5 @@ class BaseClient:
         if not evaluation_server_ip:
             raise ValueError("No response from server, refer README.md.")
 
-        self.channel = grpc.insecure_channel(
-            f"{evaluation_server_ip}:{evaluation_server_port}"
-        )
+        self.channel = get_channel(f"{evaluation_server_ip}:{evaluation_server_port}")
         self.stub = stub_class(self.channel)
@@ -41,6 +41,30 @@ class EvaluationClient(BaseClient):
             bool: True if the feature flag is enabled for the given entity,
               False otherwise.
         """
+        return bool(
+            self.try_boolean_evaluate_feature_flag(
+                namespace_key=namespace_key,
+                flag_key=flag_key,
+                entity_id=entity_id,
+                context=context,
+            )
+        )
+
+    def try_boolean_evaluate_feature_flag(
+        self,
+        namespace_key: str,
+        flag_key: str,
+        entity_id: str,
+        context: Optional[dict] = None,
+    ) -> Optional[bool]:
+        """Evaluates the state of a feature flag like
+        `boolean_evaluate_feature_flag`, telling apart an unreachable server.
+
+        Returns:
+            Optional[bool]: True if the feature flag is enabled for the given
+              entity, False if not or on evaluation errors, None if the
+              evaluation server is unavailable.
+        """
         try:
             request = evaluation_pb2.EvaluationRequest(
                 namespace_key=namespace_key,
@@ -55,8 +79,12 @@ class EvaluationClient(BaseClient):
                 logger.warning(
                     f"Flag key {flag_key} not found in namespace {namespace_key}."
                 )
-            elif e.code() == grpc.StatusCode.UNAVAILABLE:
+            elif e.code() in (
+                grpc.StatusCode.UNAVAILABLE,
+                grpc.StatusCode.DEADLINE_EXCEEDED,
+            ):
                 logger.warning(f"Evaluation server is unavailable: {e.details()}.")
+                return None
             else:
                 logger.warning(
                     f"Error evaluating feature flag {flag_key} for {namespace_key}"
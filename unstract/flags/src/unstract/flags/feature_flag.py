@@ -2,13 +2,121 @@
 
 import logging
 import os
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
 
 from .client.evaluation import EvaluationClient
+from .client.flipt import FliptClient
 
 logger = logging.getLogger(__name__)
 
 
+class FlagEvaluationCache:
+    """Caches flag evaluations of the process.
+
+    Evaluations are reused for `FEATURE_FLAG_CACHE_TTL` seconds per
+    namespace, flag, entity and context. Once expired they're kept as the
+    last known value, served when Flipt is unavailable. At most
+    `FEATURE_FLAG_CACHE_MAX_SIZE` evaluations are kept, evicting the least
+    recently used ones. Namespaces listed
+    in `FEATURE_FLAG_PRELOAD_NAMESPACES` have a snapshot of their flags'
+    enabled states loaded on first use, as fallback for flags not evaluated
+    yet.
+    """
+
+    _lock = threading.Lock()
+    _evaluations: OrderedDict[tuple[Any, ...], tuple[bool, float]] = OrderedDict()
+    _snapshots: dict[str, dict[str, bool]] = {}
+
+    @staticmethod
+    def get_key(
+        namespace_key: str,
+        flag_key: str,
+        entity_id: str,
+        context: Optional[dict[str, str]] = None,
+    ) -> tuple[Any, ...]:
+        return (
+            namespace_key,
+            flag_key,
+            entity_id,
+            tuple(sorted((context or {}).items())),
+        )
+
+    @classmethod
+    def get(cls, key: tuple[Any, ...]) -> Optional[bool]:
+        """Cached evaluation, None if missing or expired."""
+        with cls._lock:
+            cached = cls._evaluations.get(key)
+            if cached:
+                cls._evaluations.move_to_end(key)
+        if not cached:
+            return None
+        enabled, evaluated_at = cached
+        if time.monotonic() - evaluated_at >= cls._ttl():
+            return None
+        return enabled
+
+    @classmethod
+    def set(cls, key: tuple[Any, ...], enabled: bool) -> None:
+        max_size = cls._max_size()
+        with cls._lock:
+            cls._evaluations[key] = (enabled, time.monotonic())
+            cls._evaluations.move_to_end(key)
+            while len(cls._evaluations) > max_size:
+                cls._evaluations.popitem(last=False)
+
+    @classmethod
+    def get_last_known(cls, key: tuple[Any, ...]) -> Optional[bool]:
+        """Last evaluation regardless of its age, else the flag's enabled
+        state from the namespace snapshot."""
+        namespace_key, flag_key = key[0], key[1]
+        with cls._lock:
+            cached = cls._evaluations.get(key)
+            if cached:
+                return cached[0]
+            return cls._snapshots.get(namespace_key, {}).get(flag_key)
+
+    @classmethod
+    def preload(cls, namespace_key: str) -> None:
+        """Loads a snapshot of the namespace's flags if it's configured to be
+        preloaded and not loaded yet."""
+        namespaces = os.environ.get("FEATURE_FLAG_PRELOAD_NAMESPACES", "")
+        if namespace_key not in {ns.strip() for ns in namespaces.split(",")}:
+            return
+        with cls._lock:
+            if namespace_key in cls._snapshots:
+                return
+            # Marked as loaded upfront, a failed load isn't retried per call
+            cls._snapshots[namespace_key] = {}
+        try:
+            response = FliptClient().list_feature_flags(namespace_key=namespace_key)
+        except Exception as e:
+            logger.warning(f"Unable to preload flags of {namespace_key}: {e}")
+            return
+        flags = {
+            flag_key: bool(enabled)
+            for flag_key, enabled in response.get("flags", {}).items()
+        }
+        with cls._lock:
+            cls._snapshots[namespace_key] = flags
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._evaluations.clear()
+            cls._snapshots.clear()
+
+    @staticmethod
+    def _ttl() -> float:
+        return float(os.environ.get("FEATURE_FLAG_CACHE_TTL", 30))
+
+    @staticmethod
+    def _max_size() -> int:
+        return int(os.environ.get("FEATURE_FLAG_CACHE_MAX_SIZE", 10000))
+
+
 def check_feature_flag_status(
     flag_key: str,
     namespace_key: str = "default",
@@ -17,6 +125,8 @@ def check_feature_flag_status(
 ) -> bool:
     """Check the status of a feature flag for a given entity.
 
+    Evaluations are cached, see `FlagEvaluationCache`.
+
     Args:
         namespace_key (str): The namespace key of the feature flag.
         flag_key (str): The flag key of the feature flag.
@@ -37,13 +147,27 @@ def check_feature_flag_status(
         if not FLIPT_SERVICE_AVAILABLE:
             return False
 
+        key = FlagEvaluationCache.get_key(
+            namespace_key=namespace_key,
+            flag_key=flag_key,
+            entity_id=entity_id,
+            context=context,
+        )
+        enabled = FlagEvaluationCache.get(key)
+        if enabled is not None:
+            return enabled
+
+        FlagEvaluationCache.preload(namespace_key)
         evaluation_client = EvaluationClient()
-        response = evaluation_client.boolean_evaluate_feature_flag(
+        response = evaluation_client.try_boolean_evaluate_feature_flag(
             namespace_key=namespace_key,
             flag_key=flag_key,
             entity_id=entity_id,
             context=context,
         )
-        return bool(response)  # Wrap the response in a boolean check
+        if response is None:
+            return bool(FlagEvaluationCache.get_last_known(key))
+        FlagEvaluationCache.set(key, response)
+        return response
     except Exception:
         return False
@@ -0,0 +1,32 @@
+import unittest
+from unittest.mock import patch
+
+from unstract.flags.client import base
+
+
+@patch(
+    "unstract.flags.client.base.grpc.insecure_channel",
+    side_effect=lambda target: object(),
+)
+class TestGetChannel(unittest.TestCase):
+    def setUp(self) -> None:
+        base._channels.clear()
+
+    def tearDown(self) -> None:
+        base._channels.clear()
+
+    def test_channel_shared_per_target(self, insecure_channel):
+        channel = base.get_channel("flipt:9000")
+        self.assertIs(base.get_channel("flipt:9000"), channel)
+        self.assertIsNot(base.get_channel("other:9000"), channel)
+        self.assertEqual(insecure_channel.call_count, 2)
+
+    def test_channel_not_shared_across_processes(self, insecure_channel):
+        with patch("os.getpid", return_value=1):
+            channel = base.get_channel("flipt:9000")
+        with patch("os.getpid", return_value=2):
+            self.assertIsNot(base.get_channel("flipt:9000"), channel)
+
+
+if __name__ == "__main__":
+    unittest.main()
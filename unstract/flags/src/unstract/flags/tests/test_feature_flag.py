@@ -0,0 +1,71 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from unstract.flags.feature_flag import FlagEvaluationCache, check_feature_flag_status
+
+
+class TestFlagEvaluationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        FlagEvaluationCache.clear()
+        self.key = FlagEvaluationCache.get_key("default", "flag", "entity")
+
+    def tearDown(self) -> None:
+        FlagEvaluationCache.clear()
+
+    def test_key_ignores_context_order(self):
+        self.assertEqual(
+            FlagEvaluationCache.get_key("ns", "flag", "e", {"a": "1", "b": "2"}),
+            FlagEvaluationCache.get_key("ns", "flag", "e", {"b": "2", "a": "1"}),
+        )
+
+    def test_expired_evaluation_is_last_known(self):
+        with patch("time.monotonic", return_value=100):
+            FlagEvaluationCache.set(self.key, True)
+        with patch.dict(os.environ, {"FEATURE_FLAG_CACHE_TTL": "30"}):
+            with patch("time.monotonic", return_value=129):
+                self.assertTrue(FlagEvaluationCache.get(self.key))
+            with patch("time.monotonic", return_value=130):
+                self.assertIsNone(FlagEvaluationCache.get(self.key))
+        self.assertTrue(FlagEvaluationCache.get_last_known(self.key))
+
+    def test_least_recently_used_evicted(self):
+        keys = [FlagEvaluationCache.get_key("ns", f"flag-{n}", "e") for n in range(3)]
+        with patch.dict(os.environ, {"FEATURE_FLAG_CACHE_MAX_SIZE": "2"}):
+            FlagEvaluationCache.set(keys[0], True)
+            FlagEvaluationCache.set(keys[1], True)
+            FlagEvaluationCache.get(keys[0])
+            FlagEvaluationCache.set(keys[2], True)
+        self.assertTrue(FlagEvaluationCache.get_last_known(keys[0]))
+        self.assertIsNone(FlagEvaluationCache.get_last_known(keys[1]))
+        self.assertTrue(FlagEvaluationCache.get_last_known(keys[2]))
+
+
+@patch.dict(os.environ, {"FLIPT_SERVICE_AVAILABLE": "true"})
+@patch("unstract.flags.feature_flag.EvaluationClient")
+class TestCheckFeatureFlagStatus(unittest.TestCase):
+    def setUp(self) -> None:
+        FlagEvaluationCache.clear()
+
+    def tearDown(self) -> None:
+        FlagEvaluationCache.clear()
+
+    def test_evaluation_cached(self, client_class):
+        evaluate = client_class.return_value.try_boolean_evaluate_feature_flag
+        evaluate.return_value = True
+        self.assertTrue(check_feature_flag_status("flag"))
+        self.assertTrue(check_feature_flag_status("flag"))
+        evaluate.assert_called_once()
+
+    def test_last_known_served_when_unavailable(self, client_class):
+        evaluate = client_class.return_value.try_boolean_evaluate_feature_flag
+        evaluate.return_value = True
+        with patch.dict(os.environ, {"FEATURE_FLAG_CACHE_TTL": "0"}):
+            self.assertTrue(check_feature_flag_status("flag"))
+            evaluate.return_value = None
+            self.assertTrue(check_feature_flag_status("flag"))
+            self.assertFalse(check_feature_flag_status("other-flag"))
+
+
+if __name__ == "__main__":
+    unittest.main()
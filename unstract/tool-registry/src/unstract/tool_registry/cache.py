@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from unstract.sdk.file_storage import FileStorage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedTools:
+    """Tools parsed from the tools JSON files, keyed by uid.
+
+    Treat as read-only, it's shared by all registries of the process.
+    """
+
+    versions: tuple[Any, ...]
+    tools: dict[str, dict[str, Any]] = field(default_factory=dict)
+    checked_at: float = 0.0
+
+
+class ToolRegistryCache:
+    """Process wide cache of the parsed tools JSON files.
+
+    `ToolRegistry` is created per use, so parsed tools are kept here rather
+    than on the registry. Files are parsed again only if their modification
+    time changed, or the cache was invalidated after the registry wrote
+    them. Modification times are checked at most every
+    `TOOL_REGISTRY_CACHE_CHECK_INTERVAL` seconds, lookups in between
+    don't touch the storage.
+    """
+
+    _lock = threading.Lock()
+    _entries: dict[tuple[str, ...], CachedTools] = {}
+
+    @classmethod
+    def get(
+        cls,
+        tool_files: tuple[str, ...],
+        fs: FileStorage,
+        load: Callable[[], dict[str, dict[str, Any]]],
+    ) -> CachedTools:
+        """Get the tools of the given files, loading them if needed.
+
+        Args:
+            tool_files (tuple[str, ...]): Tools JSON files, in load order
+            fs (FileStorage): Storage the files are read from
+            load (Callable): Parses and merges the tools of the files
+
+        Returns:
+            CachedTools: Tools of the files
+        """
+        with cls._lock:
+            entry = cls._entries.get(tool_files)
+            now = time.monotonic()
+            if entry and now - entry.checked_at < cls._check_interval():
+                return entry
+            versions = cls._get_versions(tool_files=tool_files, fs=fs)
+            if entry and None not in versions and entry.versions == versions:
+                entry.checked_at = now
+                return entry
+            entry = CachedTools(versions=versions, tools=load())
+            entry.checked_at = now
+            cls._entries[tool_files] = entry
+            return entry
+
+    @classmethod
+    def invalidate(cls, tool_file: Optional[str] = None) -> None:
+        """Drop cached tools of a file, or of all files if none is given."""
+        with cls._lock:
+            if tool_file is None:
+                cls._entries.clear()
+                return
+            for tool_files in list(cls._entries):
+                if tool_file in tool_files:
+                    del cls._entries[tool_files]
+
+    @staticmethod
+    def _check_interval() -> float:
+        return float(os.getenv("TOOL_REGISTRY_CACHE_CHECK_INTERVAL", 10))
+
+    @staticmethod
+    def _get_versions(tool_files: tuple[str, ...], fs: FileStorage) -> tuple[Any, ...]:
+        """Modification times of the files, `False` for missing files and
+        `None` where it could not be determined."""
+        versions: list[Any] = []
+        for tool_file in tool_files:
+            try:
+                versions.append(fs.modification_time(tool_file))
+            except FileNotFoundError:
+                versions.append(False)
+            except Exception as e:
+                logger.warning(f"Unable to check modification of {tool_file}: {e}")
+                versions.append(None)
+        return tuple(versions)
@@ -1,7 +1,9 @@
+import copy
 import logging
 from typing import Any, Optional
 
 from unstract.sdk.file_storage import FileStorage, FileStorageProvider
+from unstract.tool_registry.cache import CachedTools, ToolRegistryCache
 from unstract.tool_registry.constants import PropKey
 from unstract.tool_registry.dto import Tool, ToolMeta
 from unstract.tool_registry.exceptions import (
@@ -272,6 +274,7 @@ class ToolRegistryHelper:
         ToolUtils.save_tools_in_to_disk(
             file_path=self.private_tools_file, data=tools_configs
         )
+        ToolRegistryCache.invalidate(self.private_tools_file)
         return tools_configs
 
     def save_tools(self, data: dict[str, Any]) -> None:
@@ -290,13 +293,36 @@ class ToolRegistryHelper:
         except FileNotFoundError:
             logger.error(f"File not found: {self.registry_file}")
             raise RegistryNotFound()
+        finally:
+            ToolRegistryCache.invalidate(self.private_tools_file)
+
+    def _get_cached_tools(self) -> CachedTools:
+        return ToolRegistryCache.get(
+            tool_files=(self.private_tools_file, self.public_tools_file),
+            fs=self.fs,
+            load=self._load_all_tools_from_disk,
+        )
+
+    def get_tools_version(self) -> tuple[Any, ...]:
+        """Version of the tools JSON files, changes whenever a file does.
+
+        Contains None where the modification of a file could not be
+        determined.
+        """
+        return self._get_cached_tools().versions
 
     def get_all_tools_from_disk(self) -> dict[str, dict[str, Any]]:
         """get_all_tools_from_disk.
 
+        Tools are served from `ToolRegistryCache`, the copy returned can be
+        modified freely.
+
         Returns:
             dict[str, Any]: _description_
         """
+        return copy.deepcopy(self._get_cached_tools().tools)
+
+    def _load_all_tools_from_disk(self) -> dict[str, dict[str, Any]]:
         tool_files = [self.private_tools_file, self.public_tools_file]
         tools = {}
         for tool_file in tool_files:
@@ -325,14 +351,15 @@ class ToolRegistryHelper:
         Returns:
             dict[str, Any]: _description_
         """
-        tools: dict[str, Any] = self.get_all_tools_from_disk()
-        tool_data: dict[str, Any] = tools.pop(tool_uid, {})
+        tools = self._get_cached_tools().tools
+        tool_data: dict[str, Any] = copy.deepcopy(tools.get(tool_uid, {}))
         return tool_data
 
     def add_new_tool_to_disk_by_uid(self, uuid: str, data: dict[str, Any]) -> None:
         tools = self.get_all_tools_from_disk()
         tools[uuid] = data
         ToolUtils.save_tools_in_to_disk(file_path=self.private_tools_file, data=tools)
+        ToolRegistryCache.invalidate(self.private_tools_file)
 
     def add_new_tool_to_disk_by_image_url(self, image_url: str) -> None:
         tool_data = self.get_tool_data_by_image_url(image_url=image_url)
@@ -360,4 +387,5 @@ class ToolRegistryHelper:
                 )
             except FileNotFoundError:
                 break
+        ToolRegistryCache.invalidate(self.private_tools_file)
         return tools
@@ -139,6 +139,11 @@ class ToolRegistry:
             tools_list.append(tool_data)
         return tools_list
 
+    def get_tools_version(self) -> tuple[Any, ...]:
+        """Version of the registry's tools, see
+        `ToolRegistryHelper.get_tools_version`."""
+        return self.helper.get_tools_version()
+
     def get_tool_by_uid(self, uid: str) -> Optional[Tool]:
         """Get tools from json.
 
@@ -148,8 +153,7 @@ class ToolRegistry:
         Returns:
             list[dict[str, Any]]: Tools
         """
-        tools = self.helper.get_all_tools_from_disk()
-        data = tools.get(uid)
+        data = self.helper.get_tool_data_by_id(tool_uid=uid)
         if not data:
             return None
         properties = data.get(ToolJsonField.PROPERTIES)
@@ -290,8 +294,8 @@ class ToolRegistry:
         Returns:
             dict[str, Any]: _description_
         """
-        tools = self.helper.get_all_tools_from_disk()
-        spec: dict[str, Any] = tools.get(tool_id, {}).get("spec", {})
+        tool = self.helper.get_tool_data_by_id(tool_uid=tool_id)
+        spec: dict[str, Any] = tool.get("spec", {})
         return spec
 
     def get_tool_properties_by_tool_id(self, tool_id: str) -> dict[str, Any]:
@@ -303,8 +307,8 @@ class ToolRegistry:
         Returns:
             dict[str, Any]: _description_
         """
-        tools = self.helper.get_all_tools_from_disk()
-        properties: dict[str, Any] = tools.get(tool_id, {}).get("properties", {})
+        tool = self.helper.get_tool_data_by_id(tool_uid=tool_id)
+        properties: dict[str, Any] = tool.get("properties", {})
         return properties
 
     def get_tool_icon_by_tool_id(self, tool_id: str) -> dict[str, Any]:
@@ -316,8 +320,8 @@ class ToolRegistry:
         Returns:
             dict[str, Any]: _description_
         """
-        tools = self.helper.get_all_tools_from_disk()
-        icon: dict[str, Any] = tools.get(tool_id, {}).get("icon", {})
+        tool = self.helper.get_tool_data_by_id(tool_uid=tool_id)
+        icon: dict[str, Any] = tool.get("icon", {})
         return icon
 
     def is_image_available(self, tool_id: str) -> bool:
@@ -0,0 +1,56 @@
+import unittest
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from unstract.tool_registry.cache import ToolRegistryCache
+
+TOOL_FILES = ("private_tools.json", "public_tools.json")
+
+
+class TestToolRegistryCache(unittest.TestCase):
+    def setUp(self) -> None:
+        ToolRegistryCache.invalidate()
+        self.fs = MagicMock()
+        self.fs.modification_time.return_value = datetime(2024, 1, 1)
+        self.tools: dict[str, Any] = {
+            "tool_a": {"image_url": "docker:unstract/tool-a:1.0.0"},
+        }
+        self.load = MagicMock(side_effect=lambda: dict(self.tools))
+
+    def tearDown(self) -> None:
+        ToolRegistryCache.invalidate()
+
+    def _get(self):
+        return ToolRegistryCache.get(tool_files=TOOL_FILES, fs=self.fs, load=self.load)
+
+    @patch.dict("os.environ", {"TOOL_REGISTRY_CACHE_CHECK_INTERVAL": "60"})
+    def test_lookups_served_from_memory(self) -> None:
+        for _ in range(10):
+            cached = self._get()
+        self.assertEqual(self.load.call_count, 1)
+        self.assertEqual(self.fs.modification_time.call_count, len(TOOL_FILES))
+        self.assertIn("tool_a", cached.tools)
+
+    @patch.dict("os.environ", {"TOOL_REGISTRY_CACHE_CHECK_INTERVAL": "0"})
+    def test_reloaded_on_modification(self) -> None:
+        self._get()
+        self._get()
+        self.assertEqual(self.load.call_count, 1)
+
+        self.tools["tool_b"] = {"image_url": "docker:unstract/tool-b:1.0.0"}
+        self.fs.modification_time.return_value = datetime(2024, 1, 2)
+        cached = self._get()
+        self.assertEqual(self.load.call_count, 2)
+        self.assertIn("tool_b", cached.tools)
+
+    @patch.dict("os.environ", {"TOOL_REGISTRY_CACHE_CHECK_INTERVAL": "60"})
+    def test_reloaded_after_invalidation(self) -> None:
+        self._get()
+        ToolRegistryCache.invalidate(TOOL_FILES[0])
+        self._get()
+        self.assertEqual(self.load.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
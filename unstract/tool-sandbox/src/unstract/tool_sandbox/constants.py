@@ -1,6 +1,7 @@
 class UnstractRunner:
     BASE_API_ENDPOINT = "/v1/api"
     RUN_API_ENDPOINT = "/container/run"
+    JOBS_API_ENDPOINT = "/container/jobs"
     SPEC_API_ENDPOINT = "/container/spec"
     PROPERTIES_API_ENDPOINT = "/container/properties"
     ICON_API_ENDPOINT = "/container/icon"
@@ -12,3 +13,11 @@ class ToolCommandKey:
     SPEC = "spec"
     VARIABLES = "variables"
     ICON = "icon"
+
+
+class RunnerJobEnv:
+    ENABLED = "UNSTRACT_RUNNER_JOBS_ENABLED"
+    WAIT_INTERVAL = "UNSTRACT_RUNNER_JOB_WAIT_INTERVAL"
+    MAX_WAIT = "UNSTRACT_RUNNER_JOB_MAX_WAIT"
+    REQUEST_TIMEOUT = "UNSTRACT_RUNNER_REQUEST_TIMEOUT"
+    MAX_REQUEST_RETRIES = "UNSTRACT_RUNNER_MAX_REQUEST_RETRIES"
@@ -1,17 +1,24 @@
 import json
 import logging
+import math
 import os
+import time
 from typing import Any, Optional, Union
 
+import redis
 import requests
-from unstract.tool_sandbox.constants import UnstractRunner
+from unstract.tool_sandbox.constants import RunnerJobEnv, UnstractRunner
 
+from unstract.core.constants import RunnerJobKey, RunnerJobStatus
 from unstract.core.utilities import UnstractUtils
 
 logger = logging.getLogger(__name__)
 
 
 class ToolSandboxHelper:
+    _redis: Optional[redis.Redis] = None
+    _session: Optional[requests.Session] = None
+
     def __init__(
         self,
         organization_id: str,
@@ -19,6 +26,7 @@ class ToolSandboxHelper:
         execution_id: str,
         messaging_channel: str,
         environment_variables: dict[str, str],
+        isolate_file_execution: bool = False,
     ) -> None:
         runner_host = os.environ.get("UNSTRACT_RUNNER_HOST")
         runner_port = os.environ.get("UNSTRACT_RUNNER_PORT")
@@ -28,6 +36,7 @@ class ToolSandboxHelper:
         self.execution_id = str(execution_id)
         self.envs = environment_variables
         self.messaging_channel = str(messaging_channel)
+        self.isolate_file_execution = isolate_file_execution
 
     def convert_str_to_dict(self, data: Union[str, dict[str, Any]]) -> dict[str, Any]:
         if isinstance(data, str):
@@ -88,14 +97,130 @@ class ToolSandboxHelper:
         Returns:
             Optional[dict[str, Any]]: tool response
         """
-        url = f"{self.base_url}{UnstractRunner.RUN_API_ENDPOINT}"
         data = self.create_tool_request_data(
             file_execution_id, image_name, image_tag, settings, retry_count
         )
+        if os.environ.get(RunnerJobEnv.ENABLED, "False").lower() == "true":
+            return self.run_tool_job(image_name=image_name, data=data)
+
+        return self._run_tool_request(image_name=image_name, data=data)
+
+    def run_tool_job(
+        self, image_name: str, data: dict[str, Any]
+    ) -> Optional[dict[str, Any]]:
+        """Runs the tool as a job of the runner and waits for its result.
+
+        The job is keyed by the container name, so submitting it again
+        after a failed request doesn't run the tool twice. Completion is
+        awaited on a Redis list the runner pushes to, with the job's status
+        checked every `UNSTRACT_RUNNER_JOB_WAIT_INTERVAL` seconds, for up to
+        `UNSTRACT_RUNNER_JOB_MAX_WAIT` seconds, after which the job is
+        cancelled. Runners without the jobs API are called with a blocking
+        request instead.
+
+        Args:
+            image_name (str): image name
+            data (dict[str, Any]): run request of the tool
+
+        Returns:
+            Optional[dict[str, Any]]: tool response
+        """
+        url = f"{self.base_url}{UnstractRunner.JOBS_API_ENDPOINT}"
+        response = self._request_job("post", url, json=data)
+        if response is not None and response.status_code == 404:
+            logger.warning("Runner has no jobs API, running tool with a request")
+            return self._run_tool_request(image_name=image_name, data=data)
+        job_url = f"{url}/{data['container_name']}"
+        max_wait = self._get_max_wait()
+        deadline = time.monotonic() + max_wait
+        while True:
+            if response is None or response.status_code not in (200, 202):
+                return self._get_run_result(image_name=image_name, response=response)
+            job: dict[str, Any] = response.json()
+            if job["status"] in RunnerJobStatus.FINISHED:
+                return job.get("result")
+            if time.monotonic() >= deadline:
+                error = (
+                    f"Tool {image_name} job {job['job_id']} did not finish "
+                    f"within {max_wait:.0f}s"
+                )
+                logger.error(error)
+                self._cancel_job(job_url)
+                return {"type": "RESULT", "result": None, "error": error}
+            self._wait_for_job(job["job_id"], deadline)
+            response = self._request_job("get", job_url)
+
+    def _run_tool_request(
+        self, image_name: str, data: dict[str, Any]
+    ) -> Optional[dict[str, Any]]:
+        """Runs the tool over a single request blocking until it's done.
+
+        Connecting to the runner is bounded by the request timeout and
+        awaiting the response, which lasts as long as the tool runs, by
+        `UNSTRACT_RUNNER_JOB_MAX_WAIT`.
+        """
+        url = f"{self.base_url}{UnstractRunner.RUN_API_ENDPOINT}"
+        try:
+            response: Optional[requests.Response] = self._get_session().post(
+                url,
+                json=data,
+                timeout=(self._get_request_timeout(), self._get_max_wait()),
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error while calling tool {image_name}: {e}")
+            response = None
+        return self._get_run_result(image_name=image_name, response=response)
+
+    def _request_job(
+        self, method: str, url: str, **kwargs: Any
+    ) -> Optional[requests.Response]:
+        """Requests the runner's jobs API, retrying failed connections.
 
-        response = requests.post(url, json=data)
+        Returns:
+            Optional[requests.Response]: None if the runner is unreachable
+        """
+        retries = int(os.environ.get(RunnerJobEnv.MAX_REQUEST_RETRIES, 3))
+        for attempt in range(retries + 1):
+            try:
+                return self._get_session().request(
+                    method, url, timeout=self._get_request_timeout(), **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                logger.warning(
+                    f"Request to runner {url} failed, attempt {attempt + 1}: {e}"
+                )
+                if attempt < retries:
+                    time.sleep(2**attempt)
+        return None
+
+    def _cancel_job(self, job_url: str) -> None:
+        """Cancels a job so its container stops, it's left to expire if the
+        runner can't be reached."""
+        response = self._request_job("delete", job_url)
+        if response is None or response.status_code != 200:
+            logger.warning(f"Unable to cancel job {job_url}")
+
+    def _wait_for_job(self, job_id: str, deadline: float) -> None:
+        """Blocks until the job is notified as done or the wait interval
+        elapses, without waiting past the deadline."""
+        interval = int(os.environ.get(RunnerJobEnv.WAIT_INTERVAL, 30))
+        interval = max(1, min(interval, math.ceil(deadline - time.monotonic())))
+        try:
+            self._get_redis().blpop(
+                [f"{RunnerJobKey.DONE_PREFIX}{job_id}"], timeout=interval
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Unable to wait for job {job_id} notification: {e}")
+            time.sleep(interval)
+
+    @staticmethod
+    def _get_run_result(
+        image_name: str, response: Optional[requests.Response]
+    ) -> Optional[dict[str, Any]]:
         result: Optional[dict[str, Any]] = None
-        if response.status_code == 200:
+        if response is None:
+            logger.error(f"Error while calling tool {image_name}: runner unreachable")
+        elif response.status_code == 200:
             result = response.json()
         elif response.status_code == 404:
             logger.error(
@@ -108,6 +233,31 @@ class ToolSandboxHelper:
             )
         return result
 
+    @staticmethod
+    def _get_request_timeout() -> float:
+        return float(os.environ.get(RunnerJobEnv.REQUEST_TIMEOUT, 30))
+
+    @staticmethod
+    def _get_max_wait() -> float:
+        return float(os.environ.get(RunnerJobEnv.MAX_WAIT, 7200))
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        if cls._session is None:
+            cls._session = requests.Session()
+        return cls._session
+
+    @classmethod
+    def _get_redis(cls) -> redis.Redis:
+        if cls._redis is None:
+            cls._redis = redis.Redis(
+                host=os.environ.get("REDIS_HOST", "localhost"),
+                port=int(os.environ.get("REDIS_PORT", 6379)),
+                username=os.environ.get("REDIS_USER", ""),
+                password=os.environ.get("REDIS_PASSWORD", ""),
+            )
+        return cls._redis
+
     def create_tool_request_data(
         self,
         file_execution_id: str,
@@ -133,5 +283,6 @@ class ToolSandboxHelper:
             "settings": settings,
             "envs": self.envs,
             "messaging_channel": self.messaging_channel,
+            "isolate_file_execution": self.isolate_file_execution,
         }
         return data
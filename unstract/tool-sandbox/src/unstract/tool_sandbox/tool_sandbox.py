@@ -16,8 +16,14 @@ class ToolSandbox:
         tool_instance_id: Optional[str] = None,
         environment_variables: dict[str, Any] = {},
         messaging_channel: Optional[str] = None,
+        isolate_file_execution: bool = False,
     ):
-        """PLATFORM_SERVICE_API_KEY should be available in the environment."""
+        """PLATFORM_SERVICE_API_KEY should be available in the environment.
+
+        With `isolate_file_execution`, each file is run in a directory of
+        its own under the execution directory, named by its file
+        execution ID.
+        """
         self.messaging_channel = str(messaging_channel)
         self.helper = ToolSandboxHelper(
             organization_id=organization_id,
@@ -25,6 +31,7 @@ class ToolSandbox:
             execution_id=execution_id,
             messaging_channel=self.messaging_channel,
             environment_variables=environment_variables,
+            isolate_file_execution=isolate_file_execution,
         )
         self.tool_guid = tool_guid
         self.tool_instance_id = tool_instance_id
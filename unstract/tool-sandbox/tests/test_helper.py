@@ -0,0 +1,177 @@
+import unittest
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+import redis
+import requests
+from unstract.tool_sandbox.constants import UnstractRunner
+from unstract.tool_sandbox.helper import ToolSandboxHelper
+
+from unstract.core.constants import RunnerJobKey, RunnerJobStatus
+
+BASE_URL = "http://runner:5002/v1/api"
+JOBS_URL = f"{BASE_URL}{UnstractRunner.JOBS_API_ENDPOINT}"
+JOB_ID = "tool-file-1"
+
+
+def completed(result: dict[str, Any]) -> dict[str, Any]:
+    return {"job_id": JOB_ID, "status": RunnerJobStatus.COMPLETED, "result": result}
+
+
+def get_response(status_code: int, json: Optional[Any] = None) -> MagicMock:
+    response = MagicMock(status_code=status_code, reason="reason")
+    response.json.return_value = json
+    return response
+
+
+@patch.dict(
+    "os.environ",
+    {
+        "UNSTRACT_RUNNER_HOST": "http://runner",
+        "UNSTRACT_RUNNER_PORT": "5002",
+        "UNSTRACT_RUNNER_JOB_WAIT_INTERVAL": "5",
+        "UNSTRACT_RUNNER_MAX_REQUEST_RETRIES": "2",
+    },
+)
+class TestRunToolJob(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = MagicMock()
+        self.redis = MagicMock()
+        for name, value in (("_session", self.session), ("_redis", self.redis)):
+            patcher = patch.object(ToolSandboxHelper, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        sleep = patch("unstract.tool_sandbox.helper.time.sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        self.data = {"container_name": JOB_ID, "image_name": "unstract/tool"}
+
+    def _get_helper(self) -> ToolSandboxHelper:
+        return ToolSandboxHelper(
+            organization_id="org",
+            workflow_id="workflow",
+            execution_id="execution",
+            messaging_channel="channel",
+            environment_variables={},
+        )
+
+    def _run(self) -> Optional[dict[str, Any]]:
+        return self._get_helper().run_tool_job(
+            image_name="unstract/tool", data=self.data
+        )
+
+    def _assert_run_request(self) -> None:
+        self.session.post.assert_called_once_with(
+            f"{BASE_URL}{UnstractRunner.RUN_API_ENDPOINT}",
+            json=self.data,
+            timeout=(30.0, 7200.0),
+        )
+
+    def _requests(self) -> list[tuple[str, str]]:
+        return [call.args[:2] for call in self.session.request.call_args_list]
+
+    def test_waits_for_completion_notification(self) -> None:
+        result = {"type": "RESULT", "result": "output"}
+        self.session.request.side_effect = [
+            get_response(202, {"job_id": JOB_ID, "status": RunnerJobStatus.QUEUED}),
+            get_response(200, completed(result)),
+        ]
+
+        self.assertEqual(self._run(), result)
+        self.assertEqual(
+            self._requests(), [("post", JOBS_URL), ("get", f"{JOBS_URL}/{JOB_ID}")]
+        )
+        self.redis.blpop.assert_called_once_with(
+            [f"{RunnerJobKey.DONE_PREFIX}{JOB_ID}"], timeout=5
+        )
+
+    def test_resubmits_same_job_after_dropped_connection(self) -> None:
+        result = {"type": "RESULT", "result": "output"}
+        self.session.request.side_effect = [
+            requests.exceptions.ConnectionError("Connection reset"),
+            get_response(200, completed(result)),
+        ]
+
+        self.assertEqual(self._run(), result)
+        # Resubmitted with the same container name, which the runner maps to
+        # the job already started instead of running the tool again
+        self.assertEqual(self._requests(), [("post", JOBS_URL), ("post", JOBS_URL)])
+        for call in self.session.request.call_args_list:
+            self.assertEqual(call.kwargs["json"]["container_name"], JOB_ID)
+        self.redis.blpop.assert_not_called()
+
+    def test_unreachable_runner_returns_no_result(self) -> None:
+        self.session.request.side_effect = requests.exceptions.ConnectionError()
+
+        self.assertIsNone(self._run())
+        self.assertEqual(self.session.request.call_count, 3)
+
+    def test_falls_back_to_run_request_without_jobs_api(self) -> None:
+        result = {"type": "RESULT", "result": "output"}
+        self.session.request.return_value = get_response(404)
+        self.session.post.return_value = get_response(200, result)
+
+        self.assertEqual(self._run(), result)
+        self._assert_run_request()
+        self.redis.blpop.assert_not_called()
+
+    @patch.dict("os.environ", {"UNSTRACT_RUNNER_JOBS_ENABLED": "False"})
+    def test_runs_tool_with_request_when_jobs_disabled(self) -> None:
+        result = {"type": "RESULT", "result": "output"}
+        self.session.post.return_value = get_response(200, result)
+        helper = self._get_helper()
+
+        with patch.object(helper, "create_tool_request_data", return_value=self.data):
+            response = helper.call_tool_handler(
+                file_execution_id="file-1",
+                image_name="unstract/tool",
+                image_tag="0.0.1",
+                settings={},
+            )
+
+        self.assertEqual(response, result)
+        self._assert_run_request()
+        self.session.request.assert_not_called()
+
+    @patch.dict("os.environ", {"UNSTRACT_RUNNER_JOBS_ENABLED": "False"})
+    def test_unreachable_runner_without_jobs_returns_no_result(self) -> None:
+        self.session.post.side_effect = requests.exceptions.ConnectionError()
+
+        self.assertIsNone(
+            self._get_helper()._run_tool_request(
+                image_name="unstract/tool", data=self.data
+            )
+        )
+
+    @patch.dict("os.environ", {"UNSTRACT_RUNNER_JOB_MAX_WAIT": "0"})
+    def test_cancels_job_after_max_wait(self) -> None:
+        running = {"job_id": JOB_ID, "status": RunnerJobStatus.RUNNING}
+        self.session.request.side_effect = [
+            get_response(202, running),
+            get_response(200, {**running, "status": RunnerJobStatus.CANCELLED}),
+        ]
+
+        result = self._run()
+
+        self.assertIsNone(result["result"])
+        self.assertIn("did not finish", result["error"])
+        self.assertEqual(
+            self._requests(),
+            [("post", JOBS_URL), ("delete", f"{JOBS_URL}/{JOB_ID}")],
+        )
+        self.redis.blpop.assert_not_called()
+
+    def test_polls_status_while_redis_is_unavailable(self) -> None:
+        result = {"type": "RESULT", "result": "output"}
+        self.redis.blpop.side_effect = redis.exceptions.ConnectionError
+        self.session.request.side_effect = [
+            get_response(202, {"job_id": JOB_ID, "status": RunnerJobStatus.QUEUED}),
+            get_response(200, completed(result)),
+        ]
+
+        self.assertEqual(self._run(), result)
+        self.sleep.assert_called_once_with(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
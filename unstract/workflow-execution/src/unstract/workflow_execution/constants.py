@@ -1,10 +1,18 @@
 class StepExecution:
     CACHE_EXP_START_SEC = 86400  # 1 Day
     WAIT_FOR_NEXT_TRIGGER = 10800  # 3 Hrs
+    # List the user's actions are pushed to, suffixed by the execution ID
+    ACTION_KEY_PREFIX = "step_execution_action"
+
+    @classmethod
+    def get_action_key(cls, execution_id: str) -> str:
+        return f"{cls.ACTION_KEY_PREFIX}:{execution_id}"
 
 
 class ToolExecution:
-    MAXIMUM_RETRY = 1
+    # Retries of a tool run failing with a transient error, unless
+    # overridden by TOOL_RUN_MAX_RETRIES
+    MAXIMUM_RETRY = 0
     # Offset for step adjustment: Converts zero-based indexing to one-based
     # for readability
     STEP_ADJUSTMENT_OFFSET: int = 1
@@ -43,6 +51,7 @@ class MetaDataKey:
     FILE_EXECUTION_ID = "file_execution_id"
     ORGANIZATION_ID = "organization_id"
     TOOL_METADATA = "tool_metadata"
+    TOOL_RETRIES = "tool_retries"
     TAGS = "tags"
 
 
@@ -13,6 +13,11 @@ class ExecutionAction(Enum):
     CONTINUE = "CONTINUE"
 
 
+class ToolErrorType(Enum):
+    TRANSIENT = "TRANSIENT"
+    DETERMINISTIC = "DETERMINISTIC"
+
+
 class LogStage(Enum):
     """A enum class representing the different states of a log.
 
@@ -1,8 +1,12 @@
+import copy
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, TypeVar
 
 from unstract.workflow_execution.constants import (
     MetaDataKey,
@@ -19,7 +23,25 @@ from unstract.filesystem import FileStorageType, FileSystem
 logger = logging.getLogger(__name__)
 
 
+FileHandler = TypeVar("FileHandler", bound="ExecutionFileHandler")
+
+
+@dataclass
+class CachedMetadata:
+    metadata: dict[str, Any]
+    # Version of the file read, None if written by the handler
+    version: Optional[tuple[Any, ...]]
+    # Whether the file may have changed since it was cached
+    stale: bool = False
+
+
 class ExecutionFileHandler:
+    # Parsed METADATA.json files by path, shared by the handlers of a process
+    # since the source, destination and execution service each have one
+    METADATA_CACHE_SIZE = 256
+    _metadata_lock = threading.Lock()
+    _metadata_cache: "OrderedDict[str, CachedMetadata]" = OrderedDict()
+
     def __init__(
         self, workflow_id: str, execution_id: str, organization_id: str
     ) -> None:
@@ -35,17 +57,98 @@ class ExecutionFileHandler:
             self.execution_dir, WorkflowFileType.METADATA_JSON
         )
 
+    def for_file_execution(self: FileHandler, file_execution_id: str) -> FileHandler:
+        """Copy of the handler whose files are in a directory of their own,
+        named by the file execution ID under the execution directory.
+
+        Used to execute files concurrently, see `isolate_file_execution` of
+        `ToolSandbox`.
+
+        Args:
+            file_execution_id (str): UUID for a single run of a file
+
+        Returns:
+            A shallow copy of the handler
+        """
+        handler = copy.copy(self)
+        handler.execution_dir = os.path.join(self.execution_dir, str(file_execution_id))
+        handler.source_file = os.path.join(
+            handler.execution_dir, WorkflowFileType.SOURCE
+        )
+        handler.infile = os.path.join(handler.execution_dir, WorkflowFileType.INFILE)
+        handler.metadata_file = os.path.join(
+            handler.execution_dir, WorkflowFileType.METADATA_JSON
+        )
+        return handler
+
     def get_workflow_metadata(self) -> dict[str, Any]:
         """Get metadata for the workflow.
 
+        The parsed metadata is cached until a tool has run, after which it's
+        revalidated against the file's ETag or modification time.
+
         Returns:
             dict[str, Any]: Workflow metadata.
         """
+        with self._metadata_lock:
+            cached = self._metadata_cache.get(self.metadata_file)
+            if cached:
+                self._metadata_cache.move_to_end(self.metadata_file)
+        if cached and not cached.stale:
+            return copy.deepcopy(cached.metadata)
+
         file_system = FileSystem(FileStorageType.WORKFLOW_EXECUTION)
         file_storage = file_system.get_file_storage()
+        version = self._get_metadata_version(file_storage)
+        if cached and version is not None and cached.version == version:
+            cached.stale = False
+            return copy.deepcopy(cached.metadata)
+
         metadata_content = file_storage.read(path=self.metadata_file, mode="r")
         metadata = json.loads(metadata_content)
-        return metadata
+        self._cache_metadata(metadata, version=version)
+        return copy.deepcopy(metadata)
+
+    def _get_metadata_version(self, file_storage: Any) -> Optional[tuple[Any, ...]]:
+        """ETag or modification time of the metadata file with its size,
+        from a single stat of the storage.
+
+        Returns:
+            Optional[tuple[Any, ...]]: None if it could not be determined
+        """
+        try:
+            info = file_storage.fs.info(self.metadata_file)
+        except Exception as e:
+            logger.warning(f"Unable to revalidate {self.metadata_file}: {e}")
+            return None
+        tag = (
+            info.get("ETag")
+            or info.get("etag")
+            or info.get("LastModified")
+            or info.get("updated")
+            or info.get("mtime")
+        )
+        if tag is None:
+            return None
+        return tag, info.get("size")
+
+    def invalidate_metadata(self) -> None:
+        """Marks the cached metadata as possibly changed, e.g. by a tool."""
+        with self._metadata_lock:
+            cached = self._metadata_cache.get(self.metadata_file)
+            if cached:
+                cached.stale = True
+
+    def _cache_metadata(
+        self, metadata: dict[str, Any], version: Optional[tuple[Any, ...]] = None
+    ) -> None:
+        with self._metadata_lock:
+            self._metadata_cache[self.metadata_file] = CachedMetadata(
+                metadata=copy.deepcopy(metadata), version=version
+            )
+            self._metadata_cache.move_to_end(self.metadata_file)
+            while len(self._metadata_cache) > self.METADATA_CACHE_SIZE:
+                self._metadata_cache.popitem(last=False)
 
     def get_list_of_tool_metadata(
         self, metadata: dict[str, Any]
@@ -113,7 +216,6 @@ class ExecutionFileHandler:
         Raises:
             None
         """
-        metadata_path = os.path.join(self.execution_dir, WorkflowFileType.METADATA_JSON)
         filename = os.path.basename(input_file_path)
         content = {
             MetaDataKey.SOURCE_NAME: filename,
@@ -126,12 +228,27 @@ class ExecutionFileHandler:
         }
         file_system = FileSystem(FileStorageType.WORKFLOW_EXECUTION)
         file_storage = file_system.get_file_storage()
-        file_storage.json_dump(path=metadata_path, data=content)
+        file_storage.json_dump(path=self.metadata_file, data=content)
+        self._cache_metadata(content)
 
         logger.info(
             f"metadata for {input_file_path} is " "added in to execution directory"
         )
 
+    def add_tool_retries(self, tool_instance_id: str, retries: int) -> None:
+        """Records the retries of a tool's run in the workflow metadata.
+
+        Args:
+            tool_instance_id (str): Tool instance that was run
+            retries (int): Retries of transient failures the run took
+        """
+        metadata = self.get_workflow_metadata()
+        metadata.setdefault(MetaDataKey.TOOL_RETRIES, {})[tool_instance_id] = retries
+        file_system = FileSystem(FileStorageType.WORKFLOW_EXECUTION)
+        file_storage = file_system.get_file_storage()
+        file_storage.json_dump(path=self.metadata_file, data=metadata)
+        self._cache_metadata(metadata)
+
     @classmethod
     def get_execution_dir(
         cls, workflow_id: str, execution_id: str, organization_id: str
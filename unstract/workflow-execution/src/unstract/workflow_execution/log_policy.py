@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from unstract.workflow_execution.enums import LogLevel, LogState
+
+# Updates that mark the boundaries of an execution, never coalesced
+UNCOALESCED_STATES = {
+    LogState.BEGIN_WORKFLOW.value,
+    LogState.END_WORKFLOW.value,
+    LogState.PROGRESS_MAX_UPDATE.value,
+    LogState.ERROR.value,
+}
+
+
+class LogPolicy:
+    """Budgets the logs published by an execution.
+
+    Verbose executions, such as interactive and single-step runs, publish
+    every log. Others publish errors and update logs that bound the
+    execution as they come, and otherwise:
+    - Publish info logs at up to `WORKFLOW_LOG_RATE_LIMIT` per second
+    - Coalesce update logs of a component within
+      `WORKFLOW_LOG_UPDATE_INTERVAL` seconds into the latest one
+    - Publish only the execution's summary logs, dropping info logs of its
+      files, when it has `WORKFLOW_LOG_SUMMARY_THRESHOLD` files or more
+
+    Info logs of the execution itself rather than of a file, such as its
+    summary, are never rate limited.
+
+    A value of 0 disables the respective limit. The policy is shared by the
+    copies of a service processing files concurrently.
+    """
+
+    def __init__(self, verbose: bool = True) -> None:
+        self.verbose = verbose
+        self.rate_limit = float(os.environ.get("WORKFLOW_LOG_RATE_LIMIT", 20))
+        self.update_interval = float(os.environ.get("WORKFLOW_LOG_UPDATE_INTERVAL", 1))
+        self.summary_threshold = int(
+            os.environ.get("WORKFLOW_LOG_SUMMARY_THRESHOLD", 1000)
+        )
+        self.summary_only = False
+        self.suppressed = 0
+        self._lock = threading.Lock()
+        self._tokens = self.rate_limit
+        self._refilled_at = time.monotonic()
+        self._updated_at: dict[Optional[str], float] = {}
+        self._pending_updates: dict[Optional[str], tuple[str, str]] = {}
+
+    def set_total_files(self, total_files: int) -> None:
+        self.summary_only = (
+            not self.verbose
+            and self.summary_threshold > 0
+            and total_files >= self.summary_threshold
+        )
+
+    def allow_log(self, level: LogLevel, file_execution_id: Optional[str]) -> bool:
+        """Whether a log is published, counting it as suppressed if not."""
+        if self.verbose or level != LogLevel.INFO or not file_execution_id:
+            return True
+        with self._lock:
+            if self.summary_only or not self._take_token():
+                self.suppressed += 1
+                return False
+            return True
+
+    def allow_update(
+        self, state: LogState, message: str, component: Optional[str]
+    ) -> bool:
+        """Whether an update log is published now, keeping it to publish
+        with `flush` if not."""
+        if self.verbose or self.update_interval <= 0:
+            return True
+        if state.value in UNCOALESCED_STATES:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            updated_at = self._updated_at.get(component)
+            if updated_at is not None and now - updated_at < self.update_interval:
+                self._pending_updates[component] = (state.value, message)
+                return False
+            self._updated_at[component] = now
+            self._pending_updates.pop(component, None)
+            return True
+
+    def flush(self) -> tuple[list[tuple[str, str, Optional[str]]], int]:
+        """Update logs left pending, and the number of suppressed logs.
+
+        Returns:
+            tuple[list[tuple[str, str, Optional[str]]], int]: Pending updates
+                as state, message and component, and the count of logs
+                suppressed since the last flush
+        """
+        with self._lock:
+            updates = [
+                (state, message, component)
+                for component, (state, message) in self._pending_updates.items()
+            ]
+            self._pending_updates.clear()
+            suppressed, self.suppressed = self.suppressed, 0
+        return updates, suppressed
+
+    def _take_token(self) -> bool:
+        if self.rate_limit <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(
+            self.rate_limit,
+            self._tokens + (now - self._refilled_at) * self.rate_limit,
+        )
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
@@ -0,0 +1,137 @@
+import logging
+import os
+import random
+import re
+from typing import Any, Optional
+
+from redis import Redis
+from unstract.workflow_execution.constants import ToolExecution
+from unstract.workflow_execution.enums import ToolErrorType
+
+from unstract.core.constants import ToolRunErrorType
+
+logger = logging.getLogger(__name__)
+
+# Tool errors worth retrying, raised by degraded services rather than input
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r"out of memory|oomkilled|memoryerror|rate.?limit|too many requests|\b429\b"
+    r"|\b50[234]\b|service unavailable|bad gateway|timed? ?out"
+    r"|connection (refused|reset|aborted)",
+    re.IGNORECASE,
+)
+
+
+class ToolRetryPolicy:
+    """Decides whether and when a failed tool run is retried.
+
+    Runs are retried up to `TOOL_RUN_MAX_RETRIES` times, only for transient
+    errors, after an exponential backoff from `TOOL_RUN_RETRY_BACKOFF_BASE`
+    seconds capped at `TOOL_RUN_RETRY_BACKOFF_MAX`, with jitter so that
+    workers failing together don't retry in lockstep.
+    """
+
+    def __init__(self) -> None:
+        self.max_retries = int(
+            os.environ.get("TOOL_RUN_MAX_RETRIES", ToolExecution.MAXIMUM_RETRY)
+        )
+        self.backoff_base = float(os.environ.get("TOOL_RUN_RETRY_BACKOFF_BASE", 2))
+        self.backoff_max = float(os.environ.get("TOOL_RUN_RETRY_BACKOFF_MAX", 60))
+
+    @staticmethod
+    def classify(result: Optional[dict[str, Any]]) -> Optional[ToolErrorType]:
+        """Classifies the outcome of a run from the runner's response.
+
+        Args:
+            result (Optional[dict[str, Any]]): Response of the runner, None if
+                the runner could not be reached or failed to respond
+
+        Returns:
+            Optional[ToolErrorType]: None if the run succeeded
+        """
+        if not result:
+            return ToolErrorType.TRANSIENT
+        error = result.get("error")
+        if not error:
+            return None
+        if result.get("error_type") == ToolRunErrorType.RUNNER:
+            return ToolErrorType.TRANSIENT
+        if TRANSIENT_ERROR_PATTERN.search(str(error)):
+            return ToolErrorType.TRANSIENT
+        return ToolErrorType.DETERMINISTIC
+
+    def should_retry(self, error_type: Optional[ToolErrorType], retry: int) -> bool:
+        return error_type == ToolErrorType.TRANSIENT and retry < self.max_retries
+
+    def get_backoff(self, retry: int) -> float:
+        """Seconds to wait before the given retry, counted from 0."""
+        backoff = min(self.backoff_base * (2**retry), self.backoff_max)
+        return random.uniform(backoff / 2, backoff)
+
+
+class ToolCircuitBreaker:
+    """Fails tool runs fast while a runner or tool image keeps failing.
+
+    Failures of the runner to run the image, where it didn't respond or
+    reported a runner error, are counted in Redis per runner and image
+    across workers and organizations. Errors raised by the tool itself,
+    such as an organization's exhausted LLM quota, are not counted so that
+    they don't pause the tool for other organizations. After
+    `TOOL_CIRCUIT_FAILURE_THRESHOLD` failures within
+    `TOOL_CIRCUIT_OPEN_SECONDS`, the circuit opens and runs are rejected
+    for `TOOL_CIRCUIT_OPEN_SECONDS`. Once it closes again, a successful run
+    resets the count.
+    """
+
+    KEY_PREFIX = "tool_circuit"
+
+    def __init__(self, redis: "Redis[Any]", image_name: str, image_tag: str) -> None:
+        self.redis = redis
+        runner = (
+            f"{os.environ.get('UNSTRACT_RUNNER_HOST')}:"
+            f"{os.environ.get('UNSTRACT_RUNNER_PORT')}"
+        )
+        key = f"{self.KEY_PREFIX}:{runner}:{image_name}:{image_tag}"
+        self.failures_key = f"{key}:failures"
+        self.open_key = f"{key}:open"
+        self.threshold = int(os.environ.get("TOOL_CIRCUIT_FAILURE_THRESHOLD", 5))
+        self.open_seconds = int(os.environ.get("TOOL_CIRCUIT_OPEN_SECONDS", 60))
+
+    @staticmethod
+    def is_runner_failure(result: Optional[dict[str, Any]]) -> bool:
+        """Whether a run failed in the runner rather than in the tool."""
+        return not result or result.get("error_type") == ToolRunErrorType.RUNNER
+
+    def is_open(self) -> bool:
+        if not self.threshold:
+            return False
+        try:
+            return bool(self.redis.exists(self.open_key))
+        except Exception as e:
+            logger.warning(f"Unable to check tool circuit: {e}")
+            return False
+
+    def record_success(self) -> None:
+        if not self.threshold:
+            return
+        try:
+            self.redis.delete(self.failures_key)
+        except Exception as e:
+            logger.warning(f"Unable to reset tool circuit: {e}")
+
+    def record_failure(self) -> None:
+        """Counts a runner failure, opening the circuit at the threshold."""
+        if not self.threshold:
+            return
+        try:
+            pipeline = self.redis.pipeline()
+            pipeline.incr(self.failures_key)
+            pipeline.expire(self.failures_key, self.open_seconds)
+            failures, _ = pipeline.execute()
+            if failures >= self.threshold:
+                self.redis.set(self.open_key, 1, ex=self.open_seconds)
+                self.redis.delete(self.failures_key)
+                logger.warning(
+                    f"Tool circuit {self.open_key} opened after {failures} " "failures"
+                )
+        except Exception as e:
+            logger.warning(f"Unable to record tool circuit failure: {e}")
@@ -1,11 +1,11 @@
 import logging
 import os
+import time
 from typing import Any, Optional
 
 from redis import Redis
 from unstract.tool_registry import ToolRegistry
 from unstract.tool_sandbox import ToolSandbox
-from unstract.workflow_execution.constants import ToolExecution
 from unstract.workflow_execution.constants import ToolRuntimeVariable as ToolRV
 from unstract.workflow_execution.dto import ToolInstance, WorkflowDto
 from unstract.workflow_execution.exceptions import (
@@ -14,6 +14,7 @@ from unstract.workflow_execution.exceptions import (
     ToolExecutionException,
     ToolNotFoundException,
 )
+from unstract.workflow_execution.retry_policy import ToolCircuitBreaker, ToolRetryPolicy
 
 from unstract.core.pubsub_helper import LogPublisher
 
@@ -30,12 +31,13 @@ class ToolsUtils:
         ignore_processed_entities: bool = False,
     ) -> None:
         self.redis = redis
-        self.tool_registry = ToolRegistry()
+        self._tool_registry: Optional[ToolRegistry] = None
         self.organization_id = organization_id
         self.platform_service_api_key = platform_service_api_key
         self.workflow_id = workflow.id
         self.ignore_processed_entities = ignore_processed_entities
         self.messaging_channel: Optional[str] = None
+        self.retry_counts: dict[str, int] = {}
         self.platform_service_host = ToolsUtils.get_env(
             ToolRV.PLATFORM_HOST, raise_exception=True
         )
@@ -59,6 +61,14 @@ class ToolsUtils:
             ToolRV.REDIS_PASSWORD, raise_exception=True
         )
 
+    @property
+    def tool_registry(self) -> ToolRegistry:
+        # Created on first use, building the tools of a compiled workflow
+        # doesn't need the registry
+        if self._tool_registry is None:
+            self._tool_registry = ToolRegistry()
+        return self._tool_registry
+
     def set_messaging_channel(self, messaging_channel: str) -> None:
         self.messaging_channel = messaging_channel
 
@@ -88,7 +98,10 @@ class ToolsUtils:
         return tools
 
     def check_to_build(
-        self, tools: list[ToolInstance], execution_id: str
+        self,
+        tools: list[ToolInstance],
+        execution_id: str,
+        isolate_file_execution: bool = False,
     ) -> list[ToolSandbox]:
         """_summary_
 
@@ -141,6 +154,7 @@ class ToolsUtils:
                 image_tag=image_tag,
                 environment_variables=tool_envs,
                 messaging_channel=self.messaging_channel,
+                isolate_file_execution=isolate_file_execution,
             )
             tool_sandbox.set_tool_instance_settings(tool_instance.metadata)
             tool_sandboxes.append(tool_sandbox)
@@ -183,28 +197,70 @@ class ToolsUtils:
         self,
         file_execution_id: str,
         tool_sandbox: ToolSandbox,
-        max_retries: int = ToolExecution.MAXIMUM_RETRY,
+        max_retries: Optional[int] = None,
     ) -> Any:
-        error: Optional[dict[str, Any]] = None
-        for retry_count in range(max_retries):
+        """Runs the tool, retrying transient failures as per
+        `ToolRetryPolicy`.
+
+        Runs are failed fast while the circuit of the runner and tool image
+        is open. The retries of the last run are kept in `retry_counts` by
+        tool instance.
+
+        Args:
+            file_execution_id (str): UUID for a single run of a file
+            tool_sandbox (ToolSandbox): Sandbox of the tool to run
+            max_retries (Optional[int]): Overrides `TOOL_RUN_MAX_RETRIES`
+
+        Returns:
+            Any: Response of the last run, None if the runner didn't respond
+        """
+        policy = ToolRetryPolicy()
+        if max_retries is not None:
+            policy.max_retries = max_retries
+        circuit = ToolCircuitBreaker(
+            redis=self.redis,
+            image_name=tool_sandbox.image_name,
+            image_tag=tool_sandbox.image_tag,
+        )
+        tool_instance_id = str(tool_sandbox.get_tool_instance_id())
+        retry_count = 0
+        while True:
+            self.retry_counts[tool_instance_id] = retry_count
+            if circuit.is_open():
+                return {
+                    "type": "RESULT",
+                    "result": None,
+                    "error": (
+                        f"Tool {tool_sandbox.image_name} is failing repeatedly, "
+                        "its runs are paused. Try again later"
+                    ),
+                }
+            response: Optional[dict[str, Any]] = None
             try:
                 response = tool_sandbox.run_tool(file_execution_id, retry_count)
-                if response:
-                    return response
-                logger.warning(
-                    f"ToolExecutionException - Retrying "
-                    f"({retry_count + 1}/{max_retries})"
-                )
             except Exception as e:
-                logger.warning(
-                    f"Exception - Retrying ({retry_count + 1}/{max_retries}): "
-                    f"{str(e)}"
-                )
+                logger.warning(f"Exception while running tool: {str(e)}")
+            error_type = policy.classify(response)
+            if circuit.is_runner_failure(response):
+                circuit.record_failure()
+            else:
+                circuit.record_success()
+            if not policy.should_retry(error_type, retry_count):
+                break
+            backoff = policy.get_backoff(retry_count)
+            logger.warning(
+                f"Transient tool failure - Retrying in {backoff:.1f}s "
+                f"({retry_count + 1}/{policy.max_retries})"
+            )
+            time.sleep(backoff)
+            retry_count += 1
 
-        logger.warning(
-            f"Operation failed after {max_retries} " f"retries, error: {error}"
-        )
-        return None
+        if error_type:
+            logger.warning(
+                f"Tool run failed with a {error_type.value.lower()} error after "
+                f"{retry_count} retries"
+            )
+        return response
 
     def get_tool_environment_variables(self) -> dict[str, Any]:
         """Obtain a dictionary of env variables required by a tool.
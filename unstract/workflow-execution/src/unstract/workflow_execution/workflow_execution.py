@@ -1,6 +1,6 @@
+import copy
 import logging
 import os
-import time
 from typing import Any, Optional, Union
 
 import redis
@@ -21,6 +21,7 @@ from unstract.workflow_execution.exceptions import (
     ToolOutputNotFoundException,
 )
 from unstract.workflow_execution.execution_file_handler import ExecutionFileHandler
+from unstract.workflow_execution.log_policy import LogPolicy
 from unstract.workflow_execution.tools_utils import ToolsUtils
 
 from unstract.core.pubsub_helper import LogPublisher
@@ -58,12 +59,16 @@ class WorkflowExecutionService:
         )
         self.tool_sandboxes: list[ToolSandbox] = []
         self.ignore_processed_entities = ignore_processed_entities
+        # Runs each file in a directory of its own, for files executed
+        # concurrently through `for_file_execution`
+        self.isolate_file_execution = False
         self.override_single_step = False
         self.execution_id: str = ""
         self.file_execution_id: Optional[str] = None
         self.messaging_channel: Optional[str] = None
         self.input_files: list[str] = []
         self.log_stage: LogStage = LogStage.COMPILE
+        self.log_policy = LogPolicy()
 
     def set_messaging_channel(self, messaging_channel: str) -> None:
         self.messaging_channel = messaging_channel
@@ -124,7 +129,9 @@ class WorkflowExecutionService:
 
         try:
             self.tool_sandboxes = self.tool_utils.check_to_build(
-                tools=self.tool_instances, execution_id=self.execution_id
+                tools=self.tool_instances,
+                execution_id=self.execution_id,
+                isolate_file_execution=self.isolate_file_execution,
             )
 
             log_message = (
@@ -172,6 +179,41 @@ class WorkflowExecutionService:
             )
         self._finalize_execution(execution_type)
 
+    def for_file_execution(self, file_execution_id: str) -> "WorkflowExecutionService":
+        """Copy of the service for executing a single file, concurrently
+        with other files of the execution.
+
+        The copy logs for the file and works in the file's own directory,
+        which requires the workflow to be built with
+        `isolate_file_execution`.
+
+        Args:
+            file_execution_id (str): UUID for a single run of a file
+
+        Returns:
+            WorkflowExecutionService: A shallow copy of the service
+        """
+        service = copy.copy(self)
+        service.file_execution_id = file_execution_id
+        service.file_handler = self.file_handler.for_file_execution(file_execution_id)
+        service.tool_utils = copy.copy(self.tool_utils)
+        service.tool_utils.retry_counts = {}
+        return service
+
+    def execute_workflow_step(self, step: int) -> None:
+        """Executes a single step of the workflow for the service's file.
+
+        Steps of a file have to be executed in order, see `execute_workflow`
+        for executing them all.
+
+        Args:
+            step (int): Zero-based step to execute
+        """
+        self.log_stage = LogStage.RUN
+        self._initialize_execution()
+        self.total_steps = len(self.tool_sandboxes)
+        self._execute_step(step=step, sandbox=self.tool_sandboxes[step])
+
     def _execute_step(
         self,
         step: int,
@@ -209,9 +251,19 @@ class WorkflowExecutionService:
                 message="Ready for execution",
                 component=tool_instance_id,
             )
-            result = self.tool_utils.run_tool(
-                file_execution_id=self.file_execution_id, tool_sandbox=sandbox
-            )
+            try:
+                result = self.tool_utils.run_tool(
+                    file_execution_id=self.file_execution_id, tool_sandbox=sandbox
+                )
+            finally:
+                # The tool updates the metadata from its container
+                self.file_handler.invalidate_metadata()
+            retries = self.tool_utils.retry_counts.get(str(tool_instance_id), 0)
+            if retries:
+                self.publish_log(
+                    f"Step {actual_step} took {retries} retries", step=actual_step
+                )
+                self.file_handler.add_tool_retries(str(tool_instance_id), retries)
             if result and result.get("error"):
                 raise ToolOutputNotFoundException(result.get("error"))
             if not self.validate_execution_result(step + 1):
@@ -255,6 +307,9 @@ class WorkflowExecutionService:
             logger.info(
                 f"Setting single stepping flag to " f"{ExecutionAction.START.value}"
             )
+            action_key = StepExecution.get_action_key(self.execution_id)
+            # Drops actions left over from an earlier step
+            red.delete(action_key)
             red.setex(
                 self.execution_id,
                 StepExecution.CACHE_EXP_START_SEC,
@@ -271,47 +326,34 @@ class WorkflowExecutionService:
             )
             self.publish_log(log_message)
 
-            wait_for_user = 0
-            while wait_for_user < StepExecution.WAIT_FOR_NEXT_TRIGGER:
-                execution_value_in_byte = red.get(self.execution_id)
-                execution_action = None
-                execution_value = None
-                if execution_value_in_byte is not None:
-                    execution_value = execution_value_in_byte.decode("utf-8")
-                if execution_value:
-                    execution_action = ExecutionAction(execution_value)
-                if execution_action == ExecutionAction.NEXT:
-                    log_message = (
-                        f"Execution '{self.execution_id}' Executing " "NEXT step"
-                    )
-                    self.publish_log(log_message)
-                    break
-                if execution_action == ExecutionAction.CONTINUE:
-                    log_message = (
-                        f"Execution '{self.execution_id}' "
-                        "CONTINUE to the end of execution"
-                    )
-                    self.publish_log(log_message)
-                    self.override_single_step = True
-                    break
-                if execution_action == ExecutionAction.STOP:
-                    log_message = (
-                        f"Execution '{self.execution_id}' " "STOPPING execution"
-                    )
-                    self.publish_log(log_message)
-                    raise StopExecution(
-                        "User clicked on stop button. Stopping execution"
-                    )
-                time.sleep(1)
-                wait_for_user += 1
+            # Blocks until an action is pushed, resuming as soon as it's posted
+            popped = red.blpop(
+                [action_key], timeout=StepExecution.WAIT_FOR_NEXT_TRIGGER
+            )
             red.delete(self.execution_id)
-            if wait_for_user >= StepExecution.WAIT_FOR_NEXT_TRIGGER:
+            if popped is None:
                 message = (
                     f"User did not click on next button in "
                     f"{StepExecution.WAIT_FOR_NEXT_TRIGGER}.Stopping execution"
                 )
                 logger.info(message)
                 raise RuntimeError(message)
+            _, execution_value = popped
+            execution_action = ExecutionAction(execution_value.decode("utf-8"))
+            if execution_action == ExecutionAction.NEXT:
+                log_message = f"Execution '{self.execution_id}' Executing " "NEXT step"
+                self.publish_log(log_message)
+            elif execution_action == ExecutionAction.CONTINUE:
+                log_message = (
+                    f"Execution '{self.execution_id}' "
+                    "CONTINUE to the end of execution"
+                )
+                self.publish_log(log_message)
+                self.override_single_step = True
+            elif execution_action == ExecutionAction.STOP:
+                log_message = f"Execution '{self.execution_id}' " "STOPPING execution"
+                self.publish_log(log_message)
+                raise StopExecution("User clicked on stop button. Stopping execution")
 
     def _initialize_execution(self) -> None:
         """Initialize the execution process.
@@ -334,7 +376,9 @@ class WorkflowExecutionService:
         """
         if execution_type == ExecutionType.STEP:
             with self.redis_con as r:
-                r.delete(self.execution_id)
+                r.delete(
+                    self.execution_id, StepExecution.get_action_key(self.execution_id)
+                )
 
         log_message = f"Executed workflow {self.workflow_id} successfully."
         self.publish_log(log_message)
@@ -380,6 +424,8 @@ class WorkflowExecutionService:
         Returns:
             None
         """
+        if not self.log_policy.allow_log(level, self.file_execution_id):
+            return
         log_details = LogPublisher.log_workflow(
             self.log_stage.value,
             message,
@@ -412,6 +458,26 @@ class WorkflowExecutionService:
         """
         if isinstance(component, LogComponent):
             component = component.value
+        if not self.log_policy.allow_update(state, message, component):
+            return
 
         log_details = LogPublisher.log_workflow_update(state.value, message, component)
         LogPublisher.publish(self.messaging_channel, log_details)
+
+    def flush_logs(self) -> None:
+        """Publishes the update logs held back by the log policy, and the
+        number of logs it suppressed."""
+        updates, suppressed = self.log_policy.flush()
+        for state, message, component in updates:
+            log_details = LogPublisher.log_workflow_update(state, message, component)
+            LogPublisher.publish(self.messaging_channel, log_details)
+        if suppressed:
+            log_details = LogPublisher.log_workflow(
+                self.log_stage.value,
+                f"{suppressed} log message(s) were not published to limit the "
+                "log volume of the execution",
+                LogLevel.INFO.value,
+                execution_id=self.execution_id,
+                organization_id=self.organization_id,
+            )
+            LogPublisher.publish(self.messaging_channel, log_details)
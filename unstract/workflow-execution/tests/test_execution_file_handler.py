@@ -0,0 +1,118 @@
+import json
+import os
+import unittest
+from collections import OrderedDict
+from contextlib import ExitStack
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from unstract.workflow_execution.execution_file_handler import ExecutionFileHandler
+
+MODULE = "unstract.workflow_execution.execution_file_handler"
+
+
+class TestWorkflowMetadataCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.files: dict[str, Any] = {}
+        self.info = {"ETag": "1", "size": 10}
+        self.storage = MagicMock()
+        self.storage.fs.info.side_effect = lambda path: dict(self.info)
+        self.storage.read.side_effect = lambda path, mode: json.dumps(self.files[path])
+        self.storage.json_dump.side_effect = self.write
+        with ExitStack() as stack:
+            file_system = stack.enter_context(patch(f"{MODULE}.FileSystem"))
+            file_system.return_value.get_file_storage.return_value = self.storage
+            stack.enter_context(
+                patch.object(ExecutionFileHandler, "_metadata_cache", OrderedDict())
+            )
+            stack.enter_context(
+                patch.dict(os.environ, {"WORKFLOW_EXECUTION_DIR_PREFIX": "/data"})
+            )
+            self.addCleanup(stack.pop_all().close)
+        self.handler = ExecutionFileHandler(
+            workflow_id="workflow", execution_id="execution", organization_id="org"
+        )
+
+    def write(self, path: str, data: dict[str, Any]) -> None:
+        self.files[path] = json.loads(json.dumps(data))
+
+    def write_by_tool(self, metadata: dict[str, Any], etag: str) -> None:
+        self.files[self.handler.metadata_file] = metadata
+        self.info = {"ETag": etag, "size": 20}
+
+    def test_served_from_cache_until_invalidated(self) -> None:
+        self.write_by_tool({"step": 1}, etag="1")
+        self.assertEqual(self.handler.get_workflow_metadata(), {"step": 1})
+
+        self.write_by_tool({"step": 2}, etag="2")
+        self.assertEqual(self.handler.get_workflow_metadata(), {"step": 1})
+        self.assertEqual(self.storage.read.call_count, 1)
+
+        self.handler.invalidate_metadata()
+        self.assertEqual(self.handler.get_workflow_metadata(), {"step": 2})
+        self.assertEqual(self.storage.read.call_count, 2)
+
+    def test_unchanged_file_is_revalidated_without_reading(self) -> None:
+        self.write_by_tool({"step": 1}, etag="1")
+        self.handler.get_workflow_metadata()
+
+        self.handler.invalidate_metadata()
+        self.assertEqual(self.handler.get_workflow_metadata(), {"step": 1})
+        self.assertEqual(self.storage.read.call_count, 1)
+        self.assertEqual(self.storage.fs.info.call_count, 2)
+
+        # Revalidated once until invalidated again
+        self.handler.get_workflow_metadata()
+        self.assertEqual(self.storage.fs.info.call_count, 2)
+
+    def test_modification_time_is_the_version_without_etag(self) -> None:
+        self.files[self.handler.metadata_file] = {"step": 1}
+        self.info = {"mtime": 100.0, "size": 10}
+        self.handler.get_workflow_metadata()
+
+        self.handler.invalidate_metadata()
+        self.handler.get_workflow_metadata()
+        self.assertEqual(self.storage.read.call_count, 1)
+
+        self.files[self.handler.metadata_file] = {"step": 2}
+        self.info = {"mtime": 200.0, "size": 10}
+        self.handler.invalidate_metadata()
+        self.assertEqual(self.handler.get_workflow_metadata(), {"step": 2})
+
+    def test_metadata_written_by_handler_is_read_once_invalidated(self) -> None:
+        self.handler.add_metadata_to_volume(
+            input_file_path="/input/a.pdf",
+            file_execution_id="file",
+            source_hash="hash",
+            tags=[],
+        )
+        metadata = self.handler.get_workflow_metadata()
+        self.assertEqual(metadata["source_name"], "a.pdf")
+        self.storage.read.assert_not_called()
+        self.storage.fs.info.assert_not_called()
+
+        # Its version is unknown, whatever the file's version it's read again
+        self.handler.invalidate_metadata()
+        self.assertEqual(self.handler.get_workflow_metadata(), metadata)
+        self.assertEqual(self.storage.read.call_count, 1)
+
+    def test_unknown_version_is_read_again(self) -> None:
+        self.write_by_tool({"step": 1}, etag="1")
+        self.handler.get_workflow_metadata()
+        self.storage.fs.info.side_effect = FileNotFoundError
+
+        self.handler.invalidate_metadata()
+        self.handler.get_workflow_metadata()
+        self.handler.invalidate_metadata()
+        self.handler.get_workflow_metadata()
+        self.assertEqual(self.storage.read.call_count, 3)
+
+    def test_cached_metadata_is_not_shared(self) -> None:
+        self.write_by_tool({"tags": ["a"]}, etag="1")
+        self.handler.get_workflow_metadata()["tags"].append("b")
+
+        self.assertEqual(self.handler.get_workflow_metadata(), {"tags": ["a"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
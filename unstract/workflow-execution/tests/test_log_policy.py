@@ -0,0 +1,34 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from unstract.workflow_execution.enums import LogLevel
+from unstract.workflow_execution.log_policy import LogPolicy
+
+
+class TestLogPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        env = {"WORKFLOW_LOG_RATE_LIMIT": "2", "WORKFLOW_LOG_SUMMARY_THRESHOLD": "10"}
+        with patch.dict(os.environ, env):
+            self.policy = LogPolicy(verbose=False)
+
+    def test_rate_limits_file_logs(self):
+        allowed = [self.policy.allow_log(LogLevel.INFO, "file") for _ in range(5)]
+        self.assertEqual(allowed, [True, True, False, False, False])
+        self.assertEqual(self.policy.flush(), ([], 3))
+
+    def test_execution_logs_not_rate_limited(self):
+        for _ in range(5):
+            self.policy.allow_log(LogLevel.INFO, "file")
+        self.assertTrue(self.policy.allow_log(LogLevel.INFO, None))
+        self.assertTrue(self.policy.allow_log(LogLevel.ERROR, "file"))
+
+    def test_summary_only(self):
+        self.policy.set_total_files(10)
+        self.assertFalse(self.policy.allow_log(LogLevel.INFO, "file"))
+        self.assertTrue(self.policy.allow_log(LogLevel.INFO, None))
+        self.assertEqual(self.policy.flush(), ([], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
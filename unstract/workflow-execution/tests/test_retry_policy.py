@@ -0,0 +1,161 @@
+import os
+import unittest
+from typing import Any, Optional
+from unittest.mock import patch
+
+from unstract.workflow_execution.enums import ToolErrorType
+from unstract.workflow_execution.retry_policy import ToolCircuitBreaker, ToolRetryPolicy
+
+from unstract.core.constants import ToolRunErrorType
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    def incr(self, key: str) -> None:
+        self.commands.append(("incr", (key,)))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.commands.append(("expire", (key, seconds)))
+
+    def execute(self) -> list[Any]:
+        return [getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class FakeRedis:
+    """Keeps the keys of a `Redis` client in memory, without expiry."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self)
+
+    def incr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) + 1
+        return int(self.data[key])
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return key in self.data
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        self.data[key] = value
+        return True
+
+    def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    def delete(self, key: str) -> int:
+        return int(self.data.pop(key, None) is not None)
+
+
+class TestToolRetryPolicy(unittest.TestCase):
+    def test_classify_success(self):
+        result = {"type": "RESULT", "result": "text", "error": None}
+        self.assertIsNone(ToolRetryPolicy.classify(result))
+
+    def test_classify_no_response(self):
+        self.assertEqual(ToolRetryPolicy.classify(None), ToolErrorType.TRANSIENT)
+
+    def test_classify_runner_error(self):
+        result = {"error": "Image not found", "error_type": ToolRunErrorType.RUNNER}
+        self.assertEqual(ToolRetryPolicy.classify(result), ToolErrorType.TRANSIENT)
+
+    def test_classify_transient_tool_errors(self):
+        for error in (
+            "Container OOMKilled",
+            "429 Too Many Requests",
+            "502 Bad Gateway",
+            "Request timed out",
+            "Connection refused by host",
+        ):
+            with self.subTest(error=error):
+                self.assertEqual(
+                    ToolRetryPolicy.classify({"error": error}),
+                    ToolErrorType.TRANSIENT,
+                )
+
+    def test_classify_deterministic_tool_errors(self):
+        for error in (
+            "Invalid connection string for database",
+            "Unsupported file type",
+            "Error 5021 in page 3",
+        ):
+            with self.subTest(error=error):
+                self.assertEqual(
+                    ToolRetryPolicy.classify({"error": error}),
+                    ToolErrorType.DETERMINISTIC,
+                )
+
+    def test_no_retries_by_default(self):
+        with patch.dict(os.environ, clear=True):
+            policy = ToolRetryPolicy()
+        self.assertFalse(policy.should_retry(ToolErrorType.TRANSIENT, 0))
+
+    def test_should_retry(self):
+        with patch.dict(os.environ, {"TOOL_RUN_MAX_RETRIES": "2"}):
+            policy = ToolRetryPolicy()
+        self.assertTrue(policy.should_retry(ToolErrorType.TRANSIENT, 1))
+        self.assertFalse(policy.should_retry(ToolErrorType.TRANSIENT, 2))
+        self.assertFalse(policy.should_retry(ToolErrorType.DETERMINISTIC, 0))
+        self.assertFalse(policy.should_retry(None, 0))
+
+    def test_get_backoff(self):
+        with patch.dict(
+            os.environ,
+            {"TOOL_RUN_RETRY_BACKOFF_BASE": "2", "TOOL_RUN_RETRY_BACKOFF_MAX": "10"},
+        ):
+            policy = ToolRetryPolicy()
+        for retry, (low, high) in enumerate([(1, 2), (2, 4), (4, 8), (5, 10)]):
+            with self.subTest(retry=retry):
+                for _ in range(20):
+                    backoff = policy.get_backoff(retry)
+                    self.assertGreaterEqual(backoff, low)
+                    self.assertLessEqual(backoff, high)
+        self.assertLessEqual(policy.get_backoff(10), 10)
+
+
+class TestToolCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.redis = FakeRedis()
+        env = {"TOOL_CIRCUIT_FAILURE_THRESHOLD": "3", "TOOL_CIRCUIT_OPEN_SECONDS": "60"}
+        with patch.dict(os.environ, env):
+            self.circuit = ToolCircuitBreaker(self.redis, "tool", "0.0.1")
+
+    def test_opens_at_threshold(self):
+        for _ in range(2):
+            self.circuit.record_failure()
+        self.assertFalse(self.circuit.is_open())
+        self.circuit.record_failure()
+        self.assertTrue(self.circuit.is_open())
+
+    def test_success_resets_failures(self):
+        for _ in range(2):
+            self.circuit.record_failure()
+        self.circuit.record_success()
+        self.circuit.record_failure()
+        self.assertFalse(self.circuit.is_open())
+
+    def test_runner_failures(self):
+        runner_error = {"error": "Timed out", "error_type": ToolRunErrorType.RUNNER}
+        self.assertTrue(ToolCircuitBreaker.is_runner_failure(None))
+        self.assertTrue(ToolCircuitBreaker.is_runner_failure(runner_error))
+        self.assertFalse(ToolCircuitBreaker.is_runner_failure({"error": "429"}))
+        self.assertFalse(ToolCircuitBreaker.is_runner_failure({"result": "text"}))
+
+    def test_disabled(self):
+        with patch.dict(os.environ, {"TOOL_CIRCUIT_FAILURE_THRESHOLD": "0"}):
+            circuit = ToolCircuitBreaker(self.redis, "tool", "0.0.1")
+        for _ in range(5):
+            circuit.record_failure()
+        self.assertFalse(circuit.is_open())
+
+    def test_fails_open_on_redis_errors(self):
+        with patch.object(self.redis, "exists", side_effect=ConnectionError):
+            self.assertFalse(self.circuit.is_open())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 """Basic Controller."""
 
 import logging
-from io import BytesIO
+import tempfile
+from collections.abc import Iterator
 from typing import Any
 
 import requests
@@ -9,9 +10,11 @@ from app.authentication_middleware import (
     AuthenticationMiddleware,
     authentication_middleware,
 )
+from app.env import Env
 from app.models import X2TextAudit
+from app.proxy import MultipartFileStream, get_session
 from app.util import X2TextUtil
-from flask import Blueprint, request, send_file
+from flask import Blueprint, Response, request
 
 basic = Blueprint("basic", __name__)
 # Configure the logging format and level
@@ -47,7 +50,7 @@ def test_connection() -> Any:
     files = {"files": ("test")}
 
     try:
-        response = requests.request(
+        response = get_session().request(
             "POST",
             url,
             headers=headers,
@@ -95,45 +98,79 @@ def process() -> Any:
         bearer_token
     )
 
-    x2_text_audit: X2TextAudit = X2TextAudit.create(
-        org_id=org_id,
-        file_name=uploaded_file.filename,
-        file_type=uploaded_file.mimetype,
-        file_size_in_kb=round(file_size_in_kb, 2),
-    )
-
-    files = {
-        "files": (
-            uploaded_file.filename,
-            uploaded_file.stream,
-            uploaded_file.content_type,
-        )
+    audit = {
+        "org_id": org_id,
+        "file_name": uploaded_file.filename,
+        "file_type": uploaded_file.mimetype,
+        "file_size_in_kb": round(file_size_in_kb, 2),
+        "status": "Failed",
     }
 
     unstructured_api_key = X2TextUtil.get_value_for_key(UNSTRUCTURED_API_KEY, form_data)
+    # Upload is streamed from the spooled request file, not read into memory
+    body = MultipartFileStream(
+        fields=form_data,
+        file_field="files",
+        file_name=uploaded_file.filename,
+        file=uploaded_file.stream,
+        content_type=uploaded_file.content_type,
+    )
     headers = {
         "accept": "application/json",
         "unstructured-api-key": unstructured_api_key,
+        "Content-Type": body.content_type,
     }
-    payload = form_data
-
-    response = requests.request(
-        "POST",
-        url,
-        headers=headers,
-        data=payload,
-        files=files,
-        timeout=None,
+
+    try:
+        response = get_session().request(
+            "POST",
+            url,
+            headers=headers,
+            data=body,
+            timeout=None,
+            stream=True,
+        )
+    except requests.RequestException:
+        X2TextAudit.create(**audit)
+        raise
+    if not response.ok:
+        try:
+            return_val = X2TextUtil.read_response(response=response)
+        finally:
+            response.close()
+            X2TextAudit.create(**audit)
+        logging.error(
+            "Text extraction failed: [%s] %s", response.status_code, return_val
+        )
+        return return_val, response.status_code
+
+    # Text is spooled, to disk past TEXT_SPOOL_MAX_SIZE, before the status is
+    # sent so that a malformed response fails the request instead of
+    # truncating the text of a successful one
+    text = tempfile.SpooledTemporaryFile(max_size=Env.TEXT_SPOOL_MAX_SIZE)
+    try:
+        for chunk in X2TextUtil.iter_text_content(
+            response.iter_content(chunk_size=Env.STREAM_CHUNK_SIZE)
+        ):
+            text.write(chunk)
+        audit["status"] = "Success"
+    except Exception as e:
+        text.close()
+        logging.error("Text extraction response could not be parsed: %s", e)
+        return {"message": f"Invalid response from text extraction: {e}"}, 502
+    finally:
+        response.close()
+        X2TextAudit.create(**audit)
+    text.seek(0)
+
+    def stream_text() -> Iterator[bytes]:
+        while chunk := text.read(Env.STREAM_CHUNK_SIZE):
+            yield chunk
+
+    file_response = Response(
+        stream_text(),
+        mimetype="text/plain",
+        headers={"Content-Disposition": "attachment; filename=infile.txt"},
     )
-    if response.ok:
-        json_response = response.json()
-        response_text = X2TextUtil.get_text_content(json_response)
-        file_stream = BytesIO(response_text.encode("utf-8"))
-        x2_text_audit.status = "Success"
-        x2_text_audit.save()
-        return send_file(file_stream, download_name="infile.txt", as_attachment=True)
-    x2_text_audit.status = "Failed"
-    x2_text_audit.save()
-    return_val = X2TextUtil.read_response(response=response)
-    logging.error("Text extraction failed: [%s] %s", response.status_code, return_val)
-    return return_val, response.status_code
+    file_response.call_on_close(text.close)
+    return file_response
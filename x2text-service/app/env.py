@@ -52,6 +52,13 @@ class Env:
     DB_USERNAME = EnvManager.get_required_setting("DB_USERNAME")
     DB_PASSWORD = EnvManager.get_required_setting("DB_PASSWORD")
     DB_NAME = EnvManager.get_required_setting("DB_NAME")
+    # Pooling of connections to the extraction backends
+    HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 10))
+    HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+    # Size of chunks streamed to and from the extraction backends
+    STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 64 * 1024))
+    # Size of extracted text held in memory before it is spooled to disk
+    TEXT_SPOOL_MAX_SIZE = int(os.environ.get("TEXT_SPOOL_MAX_SIZE", 10 * 1024 * 1024))
 
 
 EnvManager.raise_for_missing_envs()
@@ -0,0 +1,173 @@
+import codecs
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from typing import IO, Any, Optional
+
+import requests
+from app.env import Env
+from requests.adapters import HTTPAdapter
+
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Returns the process wide HTTP session used to reach extraction backends.
+
+    Connections are kept alive and pooled per host, avoiding a TCP/TLS
+    handshake for every proxied request.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=Env.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=Env.HTTP_POOL_MAXSIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+class MultipartFileStream:
+    """A multipart/form-data body of form fields and a single file, read
+    lazily so that the file is never held in memory as a whole.
+
+    Its length is known upfront, so it is sent with a `Content-Length`
+    header rather than chunked transfer encoding.
+    """
+
+    def __init__(
+        self,
+        fields: dict[str, Any],
+        file_field: str,
+        file_name: str,
+        file: IO[bytes],
+        content_type: Optional[str] = None,
+    ) -> None:
+        self.boundary = uuid.uuid4().hex
+        self._file = file
+        head = b"".join(
+            self._part_header(name=name) + str(value).encode("utf-8") + b"\r\n"
+            for name, value in fields.items()
+        )
+        head += self._part_header(
+            name=file_field,
+            file_name=file_name,
+            content_type=content_type or "application/octet-stream",
+        )
+        self._head = head
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file.seek(0, 2)
+        self._file_size = self._file.tell()
+        self._file.seek(0)
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.read(Env.STREAM_CHUNK_SIZE):
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self) - self._position
+        chunks = []
+        while size > 0 and self._position < len(self):
+            chunk = self._read_part(size)
+            chunks.append(chunk)
+            size -= len(chunk)
+            self._position += len(chunk)
+        return b"".join(chunks)
+
+    def _read_part(self, size: int) -> bytes:
+        head_size = len(self._head)
+        position = self._position
+        if position < head_size:
+            return self._head[position:][:size]
+        file_end = head_size + self._file_size
+        if position < file_end:
+            chunk = self._file.read(min(size, file_end - position))
+            if not chunk:
+                raise ValueError("File ended before its expected size")
+            return chunk
+        offset = position - file_end
+        return self._tail[offset:][:size]
+
+    def _part_header(
+        self,
+        name: str,
+        file_name: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> bytes:
+        disposition = f'form-data; name="{self._quote(name)}"'
+        if file_name is not None:
+            disposition += f'; filename="{self._quote(file_name)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return f"{header}\r\n".encode()
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r\n", " ")
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yields the items of a JSON array as its bytes arrive.
+
+    Only the item being parsed is buffered, not the whole document.
+
+    Args:
+        chunks (Iterable[bytes]): The JSON document in chunks
+
+    Raises:
+        ValueError: If the document is not a complete JSON array
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    items = 0
+    # Whether the next token is an item, rather than a separator
+    expect_item = True
+    for chunk in chunks:
+        buffer += utf8_decoder.decode(chunk)
+        while True:
+            buffer = buffer.lstrip()
+            if not buffer:
+                break
+            if not started:
+                if buffer[0] != "[":
+                    raise ValueError("Expected a JSON array")
+                buffer = buffer[1:]
+                started = True
+            elif buffer[0] == "]":
+                if expect_item and items:
+                    raise ValueError("Expected an item after ','")
+                return
+            elif not expect_item:
+                if buffer[0] != ",":
+                    raise ValueError(f"Expected ',' or ']', got {buffer[0]!r}")
+                buffer = buffer[1:]
+                expect_item = True
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    # Item is incomplete, wait for more data
+                    break
+                if end == len(buffer):
+                    # A number may continue in the next chunk
+                    break
+                yield item
+                buffer = buffer[end:]
+                items += 1
+                expect_item = False
+    raise ValueError("Incomplete JSON array")
@@ -1,5 +1,7 @@
+from collections.abc import Iterable, Iterator
 from typing import Any
 
+from app.proxy import iter_json_array
 from requests import Response
 
 
@@ -16,6 +18,15 @@ class X2TextUtil:
         )
         return combined_text
 
+    @staticmethod
+    def iter_text_content(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Streaming counterpart of `get_text_content`, yields the combined
+        text of the elements in a JSON response as the response arrives."""
+        for index, item in enumerate(iter_json_array(chunks)):
+            if index:
+                yield b"\n"
+            yield item["text"].encode("utf-8")
+
     @staticmethod
     def read_response(response: Response) -> dict[str, Any]:
         if response.headers.get("Content-Type") == "application/json":
@@ -0,0 +1,113 @@
+import io
+import json
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+
+from app.proxy import MultipartFileStream, iter_json_array
+
+ITEMS = [
+    {"text": 'say "hi"\\', "escaped": "é\n\t☃"},
+    [[1, [2.5, -3e2]], []],
+    "\U0001f600",
+    12345,
+    None,
+    True,
+]
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    stream = io.BytesIO(data)
+    return list(iter(lambda: stream.read(size), b""))
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_items_split_at_every_boundary(self) -> None:
+        document = json.dumps(ITEMS).encode()
+        for size in range(1, 8):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(chunked(document, size))), ITEMS)
+
+    def test_escapes_and_multibyte_characters_split(self) -> None:
+        document = json.dumps(ITEMS, ensure_ascii=False).encode()
+        for size in range(1, 5):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(chunked(document, size))), ITEMS)
+
+    def test_empty_array_with_whitespace(self) -> None:
+        self.assertEqual(list(iter_json_array([b" \n[", b" ", b"]\n"])), [])
+
+    def test_malformed_documents(self) -> None:
+        documents = [
+            b'{"a": 1}',
+            b"[1, 2",
+            b"[1 2]",
+            b"[1, ]",
+            b'["unterminated]',
+            b"",
+        ]
+        for document in documents:
+            with self.subTest(document=document):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(chunked(document, 2)))
+
+    def test_items_are_yielded_as_they_arrive(self) -> None:
+        items = iter_json_array(iter([b'[{"a": 1}, ', b"{"]))
+        self.assertEqual(next(items), {"a": 1})
+
+
+class TestMultipartFileStream(unittest.TestCase):
+    content = bytes(range(256)) * 10
+
+    def make_body(self) -> MultipartFileStream:
+        return MultipartFileStream(
+            fields={"mode": "text", 'quoted"name': 2},
+            file_field="file",
+            file_name='a "b".pdf',
+            file=io.BytesIO(self.content),
+            content_type="application/pdf",
+        )
+
+    def parse(self, body: MultipartFileStream, data: bytes) -> list:
+        head = f"Content-Type: {body.content_type}\r\n\r\n".encode()
+        message = BytesParser(policy=HTTP).parsebytes(head + data)
+        self.assertTrue(message.is_multipart())
+        return list(message.iter_parts())
+
+    def test_parts_are_framed(self) -> None:
+        body = self.make_body()
+        data = body.read()
+        self.assertEqual(len(data), len(body))
+        self.assertTrue(data.endswith(f"--{body.boundary}--\r\n".encode()))
+
+        mode, quoted, file = self.parse(body, data)
+        self.assertEqual(mode.get_param("name", header="content-disposition"), "mode")
+        self.assertEqual(mode.get_payload(decode=True), b"text")
+        self.assertEqual(
+            quoted.get_param("name", header="content-disposition"), 'quoted"name'
+        )
+        self.assertEqual(quoted.get_payload(decode=True), b"2")
+        self.assertEqual(file.get_filename(), 'a "b".pdf')
+        self.assertEqual(file.get_content_type(), "application/pdf")
+        self.assertEqual(file.get_payload(decode=True), self.content)
+
+    def test_reads_across_parts(self) -> None:
+        for size in (1, 7, 100, 4096):
+            with self.subTest(size=size):
+                body = self.make_body()
+                data = b"".join(iter(lambda: body.read(size), b""))
+                self.assertEqual(len(data), len(body))
+                self.assertEqual(len(self.parse(body, data)), 3)
+
+    def test_file_truncated_while_read(self) -> None:
+        file = io.BytesIO(self.content)
+        body = MultipartFileStream(
+            fields={}, file_field="file", file_name="a.pdf", file=file
+        )
+        file.truncate(10)
+        with self.assertRaises(ValueError):
+            body.read()
+
+
+if __name__ == "__main__":
+    unittest.main()